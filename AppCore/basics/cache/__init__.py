@@ -0,0 +1,3 @@
+from AppCore.basics.cache.cache import CacheVersionado, cache_compartilhado, cache_respostas
+
+__all__ = ['CacheVersionado', 'cache_compartilhado', 'cache_respostas']
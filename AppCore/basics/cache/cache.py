@@ -0,0 +1,167 @@
+"""
+Cache versionado - snapshots por entidade invalidados por um contador de versão.
+
+Cada entidade (ex: um usuário) tem um contador próprio, e existe um contador global
+para mudanças que afetam todas as entidades (ex: renomear um setor). A chave do
+snapshot inclui as duas versões; incrementar qualquer uma delas torna os snapshots
+antigos inalcançáveis, sem precisar apagá-los um a um.
+
+O backend é um alias de `CACHES` (por padrão `snapshots`), então a troca entre
+memória local, arquivo ou banco é feita apenas por configuração. A invalidação só
+alcança todos os workers com um backend compartilhado (arquivo ou banco): com a memória
+local (`locmem`) fora de um único processo (`CACHE_LOCAL_PERMITIDO`), `obter` não usa o
+cache e sempre gera o snapshot.
+
+Exemplo de uso:
+    snapshot_usuario = CacheVersionado('snapshot_usuario')
+
+    dados = snapshot_usuario.obter('perfil', usuario.pk, lambda: montar_perfil(usuario))
+
+    # Em um signal de post_save:
+    snapshot_usuario.invalidar(usuario.pk)
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from AppCore.basics.instrumentacao import contar
+
+
+def cache_compartilhado(cache):
+    """
+    Indica se o backend é visto por todos os workers.
+
+    A memória local só vale para um único processo (runserver, testes): fora dele, cada
+    worker teria as próprias versões e uma invalidação não alcançaria os demais.
+    """
+    if isinstance(cache, DummyCache):
+        return False
+    if isinstance(cache, LocMemCache):
+        return getattr(settings, 'CACHE_LOCAL_PERMITIDO', True)
+    return True
+
+
+class CacheVersionado:
+    """
+    Cache de snapshots por entidade com invalidação por versão.
+
+    Args:
+        prefixo: Prefixo das chaves no cache (ex: 'snapshot_usuario')
+        alias: Alias do backend em `CACHES` (padrão: `CACHE_SNAPSHOTS_ALIAS`)
+        timeout: Validade dos snapshots em segundos (padrão: `CACHE_SNAPSHOTS_TIMEOUT`)
+    """
+
+    VERSAO_GLOBAL = 'global'
+
+    def __init__(self, prefixo, alias=None, timeout=None):
+        self.prefixo = prefixo
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias or getattr(settings, 'CACHE_SNAPSHOTS_ALIAS', 'default')]
+
+    @property
+    def compartilhado(self):
+        return cache_compartilhado(self.cache)
+
+    @property
+    def validade(self):
+        if self.timeout is not None:
+            return self.timeout
+        return getattr(settings, 'CACHE_SNAPSHOTS_TIMEOUT', 300)
+
+    def _chave_versao(self, identificador):
+        return f'{self.prefixo}:versao:{identificador}'
+
+    def obter_versao(self, identificador):
+        """
+        Retorna a versão atual do identificador, criando-a se ainda não existir.
+
+        A versão inicial é derivada do relógio, para que um contador expulso do
+        cache não volte a um valor já usado por snapshots antigos.
+        """
+        chave = self._chave_versao(identificador)
+        versao = self.cache.get(chave)
+
+        if versao is None:
+            self.cache.add(chave, time.time_ns(), timeout=None)
+            versao = self.cache.get(chave)
+
+        return versao
+
+    def _chave_alteracao(self, identificador):
+        return f'{self.prefixo}:alterado_em:{identificador}'
+
+    def _incrementar(self, identificador):
+        chave = self._chave_versao(identificador)
+        try:
+            self.cache.incr(chave)
+        except ValueError:
+            self.cache.set(chave, time.time_ns(), timeout=None)
+        self.cache.set(self._chave_alteracao(identificador), time.time(), timeout=None)
+
+    def obter_alteracao(self, identificador):
+        """Retorna o timestamp da última invalidação do identificador (None se não houve)."""
+        return self.cache.get(self._chave_alteracao(identificador))
+
+    def invalidar(self, identificador):
+        """
+        Invalida os snapshots do identificador após o commit da transação corrente.
+
+        Incrementar só depois do commit evita que uma leitura concorrente grave,
+        já com a versão nova, dados que ainda não foram confirmados.
+        """
+        transaction.on_commit(lambda: self._incrementar(identificador))
+
+    def invalidar_todos(self):
+        """Invalida os snapshots de todos os identificadores após o commit."""
+        self.invalidar(self.VERSAO_GLOBAL)
+
+    def chave(self, tipo, identificador):
+        """Monta a chave do snapshot com as versões atuais (global e do identificador)."""
+        versao_global = self.obter_versao(self.VERSAO_GLOBAL)
+        versao = self.obter_versao(identificador)
+        return f'{self.prefixo}:{tipo}:{identificador}:{versao_global}:{versao}'
+
+    def registrar_acesso(self, tipo, acertou):
+        """Conta um hit ou miss na instrumentação da requisição (métrica `cache:<prefixo>.<tipo>`)."""
+        contar(f'cache:{self.prefixo}.{tipo}:{"hit" if acertou else "miss"}')
+
+    def obter(self, tipo, identificador, gerar):
+        """
+        Retorna o snapshot do cache ou o gera e armazena.
+
+        Args:
+            tipo: Tipo do snapshot (ex: 'login', 'perfil'), permite vários por identificador
+            identificador: Identificador da entidade (ex: pk do usuário)
+            gerar: Callable sem argumentos que monta o snapshot em caso de miss
+
+        Returns:
+            O snapshot armazenado ou recém-gerado
+        """
+        if not self.compartilhado:
+            return gerar()
+
+        chave = self.chave(tipo, identificador)
+
+        snapshot = self.cache.get(chave)
+        self.registrar_acesso(tipo, snapshot is not None)
+        if snapshot is None:
+            snapshot = gerar()
+            self.cache.set(chave, snapshot, timeout=self.validade)
+
+        return snapshot
+
+
+# Respostas das listagens públicas (`cache_resposta = True`), invalidadas pelas escritas das Basic*APIView
+cache_respostas = CacheVersionado(
+    'resposta',
+    alias=getattr(settings, 'CACHE_RESPOSTAS_ALIAS', 'default'),
+    timeout=getattr(settings, 'CACHE_RESPOSTAS_TIMEOUT', 300),
+)
@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save
+
+from AppCore.basics.cache.cache import cache_respostas
+from AppCore.core.business.business import atualizacao_em_lote
+
+
+def invalidar_cache_respostas(sender, **kwargs):
+    """Invalida as respostas em cache após a escrita de um model do projeto."""
+    cache_respostas.invalidar_todos()
+
+
+def obter_models_do_projeto():
+    """Models dos apps do projeto (fora os históricos do simple_history)."""
+    from django.apps import apps
+    from django.conf import settings
+
+    return [
+        model
+        for app_config in apps.get_app_configs()
+        if app_config.path.startswith(str(settings.BASE_DIR))
+        for model in app_config.get_models()
+        if not hasattr(model, 'instance_type')
+    ]
+
+
+def conectar_signals_cache_respostas():
+    """
+    Conecta a invalidação do cache de respostas às escritas de todos os models do projeto.
+
+    As listagens em cache exibem dados de outras tabelas (contagens de usuários e
+    vínculos, setores e atividades aninhados), e as escritas também vêm do admin, da
+    importação e das operações em lote, não só das Basic*APIView.
+    """
+    for model in obter_models_do_projeto():
+        label = model._meta.label
+        post_save.connect(invalidar_cache_respostas, sender=model, dispatch_uid=f'cache_respostas_save_{label}')
+        post_delete.connect(invalidar_cache_respostas, sender=model, dispatch_uid=f'cache_respostas_delete_{label}')
+
+    atualizacao_em_lote.connect(invalidar_cache_respostas, dispatch_uid='cache_respostas_lote')
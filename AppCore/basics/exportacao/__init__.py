@@ -0,0 +1,10 @@
+from AppCore.basics.exportacao.exportacao import (
+    CONTENT_TYPES_EXPORTACAO, Exportacao, FORMATOS_EXPORTACAO, RespostaExportacao, TAMANHO_BLOCO_EXPORTACAO,
+    desproteger_valor_csv, gerar_exportacao, proteger_valor_csv, validar_formato_exportacao
+)
+
+__all__ = [
+    'CONTENT_TYPES_EXPORTACAO', 'Exportacao', 'FORMATOS_EXPORTACAO', 'RespostaExportacao',
+    'TAMANHO_BLOCO_EXPORTACAO', 'desproteger_valor_csv', 'gerar_exportacao', 'proteger_valor_csv',
+    'validar_formato_exportacao',
+]
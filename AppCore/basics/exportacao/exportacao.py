@@ -0,0 +1,189 @@
+"""
+Exportação em streaming - CSV, NDJSON ou JSON com memória constante.
+
+Uma `Exportacao` percorre o queryset com `values()` e `iterator(chunk_size=...)` (cursor
+no servidor, no PostgreSQL) e entrega as linhas em blocos de `tamanho_bloco`. Dados de
+relações de muitos (contatos, setores...) são buscados com uma consulta por bloco em
+`montar_linhas`, nunca por linha. `gerar_exportacao` codifica cada bloco assim que ele
+fica pronto, então nem o queryset nem o arquivo inteiro ficam em memória.
+
+No CSV, textos que uma planilha executaria como fórmula (começando com `=`, `+`, `-`, `@`,
+tabulação ou retorno de carro) recebem o prefixo `'`; `desproteger_valor_csv` o remove na
+importação.
+
+Exemplo de uso:
+    class ExportacaoCampi(Exportacao):
+        nome = 'campi'
+        colunas = ['nome', 'cnpj']
+
+        def obter_queryset(self):
+            return Campus.objects.filter()
+
+    return RespostaExportacao(ExportacaoCampi(), 'csv')
+"""
+import csv
+import io
+from decimal import Decimal
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from rest_framework.utils import encoders
+
+from AppCore.basics.renderers.renderers import codificar_json, gerar_envelope
+from AppCore.core.exceptions.exceptions import SystemErrorException, ValidationException
+
+
+FORMATOS_EXPORTACAO = ['csv', 'ndjson', 'json']
+
+CONTENT_TYPES_EXPORTACAO = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+TAMANHO_BLOCO_EXPORTACAO = 2000
+
+# Inícios de célula que planilhas interpretam como fórmula (injeção de fórmulas em CSV)
+INICIOS_FORMULA_CSV = ('=', '+', '-', '@', '\t', '\r')
+PREFIXO_PROTECAO_CSV = "'"
+
+_ENCODER_DRF = encoders.JSONEncoder()
+
+
+def validar_formato_exportacao(formato):
+    """
+    Retorna o formato de exportação normalizado (padrão: csv).
+
+    Raises:
+        ValidationException: Se o formato não for suportado
+    """
+    formato = (formato or 'csv').lower()
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValidationException(f'Formato inválido. Use {", ".join(FORMATOS_EXPORTACAO)}.')
+    return formato
+
+
+class Exportacao:
+    """
+    Base das exportações: consulta em `values()` percorrida em blocos.
+
+    Subclasses definem `nome` (usado no nome do arquivo), `colunas` (ordem das colunas
+    no CSV) e `obter_queryset()`. Por padrão, cada coluna é um lookup do `values()`;
+    para colunas calculadas ou vindas de outras tabelas, sobrescreva `obter_valores()` e
+    `montar_linhas()`.
+
+    Args:
+        tamanho_bloco: Registros buscados do banco e codificados por vez
+    """
+    nome = ''
+    colunas = []
+
+    def __init__(self, tamanho_bloco=TAMANHO_BLOCO_EXPORTACAO):
+        self.tamanho_bloco = tamanho_bloco
+
+    def obter_queryset(self):
+        raise SystemErrorException('Este método não foi implementado.')
+
+    def obter_valores(self):
+        """Lookups buscados com `values()` (por padrão, as próprias colunas)."""
+        return list(self.colunas)
+
+    def montar_linhas(self, bloco):
+        """
+        Converte um bloco de dicionários de `values()` nas linhas exportadas.
+
+        É chamado uma vez por bloco: busque aqui, em lote, o que vem de outras tabelas.
+        """
+        return [{coluna: dados.get(coluna) for coluna in self.colunas} for dados in bloco]
+
+    def iterar_blocos(self):
+        """Gera listas de até `tamanho_bloco` linhas, sem carregar o queryset inteiro."""
+        queryset = self.obter_queryset().values(*self.obter_valores())
+        iterador = queryset.iterator(chunk_size=self.tamanho_bloco)
+        while True:
+            bloco = list(islice(iterador, self.tamanho_bloco))
+            if not bloco:
+                return
+            yield self.montar_linhas(bloco)
+
+    def nome_arquivo(self, formato):
+        return f'{self.nome}-{timezone.localdate():%Y%m%d}.{formato}'
+
+
+def proteger_valor_csv(valor):
+    """Prefixa com `'` o texto que uma planilha executaria como fórmula."""
+    if isinstance(valor, str) and valor.startswith(INICIOS_FORMULA_CSV):
+        return PREFIXO_PROTECAO_CSV + valor
+    return valor
+
+
+def desproteger_valor_csv(valor):
+    """Remove o prefixo de `proteger_valor_csv` (usado ao importar um CSV exportado)."""
+    if isinstance(valor, str) and valor.startswith(PREFIXO_PROTECAO_CSV) \
+            and valor[1:].startswith(INICIOS_FORMULA_CSV):
+        return valor[1:]
+    return valor
+
+
+def _valor_csv(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, (list, tuple)):
+        valor = '; '.join(str(item) for item in valor)
+    return proteger_valor_csv(valor)
+
+
+def _gerar_csv(exportacao):
+    saida = io.StringIO()
+    escritor = csv.writer(saida)
+    escritor.writerow(exportacao.colunas)
+    # BOM para que planilhas reconheçam o UTF-8; o importador lê com 'utf-8-sig'
+    yield ('\ufeff' + saida.getvalue()).encode()
+
+    for linhas in exportacao.iterar_blocos():
+        saida.seek(0)
+        saida.truncate()
+        for linha in linhas:
+            escritor.writerow([_valor_csv(linha.get(coluna)) for coluna in exportacao.colunas])
+        yield saida.getvalue().encode()
+
+
+def _converter_json(valor):
+    # Decimais como texto ("7.50"), como nos serializers, sem perder casas nem precisão
+    if isinstance(valor, Decimal):
+        return str(valor)
+    return _ENCODER_DRF.default(valor)
+
+
+def _gerar_ndjson(exportacao):
+    for linhas in exportacao.iterar_blocos():
+        yield b''.join(codificar_json(linha, _converter_json) + b'\n' for linha in linhas)
+
+
+def gerar_exportacao(exportacao, formato):
+    """
+    Gera o conteúdo da exportação em pedaços de bytes (um por bloco).
+
+    Args:
+        exportacao: Instância de `Exportacao`
+        formato: 'csv', 'ndjson' (um objeto JSON por linha) ou 'json' (envelope das listagens)
+    """
+    if formato == 'csv':
+        return _gerar_csv(exportacao)
+    if formato == 'ndjson':
+        return _gerar_ndjson(exportacao)
+    return gerar_envelope(
+        {'status': 'success', 'mensagem': 'Exportação concluída.'},
+        (linha for linhas in exportacao.iterar_blocos() for linha in linhas),
+        default=_converter_json,
+    )
+
+
+class RespostaExportacao(StreamingHttpResponse):
+    """Download da exportação em streaming, com o nome do arquivo no `Content-Disposition`."""
+
+    def __init__(self, exportacao, formato):
+        super().__init__(gerar_exportacao(exportacao, formato), content_type=CONTENT_TYPES_EXPORTACAO[formato])
+        self['Content-Disposition'] = f'attachment; filename="{exportacao.nome_arquivo(formato)}"'
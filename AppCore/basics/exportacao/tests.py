@@ -0,0 +1,44 @@
+import csv
+import io
+
+from django.test import SimpleTestCase
+
+from AppCore.basics.exportacao import Exportacao, desproteger_valor_csv, gerar_exportacao
+
+
+class ExportacaoFixa(Exportacao):
+    nome = 'teste'
+    colunas = ['nome', 'observacao']
+
+    def __init__(self, linhas):
+        super().__init__()
+        self.linhas = linhas
+
+    def iterar_blocos(self):
+        yield self.linhas
+
+
+class ExportacaoCsvTests(SimpleTestCase):
+    """Proteção contra injeção de fórmulas no CSV exportado."""
+
+    def exportar(self, linhas):
+        conteudo = b''.join(gerar_exportacao(ExportacaoFixa(linhas), 'csv')).decode('utf-8-sig')
+        return list(csv.reader(io.StringIO(conteudo)))[1:]
+
+    def test_formulas_recebem_prefixo(self):
+        linhas = self.exportar([
+            {'nome': '=HYPERLINK("http://exemplo")', 'observacao': '+1'},
+            {'nome': '-2+3', 'observacao': '@SUM(A1)'},
+            {'nome': 'Maria', 'observacao': ['=A1', 'b']},
+        ])
+
+        self.assertEqual(linhas, [
+            ["'=HYPERLINK(\"http://exemplo\")", "'+1"],
+            ["'-2+3", "'@SUM(A1)"],
+            ['Maria', "'=A1; b"],
+        ])
+
+    def test_importacao_remove_o_prefixo(self):
+        self.assertEqual(desproteger_valor_csv("'=A1"), '=A1')
+        self.assertEqual(desproteger_valor_csv("'Maria"), "'Maria")
+        self.assertEqual(desproteger_valor_csv('Maria'), 'Maria')
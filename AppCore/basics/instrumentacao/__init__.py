@@ -0,0 +1,14 @@
+from AppCore.basics.instrumentacao.instrumentacao import (
+    MedicaoRequisicao, RegistroLatencias, contar, medir, obter_medicao, registro_latencias
+)
+from AppCore.basics.instrumentacao.metricas import (
+    ArmazemMetricas, CONTENT_TYPE_PROMETHEUS, armazem_metricas, formatar_prometheus
+)
+from AppCore.basics.instrumentacao.middleware import InstrumentacaoMiddleware
+from AppCore.basics.instrumentacao.n_mais_um import DetectorNMaisUm, DetectorNMaisUmMiddleware
+
+__all__ = [
+    'MedicaoRequisicao', 'RegistroLatencias', 'contar', 'medir', 'obter_medicao', 'registro_latencias',
+    'ArmazemMetricas', 'CONTENT_TYPE_PROMETHEUS', 'armazem_metricas', 'formatar_prometheus',
+    'InstrumentacaoMiddleware', 'DetectorNMaisUm', 'DetectorNMaisUmMiddleware',
+]
@@ -0,0 +1,311 @@
+"""
+Instrumentação por requisição - queries, tempo de banco, serialização e renderização.
+
+O `InstrumentacaoMiddleware` abre uma `MedicaoRequisicao` para cada requisição e a deixa
+acessível pelo contexto (`obter_medicao`). As Basic*APIView marcam suas etapas com
+`medir('auth')` e `medir('serializacao')`; o banco é medido por `execute_wrapper` e a
+renderização pelo próprio middleware. No fim, a medição vira o header `Server-Timing`
+e alimenta os histogramas por endpoint do `registro_latencias`.
+
+Exemplo de uso:
+    with medir('serializacao'):
+        dados = serializer.data
+
+    registro_latencias.resumo()  # [{'endpoint': 'GET usuarios:lista', 'total': 42, 'p95_ms': 250, ...}]
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+# Limites superiores (ms) das faixas dos histogramas de latência; a última faixa é aberta
+FAIXAS_LATENCIA_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+ETAPAS = ['auth', 'db', 'serializacao', 'render']
+
+_medicao_atual = ContextVar('medicao_requisicao', default=None)
+
+
+class MedicaoRequisicao:
+    """Tempos (ms) e contadores de uma requisição."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.duracao_ms = None
+        self.queries = 0
+        self.etapas = dict.fromkeys(ETAPAS, 0.0)
+        self.contadores = {}
+
+    def adicionar(self, etapa, duracao_ms):
+        self.etapas[etapa] = self.etapas.get(etapa, 0.0) + duracao_ms
+
+    def contar(self, nome, quantidade=1):
+        self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def finalizar(self):
+        self.duracao_ms = (time.perf_counter() - self.inicio) * 1000
+        return self
+
+    def server_timing(self):
+        """Monta o valor do header `Server-Timing` (ex: `db;dur=12.4;desc="8 queries", total;dur=40.1`)."""
+        partes = []
+        for etapa, duracao in self.etapas.items():
+            if etapa == 'db':
+                partes.append(f'db;dur={duracao:.1f};desc="{self.queries} queries"')
+            elif duracao:
+                partes.append(f'{etapa};dur={duracao:.1f}')
+        partes.append(f'total;dur={self.duracao_ms:.1f}')
+        return ', '.join(partes)
+
+
+def obter_medicao():
+    """Retorna a medição da requisição corrente, ou None fora de uma requisição instrumentada."""
+    return _medicao_atual.get()
+
+
+def definir_medicao(medicao):
+    """Torna `medicao` a medição corrente; retorna o token para `encerrar_medicao`."""
+    return _medicao_atual.set(medicao)
+
+
+def encerrar_medicao(token):
+    _medicao_atual.reset(token)
+
+
+@contextmanager
+def medir(etapa):
+    """Soma ao tempo da etapa a duração do bloco (sem efeito fora de uma requisição instrumentada)."""
+    medicao = _medicao_atual.get()
+    if medicao is None:
+        yield
+        return
+
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicao.adicionar(etapa, (time.perf_counter() - inicio) * 1000)
+
+
+def contar(nome, quantidade=1):
+    """Incrementa um contador da requisição corrente (ex: 'cache_hit')."""
+    medicao = _medicao_atual.get()
+    if medicao is not None:
+        medicao.contar(nome, quantidade)
+
+
+def medir_query(execute, sql, params, many, context):
+    """`execute_wrapper` que conta as queries e soma o tempo de banco da requisição."""
+    medicao = _medicao_atual.get()
+    if medicao is None:
+        return execute(sql, params, many, context)
+
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicao.queries += 1
+        medicao.adicionar('db', (time.perf_counter() - inicio) * 1000)
+
+
+# ============================================================================
+# HISTOGRAMAS POR ENDPOINT
+# ============================================================================
+
+class JanelaEndpoint:
+    """Acumulado de um endpoint durante um minuto (ou desde o início do processo, com `minuto=None`)."""
+
+    def __init__(self, minuto=None):
+        self.minuto = minuto
+        self.total = 0
+        self.erros = 0
+        self.soma_ms = 0.0
+        self.faixas = [0] * (len(FAIXAS_LATENCIA_MS) + 1)
+        self.queries = 0
+        self.etapas = dict.fromkeys(ETAPAS, 0.0)
+        self.contadores = {}
+
+    def registrar(self, medicao, status_code):
+        self.total += 1
+        if status_code >= 500:
+            self.erros += 1
+        self.soma_ms += medicao.duracao_ms
+        self.faixas[indice_faixa(medicao.duracao_ms)] += 1
+        self.queries += medicao.queries
+        for etapa, duracao in medicao.etapas.items():
+            self.etapas[etapa] = self.etapas.get(etapa, 0.0) + duracao
+        for nome, quantidade in medicao.contadores.items():
+            self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def somar(self, outra):
+        """Acumula os valores de outra janela nesta."""
+        self.total += outra.total
+        self.erros += outra.erros
+        self.soma_ms += outra.soma_ms
+        self.queries += outra.queries
+        self.faixas = [a + b for a, b in zip(self.faixas, outra.faixas)]
+        for etapa, duracao in outra.etapas.items():
+            self.etapas[etapa] = self.etapas.get(etapa, 0.0) + duracao
+        for nome, quantidade in outra.contadores.items():
+            self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+        return self
+
+    def como_dict(self):
+        return {
+            'total': self.total,
+            'erros': self.erros,
+            'soma_ms': self.soma_ms,
+            'faixas': self.faixas,
+            'queries': self.queries,
+            'etapas': self.etapas,
+            'contadores': self.contadores,
+        }
+
+    @classmethod
+    def de_dict(cls, dados):
+        janela = cls()
+        janela.total = dados['total']
+        janela.erros = dados['erros']
+        janela.soma_ms = dados['soma_ms']
+        janela.faixas = list(dados['faixas'])
+        janela.queries = dados['queries']
+        janela.etapas = dict(dados['etapas'])
+        janela.contadores = dict(dados['contadores'])
+        return janela
+
+
+def indice_faixa(duracao_ms):
+    for indice, limite in enumerate(FAIXAS_LATENCIA_MS):
+        if duracao_ms <= limite:
+            return indice
+    return len(FAIXAS_LATENCIA_MS)
+
+
+def percentil(faixas, fracao):
+    """
+    Estima o percentil pelo histograma: limite superior da faixa que atinge a fração.
+
+    Na faixa aberta (acima do último limite) retorna o último limite.
+    """
+    total = sum(faixas)
+    if not total:
+        return None
+
+    alvo = fracao * total
+    acumulado = 0
+    for indice, quantidade in enumerate(faixas):
+        acumulado += quantidade
+        if acumulado >= alvo:
+            return FAIXAS_LATENCIA_MS[min(indice, len(FAIXAS_LATENCIA_MS) - 1)]
+    return FAIXAS_LATENCIA_MS[-1]
+
+
+class RegistroLatencias:
+    """
+    Histogramas de latência por endpoint, na memória do processo.
+
+    Cada endpoint guarda uma `JanelaEndpoint` por minuto; ao consultar, as janelas mais
+    antigas que `INSTRUMENTACAO_JANELA_MINUTOS` são descartadas. Em paralelo, mantém o
+    acumulado desde o início do processo, usado nos contadores das métricas.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._acumulado = {}
+
+    @property
+    def janela_minutos(self):
+        return getattr(settings, 'INSTRUMENTACAO_JANELA_MINUTOS', 15)
+
+    def _descartar_antigas(self, janelas, minuto_atual):
+        while janelas and janelas[0].minuto <= minuto_atual - self.janela_minutos:
+            janelas.popleft()
+
+    def registrar(self, endpoint, medicao, status_code):
+        minuto = int(time.time() // 60)
+        with self._lock:
+            janelas = self._endpoints.setdefault(endpoint, deque())
+            if not janelas or janelas[-1].minuto != minuto:
+                janelas.append(JanelaEndpoint(minuto))
+                self._descartar_antigas(janelas, minuto)
+            janelas[-1].registrar(medicao, status_code)
+
+            if endpoint not in self._acumulado:
+                self._acumulado[endpoint] = JanelaEndpoint()
+            self._acumulado[endpoint].registrar(medicao, status_code)
+
+    def limpar(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._acumulado.clear()
+
+    def agregar(self):
+        """Soma as janelas vigentes de cada endpoint; retorna {endpoint: JanelaEndpoint}."""
+        minuto = int(time.time() // 60)
+        agregados = {}
+
+        with self._lock:
+            for endpoint, janelas in list(self._endpoints.items()):
+                self._descartar_antigas(janelas, minuto)
+                if not janelas:
+                    del self._endpoints[endpoint]
+                    continue
+
+                soma = JanelaEndpoint(minuto)
+                for janela in janelas:
+                    soma.somar(janela)
+                agregados[endpoint] = soma
+
+        return agregados
+
+    def exportar(self):
+        """
+        Retorna o estado do processo em formato serializável (JSON).
+
+        Returns:
+            dict: {'acumulado': {endpoint: dict}, 'janela': {endpoint: dict}}
+        """
+        janela = {endpoint: soma.como_dict() for endpoint, soma in self.agregar().items()}
+        with self._lock:
+            acumulado = {endpoint: soma.como_dict() for endpoint, soma in self._acumulado.items()}
+        return {'acumulado': acumulado, 'janela': janela}
+
+    @staticmethod
+    def resumir(agregados):
+        """Monta o resumo de {endpoint: JanelaEndpoint} (ver `resumo`)."""
+        rotulos = [f'<={limite}' for limite in FAIXAS_LATENCIA_MS] + [f'>{FAIXAS_LATENCIA_MS[-1]}']
+
+        resumo = []
+        for endpoint, soma in sorted(agregados.items()):
+            resumo.append({
+                'endpoint': endpoint,
+                'total': soma.total,
+                'erros': soma.erros,
+                'media_ms': round(soma.soma_ms / soma.total, 1),
+                'p50_ms': percentil(soma.faixas, 0.50),
+                'p95_ms': percentil(soma.faixas, 0.95),
+                'p99_ms': percentil(soma.faixas, 0.99),
+                'queries_media': round(soma.queries / soma.total, 1),
+                **{f'{etapa}_media_ms': round(duracao / soma.total, 1) for etapa, duracao in soma.etapas.items()},
+                'contadores': soma.contadores,
+                'histograma': dict(zip(rotulos, soma.faixas)),
+            })
+        return resumo
+
+    def resumo(self):
+        """
+        Retorna as estatísticas de cada endpoint na janela, ordenadas pelo endpoint.
+
+        Returns:
+            list: [{endpoint, total, erros, media_ms, p50_ms, p95_ms, p99_ms, queries_media,
+                   <etapa>_media_ms, contadores, histograma}]
+        """
+        return self.resumir(self.agregar())
+
+
+registro_latencias = RegistroLatencias()
@@ -0,0 +1,326 @@
+"""
+Métricas agregadas entre processos - armazenamento em arquivos e formato Prometheus.
+
+Cada worker do gunicorn tem o seu `registro_latencias`; para que as métricas reflitam o
+servidor inteiro, cada processo grava periodicamente (`METRICAS_INTERVALO_GRAVACAO`) o
+próprio estado em `METRICAS_DIR/metricas-<pid>.json`, e a coleta soma os arquivos de
+todos os processos. Os contadores de workers encerrados são incorporados ao arquivo
+`metricas-encerrados.json`, para que os totais nunca diminuam; as janelas (percentis)
+consideram apenas os processos vivos cujo arquivo foi gravado dentro da janela (um worker
+ocioso não grava, e a janela que ficou no arquivo dele já passou).
+
+Com `METRICAS_DIR` vazio, a coleta usa apenas a memória do processo atual.
+
+Exemplo de uso:
+    acumulado, janela = armazem_metricas.coletar()
+    texto = formatar_prometheus(acumulado, janela)
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from AppCore.basics.instrumentacao.instrumentacao import (
+    FAIXAS_LATENCIA_MS, JanelaEndpoint, percentil, registro_latencias
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem bloqueio entre processos
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+PREFIXO_ARQUIVO = 'metricas-'
+ARQUIVO_ENCERRADOS = 'metricas-encerrados.json'
+ARQUIVO_BLOQUEIO = '.metricas.lock'
+
+CONTENT_TYPE_PROMETHEUS = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _processo_ativo(pid):
+    if os.name != 'posix':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _somar_estado(destino, origem):
+    """Soma {endpoint: dict} (formato de `JanelaEndpoint.como_dict`) em {endpoint: JanelaEndpoint}."""
+    for endpoint, dados in origem.items():
+        if endpoint not in destino:
+            destino[endpoint] = JanelaEndpoint()
+        destino[endpoint].somar(JanelaEndpoint.de_dict(dados))
+    return destino
+
+
+class ArmazemMetricas:
+    """
+    Estado das métricas de todos os processos, compartilhado por arquivos em um diretório.
+
+    Args:
+        registro: Registro de latências do processo (padrão: `registro_latencias`)
+    """
+
+    def __init__(self, registro=None):
+        self.registro = registro or registro_latencias
+        self._lock = threading.Lock()
+        self._ultima_gravacao = 0.0
+        self._pid_inicializado = None
+
+    @property
+    def diretorio(self):
+        return getattr(settings, 'METRICAS_DIR', '')
+
+    @property
+    def intervalo(self):
+        return getattr(settings, 'METRICAS_INTERVALO_GRAVACAO', 5)
+
+    @property
+    def janela_segundos(self):
+        return getattr(settings, 'INSTRUMENTACAO_JANELA_MINUTOS', 15) * 60
+
+    def _caminho(self, nome):
+        return os.path.join(self.diretorio, nome)
+
+    @contextmanager
+    def _bloqueio(self):
+        """Bloqueio exclusivo entre processos para incorporar arquivos de workers encerrados."""
+        if fcntl is None:
+            yield
+            return
+
+        with open(self._caminho(ARQUIVO_BLOQUEIO), 'a') as arquivo:
+            fcntl.flock(arquivo, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(arquivo, fcntl.LOCK_UN)
+
+    def _ler(self, nome):
+        try:
+            with open(self._caminho(nome), encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError):
+            return None
+
+    def _escrever(self, nome, estado):
+        """Grava de forma atômica: quem lê nunca vê um arquivo pela metade."""
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, prefix='.tmp-')
+        try:
+            with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+                json.dump(estado, arquivo)
+            os.replace(temporario, self._caminho(nome))
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+    def _incorporar_encerrado(self, nome):
+        """Move os contadores de um processo encerrado para o arquivo de encerrados (com o bloqueio)."""
+        estado = self._ler(nome)
+        if estado is not None:
+            encerrados = self._ler(ARQUIVO_ENCERRADOS) or {'acumulado': {}}
+            total = _somar_estado(
+                _somar_estado({}, encerrados['acumulado']), estado.get('acumulado', {})
+            )
+            self._escrever(
+                ARQUIVO_ENCERRADOS,
+                {'acumulado': {endpoint: soma.como_dict() for endpoint, soma in total.items()}},
+            )
+        os.remove(self._caminho(nome))
+
+    def gravar(self):
+        """Grava o estado do processo atual em `metricas-<pid>.json`."""
+        if not self.diretorio:
+            return
+
+        with self._lock:
+            pid = os.getpid()
+            nome = f'{PREFIXO_ARQUIVO}{pid}.json'
+            os.makedirs(self.diretorio, exist_ok=True)
+
+            if self._pid_inicializado != pid:
+                # Um arquivo com o nosso pid é de um processo antigo que teve o pid reaproveitado
+                with self._bloqueio():
+                    if os.path.exists(self._caminho(nome)):
+                        self._incorporar_encerrado(nome)
+                self._pid_inicializado = pid
+
+            self._escrever(nome, {'pid': pid, 'gravado_em': time.time(), **self.registro.exportar()})
+            self._ultima_gravacao = time.monotonic()
+
+    def gravar_se_necessario(self):
+        """Grava o estado se o último registro tiver mais de `METRICAS_INTERVALO_GRAVACAO` segundos."""
+        if not self.diretorio or time.monotonic() - self._ultima_gravacao < self.intervalo:
+            return
+        try:
+            self.gravar()
+        except OSError:
+            logger.exception('Não foi possível gravar as métricas em %s.', self.diretorio)
+
+    def coletar(self):
+        """
+        Soma o estado de todos os processos.
+
+        Returns:
+            tuple: ({endpoint: JanelaEndpoint} acumulados, {endpoint: JanelaEndpoint} da janela)
+        """
+        if not self.diretorio:
+            estado = self.registro.exportar()
+            return _somar_estado({}, estado['acumulado']), _somar_estado({}, estado['janela'])
+
+        self.gravar()
+
+        acumulado, janela = {}, {}
+        inicio_janela = time.time() - self.janela_segundos
+        with self._bloqueio():
+            for nome in sorted(os.listdir(self.diretorio)):
+                if not nome.startswith(PREFIXO_ARQUIVO) or not nome.endswith('.json') or nome == ARQUIVO_ENCERRADOS:
+                    continue
+                try:
+                    pid = int(nome[len(PREFIXO_ARQUIVO):-len('.json')])
+                except ValueError:
+                    continue
+                if not _processo_ativo(pid):
+                    self._incorporar_encerrado(nome)
+
+            for nome in sorted(os.listdir(self.diretorio)):
+                if not nome.startswith(PREFIXO_ARQUIVO) or not nome.endswith('.json'):
+                    continue
+                estado = self._ler(nome)
+                if estado is None:
+                    continue
+                _somar_estado(acumulado, estado.get('acumulado', {}))
+                if estado.get('gravado_em', 0) >= inicio_janela:
+                    _somar_estado(janela, estado.get('janela', {}))
+
+        return acumulado, janela
+
+
+armazem_metricas = ArmazemMetricas()
+
+
+# ============================================================================
+# FORMATO PROMETHEUS
+# ============================================================================
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _rotulos(**rotulos):
+    return '{' + ','.join(f'{nome}="{_escapar(valor)}"' for nome, valor in rotulos.items()) + '}'
+
+
+def _numero(valor):
+    if isinstance(valor, float):
+        return repr(round(valor, 6))
+    return str(valor)
+
+
+def _separar_endpoint(endpoint):
+    metodo, _, nome = endpoint.partition(' ')
+    return {'endpoint': nome, 'metodo': metodo}
+
+
+def _acessos_cache(soma):
+    """Retorna {(cache, resultado): quantidade} dos contadores `cache:<nome>:<hit|miss>`."""
+    acessos = {}
+    for nome, quantidade in soma.contadores.items():
+        partes = nome.split(':')
+        if len(partes) == 3 and partes[0] == 'cache':
+            acessos[(partes[1], partes[2])] = quantidade
+    return acessos
+
+
+def formatar_prometheus(acumulado, janela, janela_minutos=None):
+    """
+    Monta o texto de exposição no formato Prometheus (0.0.4).
+
+    Contadores e histogramas vêm do acumulado desde o início dos processos; percentis e
+    taxa de requisições vêm da janela deslizante (`INSTRUMENTACAO_JANELA_MINUTOS`).
+    """
+    if janela_minutos is None:
+        janela_minutos = getattr(settings, 'INSTRUMENTACAO_JANELA_MINUTOS', 15)
+
+    linhas = []
+
+    def metrica(nome, tipo, ajuda, amostras):
+        linhas.append(f'# HELP {nome} {ajuda}')
+        linhas.append(f'# TYPE {nome} {tipo}')
+        for sufixo, rotulos, valor in amostras:
+            linhas.append(f'{nome}{sufixo}{_rotulos(**rotulos)} {_numero(valor)}')
+
+    endpoints = sorted(acumulado.items())
+
+    metrica('cortex_http_requisicoes_total', 'counter', 'Requisições atendidas por endpoint.', [
+        ('', _separar_endpoint(endpoint), soma.total) for endpoint, soma in endpoints
+    ])
+    metrica('cortex_http_erros_total', 'counter', 'Respostas com status 5xx por endpoint.', [
+        ('', _separar_endpoint(endpoint), soma.erros) for endpoint, soma in endpoints
+    ])
+
+    amostras = []
+    for endpoint, soma in endpoints:
+        rotulos = _separar_endpoint(endpoint)
+        acumulada = 0
+        for limite, quantidade in zip(FAIXAS_LATENCIA_MS + [None], soma.faixas):
+            acumulada += quantidade
+            le = '+Inf' if limite is None else _numero(limite / 1000)
+            amostras.append(('_bucket', {**rotulos, 'le': le}, acumulada))
+        amostras.append(('_sum', rotulos, soma.soma_ms / 1000))
+        amostras.append(('_count', rotulos, soma.total))
+    metrica('cortex_http_duracao_segundos', 'histogram', 'Duração das requisições por endpoint.', amostras)
+
+    metrica('cortex_http_queries_total', 'counter', 'Queries SQL executadas por endpoint.', [
+        ('', _separar_endpoint(endpoint), soma.queries) for endpoint, soma in endpoints
+    ])
+    metrica(
+        'cortex_http_etapa_segundos_total', 'counter', 'Tempo gasto em cada etapa (auth, db, serializacao, render).',
+        [
+            ('', {**_separar_endpoint(endpoint), 'etapa': etapa}, duracao / 1000)
+            for endpoint, soma in endpoints for etapa, duracao in sorted(soma.etapas.items())
+        ],
+    )
+
+    acessos_por_cache = {}
+    amostras = []
+    for endpoint, soma in endpoints:
+        for (cache, resultado), quantidade in sorted(_acessos_cache(soma).items()):
+            amostras.append(('', {**_separar_endpoint(endpoint), 'cache': cache, 'resultado': resultado}, quantidade))
+            totais = acessos_por_cache.setdefault(cache, {'hit': 0, 'miss': 0})
+            totais[resultado] = totais.get(resultado, 0) + quantidade
+    metrica('cortex_cache_acessos_total', 'counter', 'Acessos aos caches da aplicação (hit ou miss).', amostras)
+    metrica('cortex_cache_taxa_acerto', 'gauge', 'Fração de acessos ao cache atendidos pelo cache.', [
+        ('', {'cache': cache}, totais['hit'] / (totais['hit'] + totais['miss']))
+        for cache, totais in sorted(acessos_por_cache.items()) if totais['hit'] + totais['miss']
+    ])
+
+    janelas = sorted(janela.items())
+    metrica(
+        'cortex_http_latencia_janela_segundos', 'gauge',
+        f'Percentis da duração nos últimos {janela_minutos} minutos (limite superior da faixa do histograma).',
+        [
+            ('', {**_separar_endpoint(endpoint), 'quantile': str(fracao)}, percentil(soma.faixas, fracao) / 1000)
+            for endpoint, soma in janelas for fracao in (0.5, 0.95, 0.99)
+        ],
+    )
+    metrica(
+        'cortex_http_requisicoes_por_segundo', 'gauge',
+        f'Média de requisições por segundo nos últimos {janela_minutos} minutos.',
+        [('', _separar_endpoint(endpoint), soma.total / (janela_minutos * 60)) for endpoint, soma in janelas],
+    )
+
+    return '\n'.join(linhas) + '\n'
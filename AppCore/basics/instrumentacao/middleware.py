@@ -0,0 +1,111 @@
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+from AppCore.basics.instrumentacao.instrumentacao import (
+    MedicaoRequisicao, definir_medicao, encerrar_medicao, medir_query, obter_medicao, registro_latencias
+)
+from AppCore.basics.instrumentacao.metricas import armazem_metricas
+
+
+class InstrumentacaoMiddleware:
+    """
+    Mede cada requisição: queries e tempo de banco, etapas das Basic*APIView e renderização.
+
+    Deve ser o primeiro da lista `MIDDLEWARE`, para que o total cubra os demais middlewares.
+    Responde com o header `Server-Timing` (quando `INSTRUMENTACAO_SERVER_TIMING` está ativo)
+    e registra a medição no histograma do endpoint (`<MÉTODO> <view_name>`). Requisições que
+    não casam com nenhuma URL não são registradas. O estado do processo é gravado
+    periodicamente no `armazem_metricas`, que soma os workers na coleta das métricas.
+
+    O tempo de `db` também está contido na etapa em que as queries rodaram (ex: `serializacao`).
+
+    Respostas em streaming (exportações, listagens com envelope em streaming) executam as
+    queries enquanto o conteúdo é enviado, depois que o middleware retorna: o conteúdo é
+    envolvido para que a medição continue a cada pedaço e termine quando o stream acaba
+    (ou é fechado). Os headers já foram enviados nesse momento, então essas respostas não
+    têm `Server-Timing`; a medição vai apenas para os histogramas e as métricas.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.ativa = getattr(settings, 'INSTRUMENTACAO_ATIVA', True)
+        self.server_timing = getattr(settings, 'INSTRUMENTACAO_SERVER_TIMING', True)
+
+    @contextmanager
+    def instrumentar(self, medicao):
+        """Torna `medicao` a medição corrente e mede as queries de todas as conexões."""
+        token = definir_medicao(medicao)
+        try:
+            with ExitStack() as pilha:
+                for alias in connections:
+                    pilha.enter_context(connections[alias].execute_wrapper(medir_query))
+                yield
+        finally:
+            encerrar_medicao(token)
+
+    def registrar(self, request, response, medicao):
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is not None:
+            registro_latencias.registrar(
+                f'{request.method} {resolver_match.view_name}', medicao, response.status_code
+            )
+            armazem_metricas.gravar_se_necessario()
+
+    def medir_streaming(self, request, response, medicao):
+        """Envolve o conteúdo da resposta para medir a geração de cada pedaço."""
+        conteudo = iter(response.streaming_content)
+
+        def conteudo_medido():
+            try:
+                while True:
+                    with self.instrumentar(medicao):
+                        try:
+                            parte = next(conteudo)
+                        except StopIteration:
+                            return
+                    yield parte
+            finally:
+                self.registrar(request, response, medicao.finalizar())
+
+        response.streaming_content = conteudo_medido()
+
+    def __call__(self, request):
+        if not self.ativa:
+            return self.get_response(request)
+
+        medicao = MedicaoRequisicao()
+        with self.instrumentar(medicao):
+            response = self.get_response(request)
+
+        if getattr(response, 'streaming', False) and not getattr(response, 'is_async', False):
+            self.medir_streaming(request, response, medicao)
+            return response
+
+        medicao.finalizar()
+
+        if self.server_timing:
+            response['Server-Timing'] = medicao.server_timing()
+
+        self.registrar(request, response, medicao)
+
+        return response
+
+    def process_template_response(self, request, response):
+        """Mede a renderização das respostas do DRF, que acontece depois da view."""
+        if not self.ativa:
+            return response
+
+        medicao = obter_medicao()
+        if medicao is None:
+            return response
+
+        inicio = time.perf_counter()
+
+        def registrar_render(resposta_renderizada):
+            medicao.adicionar('render', (time.perf_counter() - inicio) * 1000)
+
+        response.add_post_render_callback(registrar_render)
+        return response
@@ -0,0 +1,189 @@
+"""
+Detector de N+1 - consultas com o mesmo formato repetidas dentro de uma requisição.
+
+Ligado por `DETECTOR_N_MAIS_UM` ('avisar' registra no log, 'falhar' lança exceção, o que
+derruba o teste que fez a requisição). O formato de uma consulta é o SQL com os
+placeholders (`%s`), então consultas que só diferem pela PK têm o mesmo formato; listas
+de `IN (%s, %s, ...)` são normalizadas para não depender do tamanho.
+
+Para cada formato repetido a partir de `DETECTOR_N_MAIS_UM_LIMITE` execuções, o relatório
+traz o campo do serializer que disparou a consulta (ex: `UsuarioListaDetalhadaSerializer.setores`)
+e a linha do projeto mais próxima da consulta (ex: um `get_<campo>` do `SerializerMethodField`).
+
+Exemplo de uso (fora de requisições, ex: em um teste ou no shell):
+    with DetectorNMaisUm(modo='falhar', descricao='lista de usuários'):
+        UsuarioListaDetalhadaSerializer(usuarios, many=True).data
+"""
+import logging
+import re
+import sys
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from rest_framework.serializers import Serializer
+
+from AppCore.basics.instrumentacao.instrumentacao import contar
+from AppCore.core.exceptions.exceptions import SystemErrorException
+
+
+logger = logging.getLogger(__name__)
+
+MODOS_DETECTOR = ('avisar', 'falhar')
+
+_LISTA_PLACEHOLDERS = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+
+_CODIGO_TO_REPRESENTATION = Serializer.to_representation.__code__
+
+_PACOTE_INSTRUMENTACAO = str(Path(__file__).resolve().parent)
+
+
+def formato_query(sql):
+    """Normaliza o SQL para agrupar consultas que só diferem pelos parâmetros."""
+    return _LISTA_PLACEHOLDERS.sub('(%s...)', sql)
+
+
+def localizar_origem():
+    """
+    Retorna o campo do serializer em serialização e a linha do projeto mais próxima da consulta.
+
+    Returns:
+        tuple: ('Serializer.campo' ou None, 'arquivo:linha (função)' ou None)
+    """
+    raiz = str(settings.BASE_DIR)
+    campo = None
+    origem = None
+
+    frame = sys._getframe(1)
+    while frame is not None and (campo is None or origem is None):
+        arquivo = frame.f_code.co_filename
+
+        if origem is None and arquivo.startswith(raiz) and not arquivo.startswith(_PACOTE_INSTRUMENTACAO) \
+                and 'site-packages' not in arquivo:
+            origem = f'{Path(arquivo).relative_to(raiz)}:{frame.f_lineno} ({frame.f_code.co_name})'
+
+        if campo is None and frame.f_code is _CODIGO_TO_REPRESENTATION:
+            field = frame.f_locals.get('field')
+            if field is not None:
+                campo = f'{frame.f_locals["self"].__class__.__name__}.{field.field_name}'
+
+        frame = frame.f_back
+
+    return campo, origem
+
+
+class DetectorNMaisUm:
+    """
+    Context manager que agrupa as consultas SELECT do bloco pelo formato e aponta as repetidas.
+
+    Args:
+        modo: 'avisar' ou 'falhar' (padrão: `DETECTOR_N_MAIS_UM`); outro valor apenas coleta
+        limite: Execuções do mesmo formato a partir das quais há N+1 (padrão: `DETECTOR_N_MAIS_UM_LIMITE`)
+        descricao: Identificação do trecho medido, usada no relatório (ex: método e caminho da requisição)
+    """
+
+    def __init__(self, modo=None, limite=None, descricao=''):
+        self.modo = modo if modo is not None else getattr(settings, 'DETECTOR_N_MAIS_UM', '')
+        self.limite = limite or getattr(settings, 'DETECTOR_N_MAIS_UM_LIMITE', 3)
+        self.descricao = descricao
+        self._formatos = {}
+        self._pilha = None
+
+    def _registrar(self, execute, sql, params, many, context):
+        if not many and sql.lstrip()[:6].upper() == 'SELECT':
+            formato = formato_query(sql)
+            registro = self._formatos.get(formato)
+            if registro is None:
+                registro = self._formatos[formato] = {
+                    'execucoes': 0, 'parametros': set(), 'campos': Counter(), 'origens': Counter(),
+                }
+
+            registro['execucoes'] += 1
+            registro['parametros'].add(repr(params))
+
+            campo, origem = localizar_origem()
+            if campo:
+                registro['campos'][campo] += 1
+            if origem:
+                registro['origens'][origem] += 1
+
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._pilha = ExitStack()
+        for alias in connections:
+            self._pilha.enter_context(connections[alias].execute_wrapper(self._registrar))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._pilha.close()
+
+        if exc_type is not None or not self.ocorrencias:
+            return False
+
+        contar('n_mais_um', len(self.ocorrencias))
+
+        if self.modo not in MODOS_DETECTOR:
+            return False
+
+        mensagem = self.relatorio()
+        logger.warning(mensagem)
+
+        if self.modo == 'falhar':
+            raise SystemErrorException(mensagem)
+
+        return False
+
+    @property
+    def ocorrencias(self):
+        """
+        Formatos executados ao menos `limite` vezes, do mais repetido para o menos.
+
+        Returns:
+            list: [{sql, execucoes, parametros_distintos, campo, origem}]
+        """
+        ocorrencias = []
+        for formato, registro in self._formatos.items():
+            if registro['execucoes'] < self.limite:
+                continue
+            ocorrencias.append({
+                'sql': formato,
+                'execucoes': registro['execucoes'],
+                'parametros_distintos': len(registro['parametros']),
+                'campo': registro['campos'].most_common(1)[0][0] if registro['campos'] else None,
+                'origem': registro['origens'].most_common(1)[0][0] if registro['origens'] else None,
+            })
+        return sorted(ocorrencias, key=lambda ocorrencia: -ocorrencia['execucoes'])
+
+    def relatorio(self):
+        linhas = [f'N+1 detectado em {self.descricao or "bloco medido"}:']
+        for ocorrencia in self.ocorrencias:
+            tipo = 'N+1' if ocorrencia['parametros_distintos'] > 1 else 'consulta duplicada'
+            linhas.append(
+                f'- {ocorrencia["execucoes"]}x ({tipo}, {ocorrencia["parametros_distintos"]} parâmetros distintos) '
+                f'campo {ocorrencia["campo"] or "desconhecido"} em {ocorrencia["origem"] or "origem desconhecida"}: '
+                f'{ocorrencia["sql"][:300]}'
+            )
+        return '\n'.join(linhas)
+
+
+class DetectorNMaisUmMiddleware:
+    """
+    Aplica o `DetectorNMaisUm` a cada requisição.
+
+    Só é carregado com `DETECTOR_N_MAIS_UM` em 'avisar' ou 'falhar'; do contrário o Django
+    o descarta na inicialização, sem custo por requisição.
+    """
+
+    def __init__(self, get_response):
+        if getattr(settings, 'DETECTOR_N_MAIS_UM', '') not in MODOS_DETECTOR:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with DetectorNMaisUm(descricao=f'{request.method} {request.path}'):
+            return self.get_response(request)
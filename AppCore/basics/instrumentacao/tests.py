@@ -0,0 +1,240 @@
+import json
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from rest_framework import serializers
+
+from AppCore.basics.instrumentacao import metricas, middleware
+from AppCore.basics.instrumentacao.instrumentacao import JanelaEndpoint, MedicaoRequisicao, RegistroLatencias
+from AppCore.basics.instrumentacao.metricas import ARQUIVO_ENCERRADOS, ArmazemMetricas, formatar_prometheus
+from AppCore.basics.instrumentacao.middleware import InstrumentacaoMiddleware
+from AppCore.basics.instrumentacao.n_mais_um import DetectorNMaisUm
+from AppCore.core.exceptions.exceptions import SystemErrorException
+
+from EstruturaOrganizacional.atividade.models import Atividade
+from EstruturaOrganizacional.setor.models import Setor
+from Usuarios.usuario.models import Usuario
+
+
+def estado_com_requisicao():
+    janela = JanelaEndpoint()
+    janela.registrar(MedicaoRequisicao().finalizar(), 200)
+    return {'GET usuario:lista': janela.como_dict()}
+
+
+def janela_com(*requisicoes):
+    """Monta uma `JanelaEndpoint` a partir de (duração em ms, status, contadores)."""
+    janela = JanelaEndpoint()
+    for duracao_ms, status_code, contadores in requisicoes:
+        medicao = MedicaoRequisicao()
+        medicao.duracao_ms = duracao_ms
+        medicao.queries = 2
+        medicao.contadores = dict(contadores)
+        janela.registrar(medicao, status_code)
+    return janela
+
+
+class FormatarPrometheusTests(SimpleTestCase):
+    """Texto de exposição: contadores, histograma, taxa de acerto e percentis da janela."""
+
+    def setUp(self):
+        janela = janela_com(
+            (3, 200, {'cache:respostas:hit': 1}),
+            (30, 500, {'cache:respostas:hit': 2, 'cache:respostas:miss': 1}),
+        )
+        self.linhas = formatar_prometheus(
+            {'GET usuario:lista': janela}, {'GET usuario:lista': janela}, janela_minutos=15
+        ).splitlines()
+
+    def assertLinha(self, linha):
+        self.assertIn(linha, self.linhas)
+
+    def test_contadores(self):
+        self.assertLinha('# TYPE cortex_http_requisicoes_total counter')
+        self.assertLinha('cortex_http_requisicoes_total{endpoint="usuario:lista",metodo="GET"} 2')
+        self.assertLinha('cortex_http_erros_total{endpoint="usuario:lista",metodo="GET"} 1')
+        self.assertLinha('cortex_http_queries_total{endpoint="usuario:lista",metodo="GET"} 4')
+
+    def test_histograma_acumulado(self):
+        rotulos = 'endpoint="usuario:lista",metodo="GET"'
+
+        self.assertLinha('# TYPE cortex_http_duracao_segundos histogram')
+        self.assertLinha(f'cortex_http_duracao_segundos_bucket{{{rotulos},le="0.005"}} 1')
+        self.assertLinha(f'cortex_http_duracao_segundos_bucket{{{rotulos},le="0.025"}} 1')
+        self.assertLinha(f'cortex_http_duracao_segundos_bucket{{{rotulos},le="0.05"}} 2')
+        self.assertLinha(f'cortex_http_duracao_segundos_bucket{{{rotulos},le="+Inf"}} 2')
+        self.assertLinha(f'cortex_http_duracao_segundos_sum{{{rotulos}}} 0.033')
+        self.assertLinha(f'cortex_http_duracao_segundos_count{{{rotulos}}} 2')
+
+    def test_taxa_de_acerto_do_cache(self):
+        self.assertLinha(
+            'cortex_cache_acessos_total{endpoint="usuario:lista",metodo="GET",cache="respostas",resultado="hit"} 3'
+        )
+        self.assertLinha('cortex_cache_taxa_acerto{cache="respostas"} 0.75')
+
+    def test_percentis_e_taxa_da_janela(self):
+        rotulos = 'endpoint="usuario:lista",metodo="GET"'
+
+        self.assertLinha(f'cortex_http_latencia_janela_segundos{{{rotulos},quantile="0.5"}} 0.005')
+        self.assertLinha(f'cortex_http_latencia_janela_segundos{{{rotulos},quantile="0.99"}} 0.05')
+        self.assertLinha(f'cortex_http_requisicoes_por_segundo{{{rotulos}}} 0.002222')
+
+    def test_rotulos_escapados(self):
+        texto = formatar_prometheus({'GET a"b\\c': janela_com((3, 200, {}))}, {}, janela_minutos=15)
+
+        self.assertIn('cortex_http_requisicoes_total{endpoint="a\\"b\\\\c",metodo="GET"} 1', texto)
+
+
+class ArmazemMetricasTests(SimpleTestCase):
+    """Soma das métricas dos workers gravadas em `METRICAS_DIR`."""
+
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.diretorio = diretorio.name
+        self.armazem = ArmazemMetricas(RegistroLatencias())
+
+    def gravar_outro_worker(self, gravado_em):
+        # O processo pai está vivo: o arquivo não é incorporado como de um worker encerrado
+        pid = os.getppid()
+        estado = estado_com_requisicao()
+        with open(os.path.join(self.diretorio, f'metricas-{pid}.json'), 'w', encoding='utf-8') as arquivo:
+            json.dump({'pid': pid, 'gravado_em': gravado_em, 'acumulado': estado, 'janela': estado}, arquivo)
+
+    def coletar(self):
+        with override_settings(METRICAS_DIR=self.diretorio, INSTRUMENTACAO_JANELA_MINUTOS=15):
+            return self.armazem.coletar()
+
+    def test_janela_de_worker_recente_somada(self):
+        self.gravar_outro_worker(time.time() - 60)
+
+        acumulado, janela = self.coletar()
+
+        self.assertEqual(acumulado['GET usuario:lista'].total, 1)
+        self.assertEqual(janela['GET usuario:lista'].total, 1)
+
+    def test_janela_gravada_antes_da_janela_descartada(self):
+        self.gravar_outro_worker(time.time() - 16 * 60)
+
+        acumulado, janela = self.coletar()
+
+        self.assertEqual(acumulado['GET usuario:lista'].total, 1)
+        self.assertNotIn('GET usuario:lista', janela)
+
+    def test_worker_encerrado_incorporado_aos_encerrados(self):
+        self.gravar_outro_worker(time.time())
+        encerrados = {'acumulado': estado_com_requisicao()}
+        with open(os.path.join(self.diretorio, ARQUIVO_ENCERRADOS), 'w', encoding='utf-8') as arquivo:
+            json.dump(encerrados, arquivo)
+
+        with mock.patch.object(metricas, '_processo_ativo', lambda pid: pid != os.getppid()):
+            acumulado, janela = self.coletar()
+            # A segunda coleta não conta de novo os contadores já incorporados
+            acumulado_seguinte, _ = self.coletar()
+
+        self.assertNotIn(f'metricas-{os.getppid()}.json', os.listdir(self.diretorio))
+        self.assertEqual(acumulado['GET usuario:lista'].total, 2)
+        self.assertEqual(acumulado_seguinte['GET usuario:lista'].total, 2)
+        self.assertNotIn('GET usuario:lista', janela)
+
+        with open(os.path.join(self.diretorio, ARQUIVO_ENCERRADOS), encoding='utf-8') as arquivo:
+            self.assertEqual(json.load(arquivo)['acumulado']['GET usuario:lista']['total'], 2)
+
+
+class InstrumentacaoMiddlewareTests(TestCase):
+    """Medição das respostas comuns e das respostas em streaming."""
+
+    def setUp(self):
+        self.registro = RegistroLatencias()
+        for alvo in (
+            mock.patch.object(middleware, 'registro_latencias', self.registro),
+            mock.patch.object(middleware.armazem_metricas, 'gravar_se_necessario'),
+        ):
+            alvo.start()
+            self.addCleanup(alvo.stop)
+
+    def requisitar(self, resposta):
+        request = RequestFactory().get('/usuarios/exportar/')
+        request.resolver_match = SimpleNamespace(view_name='usuario:exportar')
+        return InstrumentacaoMiddleware(lambda request: resposta)(request)
+
+    def medicao(self):
+        return self.registro.agregar().get('GET usuario:exportar')
+
+    def test_resposta_comum_com_server_timing(self):
+        resposta = self.requisitar(HttpResponse('ok'))
+
+        self.assertIn('total;dur=', resposta['Server-Timing'])
+        self.assertEqual(self.medicao().total, 1)
+
+    def test_streaming_medido_ate_o_fim_do_conteudo(self):
+        def gerar():
+            for _ in range(3):
+                yield f'{Usuario.objects.count()}\n'
+
+        resposta = self.requisitar(StreamingHttpResponse(gerar()))
+
+        self.assertNotIn('Server-Timing', resposta)
+        self.assertIsNone(self.medicao())
+
+        b''.join(resposta.streaming_content)
+
+        medicao = self.medicao()
+        self.assertEqual(medicao.total, 1)
+        self.assertEqual(medicao.queries, 3)
+
+    def test_streaming_fechado_antes_do_fim(self):
+        def gerar():
+            while True:
+                yield f'{Usuario.objects.count()}\n'
+
+        resposta = self.requisitar(StreamingHttpResponse(gerar()))
+        next(iter(resposta))
+        resposta.close()
+
+        medicao = self.medicao()
+        self.assertEqual(medicao.total, 1)
+        self.assertEqual(medicao.queries, 1)
+
+
+class SetorTotalAtividadesSerializer(serializers.ModelSerializer):
+    total_atividades = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Setor
+        fields = ['id', 'total_atividades']
+
+    def get_total_atividades(self, obj):
+        return len(obj.atividades.all())
+
+
+class DetectorNMaisUmTests(TestCase):
+    """Consultas repetidas por linha apontadas pelo detector, com exceção no modo 'falhar'."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for indice in range(4):
+            setor = Setor.objects.create(nome=f'Setor {indice}', sigla=f'S{indice}')
+            Atividade.objects.create(setor=setor, descricao='Atividade')
+
+    def test_falhar_aponta_o_campo_do_serializer(self):
+        with self.assertLogs('AppCore.basics.instrumentacao.n_mais_um', 'WARNING'), \
+                self.assertRaises(SystemErrorException) as contexto:
+            with DetectorNMaisUm(modo='falhar', limite=3, descricao='lista de setores'):
+                SetorTotalAtividadesSerializer(Setor.objects.all(), many=True).data
+
+        self.assertIn('N+1 detectado em lista de setores', contexto.exception.message)
+        self.assertIn('4x (N+1, 4 parâmetros distintos)', contexto.exception.message)
+        self.assertIn('SetorTotalAtividadesSerializer.total_atividades', contexto.exception.message)
+
+    def test_prefetch_nao_falha(self):
+        with DetectorNMaisUm(modo='falhar', limite=3) as detector:
+            SetorTotalAtividadesSerializer(Setor.objects.prefetch_related('atividades'), many=True).data
+
+        self.assertEqual(detector.ocorrencias, [])
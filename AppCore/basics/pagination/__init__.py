@@ -1,3 +1,13 @@
+from AppCore.basics.pagination.contagem import (
+    ContagemAutomatica, ContagemEmCache, ContagemEstimada, ContagemExata, PaginadorContagem
+)
 from AppCore.basics.pagination.pagination import PaginacaoCustomizada
 
-__all__ = ['PaginacaoCustomizada']
+__all__ = [
+    'ContagemAutomatica',
+    'ContagemEmCache',
+    'ContagemEstimada',
+    'ContagemExata',
+    'PaginacaoCustomizada',
+    'PaginadorContagem',
+]
@@ -0,0 +1,206 @@
+"""
+Estratégias de contagem do `count` das listagens paginadas.
+
+- exata: `COUNT(*)` a cada requisição
+- cache: contagem exata guardada por alguns segundos, por conjunto de filtros (SQL da consulta);
+  exata quando o cache de respostas não é compartilhado entre os workers
+- estimativa: estimativa do planejador do PostgreSQL (`pg_class.reltuples`), marcada como aproximada
+- auto (padrão): exata para tabelas pequenas, estimativa para listagens grandes sem filtro e
+  cache nos demais casos
+
+A estratégia padrão vem de `PAGINACAO_ESTRATEGIA_CONTAGEM`; uma view pode definir a sua com o
+atributo `estrategia_contagem`. A estimativa de cada tabela é consultada no máximo uma vez a cada
+`PAGINACAO_CONTAGEM_CACHE_TIMEOUT` segundos por processo e não conta no `limite_queries` da view.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from AppCore.basics.cache import cache_respostas
+from AppCore.common.util.queries import fora_do_limite_queries
+
+
+# Estimativas do planejador por (banco, tabela): (válida até, linhas)
+_estimativas = {}
+
+
+class ContagemExata:
+    """Conta os registros com `COUNT(*)`."""
+
+    def contar(self, queryset):
+        """
+        Returns:
+            tuple: (total, aproximado)
+        """
+        return queryset.count(), False
+
+
+class ContagemEmCache(ContagemExata):
+    """
+    Contagem exata reaproveitada por `PAGINACAO_CONTAGEM_CACHE_TIMEOUT` segundos.
+
+    A chave é o SQL da consulta com seus parâmetros, então cada combinação de filtros tem
+    sua própria contagem; ela também inclui a versão do cache de respostas, invalidada a
+    cada escrita das Basic*APIView. Sem cache compartilhado entre os workers, a invalidação
+    não alcançaria os demais processos, então a contagem é exata.
+    """
+
+    def contar(self, queryset):
+        if not cache_respostas.compartilhado:
+            return super().contar(queryset)
+
+        sql, parametros = queryset.query.sql_with_params()
+        identificador = hashlib.md5(f'{queryset.db}|{sql}|{parametros!r}'.encode()).hexdigest()
+        chave = cache_respostas.chave('contagem', identificador)
+
+        total = cache_respostas.cache.get(chave)
+        cache_respostas.registrar_acesso('contagem', total is not None)
+        if total is None:
+            total, _ = super().contar(queryset)
+            cache_respostas.cache.set(chave, total, timeout=settings.PAGINACAO_CONTAGEM_CACHE_TIMEOUT)
+
+        return total, False
+
+
+class ContagemEstimada(ContagemExata):
+    """
+    Usa a estimativa de linhas do planejador do PostgreSQL para listagens sem filtro.
+
+    Em outros bancos, em consultas filtradas ou em tabelas nunca analisadas, conta exatamente.
+    """
+
+    def estimar_tabela(self, queryset):
+        """Retorna a estimativa de linhas da tabela do queryset, ou None se indisponível."""
+        conexao = connections[queryset.db]
+        if conexao.vendor != 'postgresql':
+            return None
+
+        chave = (queryset.db, queryset.model._meta.db_table)
+        valida_ate, estimativa = _estimativas.get(chave, (0, None))
+        if time.monotonic() >= valida_ate:
+            estimativa = self.consultar_estimativa(conexao, chave[1])
+            _estimativas[chave] = (time.monotonic() + settings.PAGINACAO_CONTAGEM_CACHE_TIMEOUT, estimativa)
+        return estimativa
+
+    def consultar_estimativa(self, conexao, tabela):
+        """Consulta `pg_class.reltuples` (None se a tabela nunca foi analisada)."""
+        with fora_do_limite_queries(), conexao.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)', [tabela])
+            linha = cursor.fetchone()
+
+        if not linha or linha[0] is None or linha[0] < 0:
+            return None
+        return linha[0]
+
+    def sem_filtro(self, queryset):
+        return not queryset.query.where and not queryset.query.distinct
+
+    def contar(self, queryset):
+        if self.sem_filtro(queryset):
+            estimativa = self.estimar_tabela(queryset)
+            if estimativa is not None:
+                return estimativa, True
+
+        return super().contar(queryset)
+
+
+class ContagemAutomatica(ContagemEstimada):
+    """
+    Escolhe a estratégia pelo tamanho estimado da tabela.
+
+    - Tabela pequena (< `PAGINACAO_LIMITE_TABELA_PEQUENA`): contagem exata
+    - Sem filtro e tabela grande (>= `PAGINACAO_LIMITE_TABELA_GRANDE`): estimativa do planejador
+    - Demais casos (ou sem estimativa disponível): contagem exata em cache
+    """
+
+    def contar(self, queryset):
+        estimativa = self.estimar_tabela(queryset)
+
+        if estimativa is not None and estimativa < settings.PAGINACAO_LIMITE_TABELA_PEQUENA:
+            return ContagemExata.contar(self, queryset)
+
+        if (
+            estimativa is not None
+            and estimativa >= settings.PAGINACAO_LIMITE_TABELA_GRANDE
+            and self.sem_filtro(queryset)
+        ):
+            return estimativa, True
+
+        return ContagemEmCache().contar(queryset)
+
+
+ESTRATEGIAS_CONTAGEM = {
+    'exata': ContagemExata,
+    'cache': ContagemEmCache,
+    'estimativa': ContagemEstimada,
+    'auto': ContagemAutomatica,
+}
+
+
+def obter_estrategia_contagem(nome=None):
+    """Retorna a instância da estratégia pelo nome (padrão: `PAGINACAO_ESTRATEGIA_CONTAGEM`)."""
+    nome = nome or getattr(settings, 'PAGINACAO_ESTRATEGIA_CONTAGEM', 'exata')
+    return ESTRATEGIAS_CONTAGEM[nome]()
+
+
+class PaginaAproximada(Page):
+    """
+    Página de um total aproximado.
+
+    A existência da próxima página vem dos próprios dados, e os números vizinhos não são
+    validados contra o total (que pode ser menor que o real).
+    """
+
+    tem_proxima = False
+
+    def has_next(self):
+        return self.tem_proxima
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class PaginadorContagem(Paginator):
+    """
+    Paginator do Django que obtém o total por uma estratégia de contagem.
+
+    Quando o total é aproximado, as páginas não são limitadas por ele: cada página busca
+    uma linha a mais para saber se existe continuação.
+    """
+
+    def __init__(self, *args, estrategia=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.estrategia = estrategia or ContagemExata()
+        self.aproximado = False
+
+    @cached_property
+    def count(self):
+        total, self.aproximado = self.estrategia.contar(self.object_list)
+        return total
+
+    def page(self, number):
+        if not self.count or not self.aproximado:
+            return super().page(number)
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Número de página inválido.')
+        if number < 1:
+            raise EmptyPage('Número de página inválido.')
+
+        inicio = (number - 1) * self.per_page
+        itens = list(self.object_list[inicio:inicio + self.per_page + 1])
+        if not itens and number > 1:
+            raise EmptyPage('Página sem resultados.')
+
+        pagina = PaginaAproximada(itens[:self.per_page], number, self)
+        pagina.tem_proxima = len(itens) > self.per_page
+        return pagina
@@ -1,42 +1,263 @@
+import base64
+import datetime
+import json
+from functools import partial
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from AppCore.basics.pagination.contagem import PaginadorContagem, obter_estrategia_contagem
+from AppCore.core.exceptions.exceptions import ValidationException
+
+
+def expandir_ordenacao(model, ordenacao, prefixo='', inverter=False):
+    """
+    Converte a ordenação de um model em uma lista de (caminho, descendente) sobre campos concretos.
+
+    Campos que são relações (ex: 'usuario') são expandidos para a ordenação do model
+    relacionado, como o próprio Django faz no ORDER BY.
+
+    Args:
+        model: Model de onde a ordenação parte
+        ordenacao: Lista de campos no formato do `Meta.ordering` (ex: ['usuario__nome', '-id'])
+        prefixo: Caminho acumulado até `model` (uso interno da recursão)
+        inverter: Inverte a direção de todos os campos (uso interno da recursão)
+
+    Returns:
+        list: Tuplas (caminho, descendente)
+    """
+    campos = []
+
+    for campo in ordenacao:
+        if not isinstance(campo, str):
+            raise ValidationException('A ordenação desta listagem não suporta paginação por cursor.')
+
+        descendente = campo.startswith('-') != inverter
+        caminho = campo.lstrip('-')
+
+        atual = model
+        field = None
+        for parte in caminho.split('__'):
+            if parte == 'pk':
+                field = None
+                break
+            field = atual._meta.get_field(parte)
+            if field.is_relation:
+                atual = field.related_model
+
+        if field is not None and field.is_relation:
+            campos.extend(expandir_ordenacao(
+                atual, atual._meta.ordering or ['pk'], f'{prefixo}{caminho}__', descendente
+            ))
+        else:
+            campos.append((f'{prefixo}{caminho}', descendente))
+
+    return campos
+
+
+class CodificadorCursor(DjangoJSONEncoder):
+    """
+    Codificador JSON dos valores do cursor.
+
+    O `DjangoJSONEncoder` trunca datas e horas em milissegundos; no cursor, linhas que
+    diferem só nos microssegundos seriam puladas ou repetidas na virada da página.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
 
 
 class PaginacaoCustomizada(PageNumberPagination):
     """
     Classe de paginação customizada que permite controle dinâmico do tamanho da página.
-    
+
     - Tamanho padrão: 10 itens por página
     - Query param 'paginacao': permite definir o tamanho da página (entre 1 e 100)
     - Valores menores que 1 são ajustados para 1
     - Valores maiores que 100 são ajustados para 100
-    
+    - Query param 'cursor' (opcional): ativa a paginação por cursor (keyset)
+    - O `count` segue a estratégia de contagem da view (`estrategia_contagem`) ou do settings;
+      quando é uma estimativa, o envelope traz `count_aproximado: true`
+
     Exemplo de uso:
         /api/usuarios/?paginacao=20  → Retorna 20 itens por página
         /api/usuarios/?paginacao=150 → Retorna 100 itens por página (máximo)
         /api/usuarios/?paginacao=0   → Retorna 1 item por página (mínimo)
+        /api/usuarios/?cursor=       → Primeira página no modo cursor (siga os links next/previous)
+
+    No modo cursor a página é buscada com `WHERE (ordenação, id) > (valores da última linha)`
+    em vez de OFFSET, e o COUNT(*) não é executado (`count` retorna null). O tempo por página
+    fica constante mesmo nas páginas profundas. A ordenação é a do queryset (ou o `ordering`
+    do model) com o `id` como desempate; os campos de ordenação não devem ser nulos.
     """
     page_size = 10
     page_size_query_param = 'paginacao'
     max_page_size = 100
+    cursor_query_param = 'cursor'
+    modo_cursor = False
 
     def get_page_size(self, request):
         """
         Retorna o tamanho da página baseado no query param 'paginacao'.
-        
+
         Garante que o valor esteja entre 1 e 100.
         """
         if self.page_size_query_param:
             try:
                 page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
-                
+
                 # Garante que o valor esteja entre 1 e 100
                 if page_size < 1:
                     return 1
                 elif page_size > 100:
                     return 100
-                
+
                 return page_size
             except (ValueError, TypeError):
                 pass
-        
+
         return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.modo_cursor = self.cursor_query_param in request.query_params
+
+        if not self.modo_cursor:
+            estrategia = obter_estrategia_contagem(getattr(view, 'estrategia_contagem', None))
+            self.django_paginator_class = partial(PaginadorContagem, estrategia=estrategia)
+            return super().paginate_queryset(queryset, request, view)
+
+        return self.paginar_por_cursor(queryset, request)
+
+    def get_paginated_response(self, data):
+        if not self.modo_cursor:
+            response = super().get_paginated_response(data)
+            if self.page.paginator.aproximado:
+                response.data['count_aproximado'] = True
+            return response
+
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.modo_cursor:
+            return super().get_next_link()
+        return self.link_proximo
+
+    def get_previous_link(self):
+        if not self.modo_cursor:
+            return super().get_previous_link()
+        return self.link_anterior
+
+    def get_schema_operation_parameters(self, view):
+        parametros = super().get_schema_operation_parameters(view)
+        parametros.append({
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': (
+                'Ativa a paginação por cursor. Envie vazio para a primeira página e siga os links '
+                'next/previous; neste modo o count não é calculado.'
+            ),
+            'schema': {'type': 'string'},
+        })
+        return parametros
+
+    # ========================================================================
+    # MODO CURSOR (KEYSET)
+    # ========================================================================
+
+    def paginar_por_cursor(self, queryset, request):
+        """
+        Retorna a página do cursor informado, sem OFFSET e sem COUNT.
+
+        Busca uma linha a mais que o tamanho da página para saber se existe continuação.
+        """
+        self.request = request
+        self.display_page_controls = False
+        tamanho = self.get_page_size(request)
+
+        ordenacao = list(queryset.query.order_by or queryset.model._meta.ordering)
+        campos = expandir_ordenacao(queryset.model, ordenacao)
+        if not any(caminho == 'pk' for caminho, _ in campos):
+            campos.append(('pk', False))
+
+        cursor = self.decodificar_cursor(request.query_params.get(self.cursor_query_param))
+        anterior = bool(cursor and cursor['anterior'])
+
+        # Para voltar uma página, percorre a ordenação invertida e desfaz a inversão no final
+        campos_busca = [(caminho, descendente != anterior) for caminho, descendente in campos]
+        queryset = queryset.annotate(**{
+            f'cursor_{indice}': F(caminho) for indice, (caminho, _) in enumerate(campos_busca)
+        }).order_by(*[f'-{caminho}' if descendente else caminho for caminho, descendente in campos_busca])
+
+        if cursor:
+            queryset = queryset.filter(self.filtro_apos(campos_busca, cursor['valores']))
+
+        resultados = list(queryset[:tamanho + 1])
+        tem_mais = len(resultados) > tamanho
+        resultados = resultados[:tamanho]
+
+        if anterior:
+            resultados.reverse()
+
+        ha_proxima = tem_mais if not anterior else True
+        ha_anterior = tem_mais if anterior else cursor is not None
+
+        self.link_proximo = None
+        self.link_anterior = None
+        if resultados and ha_proxima:
+            self.link_proximo = self.montar_link(resultados[-1], len(campos), anterior=False)
+        if resultados and ha_anterior:
+            self.link_anterior = self.montar_link(resultados[0], len(campos), anterior=True)
+
+        return resultados
+
+    def filtro_apos(self, campos, valores):
+        """
+        Monta a condição de keyset: linhas posteriores aos valores na ordenação informada.
+
+        Para (a, b, id) gera: a > x OR (a = x AND b > y) OR (a = x AND b = y AND id > z),
+        com `<` nos campos descendentes.
+        """
+        if len(valores) != len(campos):
+            raise ValidationException('Cursor inválido.')
+
+        filtro = Q()
+        for indice, (caminho, descendente) in enumerate(campos):
+            iguais = {campos[anterior][0]: valores[anterior] for anterior in range(indice)}
+            operador = 'lt' if descendente else 'gt'
+            filtro |= Q(**iguais, **{f'{caminho}__{operador}': valores[indice]})
+        return filtro
+
+    def montar_link(self, objeto, total_campos, anterior):
+        # Listagens com serializer compilado paginam dicionários de `values()`
+        if isinstance(objeto, dict):
+            valores = [objeto[f'cursor_{indice}'] for indice in range(total_campos)]
+        else:
+            valores = [getattr(objeto, f'cursor_{indice}') for indice in range(total_campos)]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.codificar_cursor(valores, anterior))
+
+    def codificar_cursor(self, valores, anterior):
+        conteudo = json.dumps({'v': valores, 'a': anterior}, cls=CodificadorCursor)
+        return base64.urlsafe_b64encode(conteudo.encode()).decode()
+
+    def decodificar_cursor(self, token):
+        """Retorna os valores e a direção do cursor, ou None para a primeira página."""
+        if not token:
+            return None
+
+        try:
+            conteudo = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            return {'valores': list(conteudo['v']), 'anterior': bool(conteudo['a'])}
+        except (ValueError, TypeError, KeyError):
+            raise ValidationException('Cursor inválido.')
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from django.db import connection, connections
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from rest_framework.request import Request
+
+from AppCore.basics.cache import cache_respostas
+from AppCore.basics.pagination import contagem
+from AppCore.basics.pagination.pagination import PaginacaoCustomizada
+from AppCore.common.util.queries import LimiteQueries, fora_do_limite_queries
+from EstruturaOrganizacional.cargo.models import Cargo
+
+
+class PaginacaoCursorTests(TestCase):
+    """Paginação por cursor (keyset) da `PaginacaoCustomizada`."""
+
+    @classmethod
+    def setUpTestData(cls):
+        base = timezone.now().replace(microsecond=0)
+        for indice in range(6):
+            cargo = Cargo.objects.create(descricao=f'Cargo {indice}')
+            # Seis linhas no mesmo milissegundo, diferentes apenas nos microssegundos
+            Cargo.objects.filter(pk=cargo.pk).update(created_at=base + timedelta(microseconds=100 + indice))
+
+    def paginar(self, queryset, cursor=''):
+        paginacao = PaginacaoCustomizada()
+        request = Request(RequestFactory().get('/', {'cursor': cursor, 'paginacao': 2}))
+        pagina = paginacao.paginate_queryset(queryset, request)
+        return pagina, paginacao.get_next_link()
+
+    def test_percorre_todas_as_linhas_sem_pular_nem_repetir(self):
+        queryset = Cargo.objects.filter().order_by('created_at')
+        vistos = []
+
+        pagina, proximo = self.paginar(queryset)
+        vistos.extend(cargo.pk for cargo in pagina)
+        while proximo and len(vistos) <= queryset.count():
+            cursor = parse_qs(urlsplit(proximo).query)['cursor'][0]
+            pagina, proximo = self.paginar(queryset, cursor)
+            vistos.extend(cargo.pk for cargo in pagina)
+
+        self.assertEqual(vistos, list(queryset.values_list('pk', flat=True)))
+
+    def test_cursor_preserva_microssegundos(self):
+        paginacao = PaginacaoCustomizada()
+        agora = timezone.now().replace(microsecond=123456)
+
+        cursor = paginacao.decodificar_cursor(paginacao.codificar_cursor([agora, 1], anterior=False))
+
+        self.assertIn('.123456', cursor['valores'][0])
+
+
+class ContagemEstimadaTests(TestCase):
+    """Estimativa do planejador usada pelas estratégias de contagem."""
+
+    def setUp(self):
+        contagem._estimativas.clear()
+
+    def test_estimativa_consultada_uma_vez_por_tabela(self):
+        estrategia = contagem.ContagemAutomatica()
+        queryset = Cargo.objects.filter()
+
+        with mock.patch.object(connections['default'], 'vendor', 'postgresql'), \
+                mock.patch.object(estrategia, 'consultar_estimativa', return_value=50) as consultar:
+            estrategia.estimar_tabela(queryset)
+            self.assertEqual(estrategia.estimar_tabela(queryset), 50)
+
+        consultar.assert_called_once()
+
+    def test_queries_fora_do_limite_nao_contam(self):
+        with LimiteQueries(1, 'teste') as limite:
+            with fora_do_limite_queries(), connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            Cargo.objects.filter().count()
+
+        self.assertEqual(limite.total, 1)
+
+
+class ContagemEmCacheTests(TestCase):
+    """Contagem em cache apenas com o cache de respostas compartilhado entre os workers."""
+
+    def setUp(self):
+        cache_respostas.cache.clear()
+        Cargo.objects.create(descricao='Cargo A')
+
+    def contar_antes_e_depois_de_inserir(self):
+        estrategia = contagem.ContagemEmCache()
+        queryset = Cargo.objects.filter(descricao__startswith='Cargo')
+
+        antes = estrategia.contar(queryset)
+        # Inserção por fora das Basic*APIView: não invalida a versão do cache de respostas
+        Cargo.objects.create(descricao='Cargo B')
+        return antes, estrategia.contar(queryset)
+
+    @override_settings(CACHE_LOCAL_PERMITIDO=False)
+    def test_sem_cache_compartilhado_conta_exatamente(self):
+        self.assertEqual(self.contar_antes_e_depois_de_inserir(), ((1, False), (2, False)))
+
+    @override_settings(CACHE_LOCAL_PERMITIDO=True)
+    def test_com_cache_compartilhado_reaproveita_contagem(self):
+        self.assertEqual(self.contar_antes_e_depois_de_inserir(), ((1, False), (1, False)))
@@ -0,0 +1,5 @@
+from AppCore.basics.renderers.renderers import (
+    JSONRapidoRenderer, RespostaEnvelopeStreaming, codificar_json, gerar_envelope
+)
+
+__all__ = ['JSONRapidoRenderer', 'RespostaEnvelopeStreaming', 'codificar_json', 'gerar_envelope']
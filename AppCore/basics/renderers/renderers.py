@@ -0,0 +1,127 @@
+"""
+Renderização JSON - codificação com orjson e envelope em streaming.
+
+`JSONRapidoRenderer` substitui o `JSONRenderer` do DRF: a saída é a mesma (JSON compacto,
+sem escapar acentos, `\\u2028`/`\\u2029` escapados), mas a codificação é feita pelo orjson.
+Tipos que o orjson não conhece (`Decimal`, `timedelta`, textos traduzíveis, querysets...)
+passam pelo `JSONEncoder` do DRF, então continuam com a mesma representação. Sem o orjson
+instalado, ou com indentação pedida (`application/json; indent=4`, API navegável), a
+renderização é a do DRF.
+
+`RespostaEnvelopeStreaming` envia o envelope das listagens (`{'status','mensagem',...,'dados'}`)
+aos poucos: os itens de `dados` são codificados em blocos à medida que o iterável é
+consumido, então a memória não cresce com o tamanho do resultado.
+
+Exemplo de uso:
+    objetos = queryset.iterator(chunk_size=500)
+    return RespostaEnvelopeStreaming(
+        {'status': 'success', 'mensagem': 'Sucesso'},
+        (serializer.to_representation(objeto) for objeto in objetos),
+    )
+"""
+import json
+
+from django.http import StreamingHttpResponse
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # Sem orjson: codificação pelo `json` da biblioteca padrão
+    orjson = None
+
+
+# Mesmo formato do `JSONRenderer` com COMPACT_JSON; o DRF representa datetimes UTC com 'Z'
+_OPCOES_ORJSON = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+# Itens codificados juntos em cada pedaço enviado pelo streaming
+ITENS_POR_BLOCO = 500
+
+_ENCODER_DRF = encoders.JSONEncoder()
+
+
+def _escapar_separadores_linha(conteudo):
+    """Escapa U+2028 e U+2029, como o `JSONRenderer` (JSON válido também como JavaScript)."""
+    if b'\xe2\x80\xa8' in conteudo or b'\xe2\x80\xa9' in conteudo:
+        conteudo = conteudo.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return conteudo
+
+
+def codificar_json(dados, default=None):
+    """
+    Codifica os dados em JSON compacto (bytes), com a mesma saída do `JSONRenderer` do DRF.
+
+    Usa o orjson quando disponível; valores fora do que ele suporta (ex: inteiros maiores
+    que 64 bits) caem no `json` da biblioteca padrão.
+
+    Args:
+        dados: Valor a codificar
+        default: Conversão dos tipos que o JSON não representa (padrão: a do `JSONEncoder` do DRF)
+    """
+    default = default or _ENCODER_DRF.default
+    if orjson is not None:
+        try:
+            conteudo = orjson.dumps(dados, default=default, option=_OPCOES_ORJSON)
+            return _escapar_separadores_linha(conteudo)
+        except TypeError:
+            pass
+
+    conteudo = json.dumps(dados, default=default, ensure_ascii=False, allow_nan=False, separators=(',', ':'))
+    return _escapar_separadores_linha(conteudo.encode())
+
+
+class JSONRapidoRenderer(JSONRenderer):
+    """`JSONRenderer` com codificação pelo orjson (mesma saída; ver `codificar_json`)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or self.ensure_ascii or not self.compact or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return codificar_json(data)
+
+
+def gerar_envelope(cabecalho, itens, itens_por_bloco=ITENS_POR_BLOCO, default=None):
+    """
+    Gera o JSON de `{**cabecalho, 'dados': [itens]}` em pedaços de bytes.
+
+    Args:
+        cabecalho: Campos do envelope antes de `dados` (ex: status e mensagem)
+        itens: Iterável com os itens já serializados (consumido aos poucos)
+        itens_por_bloco: Itens codificados em cada pedaço
+        default: Conversão dos tipos que o JSON não representa (ver `codificar_json`)
+    """
+    inicio = codificar_json(cabecalho)
+    yield inicio[:-1] + (b',"dados":[' if cabecalho else b'"dados":[')
+
+    bloco = []
+    separador = b''
+    for item in itens:
+        bloco.append(codificar_json(item, default))
+        if len(bloco) >= itens_por_bloco:
+            yield separador + b','.join(bloco)
+            separador = b','
+            bloco = []
+
+    if bloco:
+        yield separador + b','.join(bloco)
+    yield b']}'
+
+
+class RespostaEnvelopeStreaming(StreamingHttpResponse):
+    """
+    Resposta JSON com o envelope das listagens enviado em streaming (ver `gerar_envelope`).
+
+    Os itens são consumidos depois que a view retorna: validações e erros de regra devem
+    acontecer antes de criar a resposta, pois o status já terá sido enviado.
+    """
+
+    def __init__(self, cabecalho, itens, status=None, itens_por_bloco=ITENS_POR_BLOCO):
+        super().__init__(
+            gerar_envelope(cabecalho, itens, itens_por_bloco),
+            status=status, content_type=JSONRapidoRenderer.media_type,
+        )
@@ -0,0 +1,137 @@
+import json
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from AppCore.basics.cache import cache_respostas
+from AppCore.basics.renderers.renderers import JSONRapidoRenderer, gerar_envelope
+
+from EstruturaOrganizacional.setor.models import Setor
+from EstruturaOrganizacional.setor.serializers import SetorListaSerializer
+from EstruturaOrganizacional.setor.views import SetorListaView
+
+
+# Valores que passam pelo orjson, pelo `default` do DRF ou pelo `json` da biblioteca padrão
+VALORES = {
+    'datetime_utc': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    'datetime_local': datetime(2024, 5, 1, 12, 30, tzinfo=ZoneInfo('America/Sao_Paulo')),
+    'datetime_ingenuo': datetime(2024, 5, 1, 12, 30, 15),
+    'data': date(2024, 5, 1),
+    'hora': time(12, 30, 1, 500),
+    'duracao': timedelta(hours=1),
+    'uuid': uuid.UUID(int=5),
+    'decimal': Decimal('8.75'),
+    'traduzivel': _('Token is blacklisted'),
+    'separadores': 'a\u2028b\u2029c',
+    'acentos': 'ação',
+    'inteiro_grande': 2 ** 70,
+    'chave_inteira': {1: 'um'},
+    'tupla': (1, None, True, 1.5),
+}
+
+
+class JSONRapidoRendererTests(SimpleTestCase):
+    """Mesma saída do `JSONRenderer` do DRF."""
+
+    def test_mesma_saida_do_drf(self):
+        for nome, valor in VALORES.items():
+            with self.subTest(nome=nome):
+                dados = {'status': 'success', nome: valor}
+                self.assertEqual(JSONRapidoRenderer().render(dados), JSONRenderer().render(dados))
+
+    def test_indentacao_pelo_drf(self):
+        dados = {'dados': [1, 2]}
+        media_type = 'application/json; indent=2'
+
+        self.assertEqual(
+            JSONRapidoRenderer().render(dados, media_type), JSONRenderer().render(dados, media_type)
+        )
+
+    def test_envelope_em_blocos(self):
+        cabecalho = {'status': 'success', 'mensagem': 'Sucesso'}
+        itens = [{'id': indice, 'valor': VALORES['decimal']} for indice in range(5)]
+        esperado = JSONRenderer().render({**cabecalho, 'dados': itens})
+
+        for itens_por_bloco in (1, 2, 5, 500):
+            with self.subTest(itens_por_bloco=itens_por_bloco):
+                conteudo = b''.join(gerar_envelope(cabecalho, iter(itens), itens_por_bloco))
+                self.assertEqual(conteudo, esperado)
+
+        self.assertEqual(json.loads(b''.join(gerar_envelope(cabecalho, iter([])))), {**cabecalho, 'dados': []})
+
+
+@mock.patch.object(SetorListaView, 'pagination_class', None)
+@mock.patch.object(SetorListaView, 'resposta_streaming', True)
+class RespostaEnvelopeStreamingTests(TestCase):
+    """Listagem sem paginação em streaming com os mesmos itens da listagem paginada."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for indice in range(3):
+            Setor.objects.create(nome=f'Setor {indice}', sigla=f'S{indice}')
+
+    def setUp(self):
+        self.client = APIClient()
+        cache_respostas.cache.clear()
+
+    def listar(self):
+        return self.client.get('/estrutura_organizacional/setores/')
+
+    def test_streaming_opt_in(self):
+        with mock.patch.object(SetorListaView, 'resposta_streaming', False):
+            completa = self.listar()
+        streaming = self.listar()
+
+        self.assertFalse(completa.streaming)
+        self.assertTrue(streaming.streaming)
+        conteudo = json.loads(b''.join(streaming.streaming_content))
+        self.assertEqual(conteudo, json.loads(completa.content))
+        self.assertEqual(len(conteudo['dados']), 3)
+
+    @mock.patch.object(SetorListaView, 'serializer_compilado', False)
+    def test_erro_no_primeiro_bloco_nao_envia_200(self):
+        with mock.patch.object(SetorListaSerializer, 'to_representation', side_effect=ValueError('falhou')):
+            resposta = self.listar()
+
+        self.assertFalse(resposta.streaming)
+        self.assertEqual(resposta.status_code, 500)
+        self.assertEqual(resposta.data['detail'], 'falhou')
+
+    @mock.patch.object(SetorListaView, 'serializer_compilado', False)
+    @mock.patch.object(SetorListaView, 'tamanho_bloco_streaming', 2)
+    def test_erro_em_bloco_seguinte_nao_fecha_o_json(self):
+        representar = SetorListaSerializer.to_representation
+
+        def falhar_no_terceiro(serializer, setor):
+            if setor.sigla == 'S2':
+                raise ValueError('falhou')
+            return representar(serializer, setor)
+
+        with mock.patch.object(
+            SetorListaSerializer, 'to_representation', autospec=True, side_effect=falhar_no_terceiro
+        ):
+            resposta = self.listar()
+            partes = []
+            with self.assertRaises(ValueError):
+                for parte in resposta.streaming_content:
+                    partes.append(parte)
+
+        with self.assertRaises(ValueError):
+            json.loads(b''.join(partes))
+
+    @override_settings(LIMITE_QUERIES_ESTRITO=True)
+    @mock.patch.object(SetorListaView, 'limite_queries', 0)
+    def test_limite_queries_medido_no_streaming(self):
+        with self.assertLogs('AppCore.common.util.queries', 'WARNING'):
+            resposta = self.listar()
+
+        self.assertFalse(resposta.streaming)
+        self.assertEqual(resposta.status_code, 500)
@@ -0,0 +1,10 @@
+from AppCore.basics.schema.schema import (
+    ArtefatoSchema, FORMATOS_SCHEMA, PARAMETRO_VERSAO, RedocPrecomputadoView, SchemaPrecomputadoAPIView,
+    SwaggerPrecomputadoView, calcular_versao_schema, diretorio_artefatos, obter_artefato_schema, obter_versao_schema
+)
+
+__all__ = [
+    'ArtefatoSchema', 'FORMATOS_SCHEMA', 'PARAMETRO_VERSAO', 'RedocPrecomputadoView', 'SchemaPrecomputadoAPIView',
+    'SwaggerPrecomputadoView', 'calcular_versao_schema', 'diretorio_artefatos', 'obter_artefato_schema',
+    'obter_versao_schema',
+]
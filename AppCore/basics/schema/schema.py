@@ -0,0 +1,270 @@
+"""
+Schema OpenAPI pré-gerado - artefato versionado servido com ETag.
+
+O `SpectacularAPIView` gera o schema inteiro (todas as views com `@extend_schema`) a cada
+requisição, o que custa centenas de milissegundos de CPU sempre que o Swagger ou o ReDoc
+são abertos. Aqui o schema é gerado uma vez e gravado em disco (`SCHEMA_ARTEFATO_DIR`),
+já renderizado em YAML e JSON, com a versão no nome do arquivo:
+
+    openapi-<versao>.yaml
+    openapi-<versao>.json
+
+A versão é um hash das rotas do URLconf (rota + view), das configurações do
+drf-spectacular e do código-fonte dos pacotes do projeto. Enquanto ela não muda, todos os
+workers servem o mesmo artefato da memória; quando muda (deploy com rotas, views ou
+serializers alterados), o artefato é gerado novamente na primeira requisição. O comando
+`python manage.py gerar_schema` gera o artefato no deploy, antes de subir os workers.
+
+As respostas levam `ETag` (304 em `If-None-Match`). O Swagger e o ReDoc buscam o schema
+com a versão na URL (`?versao_schema=`), que pode então ficar no cache do navegador.
+
+Exemplo de uso:
+    path('api/schema/', SchemaPrecomputadoAPIView.as_view(), name='schema'),
+    path('api/schema/swagger/', SwaggerPrecomputadoView.as_view(url_name='schema'), name='swagger-ui'),
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils.cache import get_conditional_response
+
+import drf_spectacular
+from drf_spectacular.plumbing import set_query_parameters
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+
+from AppCore.basics.instrumentacao import contar
+
+
+FORMATOS_SCHEMA = {
+    'yaml': OpenApiYamlRenderer,
+    'json': OpenApiJsonRenderer,
+}
+
+# Parâmetro com a versão do artefato nas URLs usadas pelo Swagger e pelo ReDoc
+PARAMETRO_VERSAO = 'versao_schema'
+
+# Artefatos de versões anteriores mantidos no diretório (workers antigos durante o deploy)
+VERSOES_MANTIDAS = 3
+
+_lock = threading.Lock()
+_versao = None
+_artefato = None
+
+
+def _percorrer_rotas(padroes, prefixo=''):
+    """Gera (rota, view) de todas as rotas do URLconf."""
+    for padrao in padroes:
+        if isinstance(padrao, URLResolver):
+            yield from _percorrer_rotas(padrao.url_patterns, prefixo + str(padrao.pattern))
+        elif isinstance(padrao, URLPattern):
+            view = getattr(padrao.callback, 'view_class', None) or getattr(padrao.callback, 'cls', None)
+            view = view or padrao.callback
+            yield f'/{prefixo}{padrao.pattern}', f'{view.__module__}.{view.__qualname__}'
+
+
+def _pacotes_do_projeto():
+    """Pacotes Python no diretório do projeto (ex: AppCore, Usuarios, Perfis)."""
+    base = Path(settings.BASE_DIR)
+    return sorted(
+        pasta for pasta in base.iterdir()
+        if pasta.is_dir() and not pasta.name.startswith('.') and (pasta / '__init__.py').exists()
+    )
+
+
+def calcular_versao_schema(urlconf=None):
+    """
+    Retorna o hash que identifica o schema: rotas do URLconf, configurações do
+    drf-spectacular e código-fonte do projeto (descrições e serializers ficam nos fontes).
+    """
+    resumo = hashlib.sha256()
+
+    for rota, view in _percorrer_rotas(get_resolver(urlconf).url_patterns):
+        resumo.update(f'{rota} {view}\n'.encode())
+
+    configuracoes = getattr(settings, 'SPECTACULAR_SETTINGS', {})
+    resumo.update(repr(sorted(configuracoes.items())).encode())
+    resumo.update(drf_spectacular.__version__.encode())
+
+    for pacote in _pacotes_do_projeto():
+        for arquivo in sorted(pacote.rglob('*.py')):
+            resumo.update(str(arquivo.relative_to(settings.BASE_DIR)).encode())
+            resumo.update(arquivo.read_bytes())
+
+    return resumo.hexdigest()[:16]
+
+
+def obter_versao_schema():
+    """Versão do schema deste processo (calculada uma vez; o código não muda sem reiniciar)."""
+    global _versao
+    if _versao is None:
+        _versao = calcular_versao_schema()
+    return _versao
+
+
+def diretorio_artefatos():
+    return Path(getattr(
+        settings, 'SCHEMA_ARTEFATO_DIR', os.path.join(tempfile.gettempdir(), 'cortex-schema')
+    ))
+
+
+class ArtefatoSchema:
+    """
+    Schema já renderizado em cada formato de `FORMATOS_SCHEMA`.
+
+    Args:
+        versao: Versão do schema (ver `calcular_versao_schema`)
+        conteudos: {formato: bytes}
+    """
+
+    def __init__(self, versao, conteudos):
+        self.versao = versao
+        self.conteudos = conteudos
+
+    def etag(self, formato):
+        return f'"{self.versao}-{formato}"'
+
+    @staticmethod
+    def caminho(versao, formato):
+        return diretorio_artefatos() / f'openapi-{versao}.{formato}'
+
+    @classmethod
+    def gerar(cls, versao):
+        """Gera o schema (sem requisição, como o comando `spectacular`) e o renderiza."""
+        generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+        schema = generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+        return cls(versao, {
+            formato: renderer().render(schema, renderer_context={})
+            for formato, renderer in FORMATOS_SCHEMA.items()
+        })
+
+    @classmethod
+    def carregar(cls, versao):
+        """Lê o artefato do disco; retorna None se algum formato ainda não foi gerado."""
+        try:
+            return cls(versao, {formato: cls.caminho(versao, formato).read_bytes() for formato in FORMATOS_SCHEMA})
+        except FileNotFoundError:
+            return None
+
+    def gravar(self):
+        """
+        Grava os arquivos do artefato e remove os de versões antigas.
+
+        Cada arquivo é escrito em um temporário e renomeado, então um worker nunca lê um
+        artefato pela metade, mesmo que dois workers o gerem ao mesmo tempo.
+        """
+        diretorio = diretorio_artefatos()
+        diretorio.mkdir(parents=True, exist_ok=True)
+
+        for formato, conteudo in self.conteudos.items():
+            descritor, temporario = tempfile.mkstemp(dir=diretorio, prefix='.openapi-')
+            try:
+                with os.fdopen(descritor, 'wb') as arquivo:
+                    arquivo.write(conteudo)
+                os.chmod(temporario, 0o644)
+                os.replace(temporario, self.caminho(self.versao, formato))
+            except BaseException:
+                if os.path.exists(temporario):
+                    os.remove(temporario)
+                raise
+
+        self._remover_antigos(diretorio)
+
+    def _remover_antigos(self, diretorio):
+        versoes = {}
+        for arquivo in diretorio.glob('openapi-*.*'):
+            versao = arquivo.stem.removeprefix('openapi-')
+            if versao != self.versao:
+                versoes.setdefault(versao, []).append(arquivo)
+
+        try:
+            por_data = sorted(
+                versoes, key=lambda versao: max(arquivo.stat().st_mtime for arquivo in versoes[versao]), reverse=True
+            )
+            for versao in por_data[VERSOES_MANTIDAS - 1:]:
+                for arquivo in versoes[versao]:
+                    arquivo.unlink(missing_ok=True)
+        except FileNotFoundError:  # Outro worker removeu os arquivos primeiro
+            pass
+
+
+def obter_artefato_schema():
+    """
+    Retorna o artefato da versão atual: da memória, do disco ou gerado na hora (e gravado).
+    """
+    global _artefato
+    versao = obter_versao_schema()
+    if _artefato is not None and _artefato.versao == versao:
+        return _artefato
+
+    with _lock:
+        if _artefato is None or _artefato.versao != versao:
+            artefato = ArtefatoSchema.carregar(versao)
+            contar(f'schema:artefato:{"disco" if artefato is not None else "gerado"}')
+            if artefato is None:
+                artefato = ArtefatoSchema.gerar(versao)
+                try:
+                    artefato.gravar()
+                except OSError:  # Diretório sem permissão de escrita: o artefato fica só na memória
+                    pass
+            _artefato = artefato
+
+    return _artefato
+
+
+class SchemaPrecomputadoAPIView(SpectacularAPIView):
+    """
+    `SpectacularAPIView` que serve o artefato pré-gerado (YAML ou JSON por negociação).
+
+    Com `?versao_schema=` igual à versão atual, a resposta pode ficar no cache do
+    navegador indefinidamente; sem ela, o cliente revalida pelo `ETag`. Pedidos com
+    `?lang=`/`?version=` ou views configuradas com outro URLconf são gerados na hora.
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        personalizado = self.urlconf or self.patterns or self.custom_settings or self.api_version
+        if personalizado or request.GET.get('lang') or request.GET.get('version'):
+            return super().get(request, *args, **kwargs)
+
+        artefato = obter_artefato_schema()
+        renderer = request.accepted_renderer
+        etag = artefato.etag(renderer.format)
+
+        resposta = get_conditional_response(request, etag=etag)
+        if resposta is None:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f'{content_type}; charset={renderer.charset}'
+            resposta = HttpResponse(artefato.conteudos[renderer.format], content_type=content_type)
+            resposta['Content-Disposition'] = f'inline; filename="{self._get_filename(request, None)}"'
+
+        resposta['ETag'] = etag
+        if request.GET.get(PARAMETRO_VERSAO) == artefato.versao:
+            resposta['Cache-Control'] = 'public, max-age=31536000, immutable'
+        else:
+            resposta['Cache-Control'] = 'no-cache'
+        return resposta
+
+
+class _SchemaVersionadoMixin:
+    """Aponta a interface para o schema com a versão na URL (ver `SchemaPrecomputadoAPIView`)."""
+
+    def _get_schema_url(self, request):
+        schema_url = super()._get_schema_url(request)
+        return set_query_parameters(url=schema_url, **{PARAMETRO_VERSAO: obter_versao_schema()})
+
+
+class SwaggerPrecomputadoView(_SchemaVersionadoMixin, SpectacularSwaggerView):
+    pass
+
+
+class RedocPrecomputadoView(_SchemaVersionadoMixin, SpectacularRedocView):
+    pass
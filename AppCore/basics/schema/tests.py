@@ -0,0 +1,133 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path
+
+from rest_framework.test import APIClient
+
+from AppCore.basics.schema import schema
+from AppCore.basics.schema.schema import ArtefatoSchema, calcular_versao_schema, obter_artefato_schema
+
+
+def view_a(request):
+    pass
+
+
+def view_b(request):
+    pass
+
+
+class RotasA:
+    urlpatterns = [path('a/', view_a)]
+
+
+class RotasB:
+    urlpatterns = [path('a/', view_a), path('b/', view_b)]
+
+
+def artefato(versao):
+    return ArtefatoSchema(versao, {
+        'yaml': f'versao: {versao}\n'.encode(),
+        'json': f'{{"versao": "{versao}"}}'.encode(),
+    })
+
+
+class DiretorioTemporarioMixin:
+    def setUp(self):
+        super().setUp()
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.diretorio = diretorio.name
+
+        configuracao = override_settings(SCHEMA_ARTEFATO_DIR=self.diretorio)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+    def arquivos(self):
+        return sorted(os.listdir(self.diretorio))
+
+
+@mock.patch.object(schema, '_pacotes_do_projeto', list)
+class VersaoSchemaTests(SimpleTestCase):
+    """A versão muda com as rotas e com as configurações do drf-spectacular."""
+
+    def test_muda_com_as_rotas(self):
+        self.assertEqual(calcular_versao_schema(RotasA), calcular_versao_schema(RotasA))
+        self.assertNotEqual(calcular_versao_schema(RotasA), calcular_versao_schema(RotasB))
+
+    def test_muda_com_as_configuracoes(self):
+        versao = calcular_versao_schema(RotasA)
+
+        with override_settings(SPECTACULAR_SETTINGS={**settings.SPECTACULAR_SETTINGS, 'TITLE': 'Outro título'}):
+            self.assertNotEqual(calcular_versao_schema(RotasA), versao)
+
+
+class ArtefatoSchemaTests(DiretorioTemporarioMixin, SimpleTestCase):
+    """Gravação atômica dos artefatos e remoção das versões antigas."""
+
+    def test_mantem_as_ultimas_versoes(self):
+        for indice, versao in enumerate(['v1', 'v2', 'v3', 'v4']):
+            artefato(versao).gravar()
+            for formato in ('yaml', 'json'):
+                os.utime(ArtefatoSchema.caminho(versao, formato), (1000 + indice, 1000 + indice))
+
+        self.assertEqual(self.arquivos(), [
+            'openapi-v2.json', 'openapi-v2.yaml', 'openapi-v3.json', 'openapi-v3.yaml',
+            'openapi-v4.json', 'openapi-v4.yaml',
+        ])
+        self.assertEqual(ArtefatoSchema.carregar('v4').conteudos, artefato('v4').conteudos)
+        self.assertIsNone(ArtefatoSchema.carregar('v1'))
+
+    def test_falha_na_gravacao_nao_deixa_arquivo_pela_metade(self):
+        artefato('v1').gravar()
+        novo = ArtefatoSchema('v1', {'yaml': b'outro', 'json': b'outro'})
+
+        with mock.patch.object(schema.os, 'replace', side_effect=OSError('disco cheio')):
+            with self.assertRaises(OSError):
+                novo.gravar()
+
+        self.assertEqual(self.arquivos(), ['openapi-v1.json', 'openapi-v1.yaml'])
+        self.assertEqual(ArtefatoSchema.carregar('v1').conteudos, artefato('v1').conteudos)
+
+    @mock.patch.object(schema, '_artefato', None)
+    @mock.patch.object(schema, '_versao', 'v1')
+    def test_artefato_lido_do_disco(self):
+        artefato('v1').gravar()
+
+        with mock.patch.object(ArtefatoSchema, 'gerar', side_effect=AssertionError('não deveria gerar')):
+            self.assertEqual(obter_artefato_schema().conteudos, artefato('v1').conteudos)
+
+
+@mock.patch.object(schema, '_versao', 'v1')
+@mock.patch.object(schema, '_artefato', artefato('v1'))
+class SchemaPrecomputadoAPIViewTests(TestCase):
+    """ETag com 304 e cache imutável só para a URL com a versão atual."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_etag_e_304(self):
+        resposta = self.client.get('/api/schema/', {'format': 'json'})
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.content, artefato('v1').conteudos['json'])
+        self.assertEqual(resposta['ETag'], '"v1-json"')
+
+        revalidacao = self.client.get('/api/schema/', {'format': 'json'}, HTTP_IF_NONE_MATCH='"v1-json"')
+        self.assertEqual(revalidacao.status_code, 304)
+        self.assertEqual(revalidacao.content, b'')
+
+        self.assertEqual(
+            self.client.get('/api/schema/', {'format': 'json'}, HTTP_IF_NONE_MATCH='"v0-json"').status_code, 200
+        )
+
+    def test_cache_imutavel_so_com_a_versao_atual(self):
+        def cache_control(**parametros):
+            return self.client.get('/api/schema/', {'format': 'yaml', **parametros})['Cache-Control']
+
+        self.assertEqual(cache_control(versao_schema='v1'), 'public, max-age=31536000, immutable')
+        self.assertEqual(cache_control(versao_schema='v0'), 'no-cache')
+        self.assertEqual(cache_control(), 'no-cache')
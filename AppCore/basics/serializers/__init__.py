@@ -0,0 +1,12 @@
+from AppCore.basics.serializers.serializers import CampoAnotado, ContagemRelacionada, anotar_queryset
+from AppCore.basics.serializers.lote import SelecaoLoteSerializer
+from AppCore.basics.serializers.otimizacao import (
+    Otimizacao, depende_de, inferir_otimizacao, obter_campos_legiveis, podar_campos
+)
+from AppCore.basics.serializers.compilado import SerializerCompilado, SerializerNaoCompilavel, compilar_serializer
+
+__all__ = [
+    'CampoAnotado', 'ContagemRelacionada', 'anotar_queryset', 'SelecaoLoteSerializer',
+    'Otimizacao', 'depende_de', 'inferir_otimizacao', 'obter_campos_legiveis', 'podar_campos',
+    'SerializerCompilado', 'SerializerNaoCompilavel', 'compilar_serializer',
+]
@@ -0,0 +1,431 @@
+"""
+Serializer compilado - listagens somente leitura serializadas a partir de `values()`.
+
+Em uma página de 100 linhas, o DRF resolve o `source` e chama o `to_representation` de
+cada campo, em cada linha, atravessando objetos de model montados pelo ORM. Para um
+serializer somente leitura cujo grafo só tem relações de um único objeto, o resultado
+depende apenas de colunas: `compilar_serializer` transforma a declaração em
+
+- uma projeção plana (`values()` com os caminhos de todas as colunas lidas);
+- uma função por campo que lê a coluna já pelo nome do lookup e aplica a conversão
+  do próprio campo do DRF, então a saída é idêntica à do serializer;
+- para `SerializerMethodField` e propriedades do model (declarados com `depende_de`),
+  um objeto mínimo com as colunas da linha, as propriedades do model e os
+  `get_<campo>_display` resolvidos por dicionários montados na compilação.
+
+Serializers com relações de muitos, `SerializerMethodField` sem `depende_de` ou campos
+que dependem do objeto inteiro não são compiláveis: `compilar_serializer` retorna None e
+a view segue com o serializer normal.
+
+Exemplo de uso:
+    compilado = compilar_serializer(AlunoListaSerializer, Aluno)
+    dados = compilado.serializar(compilado.projetar(Aluno.objects.all()))
+"""
+import threading
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.encoding import force_str
+from django.utils.hashable import make_hashable
+
+from rest_framework import serializers
+from rest_framework.fields import empty
+
+from AppCore.basics.serializers.otimizacao import MAXIMO_COMBINACOES_CAMPOS, _No, _percorrer_serializer
+from AppCore.basics.serializers.serializers import CampoAnotado
+
+
+# Marca de campo omitido (equivalente ao `SkipField` do DRF)
+_AUSENTE = object()
+
+
+class SerializerNaoCompilavel(Exception):
+    """O serializer lê algo que não pode ser projetado em colunas de `values()`."""
+
+
+# ============================================================================
+# OBJETO DA LINHA (para métodos e propriedades)
+# ============================================================================
+
+class _Linha:
+    """Objeto com as colunas de um nível da linha, no lugar da instância do model."""
+    _colunas = ()
+    _filhos = ()
+
+    def __init__(self, dados):
+        self.__dict__.update({nome: dados[chave] for nome, chave in self._colunas})
+        for nome, chave_nulo, classe in self._filhos:
+            self.__dict__[nome] = None if dados[chave_nulo] is None else classe(dados)
+
+
+def _criar_display(campo):
+    """Equivalente ao `get_<campo>_display` do model, com as escolhas já em dicionário."""
+    escolhas = dict(make_hashable(campo.flatchoices))
+    nome = campo.attname
+
+    def display(self):
+        valor = getattr(self, nome)
+        return force_str(escolhas.get(make_hashable(valor), valor), strings_only=True)
+
+    return display
+
+
+def _classe_linha(no, prefixo, colunas, filhos):
+    atributos = {'_colunas': tuple(colunas), '_filhos': tuple(filhos)}
+
+    # Os métodos do serializer podem chamar qualquer `get_<campo>_display` do model
+    for campo in no.model._meta.concrete_fields:
+        if campo.choices and campo.name in no.nomes_campos():
+            atributos[f'get_{campo.name}_display'] = _criar_display(campo)
+
+    for nome in no.atributos:
+        if nome.startswith('get_') and nome.endswith('_display'):
+            campo = no.model._meta.get_field(nome[len('get_'):-len('_display')])
+            atributos[nome] = _criar_display(campo)
+            continue
+
+        atributo = no.model.__dict__.get(nome)
+        if atributo is None:
+            raise SerializerNaoCompilavel(f'{no.model.__name__}.{nome} não é uma propriedade ou método do model.')
+        atributos[nome] = atributo
+
+    return type(f'Linha{no.model.__name__}', (_Linha,), atributos)
+
+
+# ============================================================================
+# COMPILAÇÃO
+# ============================================================================
+
+class _Nivel:
+    """Um model da projeção: colunas lidas, chave para detectar relação nula e classe da linha."""
+
+    def __init__(self, no, prefixo):
+        if no.todos:
+            raise SerializerNaoCompilavel(f'Um campo de {no.model.__name__} depende do objeto inteiro.')
+        if no.prefetches or no.prefetch_objetos:
+            raise SerializerNaoCompilavel(f'{no.model.__name__} tem relações de muitos.')
+
+        self.no = no
+        self.prefixo = prefixo
+        pk = no.model._meta.pk
+        self.chave_nulo = f'{prefixo}{pk.name}'
+        self.valores = [self.chave_nulo]
+
+        colunas = []
+        for nome in sorted(no.nomes_campos()):
+            campo = no.model._meta.get_field(nome)
+            if campo.is_relation:
+                continue
+            chave = f'{prefixo}{nome}'
+            if chave != self.chave_nulo:
+                self.valores.append(chave)
+            colunas.append((nome, chave))
+
+        self.filhos = {}
+        filhos_linha = []
+        for nome, filho in no.selects.items():
+            nivel = _Nivel(filho, f'{prefixo}{nome}__')
+            self.filhos[nome] = nivel
+            self.valores.extend(nivel.valores)
+            filhos_linha.append((nome, nivel.chave_nulo, nivel.classe))
+
+        self.classe = _classe_linha(no, prefixo, colunas, filhos_linha)
+
+    def campo_do_model(self, nome):
+        try:
+            return self.no.model._meta.get_field(nome)
+        except FieldDoesNotExist:
+            return None
+
+    def filho(self, nome):
+        try:
+            return self.filhos[nome]
+        except KeyError:
+            raise SerializerNaoCompilavel(
+                f'{self.no.model.__name__}.{nome} não está no select_related da projeção.'
+            ) from None
+
+
+def _ausencia(campo):
+    """Valor quando uma relação intermediária é nula (mesmas regras do `Field.get_attribute` do DRF)."""
+    if campo.default is not empty:
+        raise SerializerNaoCompilavel(f'{campo.field_name} tem valor padrão.')
+    if campo.allow_null:
+        return None
+    return _AUSENTE
+
+
+def _planejar(serializer, nivel, campos=None):
+    """
+    Monta o plano de um nível: [(nome, tipo, dados)] na ordem dos campos do serializer.
+
+    Tipos: 'coluna', 'atributo', 'metodo', 'anotado' e 'aninhado'.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        raise SerializerNaoCompilavel('Serializers de lista não são compiláveis.')
+
+    plano = []
+    for campo in serializer._readable_fields:
+        nome = campo.field_name
+        if campos is not None and nome not in campos:
+            continue
+
+        if isinstance(campo, CampoAnotado):
+            if nivel.prefixo:
+                raise SerializerNaoCompilavel(f'{nome}: CampoAnotado só é compilável no primeiro nível.')
+            plano.append((nome, 'anotado', {'chave': campo.nome_anotacao, 'converter': campo.to_representation}))
+            continue
+
+        if isinstance(campo, serializers.SerializerMethodField):
+            plano.append((nome, 'metodo', {'metodo': campo.method_name}))
+            continue
+
+        if campo.source == '*':
+            if not isinstance(campo, serializers.BaseSerializer):
+                raise SerializerNaoCompilavel(f'{nome} depende do objeto inteiro.')
+            plano.append((nome, 'aninhado', {
+                'nulos': [], 'chave_nulo': None, 'caminho': [], 'plano': _planejar(campo, nivel), 'campo': nome,
+            }))
+            continue
+
+        # Relações intermediárias do `source` (ex: 'usuario' em 'usuario.nome')
+        atual = nivel
+        nulos = []
+        caminho = []
+        atributos = campo.source_attrs
+        for atributo in atributos[:-1]:
+            atual = atual.filho(atributo)
+            nulos.append(atual.chave_nulo)
+            caminho.append(atributo)
+
+        final = atributos[-1]
+        if isinstance(campo, serializers.BaseSerializer):
+            filho = atual.filho(final)
+            plano.append((nome, 'aninhado', {
+                'nulos': nulos, 'chave_nulo': filho.chave_nulo, 'caminho': caminho + [final],
+                'plano': _planejar(campo, filho), 'campo': nome, 'ausente': _ausencia(campo) if nulos else None,
+            }))
+            continue
+
+        campo_model = atual.campo_do_model(final)
+        if campo_model is not None and not campo_model.is_relation:
+            plano.append((nome, 'coluna', {
+                'nulos': nulos, 'chave': f'{atual.prefixo}{final}', 'converter': campo.to_representation,
+                'ausente': _ausencia(campo) if nulos else None,
+            }))
+        else:
+            plano.append((nome, 'atributo', {
+                'caminho': caminho + [final], 'converter': campo.to_representation,
+                'ausente': _ausencia(campo) if nulos else None,
+            }))
+
+    return plano
+
+
+def _precisa_linha(plano):
+    return any(tipo in ('atributo', 'metodo') for _, tipo, _ in plano)
+
+
+# ============================================================================
+# EXECUÇÃO
+# ============================================================================
+
+def _extrator_coluna(dados_passo):
+    chave = dados_passo['chave']
+    converter = dados_passo['converter']
+    nulos = dados_passo['nulos']
+    ausente = dados_passo['ausente']
+
+    if not nulos:
+        def extrair(dados, linha):
+            valor = dados[chave]
+            return None if valor is None else converter(valor)
+        return extrair
+
+    def extrair_com_relacao(dados, linha):
+        for chave_nulo in nulos:
+            if dados[chave_nulo] is None:
+                return ausente
+        valor = dados[chave]
+        return None if valor is None else converter(valor)
+    return extrair_com_relacao
+
+
+def _extrator_atributo(dados_passo):
+    caminho = dados_passo['caminho']
+    converter = dados_passo['converter']
+    ausente = dados_passo['ausente']
+
+    def extrair(dados, linha):
+        valor = linha
+        for atributo in caminho:
+            if valor is None:
+                return ausente
+            valor = getattr(valor, atributo)
+        if callable(valor):
+            valor = valor()
+        return None if valor is None else converter(valor)
+    return extrair
+
+
+def _vincular(plano, serializer, classe_linha):
+    """
+    Monta a função que converte um dicionário de `values()` na representação do nível.
+
+    Os métodos (`get_<campo>`) são vinculados à instância do serializer da requisição,
+    então leem o mesmo `context` que leriam no serializer normal.
+    """
+    extratores = []
+    for nome, tipo, dados_passo in plano:
+        if tipo == 'coluna':
+            extratores.append((nome, _extrator_coluna(dados_passo)))
+        elif tipo == 'anotado':
+            extratores.append((nome, _extrator_coluna({**dados_passo, 'nulos': [], 'ausente': None})))
+        elif tipo == 'atributo':
+            extratores.append((nome, _extrator_atributo(dados_passo)))
+        elif tipo == 'metodo':
+            metodo = getattr(serializer, dados_passo['metodo'])
+            extratores.append((nome, lambda dados, linha, metodo=metodo: metodo(linha)))
+        else:
+            extratores.append((nome, _extrator_aninhado(dados_passo, serializer.fields[dados_passo['campo']])))
+
+    precisa_linha = classe_linha is not None and _precisa_linha(plano)
+
+    def mapear(dados, linha=None):
+        if precisa_linha and linha is None:
+            linha = classe_linha(dados)
+        saida = {}
+        for nome, extrair in extratores:
+            valor = extrair(dados, linha)
+            if valor is not _AUSENTE:
+                saida[nome] = valor
+        return saida
+
+    return mapear
+
+
+def _extrator_aninhado(dados_passo, serializer_aninhado):
+    nulos = dados_passo['nulos']
+    chave_nulo = dados_passo['chave_nulo']
+    caminho = dados_passo['caminho']
+    ausente = dados_passo.get('ausente')
+    classe = dados_passo.get('classe')
+    mapear = _vincular(dados_passo['plano'], serializer_aninhado, classe)
+
+    if chave_nulo is None:
+        # source='*': mesmo nível, mesma linha
+        return lambda dados, linha: mapear(dados, linha)
+
+    def extrair(dados, linha):
+        for chave in nulos:
+            if dados[chave] is None:
+                return ausente
+        if dados[chave_nulo] is None:
+            return None
+        if linha is not None:
+            for atributo in caminho:
+                linha = getattr(linha, atributo)
+        return mapear(dados, linha)
+    return extrair
+
+
+def _associar_classes(plano, nivel):
+    """Guarda em cada passo aninhado a classe da linha do nível correspondente."""
+    for _, tipo, dados_passo in plano:
+        if tipo != 'aninhado':
+            continue
+        filho = nivel
+        for atributo in dados_passo['caminho']:
+            filho = filho.filho(atributo)
+        dados_passo['classe'] = filho.classe
+        _associar_classes(dados_passo['plano'], filho)
+
+
+class SerializerCompilado:
+    """
+    Projeção em `values()` e mapeamento por linha equivalentes a um serializer somente leitura.
+
+    Args:
+        serializer_class: Serializer somente leitura (sem relações de muitos)
+        model: Model do queryset
+        campos: Nomes dos campos de primeiro nível considerados (padrão: todos)
+
+    Raises:
+        SerializerNaoCompilavel: Se o serializer lê algo fora das colunas do grafo
+    """
+
+    def __init__(self, serializer_class, model, campos=None):
+        self.serializer_class = serializer_class
+        serializer = serializer_class()
+
+        raiz = _No(model)
+        _percorrer_serializer(raiz, serializer, campos)
+        self.nivel = _Nivel(raiz, '')
+
+        self.plano = _planejar(serializer, self.nivel, campos)
+        _associar_classes(self.plano, self.nivel)
+
+        self.valores = list(self.nivel.valores)
+        self.valores.extend(
+            dados_passo['chave'] for _, tipo, dados_passo in self.plano if tipo == 'anotado'
+        )
+
+    def projetar(self, queryset):
+        """Retorna o queryset como dicionários com as colunas lidas pelo serializer."""
+        return queryset.values(*self.valores)
+
+    def mapeador(self, context=None):
+        """
+        Retorna a função que serializa um dicionário de `projetar` (equivalente ao `to_representation`).
+
+        Args:
+            context: Contexto do serializer (o mesmo de `get_serializer_context`)
+        """
+        serializer = self.serializer_class(context=context or {})
+        return _vincular(self.plano, serializer, self.nivel.classe)
+
+    def serializar(self, linhas, context=None):
+        """
+        Serializa dicionários de `projetar` com a mesma saída do serializer (com `many=True`).
+
+        Args:
+            linhas: Iterável de dicionários de `values()`
+            context: Contexto do serializer (o mesmo de `get_serializer_context`)
+        """
+        mapear = self.mapeador(context)
+        return [mapear(dados) for dados in linhas]
+
+
+_cache_compilados = {}
+_lock_compilados = threading.Lock()
+
+
+def _criar_compilado(serializer_class, model, campos):
+    try:
+        return SerializerCompilado(serializer_class, model, campos)
+    except SerializerNaoCompilavel:
+        return None
+
+
+@lru_cache(maxsize=MAXIMO_COMBINACOES_CAMPOS)
+def _compilado_para_campos(serializer_class, model, campos):
+    return _criar_compilado(serializer_class, model, campos)
+
+
+def compilar_serializer(serializer_class, model, campos=None):
+    """
+    Compila o serializer para o model (uma vez por serializer e model com todos os campos;
+    as combinações de `campos` ficam no cache LRU limitado, como em `inferir_otimizacao`).
+
+    Returns:
+        SerializerCompilado, ou None se o serializer não for compilável
+    """
+    if campos is not None:
+        return _compilado_para_campos(serializer_class, model, frozenset(campos))
+
+    chave = (serializer_class, model)
+    if chave not in _cache_compilados:
+        compilado = _criar_compilado(serializer_class, model, None)
+        with _lock_compilados:
+            _cache_compilados[chave] = compilado
+    return _cache_compilados[chave]
@@ -0,0 +1,52 @@
+"""
+Seleção de registros para as operações em lote (edição e deleção).
+
+O corpo da requisição traz `ids` (lista de ids) ou `filtro` (campos e valores aceitos
+pela view em `filtros_lote`). Os serializers de edição em lote herdam daqui e declaram
+os campos que podem ser alterados.
+
+Exemplo de uso:
+    class SetorEdicaoLoteSerializer(SelecaoLoteSerializer):
+        ativo = serializers.BooleanField(required=False)
+
+    # {"ids": [1, 2, 3], "ativo": false}
+    # {"filtro": {"campus_id": 2}, "ativo": false}
+"""
+from rest_framework import serializers
+
+
+MAXIMO_IDS_LOTE = 1000
+
+
+class SelecaoLoteSerializer(serializers.Serializer):
+    """
+    Serializer de seleção dos registros de uma operação em lote.
+
+    **Informe apenas um:**
+    - ids: Lista de ids (até 1000)
+    - filtro: Objeto com os filtros aceitos pela listagem (ex: {"ativo": true})
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=MAXIMO_IDS_LOTE,
+        help_text='Ids dos registros'
+    )
+    filtro = serializers.DictField(
+        required=False,
+        allow_empty=False,
+        help_text='Filtros que selecionam os registros (campos aceitos variam por endpoint)'
+    )
+
+    def validate(self, attrs):
+        """Valida se exatamente um entre `ids` e `filtro` foi informado."""
+        if ('ids' in attrs) == ('filtro' in attrs):
+            raise serializers.ValidationError('Informe `ids` ou `filtro` (apenas um deles).')
+        return attrs
+
+    def obter_dados(self):
+        """Retorna os campos a gravar, sem os campos de seleção."""
+        return {
+            campo: valor for campo, valor in self.validated_data.items() if campo not in ('ids', 'filtro')
+        }
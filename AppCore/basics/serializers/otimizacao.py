@@ -0,0 +1,294 @@
+"""
+Otimização do queryset a partir do serializer - select_related, prefetch_related e only().
+
+Em vez de cada view escrever à mão as relações que carrega (e elas se afastarem do que o
+serializer realmente lê), `inferir_otimizacao` percorre os campos declarados e os
+`source=` do serializer sobre o model:
+
+- relações de um único objeto (ForeignKey, OneToOne) viram `select_related`;
+- relações de muitos (reversas, ManyToMany) viram `Prefetch` com o queryset já otimizado
+  para o serializer aninhado;
+- os campos concretos lidos viram a projeção `only()` de cada nível.
+
+`SerializerMethodField` e propriedades do model não revelam o que leem: declare com
+`depende_de`. Sem a declaração, o nível é carregado com todos os campos (nunca há
+carregamento tardio de colunas) e relações usadas apenas dentro do método não são carregadas.
+
+Exemplo de uso:
+    class UsuarioSerializer(serializers.Serializer):
+        nome = serializers.CharField(read_only=True)
+        campus = CampusResumoSerializer(read_only=True)
+        contatos = ContatoListaSerializer(many=True, read_only=True)
+        perfil_aluno = serializers.SerializerMethodField()
+
+        @depende_de(('aluno', AlunoPerfilSerializer))
+        def get_perfil_aluno(self, obj):
+            ...
+
+    queryset = inferir_otimizacao(UsuarioSerializer, Usuario).aplicar(Usuario.objects.all())
+"""
+import copy
+import threading
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+
+from rest_framework import serializers
+
+from AppCore.basics.serializers.serializers import CampoAnotado
+from AppCore.common.util.dependencias import depende_de
+
+
+class _No:
+    """Um model no grafo de carregamento: campos lidos e relações a seguir."""
+
+    def __init__(self, model):
+        self.model = model
+        self.campos = set()
+        self.todos = False
+        self.selects = {}
+        self.prefetches = {}
+        self.prefetch_objetos = []
+        # Atributos que não são campos (propriedades, `get_<campo>_display`) lidos neste nível
+        self.atributos = set()
+
+    def nomes_campos(self):
+        if self.todos:
+            return {campo.name for campo in self.model._meta.concrete_fields}
+        return self.campos | {self.model._meta.pk.name}
+
+
+def _obter_campo(model, nome):
+    """Retorna o campo (ou a relação reversa, pelo nome do acessor) do model, ou None."""
+    try:
+        return model._meta.get_field(nome)
+    except FieldDoesNotExist:
+        for relacao in model._meta.related_objects:
+            if relacao.get_accessor_name() == nome:
+                return relacao
+        return None
+
+
+def _dependencias_atributo(model, nome):
+    """
+    Dependências de um atributo que não é campo: `get_<campo>_display` ou função/propriedade
+    com `depende_de`.
+    """
+    if nome.startswith('get_') and nome.endswith('_display'):
+        campo = _obter_campo(model, nome[len('get_'):-len('_display')])
+        if campo is not None:
+            return [campo.name]
+
+    atributo = getattr(model, nome, None)
+    if isinstance(atributo, property):
+        atributo = atributo.fget
+    return getattr(atributo, 'dependencias', None)
+
+
+def _seguir(no, atributos, aninhado=None):
+    """Marca o caminho `atributos` a partir do nó e, no fim, percorre o serializer aninhado."""
+    nome, resto = atributos[0], atributos[1:]
+    campo = _obter_campo(no.model, nome)
+
+    if campo is None:
+        dependencias = _dependencias_atributo(no.model, nome)
+        if dependencias is None:
+            no.todos = True
+        else:
+            no.atributos.add(nome)
+            for dependencia in dependencias:
+                _adicionar_dependencia(no, dependencia)
+        return
+
+    if not campo.is_relation:
+        no.campos.add(campo.name)
+        return
+
+    if campo.one_to_many or campo.many_to_many:
+        filho = no.prefetches.setdefault(nome, _No(campo.related_model))
+        if campo.one_to_many:
+            # O prefetch associa os registros ao pai pela ForeignKey de volta
+            filho.campos.add(campo.field.name)
+    else:
+        if campo.concrete:
+            no.campos.add(campo.name)
+        filho = no.selects.setdefault(nome, _No(campo.related_model))
+
+    if resto:
+        _seguir(filho, resto, aninhado)
+    elif aninhado is not None:
+        _percorrer_serializer(filho, aninhado)
+    else:
+        filho.todos = True
+
+
+def _adicionar_dependencia(no, dependencia):
+    if isinstance(dependencia, Prefetch):
+        # Um prefetch que passa por uma ForeignKey precisa da coluna dela no pai
+        campo = _obter_campo(no.model, dependencia.prefetch_through.split('__')[0])
+        if campo is not None and campo.concrete:
+            no.campos.add(campo.name)
+        no.prefetch_objetos.append(dependencia)
+    elif isinstance(dependencia, tuple):
+        caminho, serializer_class = dependencia
+        _seguir(no, caminho.split('__'), serializer_class())
+    else:
+        _seguir(no, dependencia.split('__'))
+
+
+def _percorrer_serializer(no, serializer, campos=None):
+    """Percorre os campos legíveis do serializer (opcionalmente apenas os de `campos`)."""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+
+    for campo in serializer._readable_fields:
+        if campos is not None and campo.field_name not in campos:
+            continue
+
+        if isinstance(campo, CampoAnotado):
+            continue
+
+        if isinstance(campo, serializers.SerializerMethodField):
+            dependencias = getattr(getattr(serializer, campo.method_name), 'dependencias', None)
+            if dependencias is None:
+                no.todos = True
+            else:
+                for dependencia in dependencias:
+                    _adicionar_dependencia(no, dependencia)
+            continue
+
+        aninhado = campo if isinstance(campo, serializers.BaseSerializer) else None
+
+        if campo.source == '*':
+            if aninhado is not None:
+                _percorrer_serializer(no, aninhado)
+            else:
+                no.todos = True
+            continue
+
+        _seguir(no, campo.source_attrs, aninhado)
+
+
+class Otimizacao:
+    """Resultado da inferência: relações e projeção a aplicar em um queryset."""
+
+    def __init__(self):
+        self.select_related = []
+        self.prefetch_related = []
+        self.only = []
+
+    def aplicar(self, queryset, prefetch=True):
+        """
+        Aplica a otimização ao queryset.
+
+        A projeção `only()` só é aplicada se o queryset ainda não tiver `select_related`
+        ou `only()`/`defer()` próprios, que poderiam conflitar com ela.
+
+        Args:
+            queryset: Queryset do model usado na inferência
+            prefetch: False para deixar os prefetches para depois (ver `prefetch_related_objects`)
+        """
+        projetar = not queryset.query.select_related and queryset.query.deferred_loading == (frozenset(), True)
+
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if prefetch and self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if projetar and self.only:
+            queryset = queryset.only(*self.only)
+        return queryset
+
+
+def _compilar(no, otimizacao, prefixo=''):
+    otimizacao.only.extend(f'{prefixo}{nome}' for nome in sorted(no.nomes_campos()))
+
+    for nome, filho in no.selects.items():
+        caminho = f'{prefixo}{nome}'
+        otimizacao.select_related.append(caminho)
+        _compilar(filho, otimizacao, f'{caminho}__')
+
+    explicitos = set()
+    for prefetch in no.prefetch_objetos:
+        prefetch = copy.copy(prefetch)
+        if prefixo:
+            prefetch.add_prefix(prefixo[:-2])
+        explicitos.add(prefetch.prefetch_to)
+        otimizacao.prefetch_related.append(prefetch)
+
+    for nome, filho in no.prefetches.items():
+        caminho = f'{prefixo}{nome}'
+        if caminho in explicitos:
+            continue
+        sub_otimizacao = Otimizacao()
+        _compilar(filho, sub_otimizacao)
+        otimizacao.prefetch_related.append(
+            Prefetch(caminho, queryset=sub_otimizacao.aplicar(filho.model._default_manager.all()))
+        )
+
+
+# Combinações de `?campos=` guardadas por processo; o conjunto completo de cada serializer não entra no limite
+MAXIMO_COMBINACOES_CAMPOS = 256
+
+_cache_otimizacoes = {}
+_lock_otimizacoes = threading.Lock()
+
+
+def _calcular_otimizacao(serializer_class, model, campos):
+    raiz = _No(model)
+    _percorrer_serializer(raiz, serializer_class(), campos)
+
+    otimizacao = Otimizacao()
+    _compilar(raiz, otimizacao)
+    return otimizacao
+
+
+@lru_cache(maxsize=MAXIMO_COMBINACOES_CAMPOS)
+def _otimizacao_para_campos(serializer_class, model, campos):
+    return _calcular_otimizacao(serializer_class, model, campos)
+
+
+def inferir_otimizacao(serializer_class, model, campos=None):
+    """
+    Deriva select_related, prefetch_related e only() dos campos do serializer.
+
+    O resultado com todos os campos é calculado uma vez por serializer e model. As
+    combinações de `campos` vêm do cliente (`?campos=`) e ficam em um cache LRU limitado
+    a `MAXIMO_COMBINACOES_CAMPOS`, para que a memória não cresça com os pedidos.
+
+    Args:
+        serializer_class: Serializer que vai representar os objetos
+        model: Model do queryset
+        campos: Nomes dos campos de primeiro nível considerados (padrão: todos)
+
+    Returns:
+        Otimizacao: select_related, prefetch_related e only para `aplicar` ao queryset
+    """
+    if campos is not None:
+        return _otimizacao_para_campos(serializer_class, model, frozenset(campos))
+
+    chave = (serializer_class, model)
+    otimizacao = _cache_otimizacoes.get(chave)
+    if otimizacao is None:
+        otimizacao = _calcular_otimizacao(serializer_class, model, None)
+        with _lock_otimizacoes:
+            _cache_otimizacoes[chave] = otimizacao
+
+    return otimizacao
+
+
+@lru_cache(maxsize=None)
+def obter_campos_legiveis(serializer_class):
+    """Nomes dos campos de leitura do serializer, na ordem de declaração."""
+    return tuple(campo.field_name for campo in serializer_class()._readable_fields)
+
+
+def podar_campos(serializer, campos):
+    """Remove do serializer (ou do `child` de uma lista) os campos fora de `campos`; eles não são calculados."""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+
+    for nome in list(serializer.fields):
+        if nome not in campos:
+            serializer.fields.pop(nome)
+    return serializer
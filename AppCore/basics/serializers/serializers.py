@@ -0,0 +1,116 @@
+"""
+Campos anotados - agregações calculadas pelo banco em vez de uma query por linha.
+
+Um serializer declara seus campos agregados uma única vez com `CampoAnotado`, e a
+`BasicGetAPIView` empurra essas expressões para o queryset como anotações
+(`Count`/`Subquery`) antes da paginação. Assim a listagem responde com um número
+constante de queries, independente do tamanho da página.
+
+Exemplo de uso:
+    class SetorListaSerializer(serializers.Serializer):
+        id = serializers.IntegerField(read_only=True)
+        total_membros = CampoAnotado(
+            ContagemRelacionada('usuario_setores', data_saida__isnull=True)
+        )
+"""
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from rest_framework import serializers
+
+
+class ContagemRelacionada:
+    """
+    Contagem declarativa dos registros de uma relação reversa (ForeignKey apontando para o model).
+
+    É resolvida como uma Subquery correlacionada, o que evita a multiplicação de linhas
+    quando o mesmo serializer conta mais de uma relação (ex: terceirizados e estagiários).
+
+    Args:
+        relacao: related_name da relação reversa (ex: 'usuario_setores')
+        **filtros: Filtros aplicados aos registros relacionados (ex: data_saida__isnull=True)
+    """
+
+    def __init__(self, relacao, **filtros):
+        self.relacao = relacao
+        self.filtros = filtros
+
+    def resolver(self, model):
+        relacao = model._meta.get_field(self.relacao)
+        campo_remoto = relacao.field.name
+
+        queryset = relacao.related_model._base_manager.filter(
+            **{campo_remoto: OuterRef('pk')}, **self.filtros
+        ).order_by().values(campo_remoto).annotate(total=Count('pk')).values('total')
+
+        return Coalesce(Subquery(queryset, output_field=IntegerField()), Value(0))
+
+
+def nome_anotacao(nome):
+    """Nome da anotação do queryset para o `CampoAnotado` declarado como `nome`."""
+    return f'anotacao_{nome}'
+
+
+class CampoAnotado(serializers.IntegerField):
+    """
+    Campo somente leitura cujo valor inteiro é calculado pelo banco como anotação do queryset.
+
+    Aceita uma `ContagemRelacionada` ou qualquer expressão do Django (`Count`, `Subquery`...).
+    Quando o objeto serializado não veio de um queryset anotado (ex: retorno de `get_object()`),
+    o valor é calculado com uma query avulsa para aquele objeto, mantendo o mesmo resultado.
+    """
+
+    def __init__(self, expressao, **kwargs):
+        kwargs['read_only'] = True
+        self.expressao = expressao
+        super().__init__(**kwargs)
+
+    @property
+    def nome_anotacao(self):
+        return nome_anotacao(self.field_name)
+
+    def obter_expressao(self, model):
+        if isinstance(self.expressao, ContagemRelacionada):
+            return self.expressao.resolver(model)
+        return self.expressao
+
+    def get_attribute(self, instance):
+        try:
+            return getattr(instance, self.nome_anotacao)
+        except AttributeError:
+            model = type(instance)
+            return model._base_manager.filter(pk=instance.pk).annotate(
+                **{self.nome_anotacao: self.obter_expressao(model)}
+            ).values_list(self.nome_anotacao, flat=True).first()
+
+
+def obter_campos_anotados(serializer_class):
+    """
+    Retorna os `CampoAnotado` declarados no serializer, indexados pelo nome do campo.
+
+    Os campos declarados são compartilhados pela classe (e pelas subclasses) e não são
+    alterados: o nome da anotação vem da chave, não do `field_name`, que só as cópias
+    ligadas a uma instância do serializer têm.
+    """
+    campos = getattr(serializer_class, '_declared_fields', {})
+    return {nome: campo for nome, campo in campos.items() if isinstance(campo, CampoAnotado)}
+
+
+def anotar_queryset(queryset, serializer_class, campos=None):
+    """
+    Aplica ao queryset as anotações de todos os `CampoAnotado` do serializer.
+
+    Apenas campos de primeiro nível são considerados; serializers aninhados
+    continuam usando o fallback por objeto. Com `campos`, só os campos listados
+    são anotados.
+    """
+    anotados = obter_campos_anotados(serializer_class)
+    if campos is not None:
+        anotados = {nome: campo for nome, campo in anotados.items() if nome in campos}
+    if not anotados:
+        return queryset
+
+    return queryset.annotate(**{
+        nome_anotacao(nome): campo.obter_expressao(queryset.model)
+        for nome, campo in anotados.items()
+    })
@@ -0,0 +1,208 @@
+import itertools
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from AppCore.basics.cache import cache_respostas
+from AppCore.basics.serializers import compilado, otimizacao
+from AppCore.basics.serializers.compilado import SerializerCompilado, SerializerNaoCompilavel, compilar_serializer
+from AppCore.basics.serializers.otimizacao import MAXIMO_COMBINACOES_CAMPOS, inferir_otimizacao
+from AppCore.basics.serializers.serializers import CampoAnotado, ContagemRelacionada, anotar_queryset
+
+from EstruturaOrganizacional.atividade.models import Atividade
+from EstruturaOrganizacional.campus.models import Campus
+from EstruturaOrganizacional.cargo.models import Cargo
+from EstruturaOrganizacional.curso.models import Curso
+from EstruturaOrganizacional.empresa.models import Empresa
+from EstruturaOrganizacional.funcao.models import Funcao
+from EstruturaOrganizacional.setor.models import Setor
+from Perfis.aluno.models import Aluno
+from Perfis.estagiario.models import Estagiario
+from Perfis.servidor.models import Servidor
+from Perfis.terceirizado.models import Terceirizado
+from Usuarios.usuario.models import Usuario
+from Usuarios.usuario_setor.models import UsuarioSetor
+
+
+class SetorSiglaMinusculaSerializer(serializers.ModelSerializer):
+    # O `source` atravessa uma coluna, não uma relação
+    sigla_minuscula = serializers.CharField(source='sigla.lower')
+
+    class Meta:
+        model = Setor
+        fields = ['id', 'sigla_minuscula']
+
+
+class SetorTotalAtividadesSerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    total_atividades = CampoAnotado(ContagemRelacionada('atividades'))
+
+
+class CampoAnotadoTests(TestCase):
+    """Anotações pelo nome declarado, sem alterar os campos compartilhados pela classe."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.setor = Setor.objects.create(nome='Setor', sigla='S')
+        Atividade.objects.create(setor=cls.setor, descricao='Atividade 1')
+        Atividade.objects.create(setor=cls.setor, descricao='Atividade 2')
+
+    def test_campo_declarado_nao_alterado(self):
+        campo = SetorTotalAtividadesSerializer._declared_fields['total_atividades']
+
+        queryset = anotar_queryset(Setor.objects.all(), SetorTotalAtividadesSerializer)
+
+        self.assertIsNone(campo.field_name)
+        with self.assertNumQueries(1):
+            dados = SetorTotalAtividadesSerializer(queryset, many=True).data
+
+        self.assertEqual([dict(item) for item in dados], [{'id': self.setor.pk, 'total_atividades': 2}])
+
+
+class SetorCamposSerializer(serializers.Serializer):
+    """Nove campos: 511 combinações possíveis em `?campos=`."""
+    campo_0 = serializers.IntegerField(source='id', read_only=True)
+    campo_1 = serializers.IntegerField(source='id', read_only=True)
+    campo_2 = serializers.IntegerField(source='id', read_only=True)
+    campo_3 = serializers.IntegerField(source='id', read_only=True)
+    campo_4 = serializers.IntegerField(source='id', read_only=True)
+    campo_5 = serializers.IntegerField(source='id', read_only=True)
+    campo_6 = serializers.IntegerField(source='id', read_only=True)
+    campo_7 = serializers.IntegerField(source='id', read_only=True)
+    campo_8 = serializers.IntegerField(source='id', read_only=True)
+
+
+class CacheCombinacoesCamposTests(SimpleTestCase):
+    """As combinações de campos pedidas pelo cliente não fazem os caches crescerem sem limite."""
+
+    def test_caches_limitados(self):
+        nomes = [f'campo_{indice}' for indice in range(9)]
+        combinacoes = [
+            set(combinacao) for tamanho in range(1, len(nomes)) for combinacao in itertools.combinations(nomes, tamanho)
+        ]
+        self.assertGreater(len(combinacoes), MAXIMO_COMBINACOES_CAMPOS)
+
+        for campos in combinacoes:
+            inferir_otimizacao(SetorCamposSerializer, Setor, campos)
+            compilar_serializer(SetorCamposSerializer, Setor, campos)
+
+        self.assertLessEqual(otimizacao._otimizacao_para_campos.cache_info().currsize, MAXIMO_COMBINACOES_CAMPOS)
+        self.assertLessEqual(compilado._compilado_para_campos.cache_info().currsize, MAXIMO_COMBINACOES_CAMPOS)
+
+        # O conjunto completo fica fora do limite e é o mesmo objeto a cada chamada
+        completo = inferir_otimizacao(SetorCamposSerializer, Setor)
+        self.assertIs(inferir_otimizacao(SetorCamposSerializer, Setor), completo)
+        compilado_completo = compilar_serializer(SetorCamposSerializer, Setor)
+        self.assertIs(compilar_serializer(SetorCamposSerializer, Setor), compilado_completo)
+        self.assertEqual(
+            compilar_serializer(SetorCamposSerializer, Setor, {'campo_1'}).mapeador()({'id': 7}), {'campo_1': 7}
+        )
+
+
+class CompilarSerializerTests(SimpleTestCase):
+    """Serializers fora do que a compilação projeta seguem com o serializer normal."""
+
+    def test_source_por_coluna_nao_compilavel(self):
+        with self.assertRaisesMessage(SerializerNaoCompilavel, 'Setor.sigla'):
+            SerializerCompilado(SetorSiglaMinusculaSerializer, Setor)
+
+        self.assertIsNone(compilar_serializer(SetorSiglaMinusculaSerializer, Setor))
+
+
+# Listagens com `serializer_compilado = True`: (caminho, view)
+LISTAGENS_COMPILADAS = [
+    ('/estrutura_organizacional/campus/', 'EstruturaOrganizacional.campus.views.CampusListaView'),
+    ('/estrutura_organizacional/cargos/', 'EstruturaOrganizacional.cargo.views.CargoListaView'),
+    ('/estrutura_organizacional/setores/', 'EstruturaOrganizacional.setor.views.SetorListaView'),
+    ('/estrutura_organizacional/atividades/', 'EstruturaOrganizacional.atividade.views.AtividadeListaView'),
+    ('/estrutura_organizacional/funcoes/', 'EstruturaOrganizacional.funcao.views.FuncaoListaView'),
+    ('/estrutura_organizacional/empresas/', 'EstruturaOrganizacional.empresa.views.EmpresaListaView'),
+    ('/estrutura_organizacional/cursos/', 'EstruturaOrganizacional.curso.views.CursoListaView'),
+    ('/perfis/alunos/', 'Perfis.aluno.views.AlunoListaView'),
+    ('/perfis/servidores/', 'Perfis.servidor.views.ServidorListaView'),
+    ('/perfis/terceirizados/', 'Perfis.terceirizado.views.TerceirizadoListaView'),
+    ('/perfis/estagiarios/', 'Perfis.estagiario.views.EstagiarioListaView'),
+]
+
+
+class SerializerCompiladoRespostasTests(TestCase):
+    """Listagens compiladas com o mesmo corpo de resposta do serializer do DRF."""
+
+    @classmethod
+    def setUpTestData(cls):
+        admin = Usuario._base_manager.get(cpf='12345678901')
+        outro_campus = Campus.objects.create(nome='Campus Sul', cnpj='98765432000110')
+        cargo = Cargo.objects.create(descricao='Técnico')
+        setor = Setor.objects.create(nome='Coordenação', sigla='COORD')
+        sem_sigla = Setor.objects.create(nome='Protocolo')
+        for atual in (setor, sem_sigla):
+            atividade = Atividade.objects.create(
+                setor=atual, descricao='Atendimento', eh_gratificada=atual is setor
+            )
+            Funcao.objects.create(atividade=atividade, descricao='Atendente')
+        empresa = Empresa.objects.create(nome='Limpeza Ltda', cnpj='12345678000199')
+        curso = Curso.objects.create(nome='Informática')
+
+        usuarios = [
+            Usuario.objects.create_user(
+                cpf=f'{indice:011d}', nome=f'Usuário {indice}', data_nascimento=date(2000, 1, 1),
+                campus=admin.campus if indice % 2 else outro_campus, cargo=cargo if indice % 2 else None,
+            )
+            for indice in range(4)
+        ]
+        UsuarioSetor.objects.create(
+            usuario=usuarios[1], setor=setor, campus=admin.campus, data_entrada=date(2024, 1, 1)
+        )
+
+        Aluno.objects.create(usuario=usuarios[0], previsao_conclusao=2027, ira=Decimal('8.75'))
+        Aluno.objects.create(usuario=usuarios[1], previsao_conclusao=2024, ano_conclusao=2024)
+        Servidor.objects.create(
+            usuario=usuarios[1], data_posse=date(2015, 3, 1), padrao='D', classe='401', tipo_servidor='Técnico',
+        )
+        Terceirizado.objects.create(usuario=usuarios[2], empresa=empresa, data_inicio_contrato=date(2023, 1, 1))
+        Estagiario.objects.create(
+            usuario=usuarios[3], empresa=empresa, curso=curso, carga_horaria=20,
+            data_inicio_estagio=date(2024, 1, 1), data_fim_estagio=date(2024, 12, 31),
+        )
+
+        cls.admin = admin
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def listar(self, caminho, view, compilado, **parametros):
+        cache_respostas.cache.clear()
+        serializar = mock.patch.object(
+            SerializerCompilado, 'serializar', autospec=True, side_effect=SerializerCompilado.serializar
+        )
+        with mock.patch(f'{view}.serializer_compilado', compilado), serializar as serializado:
+            resposta = self.client.get(caminho, {'paginacao': 100, **parametros})
+
+        self.assertEqual(resposta.status_code, 200, resposta.content)
+        # A resposta compilada passou mesmo pelo serializer compilado
+        self.assertEqual(serializado.called, compilado)
+        return resposta
+
+    def test_mesma_resposta_do_drf(self):
+        for caminho, view in LISTAGENS_COMPILADAS:
+            with self.subTest(caminho=caminho):
+                compilada = self.listar(caminho, view, True)
+
+                self.assertGreater(len(compilada.data['dados']), 0)
+                self.assertEqual(compilada.content, self.listar(caminho, view, False).content)
+
+    def test_mesma_resposta_com_campos(self):
+        caminho, view = '/perfis/estagiarios/', 'Perfis.estagiario.views.EstagiarioListaView'
+
+        compilada = self.listar(caminho, view, True, campos='nome,empresa,estagio_ativo')
+
+        self.assertEqual(set(compilada.data['dados'][0]), {'nome', 'empresa', 'estagio_ativo'})
+        self.assertEqual(
+            compilada.content, self.listar(caminho, view, False, campos='nome,empresa,estagio_ativo').content
+        )
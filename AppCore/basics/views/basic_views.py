@@ -1,19 +1,113 @@
+import hashlib
+import itertools
+import time
+from contextlib import nullcontext
+from urllib.parse import urlencode
+
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
+from django.db.models import Count, Max
 from django.http import Http404
+from django.urls import path
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
 from rest_framework import status
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 
-from AppCore.core.exceptions.exceptions import SystemErrorException, NotFoundException
+from AppCore.core.exceptions.exceptions import SystemErrorException, NotFoundException, ValidationException
+from AppCore.basics.cache import cache_respostas
 from AppCore.basics.decorators.decorators import handle_exceptions
+from AppCore.basics.exportacao import FORMATOS_EXPORTACAO, RespostaExportacao, validar_formato_exportacao
+from AppCore.basics.instrumentacao import medir
+from AppCore.basics.renderers import RespostaEnvelopeStreaming
+from AppCore.basics.serializers.compilado import compilar_serializer
+from AppCore.basics.serializers.lote import SelecaoLoteSerializer
+from AppCore.basics.serializers.otimizacao import inferir_otimizacao, obter_campos_legiveis, podar_campos
+from AppCore.basics.serializers.serializers import anotar_queryset
 
 from AppCore.common.textos.mensagens import RESPONSE_ALGUM_DADO_NAO_FOI_ENCONTRADO
+from AppCore.common.util.queries import LimiteQueries
+
+
+class BasicAPIView(GenericAPIView):
+    """Base das Basic*APIView: mede a autenticação e as permissões (etapa `auth` do Server-Timing)."""
+
+    def initial(self, request, *args, **kwargs):
+        with medir('auth'):
+            super().initial(request, *args, **kwargs)
+
+
+@extend_schema(parameters=[
+    OpenApiParameter(
+        'campos', str, required=False,
+        description='Campos de primeiro nível a retornar, separados por vírgula (ex: id,nome). Padrão: todos.',
+    ),
+])
+class BasicLeituraAPIView(BasicAPIView):
+    """
+    Base das views de leitura (listagem e detalhe).
+
+    Aceita `?campos=` para retornar apenas parte dos campos: os demais nem são calculados
+    (inclusive `SerializerMethodField`) e, com `otimizar_queryset`, também não são buscados.
+    """
+    # Deriva select_related/prefetch_related/only() do serializer da view (ver `inferir_otimizacao`)
+    otimizar_queryset = False
+    parametro_campos = 'campos'
+
+    def obter_campos_solicitados(self):
+        """
+        Retorna os campos pedidos em `?campos=`, ou None para todos.
+
+        Raises:
+            ValidationException: Se algum campo não existir no serializer da view
+        """
+        request = getattr(self, 'request', None)
+        valor = request.query_params.get(self.parametro_campos) if request is not None else None
+        if not valor:
+            return None
+
+        campos = frozenset(nome.strip() for nome in valor.split(',') if nome.strip())
+        disponiveis = obter_campos_legiveis(self.get_serializer_class())
+        invalidos = sorted(campos - set(disponiveis))
+        if invalidos:
+            raise ValidationException(
+                f'Campos inválidos: {", ".join(invalidos)}. Disponíveis: {", ".join(disponiveis)}.'
+            )
+        return campos
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        campos = self.obter_campos_solicitados()
+        if campos is not None:
+            podar_campos(serializer, campos)
+        return serializer
+
+    def obter_otimizacao(self):
+        """Retorna a otimização inferida do serializer da view (e dos campos pedidos) para o model do queryset."""
+        return inferir_otimizacao(
+            self.get_serializer_class(), self.get_queryset().model, campos=self.obter_campos_solicitados()
+        )
 
+    def otimizar(self, queryset):
+        """Aplica ao queryset as relações e a projeção que o serializer da view vai ler."""
+        return self.obter_otimizacao().aplicar(queryset)
 
-class BasicPostAPIView(GenericAPIView):
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.otimizar_queryset:
+            queryset = self.otimizar(queryset)
+        return queryset
+
+
+class BasicPostAPIView(BasicAPIView):
     http_method_names = ['post']
     mensagem_sucesso = ''
+    # Executa `do_action_post` em uma transação única; desative quando a ação controla as próprias transações
+    transacao_unica = True
     
     def do_action_post(self, serializer, request):
         raise SystemErrorException("Este método não foi implementado.")
@@ -21,20 +115,26 @@ class BasicPostAPIView(GenericAPIView):
     @handle_exceptions
     def post(self, request, *args, **kwargs):
         serializer_object = self.get_serializer(data=request.data)
-        serializer_object.is_valid(raise_exception=True)
+        with medir('serializacao'):
+            serializer_object.is_valid(raise_exception=True)
         serializer_data = serializer_object.validated_data
 
         resultado = {}
 
-        with transaction.atomic():
-            try:
-                sid = transaction.savepoint()
-                resultado = self.do_action_post(serializer_data, request)
-            except Exception as e:
-                transaction.savepoint_rollback(sid)
-                raise e
-        
-            transaction.savepoint_commit(sid)
+        if not self.transacao_unica:
+            resultado = self.do_action_post(serializer_data, request)
+            cache_respostas.invalidar_todos()
+        else:
+            with transaction.atomic():
+                try:
+                    sid = transaction.savepoint()
+                    resultado = self.do_action_post(serializer_data, request)
+                except Exception as e:
+                    transaction.savepoint_rollback(sid)
+                    raise e
+            
+                transaction.savepoint_commit(sid)
+                cache_respostas.invalidar_todos()
 
         data = {'status': 'success'}
         
@@ -45,30 +145,151 @@ class BasicPostAPIView(GenericAPIView):
         
         data['mensagem'] = resultado.get('mensagem', 'Sucesso')
 
+        if resultado.get('dados') is not None:
+            data['dados'] = resultado['dados']
+
         return Response(
             data, status=resultado.get('status_code', status.HTTP_200_OK)
         )
 
 
-class BasicGetAPIView(GenericAPIView):
+class BasicGetAPIView(BasicLeituraAPIView):
     http_method_names = ['get']
     mensagem_sucesso = ''
+    # Máximo de queries que a listagem pode executar (None desativa a verificação)
+    limite_queries = None
+    # Serve a listagem de um cache de respostas, com ETag/Last-Modified e respostas 304 (requer cache compartilhado)
+    cache_resposta = False
+    # Estratégia do `count` paginado: 'auto', 'exata', 'cache' ou 'estimativa' (None usa o settings)
+    estrategia_contagem = None
+    # Serializa a listagem a partir de `values()` com o serializer compilado (ver `compilar_serializer`)
+    serializer_compilado = False
+    # Envia a listagem sem paginação em streaming (ver `responder_streaming`)
+    resposta_streaming = False
+    # Registros buscados (e medidos pelo `limite_queries`) por vez na listagem em streaming
+    tamanho_bloco_streaming = 500
     
     def validate_get(self, request, *args, **kwargs):
         pass
 
-    @handle_exceptions
-    def get(self, request, *args, **kwargs):
-        self.validate_get(request, *args, **kwargs)
-        
-        queryset = self.filter_queryset(self.get_queryset())
-        
-        page = self.paginate_queryset(queryset)
+    def anotar_queryset(self, queryset):
+        """Aplica as anotações declaradas via `CampoAnotado` no serializer da view (apenas dos campos pedidos)."""
+        return anotar_queryset(queryset, self.get_serializer_class(), campos=self.obter_campos_solicitados())
+
+    def medir_queries(self):
+        """Retorna o contador que garante o `limite_queries` da view durante a listagem."""
+        if self.limite_queries is None:
+            return nullcontext()
+        return LimiteQueries(self.limite_queries, self.__class__.__name__)
+
+    def obter_marca_atualizacao(self):
+        """
+        Retorna a data da última alteração e o total de registros da tabela da view.
+
+        Soft deletes atualizam o `updated_at`; o total cobre as exclusões definitivas.
+        """
+        model = self.get_queryset().model
+        return model._base_manager.aggregate(ultima_atualizacao=Max('updated_at'), total=Count('pk'))
+
+    def obter_validadores_cache(self, request):
+        """
+        Monta a chave do cache de respostas, o ETag e o Last-Modified da listagem.
+
+        A URL (com host, pois `next`/`previous` são absolutos) e os query params ordenados
+        identificam a resposta. A chave inclui a versão do cache, incrementada pelos signals
+        a cada escrita em qualquer model do projeto (ver `conectar_signals_cache_respostas`),
+        e a marca de atualização da tabela, que cobre escritas sem signals (`update()`).
+
+        O Last-Modified é a mais recente entre a tabela e a última invalidação. Enquanto ela
+        é do segundo corrente, o Last-Modified é omitido: outra escrita no mesmo segundo não
+        o mudaria, e só o ETag distingue as versões.
+        """
+        parametros = urlencode(sorted(request.query_params.lists()), doseq=True)
+        url = f'{request.build_absolute_uri(request.path)}?{parametros}'
+        identificador = hashlib.md5(url.encode()).hexdigest()
+
+        marca = self.obter_marca_atualizacao()
+        ultima_atualizacao = marca['ultima_atualizacao']
+
+        chave = cache_respostas.chave('lista', identificador)
+        assinatura = hashlib.md5(f'{chave}|{ultima_atualizacao}|{marca["total"]}'.encode()).hexdigest()
+
+        alteracoes = [cache_respostas.obter_alteracao(cache_respostas.VERSAO_GLOBAL)]
+        if ultima_atualizacao:
+            alteracoes.append(ultima_atualizacao.timestamp())
+        alteracoes = [alteracao for alteracao in alteracoes if alteracao is not None]
+
+        last_modified = int(max(alteracoes)) if alteracoes else None
+        if last_modified is not None and last_modified >= int(time.time()):
+            last_modified = None
+        return f'{chave}:{assinatura}', quote_etag(assinatura), last_modified
+
+    def obter_serializer_compilado(self):
+        """
+        Retorna o serializer compilado da view (para os campos pedidos).
+
+        Returns:
+            SerializerCompilado, ou None se a view não usa ou o serializer não é compilável
+        """
+        if not self.serializer_compilado:
+            return None
+        return compilar_serializer(
+            self.get_serializer_class(), self.get_queryset().model, campos=self.obter_campos_solicitados()
+        )
 
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            paginated_response = self.get_paginated_response(serializer.data)
+    def serializar_lista(self, objetos, compilado=None):
+        """Serializa os objetos da página (dicionários de `values()` quando há serializer compilado)."""
+        with medir('serializacao'):
+            if compilado is not None:
+                return compilado.serializar(objetos, context=self.get_serializer_context())
+            return self.get_serializer(objetos, many=True).data
+
+    def montar_queryset(self, compilado=None):
+        """Retorna o queryset filtrado e anotado da listagem (em `values()` quando há serializer compilado)."""
+        queryset = self.anotar_queryset(self.filter_queryset(self.get_queryset()))
+        if compilado is not None:
+            queryset = compilado.projetar(queryset)
+        return queryset
+
+    def iterar_blocos_serializados(self, queryset, compilado=None):
+        """
+        Serializa a listagem em blocos de `tamanho_bloco_streaming` registros.
+
+        Cada bloco (busca, prefetch e serialização) é medido pelo `limite_queries` da view,
+        como uma página da listagem paginada.
+        """
+        if compilado is not None:
+            mapear = compilado.mapeador(context=self.get_serializer_context())
+        else:
+            mapear = self.get_serializer(many=True).child.to_representation
+
+        objetos = queryset.iterator(chunk_size=self.tamanho_bloco_streaming)
+        try:
+            while True:
+                with self.medir_queries():
+                    bloco = [mapear(objeto) for objeto in itertools.islice(objetos, self.tamanho_bloco_streaming)]
+                if not bloco:
+                    return
+                yield bloco
+        finally:
+            # Libera o cursor mesmo quando o streaming é interrompido por um erro
+            objetos.close()
+
+    def montar_dados(self):
+        """Consulta, pagina e serializa a listagem, retornando o corpo da resposta."""
+        with self.medir_queries():
+            compilado = self.obter_serializer_compilado()
+            queryset = self.montar_queryset(compilado)
             
+            page = self.paginate_queryset(queryset)
+
+            if page is not None:
+                dados = self.serializar_lista(page, compilado)
+                paginated_response = self.get_paginated_response(dados)
+            else:
+                dados = self.serializar_lista(queryset, compilado)
+
+        if page is not None:
             data = {
                 'status': 'success',
                 'mensagem': self.mensagem_sucesso or 'Sucesso',
@@ -77,20 +298,79 @@ class BasicGetAPIView(GenericAPIView):
                 'previous': paginated_response.data.get('previous'),
                 'dados': paginated_response.data.get('results'),
             }
-            return Response(data, status=status.HTTP_200_OK)
+            if paginated_response.data.get('count_aproximado'):
+                data['count_aproximado'] = True
+            return data
         
-        serializer = self.get_serializer(queryset, many=True)
-        
-        data = {
+        return {
             'status': 'success',
             'mensagem': self.mensagem_sucesso or 'Sucesso',
-            'dados': serializer.data,
+            'dados': dados,
         }
 
-        return Response(data, status=status.HTTP_200_OK)
+    def responder_com_cache(self, request):
+        """
+        Responde a listagem a partir do cache de respostas.
+
+        Requisições condicionais (If-None-Match / If-Modified-Since) que ainda batem
+        com a tabela recebem 304 sem consultar os dados nem serializar.
+        """
+        chave, etag, last_modified = self.obter_validadores_cache(request)
+
+        resposta = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if resposta is not None:
+            cache_respostas.registrar_acesso('lista', True)
+
+        if resposta is None:
+            data = cache_respostas.cache.get(chave)
+            cache_respostas.registrar_acesso('lista', data is not None)
+            if data is None:
+                data = self.montar_dados()
+                cache_respostas.cache.set(chave, data, timeout=cache_respostas.validade)
+            resposta = Response(data, status=status.HTTP_200_OK)
+
+        resposta['ETag'] = etag
+        if last_modified is not None:
+            resposta['Last-Modified'] = http_date(last_modified)
+
+        return resposta
+
+    def responder_streaming(self):
+        """
+        Responde a listagem sem paginação em streaming (ver `RespostaEnvelopeStreaming`).
+
+        Os registros são buscados e serializados em blocos enquanto a resposta é enviada,
+        então a memória não cresce com o tamanho da tabela. O primeiro bloco é montado antes
+        da resposta: erros na consulta, na serialização ou no `limite_queries` ainda passam
+        pelo `handle_exceptions`. Um erro em um bloco seguinte interrompe a conexão sem
+        fechar o JSON, e o cliente não recebe um corpo válido.
+        """
+        compilado = self.obter_serializer_compilado()
+        queryset = self.montar_queryset(compilado)
+
+        blocos = self.iterar_blocos_serializados(queryset, compilado)
+        primeiro = next(blocos, [])
+
+        return RespostaEnvelopeStreaming(
+            {'status': 'success', 'mensagem': self.mensagem_sucesso or 'Sucesso'},
+            itertools.chain(primeiro, itertools.chain.from_iterable(blocos)),
+        )
+
+    @handle_exceptions
+    def get(self, request, *args, **kwargs):
+        self.validate_get(request, *args, **kwargs)
+        self.obter_campos_solicitados()
+        
+        if self.cache_resposta and cache_respostas.compartilhado:
+            return self.responder_com_cache(request)
+
+        if self.resposta_streaming and self.paginator is None and request.accepted_renderer.format == 'json':
+            return self.responder_streaming()
+
+        return Response(self.montar_dados(), status=status.HTTP_200_OK)
 
 
-class BasicDeleteAPIView(GenericAPIView):
+class BasicDeleteAPIView(BasicAPIView):
     http_method_names = ['delete']
     mensagem_sucesso = ''
 
@@ -113,13 +393,14 @@ class BasicDeleteAPIView(GenericAPIView):
                 raise e
         
             transaction.savepoint_commit(sid)
+            cache_respostas.invalidar_todos()
 
         return Response(
             status=status.HTTP_204_NO_CONTENT
         )
 
 
-class BasicPutAPIView(GenericAPIView):
+class BasicPutAPIView(BasicAPIView):
     http_method_names = ['put']
     mensagem_sucesso = ''
 
@@ -134,7 +415,8 @@ class BasicPutAPIView(GenericAPIView):
             raise NotFoundException(RESPONSE_ALGUM_DADO_NAO_FOI_ENCONTRADO)
 
         serializer_object = self.get_serializer(data=request.data)
-        serializer_object.is_valid(raise_exception=True)
+        with medir('serializacao'):
+            serializer_object.is_valid(raise_exception=True)
         serializer_data = serializer_object.validated_data
 
         resultado = {}
@@ -148,6 +430,7 @@ class BasicPutAPIView(GenericAPIView):
                 raise e
         
             transaction.savepoint_commit(sid)
+            cache_respostas.invalidar_todos()
 
         data = {'status': 'success'}
         
@@ -162,24 +445,220 @@ class BasicPutAPIView(GenericAPIView):
             data, status=resultado.get('status_code', status.HTTP_200_OK)
         )
 
-class BasicRetrieveAPIView(GenericAPIView):
+class BasicLoteAPIView(BasicAPIView):
+    """
+    Base das operações em lote: seleciona registros do `get_queryset()` por `ids` ou `filtro`
+    e executa a ação da `business_lote_class` (subclasse de `ModelLoteBusiness`).
+
+    O serializer deve herdar de `SelecaoLoteSerializer`. A resposta traz em `dados.total`
+    a quantidade de registros alterados.
+
+    `rotas_lote` gera, a partir dos atributos da view, as rotas `lote/editar/` (PUT) e
+    `lote/deletar/` (DELETE) com as mensagens e a documentação do schema:
+
+        class SetorLoteView(IsAdminMixin, BasicLoteAPIView):
+            business_lote_class = SetorLoteBusiness
+            serializer_edicao_class = SetorEdicaoLoteSerializer
+            filtros_lote = ['ativo', 'nome', 'sigla']
+            tag_schema = 'Estrutura Organizacional.Setor'
+            nome_plural = 'setores'
+
+            def get_queryset(self):
+                return Setor.objects.all()
+
+        urlpatterns = [..., *SetorLoteView.rotas_lote('setor')]
+    """
+    mensagem_sucesso = ''
+    # Campos aceitos em `filtro` (ex: ['ativo', 'campus_id'])
+    filtros_lote = []
+    business_lote_class = None
+    # Serializer da edição em lote (a deleção usa apenas a seleção)
+    serializer_edicao_class = None
+    # Tag do schema, nome dos registros no plural e seu gênero, usados pelas rotas de `rotas_lote`
+    tag_schema = None
+    nome_plural = 'registros'
+    nome_feminino = False
+    permissoes_schema = 'Apenas administradores (is_admin ou is_superuser) podem acessar.'
+
+    def selecionar_lote(self, serializer_data):
+        """Retorna o queryset dos registros selecionados."""
+        queryset = self.get_queryset()
+
+        if serializer_data.get('ids'):
+            return queryset.filter(pk__in=serializer_data['ids'])
+
+        filtro = serializer_data['filtro']
+        nao_permitidos = sorted(set(filtro) - set(self.filtros_lote))
+        if nao_permitidos:
+            raise ValidationException(
+                f'Filtros não permitidos: {", ".join(nao_permitidos)}. '
+                f'Aceitos: {", ".join(self.filtros_lote) or "nenhum"}.'
+            )
+
+        try:
+            return queryset.filter(**filtro)
+        except (ValueError, TypeError, DjangoValidationError):
+            raise ValidationException('Filtro inválido.')
+
+    def do_action_lote(self, business, dados):
+        raise SystemErrorException("Este método não foi implementado.")
+
+    def executar_lote(self, request):
+        serializer_object = self.get_serializer(data=request.data)
+        with medir('serializacao'):
+            serializer_object.is_valid(raise_exception=True)
+        serializer_data = serializer_object.validated_data
+
+        queryset = self.selecionar_lote(serializer_data)
+        business = self.business_lote_class(queryset, ids=serializer_data.get('ids'), usuario=request.user)
+
+        with transaction.atomic():
+            try:
+                sid = transaction.savepoint()
+                total = self.do_action_lote(business, serializer_object.obter_dados())
+            except Exception as e:
+                transaction.savepoint_rollback(sid)
+                raise e
+
+            transaction.savepoint_commit(sid)
+            cache_respostas.invalidar_todos()
+
+        return Response(
+            {'status': 'success', 'mensagem': self.mensagem_sucesso, 'dados': {'total': total}},
+            status=status.HTTP_200_OK,
+        )
+
+    @classmethod
+    def rotas_lote(cls, prefixo=None):
+        """
+        Retorna as rotas `lote/editar/` e `lote/deletar/` da view (nomes `editar-lote` e
+        `deletar-lote`, precedidos de `<prefixo>-` se informado). A edição só é gerada com
+        `serializer_edicao_class`.
+        """
+        prefixo = f'{prefixo}-' if prefixo else ''
+        plural = cls.nome_plural
+        a = 'a' if cls.nome_feminino else 'o'
+        selecao = (
+            f'**Seleção (informe apenas um):**\n'
+            f'- ids: lista de ids d{a}s {plural}\n'
+            f'- filtro: objeto com os campos aceitos ({", ".join(cls.filtros_lote)})'
+        )
+        respostas_acesso = {
+            status.HTTP_401_UNAUTHORIZED: {'description': 'Não autenticado'},
+            status.HTTP_403_FORBIDDEN: {'description': 'Sem permissão de administrador'},
+        }
+
+        rotas = []
+        if cls.serializer_edicao_class is not None:
+            campos = '\n'.join(
+                f'- {nome}: {campo.help_text or nome}'
+                for nome, campo in cls.serializer_edicao_class().fields.items()
+                if nome not in SelecaoLoteSerializer._declared_fields
+            )
+            mensagem = f'{plural.capitalize()} editad{a}s com sucesso'
+            editar = type(f'{cls.__name__}Editar', (BasicLotePutAPIView, cls), {
+                '__module__': cls.__module__,
+                '__doc__': f'Edição de vári{a}s {plural} de uma vez.',
+                'serializer_class': cls.serializer_edicao_class,
+                'mensagem_sucesso': f'{mensagem}.',
+            })
+            editar = extend_schema(
+                tags=[cls.tag_schema],
+                summary=f'Editar {plural} em lote',
+                description=(
+                    f'Aplica os mesmos dados a vári{a}s {plural} de uma vez, com um único UPDATE.\n\n'
+                    f'**Permissões:** {cls.permissoes_schema}\n\n{selecao}\n\n'
+                    f'**Campos editáveis (todos opcionais):**\n{campos}\n\n'
+                    f'**Retorno:** quantidade de {plural} atualizad{a}s em `dados.total`.'
+                ),
+                request=cls.serializer_edicao_class,
+                responses={
+                    status.HTTP_200_OK: {'description': mensagem},
+                    status.HTTP_400_BAD_REQUEST: {
+                        'description': 'Dados inválidos, filtro não permitido, ids não encontrados ou recusados'
+                    },
+                    **respostas_acesso,
+                },
+            )(editar)
+            rotas.append(path('lote/editar/', editar.as_view(), name=f'{prefixo}editar-lote'))
+
+        mensagem = f'{plural.capitalize()} deletad{a}s com sucesso'
+        deletar = type(f'{cls.__name__}Deletar', (BasicLoteDeleteAPIView, cls), {
+            '__module__': cls.__module__,
+            '__doc__': f'Deleção (soft delete) de vári{a}s {plural} de uma vez.',
+            'serializer_class': SelecaoLoteSerializer,
+            'mensagem_sucesso': f'{mensagem}.',
+        })
+        deletar = extend_schema(
+            tags=[cls.tag_schema],
+            summary=f'Deletar {plural} em lote',
+            description=(
+                f'Deleta vári{a}s {plural} de uma vez (soft delete - seta ativo=False).\n\n'
+                f'**Permissões:** {cls.permissoes_schema}\n\n{selecao}\n\n'
+                f'**Retorno:** quantidade de {plural} desativad{a}s em `dados.total`\n'
+                f'({plural} já inativ{a}s são ignorad{a}s).'
+            ),
+            request=SelecaoLoteSerializer,
+            responses={
+                status.HTTP_200_OK: {'description': mensagem},
+                status.HTTP_400_BAD_REQUEST: {
+                    'description': 'Seleção inválida, filtro não permitido, ids não encontrados ou recusados'
+                },
+                **respostas_acesso,
+            },
+        )(deletar)
+        rotas.append(path('lote/deletar/', deletar.as_view(), name=f'{prefixo}deletar-lote'))
+
+        return rotas
+
+
+class BasicLotePutAPIView(BasicLoteAPIView):
+    """Edição em lote: grava os mesmos campos em todos os registros selecionados."""
+    http_method_names = ['put']
+
+    def do_action_lote(self, business, dados):
+        if not dados:
+            raise ValidationException('Informe ao menos um campo para atualizar.')
+        return business.atualizar_em_lote(dados)
+
+    @handle_exceptions
+    def put(self, request, *args, **kwargs):
+        return self.executar_lote(request)
+
+
+class BasicLoteDeleteAPIView(BasicLoteAPIView):
+    """Deleção em lote: soft delete (ativo=False) dos registros selecionados."""
+    http_method_names = ['delete']
+
+    def do_action_lote(self, business, dados):
+        return business.deletar_em_lote()
+
+    @handle_exceptions
+    def delete(self, request, *args, **kwargs):
+        return self.executar_lote(request)
+
+
+class BasicRetrieveAPIView(BasicLeituraAPIView):
     http_method_names = ['get']
     mensagem_sucesso = ''
     
     def validate_retrieve(self, request, *args, **kwargs):
         pass
 
+    def serializar_objeto(self, objeto):
+        """Retorna os dados serializados do objeto recuperado."""
+        return self.get_serializer(objeto).data
+
     @handle_exceptions
     def get(self, request, *args, **kwargs):
         self.validate_retrieve(request, *args, **kwargs)
+        self.obter_campos_solicitados()
         
         try:
             self.object = self.get_object()
         except Http404:
             raise NotFoundException(RESPONSE_ALGUM_DADO_NAO_FOI_ENCONTRADO)
 
-        serializer = self.get_serializer(self.object)
-
         data = {'status': 'success'}
         
         resultado = {}
@@ -188,8 +667,56 @@ class BasicRetrieveAPIView(GenericAPIView):
         
         data['mensagem'] = resultado.get('mensagem', 'Sucesso')
         
-        data['dados'] = serializer.data
+        with medir('serializacao'):
+            data['dados'] = self.serializar_objeto(self.object)
 
         return Response(
             data, status=resultado.get('status_code', status.HTTP_200_OK)
         )
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            'formato', str, enum=FORMATOS_EXPORTACAO, required=False,
+            description='Formato do arquivo: csv, ndjson (um objeto JSON por linha) ou json. Padrão: csv.',
+        ),
+        OpenApiParameter('inativos', bool, required=False, description='Inclui os registros inativos.'),
+    ],
+    responses={
+        (status.HTTP_200_OK, 'text/csv'): {'type': 'string', 'description': 'Arquivo CSV (UTF-8 com BOM)'},
+        (status.HTTP_200_OK, 'application/x-ndjson'): {'type': 'string', 'description': 'Um objeto JSON por linha'},
+        status.HTTP_400_BAD_REQUEST: {'description': 'Formato inválido'},
+        status.HTTP_401_UNAUTHORIZED: {'description': 'Não autenticado'},
+        status.HTTP_403_FORBIDDEN: {'description': 'Sem permissão'},
+    },
+)
+class BasicExportacaoAPIView(BasicAPIView):
+    """
+    Base das exportações: responde o arquivo da `exportacao_class` em streaming.
+
+    O arquivo é gerado enquanto é enviado, um bloco de registros por vez (ver `Exportacao`),
+    então a memória não depende do tamanho da tabela.
+    """
+    http_method_names = ['get']
+    exportacao_class = None
+    parametro_formato = 'formato'
+    parametro_inativos = 'inativos'
+
+    def perform_content_negotiation(self, request, force=False):
+        # O arquivo não passa pelos renderers: o Accept (ex: text/csv) não deve gerar 406
+        return super().perform_content_negotiation(request, force=True)
+
+    def validate_exportacao(self, request, *args, **kwargs):
+        pass
+
+    def obter_exportacao(self):
+        """Retorna a exportação da view com os filtros da requisição."""
+        incluir_inativos = self.request.query_params.get(self.parametro_inativos, '').lower() in ('true', '1')
+        return self.exportacao_class(incluir_inativos=incluir_inativos)
+
+    @handle_exceptions
+    def get(self, request, *args, **kwargs):
+        self.validate_exportacao(request, *args, **kwargs)
+        formato = validar_formato_exportacao(request.query_params.get(self.parametro_formato))
+        return RespostaExportacao(self.obter_exportacao(), formato)
@@ -0,0 +1,22 @@
+"""
+Declaração do que um método ou propriedade lê do objeto.
+
+Fica fora de `AppCore.basics.serializers` para que models possam declarar as dependências
+das suas propriedades sem importar a camada de serializers. Quem lê a declaração é
+`inferir_otimizacao` (e o serializer compilado), pelo atributo `dependencias` da função.
+"""
+
+
+def depende_de(*dependencias):
+    """
+    Declara o que um `get_<campo>` (ou uma propriedade do model) lê do objeto.
+
+    Cada dependência pode ser:
+    - um caminho no formato de lookup (ex: 'cpf', 'campus', 'usuario__campus');
+    - uma tupla (caminho, SerializerAninhado), quando o método serializa a relação;
+    - um `Prefetch`, usado como está (prefixado com o caminho até o objeto).
+    """
+    def decorador(funcao):
+        funcao.dependencias = dependencias
+        return funcao
+    return decorador
@@ -0,0 +1,68 @@
+"""
+Hashers de senha com custo configurável por implantação.
+
+O custo da verificação de senha (e do login) é definido pelo hasher: iterações do
+PBKDF2 ou parâmetros do scrypt (`hashlib.scrypt`, sem dependência externa). Os hashers
+abaixo leem o custo das configurações, e `SENHAS_HASHER` escolhe qual gera as senhas
+novas:
+
+    SENHAS_HASHER=pbkdf2            SENHAS_PBKDF2_ITERACOES=600000
+    SENHAS_HASHER=scrypt            SENHAS_SCRYPT_N=32768  SENHAS_SCRYPT_R=8  SENHAS_SCRYPT_P=1
+
+Hashes gerados com outro algoritmo ou outro custo continuam válidos e são refeitos com
+a configuração atual no próximo login do usuário (`Usuario.check_password`). O comando
+`python manage.py calibrar_hash_senhas` mede o hash nesta máquina e sugere os valores
+para um tempo-alvo.
+
+Exemplo de uso:
+    PASSWORD_HASHERS = [
+        'AppCore.common.util.hashers.ScryptConfiguravelPasswordHasher',
+        'AppCore.common.util.hashers.PBKDF2ConfiguravelPasswordHasher',
+    ]
+"""
+import base64
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, ScryptPasswordHasher
+
+
+class PBKDF2ConfiguravelPasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 com as iterações de `SENHAS_PBKDF2_ITERACOES` (padrão: o do Django)."""
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'SENHAS_PBKDF2_ITERACOES', None) or PBKDF2PasswordHasher.iterations
+
+
+class ScryptConfiguravelPasswordHasher(ScryptPasswordHasher):
+    """
+    scrypt com `SENHAS_SCRYPT_N` (custo de CPU e memória, potência de 2), `SENHAS_SCRYPT_R`
+    (tamanho do bloco) e `SENHAS_SCRYPT_P` (paralelismo).
+
+    Cada verificação usa cerca de 128 * N * r bytes de memória (16 MiB com N=2**14, r=8).
+    """
+
+    @property
+    def work_factor(self):
+        return getattr(settings, 'SENHAS_SCRYPT_N', None) or ScryptPasswordHasher.work_factor
+
+    @property
+    def block_size(self):
+        return getattr(settings, 'SENHAS_SCRYPT_R', None) or ScryptPasswordHasher.block_size
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'SENHAS_SCRYPT_P', None) or ScryptPasswordHasher.parallelism
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        self._check_encode_args(password, salt)
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        # O limite padrão de memória do OpenSSL (32 MiB) recusaria N=2**15 com r=8: libera o que os parâmetros exigem
+        hash_ = hashlib.scrypt(
+            password.encode(), salt=salt.encode(), n=n, r=r, p=p, maxmem=128 * r * (n + p + 2), dklen=64,
+        )
+        hash_ = base64.b64encode(hash_).decode('ascii').strip()
+        return '%s$%d$%s$%d$%d$%s' % (self.algorithm, n, salt, r, p, hash_)
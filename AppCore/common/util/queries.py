@@ -0,0 +1,67 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection
+
+from AppCore.core.exceptions.exceptions import SystemErrorException
+
+
+logger = logging.getLogger(__name__)
+
+_fora_do_limite = ContextVar('fora_do_limite_queries', default=False)
+
+
+@contextmanager
+def fora_do_limite_queries():
+    """Executa o bloco sem contar suas queries no `LimiteQueries` (ex: consultas ao catálogo do banco)."""
+    token = _fora_do_limite.set(True)
+    try:
+        yield
+    finally:
+        _fora_do_limite.reset(token)
+
+
+class LimiteQueries:
+    """
+    Context manager que conta as queries executadas no bloco e compara com um limite.
+
+    A contagem usa `connection.execute_wrapper`, então funciona também com DEBUG=False.
+    Ao estourar o limite, registra um aviso; com `LIMITE_QUERIES_ESTRITO` ativo, lança
+    `SystemErrorException` para que a regressão apareça durante o desenvolvimento.
+
+    Args:
+        limite: Número máximo de queries permitidas no bloco
+        descricao: Identificação do trecho medido, usada na mensagem (ex: nome da view)
+    """
+
+    def __init__(self, limite, descricao=''):
+        self.limite = limite
+        self.descricao = descricao
+        self.total = 0
+        self._wrapper = None
+
+    def _contar(self, execute, sql, params, many, context):
+        if not _fora_do_limite.get():
+            self.total += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self._contar)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+
+        if exc_type is not None or self.total <= self.limite:
+            return False
+
+        mensagem = f'{self.descricao} executou {self.total} queries (limite: {self.limite}).'
+        logger.warning(mensagem)
+
+        if getattr(settings, 'LIMITE_QUERIES_ESTRITO', False):
+            raise SystemErrorException(mensagem)
+
+        return False
@@ -0,0 +1,130 @@
+"""
+Hash de senhas em lote - distribui o `make_password` entre processos.
+
+O hasher padrão (PBKDF2) é propositalmente lento e usa uma única CPU por senha; em
+cadastros em massa ele domina o tempo total. `HashSenhasEmLote` reparte as senhas
+entre os processos de um pool. Lotes pequenos são calculados no próprio processo,
+onde enviar as senhas ao pool custaria mais que o ganho.
+
+O pool é criado uma vez por processo (na primeira vez que é usado) e reaproveitado
+pelas importações seguintes, com no máximo `HASH_SENHAS_PROCESSOS` processos. Os
+processos do pool são iniciados com `spawn`: a importação roda em requisições e em
+threads dos workers do gunicorn, e um `fork` ali copiaria locks e conexões abertas
+por outras threads.
+
+Senhas vazias viram senhas inutilizáveis (`make_password(None)`); o usuário define a
+própria senha pelo fluxo de redefinição (esqueci minha senha).
+
+Exemplo de uso:
+    hash_senhas = HashSenhasEmLote()
+    for lote in lotes:
+        hashes = hash_senhas.gerar([linha.get('senha') for linha in lote])
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+
+# Limite do pool quando `HASH_SENHAS_PROCESSOS` não é definido
+PROCESSOS_PADRAO_MAXIMO = 4
+
+# Pools do processo atual, por número de processos
+_pools = {}
+_lock_pools = threading.Lock()
+
+
+def _inicializar_processo():
+    # Com spawn o processo filho começa sem o Django configurado
+    import django
+    django.setup()
+
+
+def _gerar_hashes(senhas):
+    return [make_password(senha) for senha in senhas]
+
+
+def obter_pool(processos):
+    """Retorna o pool de `processos` processos do processo atual, criando-o no primeiro uso."""
+    with _lock_pools:
+        pool = _pools.get(processos)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=processos,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_inicializar_processo,
+            )
+            _pools[processos] = pool
+        return pool
+
+
+@atexit.register
+def encerrar_pools():
+    """Encerra os pools do processo atual."""
+    with _lock_pools:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(cancel_futures=True)
+
+
+class HashSenhasEmLote:
+    """
+    Gera os hashes de várias senhas usando o pool de processos compartilhado.
+
+    Args:
+        processos: Número de processos do pool (padrão: `HASH_SENHAS_PROCESSOS`, ou o total de CPUs
+            limitado a `PROCESSOS_PADRAO_MAXIMO`)
+        minimo_para_pool: Menor quantidade de senhas que justifica usar o pool
+            (padrão: `HASH_SENHAS_MINIMO_POOL`)
+    """
+
+    def __init__(self, processos=None, minimo_para_pool=None):
+        self.processos = (
+            processos
+            or getattr(settings, 'HASH_SENHAS_PROCESSOS', None)
+            or min(os.cpu_count() or 1, PROCESSOS_PADRAO_MAXIMO)
+        )
+        if minimo_para_pool is None:
+            minimo_para_pool = getattr(settings, 'HASH_SENHAS_MINIMO_POOL', 16)
+        self.minimo_para_pool = minimo_para_pool
+
+    def gerar(self, senhas):
+        """
+        Retorna os hashes das senhas, na mesma ordem.
+
+        Args:
+            senhas: Lista de senhas em texto puro (None ou '' geram senha inutilizável)
+
+        Returns:
+            list: Hashes no formato do campo `password`
+        """
+        hashes = [None] * len(senhas)
+        pendentes = []
+        for indice, senha in enumerate(senhas):
+            if senha:
+                pendentes.append(indice)
+            else:
+                hashes[indice] = make_password(None)
+
+        if self.processos < 2 or len(pendentes) < self.minimo_para_pool:
+            for indice in pendentes:
+                hashes[indice] = make_password(senhas[indice])
+            return hashes
+
+        # Um bloco por processo evita o custo de enviar uma tarefa por senha
+        tamanho = -(-len(pendentes) // self.processos)
+        blocos = [pendentes[inicio:inicio + tamanho] for inicio in range(0, len(pendentes), tamanho)]
+
+        resultados = obter_pool(self.processos).map(
+            _gerar_hashes, [[senhas[indice] for indice in bloco] for bloco in blocos]
+        )
+        for bloco, hashes_bloco in zip(blocos, resultados):
+            for indice, hash_senha in zip(bloco, hashes_bloco):
+                hashes[indice] = hash_senha
+
+        return hashes
@@ -14,9 +14,19 @@ A camada Business:
 - Pode chamar State para transições de estado
 - Deve retornar resultados processados ou lançar exceções tratadas
 """
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
 from AppCore.core.exceptions.exceptions import (
-    AuthorizationException, BusinessRuleException, ValidationException, NotFoundException
+    AuthorizationException, BusinessRuleException, ValidationException, NotFoundException, SystemErrorException
 )
+from AppCore.core.rules.rules import ModelLoteRules
+
+
+# Enviado após cada escrita em lote (`QuerySet.update` não dispara post_save).
+# Argumentos: sender (model) e objetos (instâncias já com os valores novos).
+atualizacao_em_lote = Signal()
 
 
 class ModelInstanceBusiness:
@@ -24,3 +34,122 @@ class ModelInstanceBusiness:
     
     def __init__(self, object_instance=None):
         self.object_instance = object_instance
+
+
+
+class ModelLoteBusiness:
+    """
+    Operações em lote sobre um queryset (atualização e soft delete).
+
+    Os objetos selecionados são carregados e validados em conjunto pela `rules_class`;
+    a escrita é um único `UPDATE` apenas dos campos alterados, e o histórico é gravado
+    com `bulk_history_create`, uma linha por objeto, sem passar pelo `save()`.
+
+    Args:
+        queryset: Objetos alvo da operação
+        ids: Ids solicitados, quando a seleção é por id (os não encontrados são rejeitados)
+        usuario: Usuário registrado como autor no histórico
+    """
+    exceptions_handled = ModelInstanceBusiness.exceptions_handled
+    rules_class = ModelLoteRules
+    tamanho_lote = 500
+    mensagem_erro_atualizar = 'Não foi possível atualizar os registros.'
+    mensagem_erro_deletar = 'Não foi possível deletar os registros.'
+
+    def __init__(self, queryset, ids=None, usuario=None):
+        self.queryset = queryset
+        self.ids = ids
+        self.usuario = usuario
+
+    @property
+    def model(self):
+        return self.queryset.model
+
+    def carregar(self):
+        """Carrega (com lock) os objetos selecionados e valida a seleção."""
+        objetos = list(self.queryset.select_for_update())
+        rules = self.rules_class(objetos)
+        rules.validar_selecao(self.ids)
+        return objetos, rules
+
+    def aplicar(self, objetos, campos):
+        """
+        Grava os campos em todos os objetos e registra o histórico.
+
+        Returns:
+            int: Quantidade de objetos alterados
+        """
+        agora = timezone.now()
+        if any(field.name == 'updated_at' for field in self.model._meta.concrete_fields):
+            campos = {**campos, 'updated_at': agora}
+
+        pks = [objeto.pk for objeto in objetos]
+        for inicio in range(0, len(pks), self.tamanho_lote):
+            self.model._base_manager.filter(pk__in=pks[inicio:inicio + self.tamanho_lote]).update(**campos)
+
+        for objeto in objetos:
+            for campo, valor in campos.items():
+                setattr(objeto, campo, valor)
+
+        historico = getattr(self.model, 'history', None)
+        if historico is not None:
+            historico.bulk_history_create(
+                objetos, batch_size=self.tamanho_lote, update=True, default_user=self.usuario, default_date=agora
+            )
+
+        atualizacao_em_lote.send(sender=self.model, objetos=objetos)
+        return len(objetos)
+
+    def atualizar_em_lote(self, dados):
+        """
+        Atualiza os mesmos campos em todos os objetos selecionados.
+
+        Args:
+            dados: Dicionário com os campos e valores a gravar
+
+        Returns:
+            int: Quantidade de objetos atualizados
+
+        Raises:
+            BusinessRuleException: Se algum id não existir ou as regras recusarem o lote
+            SystemErrorException: Se ocorrer erro na atualização
+        """
+        try:
+            with transaction.atomic():
+                objetos, rules = self.carregar()
+                if not rules.can_atualizar(dados):
+                    raise BusinessRuleException('A atualização não é permitida para os registros selecionados.')
+
+                if not objetos or not dados:
+                    return 0
+                return self.aplicar(objetos, dados)
+        except self.exceptions_handled:
+            raise
+        except Exception as e:
+            raise SystemErrorException(self.mensagem_erro_atualizar)
+
+    def deletar_em_lote(self):
+        """
+        Realiza soft delete (ativo=False) dos objetos selecionados que ainda estão ativos.
+
+        Returns:
+            int: Quantidade de objetos desativados
+
+        Raises:
+            BusinessRuleException: Se algum id não existir ou as regras recusarem o lote
+            SystemErrorException: Se ocorrer erro na deleção
+        """
+        try:
+            with transaction.atomic():
+                objetos, rules = self.carregar()
+                if not rules.can_deletar():
+                    raise BusinessRuleException('A deleção não é permitida para os registros selecionados.')
+
+                ativos = [objeto for objeto in objetos if objeto.ativo]
+                if not ativos:
+                    return 0
+                return self.aplicar(ativos, {'ativo': False})
+        except self.exceptions_handled:
+            raise
+        except Exception as e:
+            raise SystemErrorException(self.mensagem_erro_deletar)
@@ -58,5 +58,79 @@ class ModelInstanceRules:
             self.return_exception(message, details)
         
         return False
+
+    def can_atualizar(self, dados):
+        """Indica se o objeto pode receber os dados informados."""
+        return True
+
+    def can_deletar(self):
+        """Indica se o objeto pode ser desativado."""
+        return True
     
 
+
+
+class ModelLoteRules(ModelInstanceRules):
+    """
+    Regras das operações em lote.
+
+    Recebe a lista de objetos selecionados (em `object_instance`) e valida o lote inteiro
+    de uma vez, antes de qualquer escrita. As regras de cada objeto são as mesmas da
+    edição e deleção individuais: `instance_rules_class` (subclasse de `ModelInstanceRules`).
+    """
+    instance_rules_class = ModelInstanceRules
+
+    def validar_selecao(self, ids=None):
+        """
+        Verifica se todos os ids informados foram encontrados.
+
+        Raises:
+            BusinessRuleException: Com os ids não encontrados em `details`
+        """
+        if not ids:
+            return True
+
+        encontrados = {objeto.pk for objeto in self.object_instance}
+        faltando = sorted(set(ids) - encontrados)
+        if faltando:
+            self.return_exception(
+                f'Registros não encontrados: {", ".join(str(pk) for pk in faltando)}.',
+                {'ids_nao_encontrados': faltando},
+            )
+
+        return True
+
+    def recusados(self, regra):
+        """Retorna os ids dos objetos do lote recusados por `regra(rules_do_objeto)`."""
+        return [
+            objeto.pk for objeto in self.object_instance
+            if not regra(self.instance_rules_class(objeto))
+        ]
+
+    def can_atualizar(self, dados):
+        """
+        Indica se todos os objetos do lote podem receber os dados informados.
+
+        Raises:
+            BusinessRuleException: Com os ids recusados em `details`
+        """
+        recusados = self.recusados(lambda rules: rules.can_atualizar(dados))
+        if recusados:
+            self.return_exception(
+                'A atualização não é permitida para os registros selecionados.', {'ids_recusados': recusados}
+            )
+        return True
+
+    def can_deletar(self):
+        """
+        Indica se todos os objetos do lote podem ser desativados.
+
+        Raises:
+            BusinessRuleException: Com os ids recusados em `details`
+        """
+        recusados = self.recusados(lambda rules: rules.can_deletar())
+        if recusados:
+            self.return_exception(
+                'A deleção não é permitida para os registros selecionados.', {'ids_recusados': recusados}
+            )
+        return True
@@ -0,0 +1,95 @@
+"""
+Armazenamento local - arquivo SQLite compartilhado pelos workers da mesma máquina.
+
+Estruturas pequenas de autenticação (lista negra de refresh tokens, limite de tentativas
+de login) precisam ser vistas por todos os workers do gunicorn, mas não justificam uma
+tabela no banco nem um serviço externo. Elas ficam em um arquivo SQLite local em modo
+WAL: leituras não bloqueiam escritas, e cada escrita é uma transação curta.
+
+Cada processo e cada thread têm a própria conexão; depois de um fork (gunicorn com
+`--preload`) o estado do processo é refeito.
+
+Exemplo de uso:
+    class Contadores(ArmazenamentoLocal):
+        SCHEMA = 'CREATE TABLE IF NOT EXISTS contadores (chave TEXT PRIMARY KEY, valor INTEGER NOT NULL);'
+
+        def incrementar(self, chave):
+            self._conexao().execute(
+                'INSERT INTO contadores VALUES (?, 1) ON CONFLICT (chave) DO UPDATE SET valor = valor + 1', (chave,)
+            )
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class ArmazenamentoLocal:
+    """
+    Base das estruturas guardadas em um arquivo SQLite local.
+
+    As subclasses definem `SCHEMA` (executado ao abrir cada conexão) e estendem
+    `_reiniciar` com o estado que pertence ao processo (ex: caches em memória).
+
+    Args:
+        arquivo: Caminho do arquivo SQLite (criado se não existir)
+    """
+    SCHEMA = ''
+
+    def __init__(self, arquivo):
+        self.arquivo = Path(arquivo)
+        self._lock = threading.Lock()
+        self._reiniciar()
+
+    def _reiniciar(self):
+        """Estado do processo (refeito após um fork, ex: gunicorn com `--preload`)."""
+        self._pid = os.getpid()
+        self._local = threading.local()
+
+    def _conexao(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reiniciar()
+
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            self.arquivo.parent.mkdir(parents=True, exist_ok=True)
+            # Sem transação implícita: cada comando é confirmado na hora, e as transações usam `_transacao`
+            conexao = sqlite3.connect(self.arquivo, timeout=10, isolation_level=None)
+            self._ativar_wal(conexao)
+            conexao.execute('PRAGMA synchronous=NORMAL')
+            conexao.executescript(self.SCHEMA)
+            self._local.conexao = conexao
+        return conexao
+
+    @staticmethod
+    def _ativar_wal(conexao, tentativas=100):
+        # O modo WAL fica gravado no arquivo. A troca não espera pelo `timeout` da conexão, então
+        # vários workers abrindo um arquivo novo ao mesmo tempo podem receber 'database is locked'
+        for tentativa in range(tentativas):
+            try:
+                if conexao.execute('PRAGMA journal_mode').fetchone()[0] != 'wal':
+                    conexao.execute('PRAGMA journal_mode=WAL')
+                return
+            except sqlite3.OperationalError:
+                if tentativa == tentativas - 1:
+                    raise
+                time.sleep(0.01)
+
+    @staticmethod
+    @contextmanager
+    def _transacao(conexao, imediata=False):
+        """
+        Transação explícita. `imediata` reserva a escrita já no início (BEGIN IMMEDIATE),
+        para leituras seguidas de escrita sem que outro processo escreva no meio.
+        """
+        conexao.execute('BEGIN IMMEDIATE' if imediata else 'BEGIN')
+        try:
+            yield conexao
+        except BaseException:
+            conexao.execute('ROLLBACK')
+            raise
+        conexao.execute('COMMIT')
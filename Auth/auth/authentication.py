@@ -0,0 +1,48 @@
+from django.utils.translation import gettext_lazy as _
+
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from Usuarios.usuario.helpers import obter_principal_usuario
+
+
+class CortexJWTAuthentication(JWTAuthentication):
+    """
+    `JWTAuthentication` que resolve o usuário do token pelo cache, sem o SELECT por requisição.
+
+    O principal (id, cpf, nome, campus, cargo, ativo e flags de administração) fica em cache
+    por `AUTENTICACAO_CACHE_TIMEOUT` segundos, com as mesmas versões do `snapshot_usuario`:
+    salvar o usuário (ex: um administrador o desativa ou remove `is_admin`) invalida o cache
+    no commit, e a próxima requisição já vê o valor novo. Como a invalidação precisa alcançar
+    todos os workers, o cache só é usado com backend compartilhado (`cache_compartilhado`): com
+    `CACHE_BACKEND=locmem` fora de `CACHE_LOCAL_PERMITIDO`, o usuário é lido do banco a cada requisição.
+
+    Usuários inativos (`ativo=False`) são recusados, como o `is_active` do Django.
+    """
+
+    def get_user(self, validated_token):
+        # A verificação de troca de senha precisa do hash, que não fica no cache
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        try:
+            usuario_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_('Token contained no recognizable user identification')) from e
+
+        usuario = obter_principal_usuario(usuario_id)
+        if usuario is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not usuario.ativo:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        return usuario
+
+
+class CortexJWTScheme(SimpleJWTScheme):
+    """Documenta o `CortexJWTAuthentication` no schema OpenAPI (mesmo esquema `jwtAuth` do SimpleJWT)."""
+    target_class = 'Auth.auth.authentication.CortexJWTAuthentication'
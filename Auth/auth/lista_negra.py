@@ -0,0 +1,239 @@
+"""
+Lista negra de refresh tokens - conjunto de JTIs compartilhado entre os workers.
+
+Com a rotação de tokens (`ROTATE_REFRESH_TOKENS`), cada refresh devolve um refresh token
+novo e revoga o usado, que não pode ser reaproveitado. A app `token_blacklist` do SimpleJWT
+faria isso com duas tabelas no banco (tokens emitidos e revogados), consultadas a cada
+refresh e sem limpeza automática. Aqui só os tokens revogados são guardados, e apenas até
+expirarem:
+
+- O conjunto exato de JTIs fica em um arquivo SQLite local (`TOKENS_LISTA_NEGRA_ARQUIVO`,
+  em modo WAL), compartilhado pelos workers do gunicorn da mesma máquina.
+- Cada worker mantém em memória um filtro de Bloom com os mesmos JTIs. Um token que não
+  está no filtro certamente não foi revogado, então a maioria dos refreshes não consulta o
+  arquivo; um positivo (revogado ou falso positivo) é confirmado pelo índice do SQLite.
+- O filtro acompanha as revogações dos outros workers pelo `PRAGMA data_version`, lendo só
+  as linhas novas (ids crescentes).
+- JTIs de tokens expirados são apagados a cada `TOKENS_LISTA_NEGRA_COMPACTACAO` segundos
+  (um token expirado já é recusado pela validade); depois da compactação, os workers
+  reconstroem o filtro.
+
+Exemplo de uso:
+    lista_negra = ListaNegraTokens('/var/lib/cortex/lista_negra.sqlite3')
+
+    if not lista_negra.revogar(jti, exp):
+        ...  # o token já tinha sido revogado (ex: dois refreshes simultâneos)
+
+    lista_negra.esta_revogado(jti)
+"""
+import hashlib
+import math
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import SimpleLazyObject, empty
+
+from rest_framework_simplejwt.settings import api_settings
+
+from AppCore.basics.instrumentacao import contar
+
+from .armazenamento import ArmazenamentoLocal
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom em um `bytearray`: `in` sem falsos negativos e com falsos positivos
+    próximos de `taxa_falsos_positivos` enquanto houver até `capacidade` itens.
+
+    Args:
+        capacidade: Quantidade de itens prevista
+        taxa_falsos_positivos: Probabilidade de falso positivo com a capacidade cheia
+    """
+
+    def __init__(self, capacidade, taxa_falsos_positivos=0.01):
+        self.capacidade = max(int(capacidade), 1)
+        self.bits = max(int(-self.capacidade * math.log(taxa_falsos_positivos) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.bits / self.capacidade * math.log(2)), 1)
+        self.itens = 0
+        self._bits = bytearray((self.bits + 7) // 8)
+
+    def _posicoes(self, item):
+        # Dois hashes de 64 bits combinados (Kirsch-Mitzenmacher) em vez de `hashes` funções independentes
+        resumo = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(resumo[:8], 'little')
+        h2 = int.from_bytes(resumo[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def adicionar(self, item):
+        for posicao in self._posicoes(item):
+            self._bits[posicao >> 3] |= 1 << (posicao & 7)
+        self.itens += 1
+
+    def __contains__(self, item):
+        return all(self._bits[posicao >> 3] & (1 << (posicao & 7)) for posicao in self._posicoes(item))
+
+
+class ListaNegraTokens(ArmazenamentoLocal):
+    """
+    Conjunto de JTIs revogados em um arquivo SQLite, com um `FiltroBloom` por processo.
+
+    Args:
+        arquivo: Caminho do arquivo SQLite (criado se não existir)
+        intervalo_compactacao: Segundos entre as remoções de JTIs expirados
+        margem: Segundos que um JTI é mantido depois do `exp` (ex: o `LEEWAY` do SimpleJWT)
+        capacidade: Capacidade inicial do filtro (dobra quando é atingida)
+    """
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS tokens_revogados (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            jti TEXT NOT NULL UNIQUE,
+            exp INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS tokens_revogados_exp ON tokens_revogados (exp);
+        CREATE TABLE IF NOT EXISTS controle (chave TEXT PRIMARY KEY, valor INTEGER NOT NULL);
+        INSERT OR IGNORE INTO controle VALUES ('geracao', 0), ('compactado_em', 0);
+    '''
+
+    def __init__(self, arquivo, intervalo_compactacao=3600, margem=0, capacidade=100_000):
+        self.intervalo_compactacao = intervalo_compactacao
+        self.margem = margem
+        self.capacidade = capacidade
+        super().__init__(arquivo)
+
+    def _reiniciar(self):
+        super()._reiniciar()
+        self._filtro = None
+        self._geracao = None
+        self._ultimo_id = 0
+        self._proxima_compactacao = 0
+
+    def _sincronizar(self, conexao):
+        """
+        Atualiza o filtro com as revogações feitas pelos outros processos.
+
+        O `data_version` da conexão só muda quando outra conexão confirma uma escrita; sem
+        mudança, o filtro já está atualizado. Como o id é AUTOINCREMENT (nunca reaproveitado),
+        basta ler as linhas depois do último id visto, a não ser que a geração tenha mudado
+        (compactação), quando o filtro é reconstruído.
+        """
+        versao = conexao.execute('PRAGMA data_version').fetchone()[0]
+        if versao == getattr(self._local, 'data_version', None):
+            return
+
+        with self._lock:
+            with self._transacao(conexao):
+                geracao = conexao.execute("SELECT valor FROM controle WHERE chave = 'geracao'").fetchone()[0]
+                reconstruir = geracao != self._geracao
+                linhas = self._linhas_desde(conexao, 0 if reconstruir else self._ultimo_id)
+                if not reconstruir and self._filtro.itens + len(linhas) > self._filtro.capacidade:
+                    # Filtro cheio: reconstrói com o dobro da capacidade
+                    reconstruir = True
+                    linhas = self._linhas_desde(conexao, 0)
+
+            if reconstruir:
+                self._filtro = FiltroBloom(max(self.capacidade, len(linhas) * 2))
+                contar('lista_negra:filtro:reconstruido')
+            for _, jti in linhas:
+                self._filtro.adicionar(jti)
+            if linhas:
+                self._ultimo_id = linhas[-1][0]
+            self._geracao = geracao
+            self._local.data_version = versao
+
+    @staticmethod
+    def _linhas_desde(conexao, ultimo_id):
+        return conexao.execute(
+            'SELECT id, jti FROM tokens_revogados WHERE id > ? ORDER BY id', (ultimo_id,)
+        ).fetchall()
+
+    def esta_revogado(self, jti):
+        conexao = self._conexao()
+        self._sincronizar(conexao)
+
+        if jti not in self._filtro:
+            contar('lista_negra:filtro:negativo')
+            return False
+
+        contar('lista_negra:filtro:positivo')
+        return conexao.execute('SELECT 1 FROM tokens_revogados WHERE jti = ?', (jti,)).fetchone() is not None
+
+    def revogar(self, jti, exp):
+        """
+        Revoga o JTI até `exp` (timestamp). Retorna False se ele já estava revogado, o que
+        torna a revogação atômica entre workers: de dois refreshes simultâneos com o mesmo
+        token, só um consegue revogá-lo.
+        """
+        conexao = self._conexao()
+        cursor = conexao.execute(
+            'INSERT OR IGNORE INTO tokens_revogados (jti, exp) VALUES (?, ?)', (jti, int(exp))
+        )
+        inserido = cursor.rowcount == 1
+
+        if inserido:
+            # A escrita desta conexão não muda o seu `data_version`: o JTI entra no filtro aqui, e o
+            # último id visto avança até ele para que a próxima sincronização não o adicione de novo
+            # (as escritas são serializadas, então as linhas anteriores já foram lidas pelo `_sincronizar`)
+            self._sincronizar(conexao)
+            with self._lock:
+                if jti not in self._filtro:
+                    self._filtro.adicionar(jti)
+                self._ultimo_id = max(self._ultimo_id, cursor.lastrowid)
+
+        if time.monotonic() >= self._proxima_compactacao:
+            self.compactar()
+        return inserido
+
+    def compactar(self, forcar=False):
+        """
+        Remove os JTIs expirados, no máximo uma vez por `intervalo_compactacao` entre todos
+        os processos (o horário da última compactação fica no próprio arquivo).
+
+        Returns:
+            Quantidade de JTIs removidos (0 se a compactação ainda não era devida)
+        """
+        conexao = self._conexao()
+        self._proxima_compactacao = time.monotonic() + self.intervalo_compactacao
+        agora = int(time.time())
+
+        with self._transacao(conexao, imediata=True):
+            compactado_em = conexao.execute(
+                "SELECT valor FROM controle WHERE chave = 'compactado_em'"
+            ).fetchone()[0]
+            if not forcar and agora - compactado_em < self.intervalo_compactacao:
+                return 0
+
+            removidos = conexao.execute(
+                'DELETE FROM tokens_revogados WHERE exp < ?', (agora - self.margem,)
+            ).rowcount
+            conexao.execute("UPDATE controle SET valor = ? WHERE chave = 'compactado_em'", (agora,))
+            if removidos:
+                conexao.execute("UPDATE controle SET valor = valor + 1 WHERE chave = 'geracao'")
+
+        contar('lista_negra:compactacao', removidos)
+        return removidos
+
+    def __len__(self):
+        return self._conexao().execute('SELECT COUNT(*) FROM tokens_revogados').fetchone()[0]
+
+
+def _criar_lista_negra_tokens():
+    leeway = api_settings.LEEWAY
+    return ListaNegraTokens(
+        settings.TOKENS_LISTA_NEGRA_ARQUIVO,
+        intervalo_compactacao=settings.TOKENS_LISTA_NEGRA_COMPACTACAO,
+        margem=math.ceil(leeway.total_seconds() if isinstance(leeway, timedelta) else leeway),
+    )
+
+
+# Lista negra dos refresh tokens, criada no primeiro uso
+lista_negra_tokens = SimpleLazyObject(_criar_lista_negra_tokens)
+
+
+@receiver(setting_changed)
+def _recriar_lista_negra_tokens(*, setting, **kwargs):
+    # Ex: override_settings(TOKENS_LISTA_NEGRA_ARQUIVO=...) em medições
+    if setting.startswith('TOKENS_LISTA_NEGRA_') or setting == 'SIMPLE_JWT':
+        lista_negra_tokens._wrapped = empty
@@ -1,7 +1,25 @@
+from django.utils.translation import gettext_lazy as _
+
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
 
 from AppCore.common.util.util import formatar_cpf
+from AppCore.core.exceptions.exceptions import NotFoundException
+
+from Usuarios.usuario.helpers import obter_principal_usuario, obter_usuario_contexto_login, snapshot_usuario
+from Usuarios.usuario.models import Usuario
+from Usuarios.usuario.ultimo_login import ultimo_login
+
+from .lista_negra import lista_negra_tokens
+from .throttling import limite_verificacoes_senha
+from .tokens import RefreshTokenRevogavel
 
 
 class LoginSerializer(TokenObtainPairSerializer):
@@ -14,15 +32,38 @@ class LoginSerializer(TokenObtainPairSerializer):
     - Tipo(s) de perfil
     - Setores vinculados com função e atividades
     - Permissões administrativas
+    
+    Se a senha foi gerada com outro hasher ou outro custo, o hash é refeito
+    com a configuração atual na verificação (`Usuario.check_password`). O
+    `last_login` só é gravado no primeiro login do dia (`ultimo_login`).
     """
     username_field = 'cpf'
 
     def validate(self, attrs):
-        # Chama o validate pai para obter os tokens
-        data = super().validate(attrs)
+        # Chama o validate pai para obter os tokens (o hash da senha ocupa uma das vagas do worker)
+        with limite_verificacoes_senha.reservar():
+            try:
+                data = super().validate(attrs)
+            except NotFoundException:
+                # O BaseManager troca o DoesNotExist, que o ModelBackend trataria, por NotFoundException.
+                # Como no ModelBackend, um CPF inexistente também calcula um hash (mesmo tempo de resposta)
+                Usuario().set_password(attrs['password'])
+                raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        ultimo_login.registrar(self.user)
+        
+        # Adiciona dados do usuário na resposta (snapshot em cache, invalidado pelos signals)
+        data.update(snapshot_usuario.obter('login', self.user.pk, self._montar_dados_usuario))
         
-        # Adiciona dados do usuário na resposta
-        usuario = self.user
+        return data
+
+    def _montar_dados_usuario(self):
+        """Monta os dados do usuário autenticado retornados junto com os tokens."""
+        data = {}
+        
+        # Recarrega o usuário com perfis e vínculos ativos em um número fixo de queries
+        usuario = obter_usuario_contexto_login(self.user.pk)
+        setores_ativos = usuario.usuario_setores_ativos
         
         # Dados básicos
         data['usuario'] = {
@@ -48,15 +89,15 @@ class LoginSerializer(TokenObtainPairSerializer):
         data['perfis'] = self._obter_perfis(usuario)
         
         # Setores vinculados (ativos)
-        data['setores'] = self._obter_setores(usuario)
+        data['setores'] = self._obter_setores(setores_ativos)
         
         # Permissões resumidas
         data['permissoes'] = {
             'is_admin': usuario.is_admin,
             'is_staff': usuario.is_staff,
             'is_superuser': usuario.is_superuser,
-            'e_responsavel_setor': self._verifica_responsavel(usuario),
-            'e_monitor': self._verifica_monitor(usuario),
+            'e_responsavel_setor': self._verifica_responsavel(setores_ativos),
+            'e_monitor': self._verifica_monitor(setores_ativos),
         }
         
         return data
@@ -141,15 +182,11 @@ class LoginSerializer(TokenObtainPairSerializer):
         
         return perfis if perfis else [{'tipo': 'Sem perfil', 'dados': None}]
 
-    def _obter_setores(self, usuario):
+    def _obter_setores(self, setores_ativos):
         """Retorna os setores ativos do usuário com atividades e funções."""
         setores = []
         
-        usuario_setores = usuario.usuario_setores.filter(
-            data_saida__isnull=True
-        ).select_related('setor', 'campus')
-        
-        for us in usuario_setores:
+        for us in setores_ativos:
             setor_data = {
                 'id': us.id,
                 'setor': {
@@ -189,19 +226,60 @@ class LoginSerializer(TokenObtainPairSerializer):
         
         return atividades
 
-    def _verifica_responsavel(self, usuario):
+    def _verifica_responsavel(self, setores_ativos):
         """Verifica se o usuário é responsável por algum setor."""
-        return usuario.usuario_setores.filter(
-            e_responsavel=True,
-            data_saida__isnull=True
-        ).exists()
+        return any(us.e_responsavel for us in setores_ativos)
 
-    def _verifica_monitor(self, usuario):
+    def _verifica_monitor(self, setores_ativos):
         """Verifica se o usuário é monitor em algum setor."""
-        return usuario.usuario_setores.filter(
-            monitor=True,
-            data_saida__isnull=True
-        ).exists()
+        return any(us.monitor for us in setores_ativos)
+
+
+class AtualizarTokenSerializer(TokenRefreshSerializer):
+    """
+    Refresh com rotação: devolve um access e um refresh novos e revoga o refresh usado.
+
+    O usuário do token vem do cache do principal (`obter_principal_usuario`), sem consultar
+    o banco, e usuários removidos ou inativos não recebem tokens novos.
+    """
+    token_class = RefreshTokenRevogavel
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+
+        usuario_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        usuario = obter_principal_usuario(usuario_id) if usuario_id else None
+        if usuario is None or (api_settings.CHECK_USER_IS_ACTIVE and not usuario.ativo):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # A revogação é atômica: de dois refreshes simultâneos com o mesmo token, só um passa
+            if api_settings.BLACKLIST_AFTER_ROTATION and not refresh.blacklist():
+                raise TokenError(_('Token is blacklisted'))
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+            data['refresh'] = str(refresh)
+
+        return data
+
+
+class VerificarTokenSerializer(TokenVerifySerializer):
+    """Verificação de token que também recusa refresh tokens revogados (`lista_negra_tokens`)."""
+
+    def validate(self, attrs):
+        token = UntypedToken(attrs['token'])
+
+        jti = token.get(api_settings.JTI_CLAIM)
+        if api_settings.BLACKLIST_AFTER_ROTATION and jti and lista_negra_tokens.esta_revogado(jti):
+            # Como um token inválido: a view responde 401 (`token_not_valid`)
+            raise TokenError(_('Token is blacklisted'))
+
+        return {}
 
 
 class LoginResponseSerializer(serializers.Serializer):
@@ -0,0 +1,175 @@
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from Auth.auth.authentication import CortexJWTAuthentication
+from Auth.auth.lista_negra import ListaNegraTokens
+from Auth.auth.throttling import limite_verificacoes_senha
+
+from Usuarios.usuario.models import Usuario
+
+
+class CortexJWTAuthenticationTests(TestCase):
+    """Principal do token lido do cache só quando a invalidação alcança todos os workers."""
+
+    def setUp(self):
+        self.usuario = Usuario._base_manager.get(cpf='12345678901')
+        self.token = AccessToken.for_user(self.usuario)
+        self.autenticacao = CortexJWTAuthentication()
+        caches['snapshots'].clear()
+
+    def desativar(self):
+        # Como em outro worker: o `update` não dispara a invalidação do cache
+        Usuario._base_manager.filter(pk=self.usuario.pk).update(ativo=False)
+
+    @override_settings(CACHE_LOCAL_PERMITIDO=True)
+    def test_principal_em_cache_com_backend_compartilhado(self):
+        self.assertEqual(self.autenticacao.get_user(self.token), self.usuario)
+
+        with self.assertNumQueries(0):
+            usuario = self.autenticacao.get_user(self.token)
+        self.assertEqual(usuario.cpf, self.usuario.cpf)
+
+    @override_settings(CACHE_LOCAL_PERMITIDO=False)
+    def test_locmem_sem_permissao_le_do_banco(self):
+        self.autenticacao.get_user(self.token)
+        self.desativar()
+
+        with self.assertNumQueries(1), self.assertRaises(AuthenticationFailed) as contexto:
+            self.autenticacao.get_user(self.token)
+        self.assertEqual(contexto.exception.detail['code'], 'user_inactive')
+
+
+class ListaNegraTokensTests(SimpleTestCase):
+    """Filtro de cada processo acompanhando as próprias revogações e as dos outros."""
+
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.arquivo = os.path.join(diretorio.name, 'lista_negra.sqlite3')
+
+    def test_revogacao_propria_nao_relida_na_sincronizacao(self):
+        lista_negra = ListaNegraTokens(self.arquivo)
+        # Outro worker: mesma lista em outra conexão
+        outro_worker = ListaNegraTokens(self.arquivo)
+        exp = time.time() + 3600
+        self.assertFalse(lista_negra.esta_revogado('jti-1'))
+
+        self.assertTrue(lista_negra.revogar('jti-1', exp))
+        self.assertFalse(lista_negra.revogar('jti-1', exp))
+        self.assertTrue(outro_worker.revogar('jti-2', exp))
+
+        self.assertTrue(lista_negra.esta_revogado('jti-2'))
+        self.assertTrue(lista_negra.esta_revogado('jti-1'))
+        self.assertFalse(lista_negra.esta_revogado('jti-3'))
+        self.assertEqual(lista_negra._filtro.itens, 2)
+
+
+class VerificarTokenTests(TestCase):
+    """Refresh token revogado pela rotação recusado no refresh e na verificação."""
+
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        configuracao = override_settings(
+            TOKENS_LISTA_NEGRA_ARQUIVO=os.path.join(diretorio.name, 'lista_negra.sqlite3')
+        )
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+        self.client = APIClient()
+        self.refresh = str(RefreshToken.for_user(Usuario._base_manager.get(cpf='12345678901')))
+
+    def test_refresh_revogado_recusado_com_401(self):
+        resposta = self.client.post('/auth/token_jwt/refresh/', {'refresh': self.refresh}, format='json')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertNotEqual(resposta.data['refresh'], self.refresh)
+
+        for url in ('/auth/token_jwt/refresh/', '/auth/token_jwt/verify/'):
+            campo = 'refresh' if url.endswith('refresh/') else 'token'
+            resposta = self.client.post(url, {campo: self.refresh}, format='json')
+
+            self.assertEqual(resposta.status_code, 401)
+            self.assertEqual(resposta.data['code'], 'token_not_valid')
+
+
+class LoginThrottleTests(TestCase):
+    """Baldes do login por CPF e por IP, com o IP do cliente pelo `REMOTE_ADDR`."""
+
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.arquivo = os.path.join(diretorio.name, 'limite_login.sqlite3')
+        self.client = APIClient()
+
+    def configurar(self, login_cpf, login_ip, num_proxies=None):
+        rest_framework = {
+            **settings.REST_FRAMEWORK,
+            'NUM_PROXIES': num_proxies,
+            'DEFAULT_THROTTLE_RATES': {'login_cpf': login_cpf, 'login_ip': login_ip},
+        }
+        configuracao = override_settings(
+            REST_FRAMEWORK=rest_framework, LOGIN_LIMITE_ARQUIVO=self.arquivo, SENHAS_PBKDF2_ITERACOES=1000,
+        )
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+    def login(self, cpf, senha, **extra):
+        return self.client.post('/auth/token_jwt/', {'cpf': cpf, 'password': senha}, format='json', **extra)
+
+    def test_x_forwarded_for_forjado_nao_troca_o_balde_do_ip(self):
+        self.configurar(login_cpf='100/hour', login_ip='2/min')
+
+        for tentativa in range(2):
+            resposta = self.login(f'{tentativa:011d}', 'errada', HTTP_X_FORWARDED_FOR=f'10.0.0.{tentativa}')
+            self.assertEqual(resposta.status_code, 401)
+
+        resposta = self.login('00000000009', 'errada', HTTP_X_FORWARDED_FOR='10.0.0.9')
+        self.assertEqual(resposta.status_code, 429)
+        self.assertIn('Retry-After', resposta)
+
+    def test_x_forwarded_for_com_num_proxies(self):
+        self.configurar(login_cpf='100/hour', login_ip='1/min', num_proxies=1)
+
+        self.assertEqual(self.login('00000000001', 'errada', HTTP_X_FORWARDED_FOR='10.0.0.1').status_code, 401)
+        self.assertEqual(self.login('00000000002', 'errada', HTTP_X_FORWARDED_FOR='10.0.0.2').status_code, 401)
+        self.assertEqual(self.login('00000000003', 'errada', HTTP_X_FORWARDED_FOR='10.0.0.1').status_code, 429)
+
+    def test_login_valido_devolve_so_o_balde_do_cpf(self):
+        self.configurar(login_cpf='2/hour', login_ip='3/min')
+
+        for _ in range(3):
+            self.assertEqual(self.login('12345678901', 'Senh@123').status_code, 200)
+
+        self.assertEqual(self.login('12345678901', 'Senh@123').status_code, 429)
+
+    def test_balde_do_cpf_pelos_digitos(self):
+        self.configurar(login_cpf='2/hour', login_ip='100/min')
+
+        self.assertEqual(self.login('123.456.789-01', 'errada').status_code, 401)
+        self.assertEqual(self.login(' 123456789-01', 'errada').status_code, 401)
+        self.assertEqual(self.login('12345678901', 'errada').status_code, 429)
+
+    @override_settings(LOGIN_VERIFICACOES_SIMULTANEAS=1, LOGIN_VERIFICACOES_ESPERA=0)
+    def test_sem_vaga_para_verificar_a_senha_devolve_o_balde_do_cpf(self):
+        self.configurar(login_cpf='1/hour', login_ip='100/min')
+
+        # Outra verificação de senha ocupa a única vaga do worker
+        limite_verificacoes_senha._semaforo.acquire()
+        try:
+            resposta = self.login('12345678901', 'errada')
+        finally:
+            limite_verificacoes_senha._semaforo.release()
+
+        self.assertEqual(resposta.status_code, 429)
+        self.assertIn('verificações de senha', str(resposta.data['detail']))
+        self.assertEqual(self.login('12345678901', 'errada').status_code, 401)
+        self.assertEqual(self.login('12345678901', 'errada').status_code, 429)
@@ -0,0 +1,249 @@
+"""
+Limite de tentativas de login - token bucket por CPF e por IP, antes do hash da senha.
+
+Cada login verifica a senha com o PBKDF2, que ocupa uma CPU por centenas de
+milissegundos. Uma rajada de logins errados (início de semestre, ataque de força bruta)
+ocuparia todos os workers. Duas proteções ficam na frente do hash:
+
+- `LoginThrottle`: dois baldes de tokens por tentativa, um do CPF informado e um do IP
+  do cliente, com as taxas `login_cpf` e `login_ip` de `DEFAULT_THROTTLE_RATES`. Os
+  baldes ficam em `BaldesTokens`, um arquivo SQLite local compartilhado pelos workers
+  (`LOGIN_LIMITE_ARQUIVO`). Sem token, o login recebe 429 (com `Retry-After`) antes de
+  qualquer hash. Um login bem-sucedido devolve o token do CPF, então só as falhas consomem
+  o limite de cada conta; o do IP não é devolvido, para que uma senha conhecida não reabra
+  o balde de quem testa senhas de outras contas pelo mesmo IP.
+- `limite_verificacoes_senha`: limita as verificações de senha simultâneas por worker
+  (`LOGIN_VERIFICACOES_SIMULTANEAS`), para que as threads restantes continuem atendendo
+  o resto da API. Quem não consegue vaga em `LOGIN_VERIFICACOES_ESPERA` segundos recebe 429.
+
+Exemplo de uso:
+    class LoginView(TokenObtainPairView):
+        throttle_classes = [LoginThrottle]
+
+    # No serializer:
+    with limite_verificacoes_senha.reservar():
+        data = super().validate(attrs)
+"""
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import SimpleLazyObject, empty
+from django.utils.translation import gettext as _
+
+from rest_framework.exceptions import Throttled
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from AppCore.basics.instrumentacao import contar
+
+from .armazenamento import ArmazenamentoLocal
+
+
+# Segundos entre as remoções dos baldes que já voltaram a ficar cheios
+INTERVALO_COMPACTACAO = 600
+
+
+class BaldesTokens(ArmazenamentoLocal):
+    """
+    Baldes de tokens (token bucket) em um arquivo SQLite, compartilhados entre processos.
+
+    Cada balde tem uma capacidade (rajada permitida) e é reabastecido continuamente à
+    taxa de `capacidade / periodo` tokens por segundo. Baldes cheios não ocupam espaço:
+    a linha só existe enquanto o balde não se recupera.
+    """
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS baldes (
+            chave TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            atualizado_em REAL NOT NULL,
+            cheio_em REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS baldes_cheio_em ON baldes (cheio_em);
+    '''
+
+    def _reiniciar(self):
+        super()._reiniciar()
+        self._proxima_compactacao = 0
+
+    @staticmethod
+    def _ler(conexao, chave):
+        return conexao.execute('SELECT tokens, atualizado_em FROM baldes WHERE chave = ?', (chave,)).fetchone()
+
+    @staticmethod
+    def _tokens(linha, capacidade, periodo, agora):
+        if linha is None:
+            return capacidade
+        tokens, atualizado_em = linha
+        return min(capacidade, tokens + (agora - atualizado_em) * capacidade / periodo)
+
+    def consumir(self, baldes):
+        """
+        Retira um token de cada balde, se todos tiverem token; senão, não retira de nenhum.
+
+        Args:
+            baldes: Lista de (chave, capacidade, periodo em segundos)
+
+        Returns:
+            0 se os tokens foram retirados, ou os segundos até haver token em todos os baldes
+        """
+        conexao = self._conexao()
+        agora = time.time()
+
+        with self._transacao(conexao, imediata=True):
+            saldos = []
+            espera = 0
+            for chave, capacidade, periodo in baldes:
+                tokens = self._tokens(self._ler(conexao, chave), capacidade, periodo, agora)
+                espera = max(espera, (1 - tokens) * periodo / capacidade)
+                saldos.append((chave, tokens - 1, capacidade, periodo))
+
+            if espera <= 0:
+                self._gravar(conexao, saldos, agora)
+
+        if time.monotonic() >= self._proxima_compactacao:
+            self.compactar()
+        return max(espera, 0)
+
+    def devolver(self, baldes):
+        """Devolve um token a cada balde (até a capacidade)."""
+        conexao = self._conexao()
+        agora = time.time()
+
+        with self._transacao(conexao, imediata=True):
+            saldos = []
+            for chave, capacidade, periodo in baldes:
+                linha = self._ler(conexao, chave)
+                if linha is not None:
+                    saldos.append((chave, self._tokens(linha, capacidade, periodo, agora) + 1, capacidade, periodo))
+            self._gravar(conexao, saldos, agora)
+
+    @staticmethod
+    def _gravar(conexao, saldos, agora):
+        for chave, tokens, capacidade, periodo in saldos:
+            if tokens >= capacidade:
+                conexao.execute('DELETE FROM baldes WHERE chave = ?', (chave,))
+                continue
+            cheio_em = agora + (capacidade - tokens) * periodo / capacidade
+            conexao.execute(
+                'INSERT INTO baldes VALUES (?, ?, ?, ?) ON CONFLICT (chave) DO UPDATE SET '
+                'tokens = excluded.tokens, atualizado_em = excluded.atualizado_em, cheio_em = excluded.cheio_em',
+                (chave, tokens, agora, cheio_em),
+            )
+
+    def compactar(self):
+        """Remove os baldes que já voltaram a ficar cheios. Retorna a quantidade removida."""
+        self._proxima_compactacao = time.monotonic() + INTERVALO_COMPACTACAO
+        return self._conexao().execute('DELETE FROM baldes WHERE cheio_em < ?', (time.time(),)).rowcount
+
+
+class LoginThrottle(BaseThrottle):
+    """
+    Throttle do login: um balde por CPF (`login_cpf`) e um por IP (`login_ip`).
+
+    As taxas seguem o formato do DRF (ex: '10/hour'): o número é a capacidade do balde, e
+    o balde inteiro é reabastecido no período. A view chama `devolver` quando o login dá
+    certo ou quando a senha nem chega a ser verificada (429 do `limite_verificacoes_senha`),
+    para que só as tentativas com falha consumam o limite do CPF. O balde do CPF usa apenas
+    os dígitos informados.
+
+    O IP é o `REMOTE_ADDR`: o `X-Forwarded-For` só é considerado com `NUM_PROXIES`
+    configurado, senão bastaria enviar um valor diferente a cada tentativa.
+    """
+    escopos = ('login_cpf', 'login_ip')
+    duracoes = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+    def __init__(self):
+        self.espera = None
+
+    def get_ident(self, request):
+        if api_settings.NUM_PROXIES is None:
+            return request.META.get('REMOTE_ADDR')
+        return super().get_ident(request)
+
+    def obter_baldes(self, request, escopos=None):
+        identificadores = {'login_ip': self.get_ident(request)}
+        cpf = request.data.get('cpf') if hasattr(request.data, 'get') else None
+        if isinstance(cpf, str):
+            # Só os dígitos: '123.456.789-01' e '12345678901' são a mesma conta e o mesmo balde
+            cpf = re.sub(r'\D', '', cpf)[:64]
+            if cpf:
+                identificadores['login_cpf'] = cpf
+
+        baldes = []
+        for escopo in escopos or self.escopos:
+            taxa = api_settings.DEFAULT_THROTTLE_RATES.get(escopo)
+            if taxa and escopo in identificadores:
+                quantidade, periodo = taxa.split('/')
+                baldes.append((f'{escopo}:{identificadores[escopo]}', int(quantidade), self.duracoes[periodo[0]]))
+        return baldes
+
+    def allow_request(self, request, view):
+        baldes = self.obter_baldes(request)
+        if not baldes:
+            return True
+
+        self.espera = limite_login.consumir(baldes)
+        if self.espera:
+            contar('login:limitado')
+        return not self.espera
+
+    def wait(self):
+        return self.espera
+
+    def devolver(self, request):
+        baldes = self.obter_baldes(request, escopos=('login_cpf',))
+        if baldes:
+            limite_login.devolver(baldes)
+
+
+class LimiteVerificacoesSenha:
+    """
+    Semáforo das verificações de senha de um worker.
+
+    Args:
+        maximo: Verificações simultâneas permitidas no processo
+        espera: Segundos que uma verificação aguarda por vaga antes do 429
+    """
+
+    def __init__(self, maximo, espera):
+        self.espera = espera
+        self._semaforo = threading.BoundedSemaphore(maximo)
+
+    @contextmanager
+    def reservar(self):
+        if not self._semaforo.acquire(timeout=self.espera):
+            contar('login:verificacoes_esgotadas')
+            raise Throttled(
+                wait=max(self.espera, 1),
+                detail=_('Muitas verificações de senha em andamento. Tente novamente em instantes.'),
+            )
+        try:
+            yield
+        finally:
+            self._semaforo.release()
+
+
+def _criar_limite_login():
+    return BaldesTokens(settings.LOGIN_LIMITE_ARQUIVO)
+
+
+def _criar_limite_verificacoes_senha():
+    return LimiteVerificacoesSenha(settings.LOGIN_VERIFICACOES_SIMULTANEAS, settings.LOGIN_VERIFICACOES_ESPERA)
+
+
+# Baldes das tentativas de login e semáforo das verificações de senha, criados no primeiro uso
+limite_login = SimpleLazyObject(_criar_limite_login)
+limite_verificacoes_senha = SimpleLazyObject(_criar_limite_verificacoes_senha)
+
+
+@receiver(setting_changed)
+def _recriar_limites_login(*, setting, **kwargs):
+    if setting == 'LOGIN_LIMITE_ARQUIVO':
+        limite_login._wrapped = empty
+    elif setting.startswith('LOGIN_VERIFICACOES_'):
+        limite_verificacoes_senha._wrapped = empty
@@ -0,0 +1,27 @@
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .lista_negra import lista_negra_tokens
+
+
+class RefreshTokenRevogavel(RefreshToken):
+    """
+    Refresh token verificado contra a `lista_negra_tokens` (no lugar da app `token_blacklist`).
+
+    Um token revogado é recusado com a mesma mensagem do SimpleJWT ('Token is blacklisted').
+    """
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        self.check_blacklist()
+
+    def check_blacklist(self):
+        if lista_negra_tokens.esta_revogado(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        """Revoga o token até a sua expiração. Retorna False se ele já estava revogado."""
+        return lista_negra_tokens.revogar(self.payload[api_settings.JTI_CLAIM], self.payload['exp'])
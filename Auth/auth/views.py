@@ -1,5 +1,6 @@
 from drf_spectacular.utils import extend_schema, OpenApiExample
 from rest_framework import status
+from rest_framework.exceptions import Throttled
 
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -8,6 +9,7 @@ from rest_framework_simplejwt.views import (
 )
 
 from .serializers import LoginSerializer, LoginInputSerializer, LoginResponseSerializer
+from .throttling import LoginThrottle
 
 
 @extend_schema(
@@ -29,6 +31,7 @@ from .serializers import LoginSerializer, LoginInputSerializer, LoginResponseSer
     responses={
         status.HTTP_200_OK: LoginResponseSerializer,
         status.HTTP_401_UNAUTHORIZED: {'description': 'Credenciais inválidas'},
+        status.HTTP_429_TOO_MANY_REQUESTS: {'description': 'Muitas tentativas de login (aguardar o Retry-After)'},
     },
     examples=[
         OpenApiExample(
@@ -47,8 +50,29 @@ class LoginView(TokenObtainPairView):
     
     Utiliza o LoginSerializer customizado que retorna dados
     completos do usuário além dos tokens JWT.
+    
+    Tentativas são limitadas por CPF e por IP (LoginThrottle) antes
+    da verificação da senha; logins bem-sucedidos e tentativas recusadas
+    por falta de vaga para verificar a senha não contam no limite do CPF.
     """
     serializer_class = LoginSerializer
+    throttle_classes = [LoginThrottle]
+
+    def devolver_tentativa(self, request):
+        for throttle in self.get_throttles():
+            throttle.devolver(request)
+
+    def post(self, request, *args, **kwargs):
+        try:
+            response = super().post(request, *args, **kwargs)
+        except Throttled:
+            # 429 do limite_verificacoes_senha: a senha não foi verificada (o LoginThrottle roda antes do post)
+            self.devolver_tentativa(request)
+            raise
+
+        if response.status_code == status.HTTP_200_OK:
+            self.devolver_tentativa(request)
+        return response
 
 
 @extend_schema(
@@ -59,10 +83,13 @@ class LoginView(TokenObtainPairView):
     
     O token de refresh tem validade de 7 dias.
     O novo token de acesso terá validade de 30 minutos.
+    
+    Retorna também um novo token de refresh: o token enviado é revogado
+    e não pode ser usado novamente.
     ''',
 )
 class AtualizarTokenView(TokenRefreshView):
-    """View para refresh do token de acesso."""
+    """View para refresh do token de acesso (com rotação do token de refresh)."""
     pass
 
 
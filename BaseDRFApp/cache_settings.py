@@ -0,0 +1,45 @@
+import os
+import tempfile
+
+
+# Backend dos caches da aplicação (snapshots por usuário e respostas das listagens públicas):
+# - locmem: memória do processo (padrão, só para um único processo; ver CACHE_LOCAL_PERMITIDO)
+# - file: diretório compartilhado entre os workers do gunicorn
+# - db: tabelas no banco (requer `python manage.py createcachetable`)
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+CACHE_DIR = os.environ.get('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'cortex-cache'))
+
+CACHE_SNAPSHOTS_ALIAS = 'snapshots'
+CACHE_SNAPSHOTS_TIMEOUT = int(os.environ.get('CACHE_SNAPSHOTS_TIMEOUT', 60 * 60))
+
+CACHE_RESPOSTAS_ALIAS = 'respostas'
+CACHE_RESPOSTAS_TIMEOUT = int(os.environ.get('CACHE_RESPOSTAS_TIMEOUT', 60 * 60))
+
+
+def _configurar_cache(nome):
+    backends = {
+        'locmem': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': f'cortex-{nome}',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+        'file': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(CACHE_DIR, nome),
+        },
+        'db': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': f'cache_{nome}',
+        },
+    }
+    return backends[CACHE_BACKEND]
+
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    CACHE_SNAPSHOTS_ALIAS: _configurar_cache('snapshots'),
+    CACHE_RESPOSTAS_ALIAS: _configurar_cache('respostas'),
+}
@@ -1,14 +1,19 @@
 import os
+import tempfile
 from datetime import timedelta
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'Auth.auth.authentication.CortexJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'AppCore.basics.renderers.JSONRapidoRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'AppCore.basics.pagination.pagination.PaginacaoCustomizada',
     'PAGE_SIZE': 10,
     'DATE_INPUT_FORMATS': [
@@ -18,23 +23,63 @@ REST_FRAMEWORK = {
     'TIME_INPUT_FORMATS': [
         '%H:%M',
     ],
+    # Proxies reversos na frente da aplicação (define o IP do cliente usado pelos throttles)
+    'NUM_PROXIES': int(os.environ['NUM_PROXIES']) if os.environ.get('NUM_PROXIES') else None,
+    # Tentativas de login (Auth.auth.throttling): capacidade do balde / período de reabastecimento
+    'DEFAULT_THROTTLE_RATES': {
+        'login_cpf': os.environ.get('LOGIN_LIMITE_CPF', '10/hour'),
+        'login_ip': os.environ.get('LOGIN_LIMITE_IP', '60/min'),
+    },
 }
 
+# Estratégia do `count` das listagens paginadas: auto, exata, cache ou estimativa
+PAGINACAO_ESTRATEGIA_CONTAGEM = os.environ.get('PAGINACAO_ESTRATEGIA_CONTAGEM', 'auto')
+# Segundos que uma contagem exata fica em cache (estratégias cache e auto)
+PAGINACAO_CONTAGEM_CACHE_TIMEOUT = int(os.environ.get('PAGINACAO_CONTAGEM_CACHE_TIMEOUT', 30))
+# Abaixo deste tamanho estimado a tabela é contada exatamente (estratégia auto)
+PAGINACAO_LIMITE_TABELA_PEQUENA = int(os.environ.get('PAGINACAO_LIMITE_TABELA_PEQUENA', 10000))
+# A partir deste tamanho estimado, listagens sem filtro usam a estimativa do planejador (estratégia auto)
+PAGINACAO_LIMITE_TABELA_GRANDE = int(os.environ.get('PAGINACAO_LIMITE_TABELA_GRANDE', 100000))
+
 signing_key = os.environ.get(
     'SIMPLE_JWT_SIGNING_KEY',
     '1234567890qwertyuiopasdfghjklzxcvbnm!@#$%^&*()QWERTYUIOPASDFGHJKLZXCVBNM'
 )
 
+# Segundos que o usuário autenticado (principal) fica em cache, evitando o SELECT do usuário a cada requisição
+AUTENTICACAO_CACHE_TIMEOUT = int(os.environ.get('AUTENTICACAO_CACHE_TIMEOUT', 60))
+
+# Lista negra dos refresh tokens rotacionados: arquivo SQLite local, compartilhado pelos workers da máquina
+TOKENS_LISTA_NEGRA_ARQUIVO = os.environ.get(
+    'TOKENS_LISTA_NEGRA_ARQUIVO',
+    os.path.join(tempfile.gettempdir(), 'cortex-tokens', 'lista_negra.sqlite3'),
+)
+# Segundos entre as remoções dos tokens revogados que já expiraram
+TOKENS_LISTA_NEGRA_COMPACTACAO = int(os.environ.get('TOKENS_LISTA_NEGRA_COMPACTACAO', 3600))
+
+# Baldes das tentativas de login por CPF e por IP: arquivo SQLite local, compartilhado pelos workers da máquina
+LOGIN_LIMITE_ARQUIVO = os.environ.get(
+    'LOGIN_LIMITE_ARQUIVO',
+    os.path.join(tempfile.gettempdir(), 'cortex-tokens', 'limite_login.sqlite3'),
+)
+# Verificações de senha (PBKDF2) simultâneas por worker, e segundos de espera por uma vaga antes do 429
+LOGIN_VERIFICACOES_SIMULTANEAS = int(os.environ.get('LOGIN_VERIFICACOES_SIMULTANEAS', 2))
+LOGIN_VERIFICACOES_ESPERA = float(os.environ.get('LOGIN_VERIFICACOES_ESPERA', 1))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=30),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
-    'BLACKLIST_AFTER_ROTATION': False,
+    # Cada refresh devolve um refresh token novo e revoga o usado (Auth.auth.lista_negra)
+    'ROTATE_REFRESH_TOKENS': True,
+    'BLACKLIST_AFTER_ROTATION': True,
     'SIGNING_KEY': signing_key,
     'AUTH_HEADER_TYPES': ('Bearer',),
     # Serializer customizado para login via CPF com dados do usuário
     'TOKEN_OBTAIN_SERIALIZER': 'Auth.auth.serializers.LoginSerializer',
-    'TOKEN_REFRESH_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenRefreshSerializer',
-    'TOKEN_VERIFY_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenVerifySerializer',
+    # O LoginSerializer grava o last_login só no primeiro login do dia (Usuarios.usuario.ultimo_login)
+    'UPDATE_LAST_LOGIN': False,
+    'TOKEN_REFRESH_SERIALIZER': 'Auth.auth.serializers.AtualizarTokenSerializer',
+    'TOKEN_VERIFY_SERIALIZER': 'Auth.auth.serializers.VerificarTokenSerializer',
     'TOKEN_BLACKLIST_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenBlacklistSerializer',
     'SLIDING_TOKEN_OBTAIN_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenObtainSlidingSerializer',
     'SLIDING_TOKEN_REFRESH_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenRefreshSlidingSerializer',
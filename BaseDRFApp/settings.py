@@ -1,8 +1,11 @@
+import hashlib
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
 
+from .cache_settings import *
 from .rest_framework_settings import *
 from .spectacular_settings import *
 
@@ -18,6 +21,15 @@ SECRET_KEY = os.environ.get(
 
 DEBUG = os.environ.get('DJANGO_DEBUG', 'False') == 'True'
 
+# Inicialização de produção: sem as ferramentas de depuração (debug toolbar) e com o admin e a documentação
+# (Swagger/ReDoc) carregados só no primeiro acesso, reduzindo o tempo de boot e a memória de cada worker
+BOOT_PRODUCAO = os.environ.get('DJANGO_BOOT_PRODUCAO', str(not DEBUG)) == 'True'
+
+# Caches em memória local (CACHE_BACKEND=locmem) só são coerentes com um único processo (runserver). No boot de
+# produção, com vários workers, os caches que dependem de invalidação entre workers (snapshots, principal da
+# autenticação, respostas com ETag) deixam de ser usados até que CACHE_BACKEND seja file ou db
+CACHE_LOCAL_PERMITIDO = os.environ.get('CACHE_LOCAL_PERMITIDO', str(not BOOT_PRODUCAO)) == 'True'
+
 ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '*').split(',')
 
 csrf_origins = os.environ.get('CSRF_TRUSTED_ORIGINS', '')
@@ -58,14 +70,14 @@ EMAIL_USE_TLS = os.environ.get("EMAIL_USE_TLS", True)
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 
 DEFAULT_ROOT_APPS = [
-    'django.contrib.admin',
+    # Sem autodiscover no boot de produção: os `admin.py` são importados no primeiro acesso ao admin
+    'django.contrib.admin.apps.SimpleAdminConfig' if BOOT_PRODUCAO else 'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'corsheaders',
-    'debug_toolbar',
     'rest_framework_simplejwt',
     'rest_framework',
     'drf_spectacular',
@@ -110,9 +122,22 @@ VINCULOS_APPS = [
     ##########################################################
 ]
 
-INSTALLED_APPS = DEFAULT_ROOT_APPS + AUTH_APPS + USERS_APPS + ESTRUTURA_APPS + VINCULOS_APPS
+MONITORAMENTO_APPS = [
+    ################ - Módulo Monitoramento - ################
+    'Monitoramento.instrumentacao',
+    'Monitoramento.tarefas',
+    ##########################################################
+]
+
+DEBUG_APPS = [] if BOOT_PRODUCAO else ['debug_toolbar']
+
+INSTALLED_APPS = (
+    DEFAULT_ROOT_APPS + DEBUG_APPS + AUTH_APPS + USERS_APPS + ESTRUTURA_APPS + VINCULOS_APPS + MONITORAMENTO_APPS
+)
 
 MIDDLEWARE = [
+    'AppCore.basics.instrumentacao.middleware.InstrumentacaoMiddleware',
+    'AppCore.basics.instrumentacao.n_mais_um.DetectorNMaisUmMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -123,9 +148,11 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'simple_history.middleware.HistoryRequestMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+if not BOOT_PRODUCAO:
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+
 AUTH_USER_MODEL = 'usuarios.Usuario'
 ACCOUNT_AUTHENTICATION_METHOD = 'email'
 ACCOUNT_USER_MODEL_USERNAME_FIELD = None
@@ -195,3 +222,62 @@ STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static/')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Quando ativo, views que ultrapassam seu `limite_queries` falham em vez de apenas registrar um aviso
+LIMITE_QUERIES_ESTRITO = os.environ.get('LIMITE_QUERIES_ESTRITO', str(DEBUG)) == 'True'
+
+# Hash de senhas em cadastros em massa: processos do pool (0 = total de CPUs, até 4) e menor lote que usa o pool
+HASH_SENHAS_PROCESSOS = int(os.environ.get('HASH_SENHAS_PROCESSOS', 0))
+HASH_SENHAS_MINIMO_POOL = int(os.environ.get('HASH_SENHAS_MINIMO_POOL', 16))
+
+# Hasher das senhas novas (pbkdf2 ou scrypt) e seu custo; ver `python manage.py calibrar_hash_senhas`.
+# Hashes de outro algoritmo ou custo continuam válidos e são refeitos no próximo login
+SENHAS_HASHER = os.environ.get('SENHAS_HASHER', 'pbkdf2')
+SENHAS_PBKDF2_ITERACOES = int(os.environ.get('SENHAS_PBKDF2_ITERACOES', 1_000_000))
+SENHAS_SCRYPT_N = int(os.environ.get('SENHAS_SCRYPT_N', 2 ** 14))
+SENHAS_SCRYPT_R = int(os.environ.get('SENHAS_SCRYPT_R', 8))
+SENHAS_SCRYPT_P = int(os.environ.get('SENHAS_SCRYPT_P', 1))
+
+HASHERS_SENHAS = {
+    'pbkdf2': 'AppCore.common.util.hashers.PBKDF2ConfiguravelPasswordHasher',
+    'scrypt': 'AppCore.common.util.hashers.ScryptConfiguravelPasswordHasher',
+}
+
+PASSWORD_HASHERS = [
+    HASHERS_SENHAS[SENHAS_HASHER],
+    *(hasher for nome, hasher in HASHERS_SENHAS.items() if nome != SENHAS_HASHER),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# Último login (gravado só quando a data muda): logins guardados em memória antes da gravação
+# (1 = UPDATE imediato) e segundos máximos entre as gravações em lote
+ULTIMO_LOGIN_LOTE = int(os.environ.get('ULTIMO_LOGIN_LOTE', 1))
+ULTIMO_LOGIN_INTERVALO = float(os.environ.get('ULTIMO_LOGIN_INTERVALO', 60))
+
+# Tarefas em segundo plano (estado no banco): segundos entre os sinais de vida de uma tarefa em execução
+# (sem sinal por 4 intervalos, ela é marcada como erro) e segundos de retenção das tarefas concluídas
+TAREFAS_INTERVALO_SINAL = int(os.environ.get('TAREFAS_INTERVALO_SINAL', 30))
+TAREFAS_RETENCAO = int(os.environ.get('TAREFAS_RETENCAO', 60 * 60 * 24))
+
+# Instrumentação por requisição: header Server-Timing e histogramas por endpoint (janela em minutos)
+INSTRUMENTACAO_ATIVA = os.environ.get('INSTRUMENTACAO_ATIVA', 'True') == 'True'
+INSTRUMENTACAO_SERVER_TIMING = os.environ.get('INSTRUMENTACAO_SERVER_TIMING', 'True') == 'True'
+INSTRUMENTACAO_JANELA_MINUTOS = int(os.environ.get('INSTRUMENTACAO_JANELA_MINUTOS', 15))
+
+# Métricas (formato Prometheus) somadas entre os workers: diretório compartilhado (vazio = só o processo
+# atual; o padrão é único por instalação, para que duas instâncias na mesma máquina não somem as métricas
+# uma da outra), intervalo de gravação do estado de cada worker (segundos) e token de coleta
+# (Authorization: Bearer <token>)
+METRICAS_DIR = os.environ.get(
+    'METRICAS_DIR',
+    os.path.join(
+        tempfile.gettempdir(), f'cortex-metricas-{hashlib.sha256(str(BASE_DIR).encode()).hexdigest()[:12]}'
+    ),
+)
+METRICAS_INTERVALO_GRAVACAO = int(os.environ.get('METRICAS_INTERVALO_GRAVACAO', 5))
+METRICAS_TOKEN = os.environ.get('METRICAS_TOKEN', '')
+
+# Detector de N+1 (opt-in): '' desligado, 'avisar' registra no log, 'falhar' lança exceção (use nos testes);
+# o limite é o número de execuções do mesmo formato de consulta na requisição
+DETECTOR_N_MAIS_UM = os.environ.get('DETECTOR_N_MAIS_UM', '')
+DETECTOR_N_MAIS_UM_LIMITE = int(os.environ.get('DETECTOR_N_MAIS_UM_LIMITE', 3))
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 SPECTACULAR_SETTINGS = {
     'TITLE': os.environ.get('TITLE_API', 'Cortex API'),
@@ -10,3 +11,6 @@ SPECTACULAR_SETTINGS = {
     'SWAGGER_UI_FAVICON_HREF': 'SIDECAR',
     'REDOC_DIST': 'SIDECAR',
 }
+
+# Schema OpenAPI pré-gerado (ver `AppCore.basics.schema`); compartilhado entre os workers do gunicorn
+SCHEMA_ARTEFATO_DIR = os.environ.get('SCHEMA_ARTEFATO_DIR', os.path.join(tempfile.gettempdir(), 'cortex-schema'))
@@ -1,17 +1,29 @@
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
-from debug_toolbar.toolbar import debug_toolbar_urls
-
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
 
 
+def incluir_sob_demanda(modulo, namespace=None):
+    """
+    Como `include()`, mas o URLconf só é importado quando uma rota dele é resolvida
+    (ou no primeiro `reverse()`), e não no boot do worker.
+    """
+    return (modulo, namespace, namespace)
+
+
+# No boot de produção, admin e documentação (drf-spectacular, Swagger/ReDoc) carregam no primeiro acesso
+incluir_ferramentas = incluir_sob_demanda if settings.BOOT_PRODUCAO else include
+
 urlpatterns = [
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/schema/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
-    path('admin/', admin.site.urls),
+    path('api/schema/', incluir_ferramentas('BaseDRFApp.urls_docs')),
+    path('admin/', incluir_ferramentas('BaseDRFApp.urls_admin', namespace='admin')),
     path('auth/', include('Auth.urls')),
     path('usuarios/', include('Usuarios.urls')),
     path('estrutura_organizacional/', include('EstruturaOrganizacional.urls')),
     path('perfis/', include('Perfis.urls')),
-] + debug_toolbar_urls()
+    path('monitoramento/', include('Monitoramento.urls')),
+]
+
+if not settings.BOOT_PRODUCAO:
+    from debug_toolbar.toolbar import debug_toolbar_urls
+
+    urlpatterns += debug_toolbar_urls()
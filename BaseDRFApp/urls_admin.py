@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+
+# No boot de produção o admin é instalado sem autodiscover (SimpleAdminConfig): os `admin.py` dos apps
+# são importados aqui, no primeiro acesso ao admin
+admin.autodiscover()
+
+app_name = 'admin'
+
+urlpatterns = admin.site.get_urls()
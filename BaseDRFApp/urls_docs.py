@@ -0,0 +1,10 @@
+from django.urls import path
+
+from AppCore.basics.schema import RedocPrecomputadoView, SchemaPrecomputadoAPIView, SwaggerPrecomputadoView
+
+
+urlpatterns = [
+    path('', SchemaPrecomputadoAPIView.as_view(), name='schema'),
+    path('swagger/', SwaggerPrecomputadoView.as_view(url_name='schema'), name='swagger-ui'),
+    path('redoc/', RedocPrecomputadoView.as_view(url_name='schema'), name='redoc'),
+]
@@ -1,6 +1,9 @@
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from AppCore.basics.serializers.otimizacao import depende_de
+from AppCore.basics.serializers.serializers import CampoAnotado, ContagemRelacionada
+
 from EstruturaOrganizacional.setor.serializers import SetorResumoSerializer
 
 
@@ -18,20 +21,19 @@ class AtividadeListaSerializer(serializers.Serializer):
     descricao = serializers.CharField(read_only=True)
     descricao_resumida = serializers.SerializerMethodField()
     setor = SetorResumoSerializer(read_only=True)
-    total_funcoes = serializers.SerializerMethodField()
+    total_funcoes = CampoAnotado(
+        ContagemRelacionada('funcoes'),
+        help_text='Total de funções da atividade',
+    )
 
     @extend_schema_field(serializers.CharField())
+    @depende_de('descricao')
     def get_descricao_resumida(self, obj) -> str:
         """Retorna a descrição resumida (primeiros 100 caracteres)."""
         if len(obj.descricao) > 100:
             return f'{obj.descricao[:100]}...'
         return obj.descricao
 
-    @extend_schema_field(serializers.IntegerField())
-    def get_total_funcoes(self, obj) -> int:
-        """Retorna o total de funções da atividade."""
-        return obj.funcoes.count()
-
 
 class AtividadeDetalheSerializer(serializers.Serializer):
     """
@@ -74,6 +76,7 @@ class AtividadeResumoSerializer(serializers.Serializer):
     descricao_resumida = serializers.SerializerMethodField()
 
     @extend_schema_field(serializers.CharField())
+    @depende_de('descricao')
     def get_descricao_resumida(self, obj) -> str:
         """Retorna a descrição resumida."""
         if len(obj.descricao) > 50:
@@ -41,9 +41,11 @@ class AtividadeListaView(AllowAnyMixin, BasicGetAPIView):
     """
     serializer_class = AtividadeListaSerializer
     mensagem_sucesso = 'Atividades listadas com sucesso.'
+    cache_resposta = True
+    serializer_compilado = True
 
     def get_queryset(self):
-        return Atividade.objects.select_related('setor').prefetch_related('funcoes').all()
+        return Atividade.objects.select_related('setor').all()
 
 
 @extend_schema(
@@ -1,6 +1,10 @@
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from AppCore.basics.serializers.lote import SelecaoLoteSerializer
+from AppCore.basics.serializers.otimizacao import depende_de
+from AppCore.basics.serializers.serializers import CampoAnotado, ContagemRelacionada
+
 
 # ============================================================================
 # SERIALIZERS DE CAMPUS
@@ -19,6 +23,7 @@ class CampusListaSerializer(serializers.Serializer):
     ativo = serializers.BooleanField(read_only=True)
 
     @extend_schema_field(serializers.CharField())
+    @depende_de('cnpj')
     def get_cnpj_formatado(self, obj) -> str:
         """Retorna o CNPJ formatado (XX.XXX.XXX/XXXX-XX)."""
         cnpj = obj.cnpj
@@ -43,13 +48,14 @@ class CampusDetalheSerializer(serializers.Serializer):
     ativo = serializers.BooleanField(read_only=True)
     
     # Estatísticas
-    total_usuarios = serializers.SerializerMethodField()
-    total_usuarios_ativos = serializers.SerializerMethodField()
+    total_usuarios = CampoAnotado(ContagemRelacionada('usuarios'))
+    total_usuarios_ativos = CampoAnotado(ContagemRelacionada('usuarios', ativo=True))
     
     # Timestamps
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
 
+    @depende_de('cnpj')
     def get_cnpj_formatado(self, obj):
         """Retorna o CNPJ formatado (XX.XXX.XXX/XXXX-XX)."""
         cnpj = obj.cnpj
@@ -57,14 +63,6 @@ class CampusDetalheSerializer(serializers.Serializer):
             return f'{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/{cnpj[8:12]}-{cnpj[12:]}'
         return cnpj
 
-    def get_total_usuarios(self, obj):
-        """Retorna o total de usuários do campus."""
-        return obj.usuarios.count()
-
-    def get_total_usuarios_ativos(self, obj):
-        """Retorna o total de usuários ativos do campus."""
-        return obj.usuarios.filter(ativo=True).count()
-
 
 class CampusResumoSerializer(serializers.Serializer):
     """
@@ -88,6 +86,7 @@ class CampusComUsuariosSerializer(serializers.Serializer):
     # Estatísticas por perfil
     estatisticas = serializers.SerializerMethodField()
 
+    @depende_de('cnpj')
     def get_cnpj_formatado(self, obj):
         """Retorna o CNPJ formatado."""
         cnpj = obj.cnpj
@@ -246,3 +245,20 @@ class CampusEditarSerializer(serializers.Serializer):
             if queryset.exists():
                 raise serializers.ValidationError({'cnpj': 'Já existe um campus com este CNPJ.'})
         return attrs
+
+
+class CampusEdicaoLoteSerializer(SelecaoLoteSerializer):
+    """
+    Serializer para edição em lote dos campi.
+    
+    **Seleção (informe apenas um):**
+    - ids: Ids dos campi
+    - filtro: Campos aceitos: ativo, nome
+    
+    **Campos editáveis (todos opcionais):**
+    - ativo: Se os campi estão ativos
+    """
+    ativo = serializers.BooleanField(
+        required=False,
+        help_text='Se os campi estão ativos'
+    )
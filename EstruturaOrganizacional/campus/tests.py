@@ -0,0 +1,58 @@
+import time
+from datetime import date
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from EstruturaOrganizacional.campus.models import Campus
+from Usuarios.usuario.models import Usuario
+
+
+URL_LISTA = '/estrutura_organizacional/campus/'
+
+
+@override_settings(CACHE_LOCAL_PERMITIDO=True)
+class CacheRespostasCampusTests(TestCase):
+    """Cache de respostas da listagem de campi (ETag, Last-Modified e 304)."""
+
+    def setUp(self):
+        self.campus = Campus.objects.filter().first()
+
+    def listar(self, **headers):
+        return self.client.get(URL_LISTA, headers=headers)
+
+    def test_requisicao_condicional_recebe_304(self):
+        etag = self.listar()['ETag']
+
+        resposta = self.listar(if_none_match=etag)
+
+        self.assertEqual(resposta.status_code, 304)
+
+    def test_escrita_em_tabela_relacionada_gera_novo_etag(self):
+        etag = self.listar()['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Usuario.objects.create_user(
+                cpf='98765432100', nome='Aluno', campus=self.campus, data_nascimento=date(2000, 1, 1)
+            )
+
+        resposta = self.listar(if_none_match=etag)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertNotEqual(resposta['ETag'], etag)
+
+    def test_last_modified_omitido_no_segundo_da_alteracao(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.campus.nome = 'Campus Central'
+            self.campus.save()
+
+        self.assertNotIn('Last-Modified', self.listar())
+
+        with mock.patch('AppCore.basics.views.basic_views.time.time', return_value=time.time() + 2):
+            self.assertIn('Last-Modified', self.listar())
+
+    @override_settings(CACHE_LOCAL_PERMITIDO=False)
+    def test_sem_cache_compartilhado_nao_ha_etag(self):
+        resposta = self.listar()
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertNotIn('ETag', resposta)
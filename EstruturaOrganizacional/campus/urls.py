@@ -5,6 +5,7 @@ from EstruturaOrganizacional.campus.views import (
     CampusCriarView,
     CampusEditarView,
     CampusDeletarView,
+    CampusLoteView,
 )
 
 app_name = 'campus'
@@ -14,4 +15,5 @@ urlpatterns = [
     path('criar/', CampusCriarView.as_view(), name='campus-criar'),
     path('<int:pk>/editar/', CampusEditarView.as_view(), name='campus-editar'),
     path('<int:pk>/deletar/', CampusDeletarView.as_view(), name='campus-deletar'),
+    *CampusLoteView.rotas_lote('campus'),
 ]
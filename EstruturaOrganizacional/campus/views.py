@@ -3,13 +3,21 @@ from drf_spectacular.utils import extend_schema
 from rest_framework import status
 
 from AppCore.basics.mixins.mixins import AllowAnyMixin, IsAdminMixin
-from AppCore.basics.views.basic_views import BasicGetAPIView, BasicPostAPIView, BasicPutAPIView, BasicDeleteAPIView
+from AppCore.basics.views.basic_views import (
+    BasicGetAPIView,
+    BasicPostAPIView,
+    BasicPutAPIView,
+    BasicDeleteAPIView,
+    BasicLoteAPIView,
+)
 
+from EstruturaOrganizacional.campus.business import CampusLoteBusiness
 from EstruturaOrganizacional.campus.models import Campus
 from EstruturaOrganizacional.campus.serializers import (
     CampusListaSerializer,
     CampusCriarSerializer,
     CampusEditarSerializer,
+    CampusEdicaoLoteSerializer,
 )
 
 
@@ -45,6 +53,8 @@ class CampusListaView(AllowAnyMixin, BasicGetAPIView):
     """
     serializer_class = CampusListaSerializer
     mensagem_sucesso = 'Campi listados com sucesso.'
+    cache_resposta = True
+    serializer_compilado = True
 
     def get_queryset(self):
         return Campus.objects.all()
@@ -165,3 +175,19 @@ class CampusDeletarView(IsAdminMixin, BasicDeleteAPIView):
 
     def do_action_delete(self, request):
         self.object.business.deletar_dados()
+
+
+class CampusLoteView(IsAdminMixin, BasicLoteAPIView):
+    """
+    Edição e deleção (soft delete) de vários campi de uma vez.
+    
+    Apenas administradores podem acessar. As rotas são geradas por `rotas_lote`.
+    """
+    business_lote_class = CampusLoteBusiness
+    serializer_edicao_class = CampusEdicaoLoteSerializer
+    filtros_lote = ['ativo', 'nome']
+    tag_schema = 'Estrutura Organizacional.Campus'
+    nome_plural = 'campi'
+
+    def get_queryset(self):
+        return Campus.objects.all()
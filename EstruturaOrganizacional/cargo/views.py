@@ -41,6 +41,8 @@ class CargoListaView(AllowAnyMixin, BasicGetAPIView):
     """
     serializer_class = CargoListaSerializer
     mensagem_sucesso = 'Cargos listados com sucesso.'
+    cache_resposta = True
+    serializer_compilado = True
 
     def get_queryset(self):
         return Cargo.objects.all()
@@ -3,6 +3,9 @@ from typing import Optional
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from AppCore.basics.serializers.otimizacao import depende_de
+from AppCore.basics.serializers.serializers import CampoAnotado, ContagemRelacionada
+
 
 # ============================================================================
 # SERIALIZERS DE CURSO
@@ -18,20 +21,19 @@ class CursoListaSerializer(serializers.Serializer):
     nome = serializers.CharField(read_only=True)
     descricao = serializers.CharField(read_only=True, allow_null=True)
     descricao_resumida = serializers.SerializerMethodField()
-    total_estagiarios = serializers.SerializerMethodField()
+    total_estagiarios = CampoAnotado(
+        ContagemRelacionada('estagiarios'),
+        help_text='Total de estagiários do curso',
+    )
 
     @extend_schema_field(serializers.CharField(allow_null=True))
+    @depende_de('descricao')
     def get_descricao_resumida(self, obj) -> Optional[str]:
         """Retorna a descrição resumida."""
         if obj.descricao and len(obj.descricao) > 100:
             return f'{obj.descricao[:100]}...'
         return obj.descricao
 
-    @extend_schema_field(serializers.IntegerField())
-    def get_total_estagiarios(self, obj) -> int:
-        """Retorna o total de estagiários do curso."""
-        return obj.estagiarios.count()
-
 
 class CursoDetalheSerializer(serializers.Serializer):
     """
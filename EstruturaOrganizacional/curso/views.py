@@ -41,9 +41,11 @@ class CursoListaView(AllowAnyMixin, BasicGetAPIView):
     """
     serializer_class = CursoListaSerializer
     mensagem_sucesso = 'Cursos listados com sucesso.'
+    cache_resposta = True
+    serializer_compilado = True
 
     def get_queryset(self):
-        return Curso.objects.prefetch_related('estagiarios').all()
+        return Curso.objects.all()
 
 
 @extend_schema(
@@ -1,6 +1,10 @@
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from AppCore.basics.serializers.lote import SelecaoLoteSerializer
+from AppCore.basics.serializers.otimizacao import depende_de
+from AppCore.basics.serializers.serializers import CampoAnotado, ContagemRelacionada
+
 
 # ============================================================================
 # SERIALIZERS DE EMPRESA
@@ -17,10 +21,17 @@ class EmpresaListaSerializer(serializers.Serializer):
     cnpj = serializers.CharField(read_only=True)
     cnpj_formatado = serializers.SerializerMethodField()
     ativo = serializers.BooleanField(read_only=True)
-    total_terceirizados = serializers.SerializerMethodField()
-    total_estagiarios = serializers.SerializerMethodField()
+    total_terceirizados = CampoAnotado(
+        ContagemRelacionada('terceirizados'),
+        help_text='Total de terceirizados da empresa',
+    )
+    total_estagiarios = CampoAnotado(
+        ContagemRelacionada('estagiarios'),
+        help_text='Total de estagiários da empresa',
+    )
 
     @extend_schema_field(serializers.CharField())
+    @depende_de('cnpj')
     def get_cnpj_formatado(self, obj) -> str:
         """Retorna o CNPJ formatado (XX.XXX.XXX/XXXX-XX)."""
         cnpj = obj.cnpj
@@ -28,16 +39,6 @@ class EmpresaListaSerializer(serializers.Serializer):
             return f'{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/{cnpj[8:12]}-{cnpj[12:]}'
         return cnpj
 
-    @extend_schema_field(serializers.IntegerField())
-    def get_total_terceirizados(self, obj) -> int:
-        """Retorna o total de terceirizados da empresa."""
-        return obj.terceirizados.count()
-
-    @extend_schema_field(serializers.IntegerField())
-    def get_total_estagiarios(self, obj) -> int:
-        """Retorna o total de estagiários da empresa."""
-        return obj.estagiarios.count()
-
 
 class EmpresaDetalheSerializer(serializers.Serializer):
     """
@@ -71,6 +72,7 @@ class EmpresaDetalheSerializer(serializers.Serializer):
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
 
+    @depende_de('cnpj')
     def get_cnpj_formatado(self, obj):
         """Retorna o CNPJ formatado."""
         cnpj = obj.cnpj
@@ -157,6 +159,7 @@ class EmpresaComVinculosSerializer(serializers.Serializer):
     # Estatísticas
     estatisticas = serializers.SerializerMethodField()
 
+    @depende_de('cnpj')
     def get_cnpj_formatado(self, obj):
         """Retorna o CNPJ formatado."""
         cnpj = obj.cnpj
@@ -335,3 +338,20 @@ class EmpresaEditarSerializer(serializers.Serializer):
             if queryset.exists():
                 raise serializers.ValidationError({'cnpj': 'Já existe uma empresa com este CNPJ.'})
         return attrs
+
+
+class EmpresaEdicaoLoteSerializer(SelecaoLoteSerializer):
+    """
+    Serializer para edição em lote das empresas.
+    
+    **Seleção (informe apenas um):**
+    - ids: Ids das empresas
+    - filtro: Campos aceitos: ativo, nome, cnpj
+    
+    **Campos editáveis (todos opcionais):**
+    - ativo: Se as empresas estão ativas
+    """
+    ativo = serializers.BooleanField(
+        required=False,
+        help_text='Se as empresas estão ativas'
+    )
@@ -5,6 +5,7 @@ from EstruturaOrganizacional.empresa.views import (
     EmpresaCriarView,
     EmpresaEditarView,
     EmpresaDeletarView,
+    EmpresaLoteView,
 )
 
 app_name = 'empresa'
@@ -14,4 +15,5 @@ urlpatterns = [
     path('criar/', EmpresaCriarView.as_view(), name='empresa-criar'),
     path('<int:pk>/editar/', EmpresaEditarView.as_view(), name='empresa-editar'),
     path('<int:pk>/deletar/', EmpresaDeletarView.as_view(), name='empresa-deletar'),
+    *EmpresaLoteView.rotas_lote('empresa'),
 ]
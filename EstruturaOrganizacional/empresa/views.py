@@ -3,13 +3,21 @@ from drf_spectacular.utils import extend_schema
 from rest_framework import status
 
 from AppCore.basics.mixins.mixins import AllowAnyMixin, IsAdminMixin
-from AppCore.basics.views.basic_views import BasicGetAPIView, BasicPostAPIView, BasicPutAPIView, BasicDeleteAPIView
+from AppCore.basics.views.basic_views import (
+    BasicGetAPIView,
+    BasicPostAPIView,
+    BasicPutAPIView,
+    BasicDeleteAPIView,
+    BasicLoteAPIView,
+)
 
+from EstruturaOrganizacional.empresa.business import EmpresaLoteBusiness
 from EstruturaOrganizacional.empresa.models import Empresa
 from EstruturaOrganizacional.empresa.serializers import (
     EmpresaListaSerializer,
     EmpresaCriarSerializer,
     EmpresaEditarSerializer,
+    EmpresaEdicaoLoteSerializer,
 )
 
 
@@ -41,9 +49,11 @@ class EmpresaListaView(AllowAnyMixin, BasicGetAPIView):
     """
     serializer_class = EmpresaListaSerializer
     mensagem_sucesso = 'Empresas listadas com sucesso.'
+    cache_resposta = True
+    serializer_compilado = True
 
     def get_queryset(self):
-        return Empresa.objects.prefetch_related('terceirizados', 'estagiarios').all()
+        return Empresa.objects.all()
 
 
 @extend_schema(
@@ -161,3 +171,20 @@ class EmpresaDeletarView(IsAdminMixin, BasicDeleteAPIView):
 
     def do_action_delete(self, request):
         self.object.business.deletar_dados()
+
+
+class EmpresaLoteView(IsAdminMixin, BasicLoteAPIView):
+    """
+    Edição e deleção (soft delete) de várias empresas de uma vez.
+    
+    Apenas administradores podem acessar. As rotas são geradas por `rotas_lote`.
+    """
+    business_lote_class = EmpresaLoteBusiness
+    serializer_edicao_class = EmpresaEdicaoLoteSerializer
+    filtros_lote = ['ativo', 'nome', 'cnpj']
+    tag_schema = 'Estrutura Organizacional.Empresa'
+    nome_plural = 'empresas'
+    nome_feminino = True
+
+    def get_queryset(self):
+        return Empresa.objects.all()
@@ -1,6 +1,8 @@
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from AppCore.basics.serializers.otimizacao import depende_de
+
 from EstruturaOrganizacional.atividade.serializers import AtividadeResumoSerializer
 
 
@@ -21,6 +23,7 @@ class FuncaoListaSerializer(serializers.Serializer):
     setor_nome = serializers.SerializerMethodField()
 
     @extend_schema_field(serializers.CharField())
+    @depende_de('descricao')
     def get_descricao_resumida(self, obj) -> str:
         """Retorna a descrição resumida (primeiros 100 caracteres)."""
         if len(obj.descricao) > 100:
@@ -28,6 +31,7 @@ class FuncaoListaSerializer(serializers.Serializer):
         return obj.descricao
 
     @extend_schema_field(serializers.CharField())
+    @depende_de('atividade__setor__nome')
     def get_setor_nome(self, obj) -> str:
         """Retorna o nome do setor da atividade."""
         return obj.atividade.setor.nome
@@ -64,6 +68,7 @@ class FuncaoDetalheSerializer(serializers.Serializer):
         from EstruturaOrganizacional.setor.serializers import SetorResumoSerializer
         return SetorResumoSerializer(obj.atividade.setor).data
 
+    @depende_de('descricao', 'atividade__descricao', 'atividade__setor__nome')
     def get_hierarquia(self, obj):
         """Retorna a hierarquia completa: Setor > Atividade > Função."""
         return {
@@ -82,6 +87,7 @@ class FuncaoResumoSerializer(serializers.Serializer):
     descricao_resumida = serializers.SerializerMethodField()
 
     @extend_schema_field(serializers.CharField())
+    @depende_de('descricao')
     def get_descricao_resumida(self, obj) -> str:
         """Retorna a descrição resumida."""
         if len(obj.descricao) > 50:
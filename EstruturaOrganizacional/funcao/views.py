@@ -41,6 +41,8 @@ class FuncaoListaView(AllowAnyMixin, BasicGetAPIView):
     """
     serializer_class = FuncaoListaSerializer
     mensagem_sucesso = 'Funções listadas com sucesso.'
+    cache_resposta = True
+    serializer_compilado = True
 
     def get_queryset(self):
         return Funcao.objects.select_related('atividade', 'atividade__setor').all()
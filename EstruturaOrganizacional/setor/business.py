@@ -1,4 +1,4 @@
-from AppCore.core.business.business import ModelInstanceBusiness
+from AppCore.core.business.business import ModelInstanceBusiness, ModelLoteBusiness
 from AppCore.core.exceptions.exceptions import SystemErrorException
 
 
@@ -18,3 +18,8 @@ class SetorBusiness(ModelInstanceBusiness):
             self.object_instance.save()
         except Exception as e:
             raise SystemErrorException('Não foi possível deletar o setor.')
+
+
+class SetorLoteBusiness(ModelLoteBusiness):
+    mensagem_erro_atualizar = 'Não foi possível atualizar os setores.'
+    mensagem_erro_deletar = 'Não foi possível deletar os setores.'
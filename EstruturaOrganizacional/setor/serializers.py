@@ -1,6 +1,8 @@
-from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from AppCore.basics.serializers.lote import SelecaoLoteSerializer
+from AppCore.basics.serializers.serializers import CampoAnotado, ContagemRelacionada
+
 from Usuarios.usuario.serializers import UsuarioReferenciaSerializer
 
 
@@ -18,12 +20,10 @@ class SetorListaSerializer(serializers.Serializer):
     nome = serializers.CharField(read_only=True)
     sigla = serializers.CharField(read_only=True, allow_null=True)
     ativo = serializers.BooleanField(read_only=True)
-    total_membros = serializers.SerializerMethodField()
-
-    @extend_schema_field(serializers.IntegerField())
-    def get_total_membros(self, obj) -> int:
-        """Retorna o total de membros ativos no setor."""
-        return obj.usuario_setores.filter(data_saida__isnull=True).count()
+    total_membros = CampoAnotado(
+        ContagemRelacionada('usuario_setores', data_saida__isnull=True),
+        help_text='Total de membros ativos no setor',
+    )
 
 
 class SetorDetalheSerializer(serializers.Serializer):
@@ -43,12 +43,18 @@ class SetorDetalheSerializer(serializers.Serializer):
     
     # Atividades
     atividades = serializers.SerializerMethodField()
-    total_atividades = serializers.SerializerMethodField()
+    total_atividades = CampoAnotado(ContagemRelacionada('atividades'))
     
     # Estatísticas de membros
-    total_membros = serializers.SerializerMethodField()
-    total_responsaveis = serializers.SerializerMethodField()
-    total_monitores = serializers.SerializerMethodField()
+    total_membros = CampoAnotado(
+        ContagemRelacionada('usuario_setores', data_saida__isnull=True)
+    )
+    total_responsaveis = CampoAnotado(
+        ContagemRelacionada('usuario_setores', e_responsavel=True, data_saida__isnull=True)
+    )
+    total_monitores = CampoAnotado(
+        ContagemRelacionada('usuario_setores', monitor=True, data_saida__isnull=True)
+    )
     
     # Timestamps
     created_at = serializers.DateTimeField(read_only=True)
@@ -59,28 +65,6 @@ class SetorDetalheSerializer(serializers.Serializer):
         from EstruturaOrganizacional.atividade.serializers import AtividadeResumoSerializer
         return AtividadeResumoSerializer(obj.atividades.all(), many=True).data
 
-    def get_total_atividades(self, obj):
-        """Retorna o total de atividades do setor."""
-        return obj.atividades.count()
-
-    def get_total_membros(self, obj):
-        """Retorna o total de membros ativos no setor."""
-        return obj.usuario_setores.filter(data_saida__isnull=True).count()
-
-    def get_total_responsaveis(self, obj):
-        """Retorna o total de responsáveis ativos no setor."""
-        return obj.usuario_setores.filter(
-            e_responsavel=True,
-            data_saida__isnull=True
-        ).count()
-
-    def get_total_monitores(self, obj):
-        """Retorna o total de monitores ativos no setor."""
-        return obj.usuario_setores.filter(
-            monitor=True,
-            data_saida__isnull=True
-        ).count()
-
 
 class SetorResumoSerializer(serializers.Serializer):
     """
@@ -270,3 +254,20 @@ class SetorEditarSerializer(serializers.Serializer):
         required=False,
         help_text='Se o setor está ativo'
     )
+
+
+class SetorEdicaoLoteSerializer(SelecaoLoteSerializer):
+    """
+    Serializer para edição em lote dos setores.
+    
+    **Seleção (informe apenas um):**
+    - ids: Ids dos setores
+    - filtro: Campos aceitos: ativo, nome, sigla
+    
+    **Campos editáveis (todos opcionais):**
+    - ativo: Se os setores estão ativos
+    """
+    ativo = serializers.BooleanField(
+        required=False,
+        help_text='Se os setores estão ativos'
+    )
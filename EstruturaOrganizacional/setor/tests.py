@@ -0,0 +1,71 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from AppCore.core.exceptions.exceptions import BusinessRuleException
+from AppCore.core.rules.rules import ModelInstanceRules, ModelLoteRules
+
+from EstruturaOrganizacional.setor.business import SetorLoteBusiness
+from EstruturaOrganizacional.setor.models import Setor
+from Usuarios.usuario.models import Usuario
+
+
+URL_LOTE = '/estrutura_organizacional/setores/lote/'
+
+
+class SetorSemSiglaRules(ModelInstanceRules):
+    def can_atualizar(self, dados):
+        return bool(self.object_instance.sigla)
+
+    def can_deletar(self):
+        return bool(self.object_instance.sigla)
+
+
+class SetorLoteRules(ModelLoteRules):
+    instance_rules_class = SetorSemSiglaRules
+
+
+class SetorLoteTests(TestCase):
+    """Edição e deleção em lote dos setores, validadas pelas regras de cada objeto."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(Usuario._base_manager.get(cpf='12345678901'))
+        self.com_sigla = Setor.objects.create(nome='Coordenação', sigla='COORD')
+        self.sem_sigla = Setor.objects.create(nome='Protocolo')
+
+    def test_deletar_em_lote(self):
+        resposta = self.client.delete(
+            f'{URL_LOTE}deletar/', {'ids': [self.com_sigla.pk, self.sem_sigla.pk]}, format='json'
+        )
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data['dados']['total'], 2)
+        self.assertEqual(resposta.data['mensagem'], 'Setores deletados com sucesso.')
+        self.assertFalse(Setor.objects.filter(pk__in=[self.com_sigla.pk, self.sem_sigla.pk], ativo=True).exists())
+
+    def test_editar_em_lote_por_filtro(self):
+        resposta = self.client.put(
+            f'{URL_LOTE}editar/', {'filtro': {'nome': 'Protocolo'}, 'ativo': False}, format='json'
+        )
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data['dados']['total'], 1)
+        self.sem_sigla.refresh_from_db()
+        self.assertFalse(self.sem_sigla.ativo)
+
+    @mock.patch.object(SetorLoteBusiness, 'rules_class', SetorLoteRules)
+    def test_regras_do_objeto_recusam_o_lote(self):
+        resposta = self.client.delete(
+            f'{URL_LOTE}deletar/', {'ids': [self.com_sigla.pk, self.sem_sigla.pk]}, format='json'
+        )
+
+        self.assertEqual(resposta.status_code, 400)
+        self.assertTrue(Setor.objects.filter(pk=self.com_sigla.pk, ativo=True).exists())
+
+        business = SetorLoteBusiness(Setor.objects.filter(pk__in=[self.com_sigla.pk, self.sem_sigla.pk]))
+        with self.assertRaises(BusinessRuleException) as contexto:
+            business.atualizar_em_lote({'ativo': False})
+        self.assertEqual(contexto.exception.details, {'ids_recusados': [self.sem_sigla.pk]})
@@ -5,6 +5,7 @@ from EstruturaOrganizacional.setor.views import (
     SetorCriarView,
     SetorEditarView,
     SetorDeletarView,
+    SetorLoteView,
 )
 
 app_name = 'setor'
@@ -14,4 +15,5 @@ urlpatterns = [
     path('criar/', SetorCriarView.as_view(), name='setor-criar'),
     path('<int:pk>/editar/', SetorEditarView.as_view(), name='setor-editar'),
     path('<int:pk>/deletar/', SetorDeletarView.as_view(), name='setor-deletar'),
+    *SetorLoteView.rotas_lote('setor'),
 ]
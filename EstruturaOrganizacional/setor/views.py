@@ -3,13 +3,21 @@ from drf_spectacular.utils import extend_schema
 from rest_framework import status
 
 from AppCore.basics.mixins.mixins import AllowAnyMixin, IsAdminMixin
-from AppCore.basics.views.basic_views import BasicGetAPIView, BasicPostAPIView, BasicPutAPIView, BasicDeleteAPIView
+from AppCore.basics.views.basic_views import (
+    BasicGetAPIView,
+    BasicPostAPIView,
+    BasicPutAPIView,
+    BasicDeleteAPIView,
+    BasicLoteAPIView,
+)
 
+from EstruturaOrganizacional.setor.business import SetorLoteBusiness
 from EstruturaOrganizacional.setor.models import Setor
 from EstruturaOrganizacional.setor.serializers import (
     SetorListaSerializer,
     SetorCriarSerializer,
     SetorEditarSerializer,
+    SetorEdicaoLoteSerializer,
 )
 
 
@@ -41,9 +49,11 @@ class SetorListaView(AllowAnyMixin, BasicGetAPIView):
     """
     serializer_class = SetorListaSerializer
     mensagem_sucesso = 'Setores listados com sucesso.'
+    cache_resposta = True
+    serializer_compilado = True
 
     def get_queryset(self):
-        return Setor.objects.prefetch_related('usuario_setores').all()
+        return Setor.objects.all()
 
 
 @extend_schema(
@@ -153,3 +163,19 @@ class SetorDeletarView(IsAdminMixin, BasicDeleteAPIView):
 
     def do_action_delete(self, request):
         self.object.business.deletar_dados()
+
+
+class SetorLoteView(IsAdminMixin, BasicLoteAPIView):
+    """
+    Edição e deleção (soft delete) de vários setores de uma vez.
+    
+    Apenas administradores podem acessar. As rotas são geradas por `rotas_lote`.
+    """
+    business_lote_class = SetorLoteBusiness
+    serializer_edicao_class = SetorEdicaoLoteSerializer
+    filtros_lote = ['ativo', 'nome', 'sigla']
+    tag_schema = 'Estrutura Organizacional.Setor'
+    nome_plural = 'setores'
+
+    def get_queryset(self):
+        return Setor.objects.all()
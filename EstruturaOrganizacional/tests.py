@@ -0,0 +1,63 @@
+from datetime import date
+
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from AppCore.basics.cache import cache_respostas
+
+from EstruturaOrganizacional.atividade.models import Atividade
+from EstruturaOrganizacional.cargo.models import Cargo
+from EstruturaOrganizacional.curso.models import Curso
+from EstruturaOrganizacional.empresa.models import Empresa
+from EstruturaOrganizacional.funcao.models import Funcao
+from EstruturaOrganizacional.setor.models import Setor
+from Usuarios.usuario.models import Usuario
+from Usuarios.usuario_setor.models import UsuarioSetor
+
+
+# Listagens da estrutura: contagem da paginação e a página, com as contagens anotadas na mesma query
+LISTAGENS = ['campus', 'cargos', 'setores', 'atividades', 'funcoes', 'empresas', 'cursos']
+QUERIES_LISTAGEM = 2
+
+
+class ListagensQueriesTests(TestCase):
+    """Número de queries das listagens da estrutura, independente da quantidade de linhas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Usuario._base_manager.get(cpf='12345678901')
+        for indice in range(4):
+            setor = Setor.objects.create(nome=f'Setor {indice}', sigla=f'S{indice}')
+            UsuarioSetor.objects.create(
+                usuario=cls.admin, setor=setor, campus=cls.admin.campus, data_entrada=date(2024, 1, 1)
+            )
+            for numero in range(3):
+                atividade = Atividade.objects.create(setor=setor, descricao=f'Atividade {indice}.{numero}')
+                Funcao.objects.create(atividade=atividade, descricao=f'Função {indice}.{numero}')
+            Cargo.objects.create(descricao=f'Cargo {indice}')
+            Curso.objects.create(nome=f'Curso {indice}')
+            Empresa.objects.create(nome=f'Empresa {indice}', cnpj=f'{indice:014d}')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        # A contagem da paginação fica em cache entre as requisições
+        cache_respostas.cache.clear()
+
+    def test_queries_constantes(self):
+        for listagem in LISTAGENS:
+            with self.subTest(listagem=listagem), self.assertNumQueries(QUERIES_LISTAGEM):
+                resposta = self.client.get(f'/estrutura_organizacional/{listagem}/', {'paginacao': 100})
+                self.assertEqual(resposta.status_code, 200)
+                self.assertGreater(resposta.data['count'], 0)
+
+    def test_contagens_anotadas(self):
+        resposta = self.client.get('/estrutura_organizacional/setores/', {'paginacao': 100})
+
+        setor = next(setor for setor in resposta.data['dados'] if setor['sigla'] == 'S0')
+        self.assertEqual(setor['total_membros'], 1)
+
+        resposta = self.client.get('/estrutura_organizacional/atividades/', {'paginacao': 100})
+
+        self.assertTrue(all(atividade['total_funcoes'] == 1 for atividade in resposta.data['dados']))
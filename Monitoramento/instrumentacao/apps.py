@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class InstrumentacaoConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'Monitoramento.instrumentacao'
+    verbose_name = 'Instrumentação'
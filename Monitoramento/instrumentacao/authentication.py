@@ -0,0 +1,43 @@
+import hmac
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+
+class TokenMetricasAuthentication(BaseAuthentication):
+    """
+    Autentica o coletor de métricas (ex: Prometheus) pelo `METRICAS_TOKEN`.
+
+    Espera `Authorization: Bearer <METRICAS_TOKEN>`. Qualquer outro valor segue para as
+    autenticações seguintes (JWT), então administradores continuam com acesso.
+    """
+
+    def authenticate(self, request):
+        token = getattr(settings, 'METRICAS_TOKEN', '')
+        if not token:
+            return None
+
+        partes = get_authorization_header(request).split()
+        if len(partes) != 2 or partes[0].lower() != b'bearer':
+            return None
+
+        if not hmac.compare_digest(partes[1], token.encode()):
+            return None
+
+        return AnonymousUser(), 'metricas'
+
+    def authenticate_header(self, request):
+        return 'Bearer realm="api"'
+
+
+class TokenMetricasScheme(OpenApiAuthenticationExtension):
+    """Documenta o `TokenMetricasAuthentication` no schema OpenAPI."""
+    target_class = 'Monitoramento.instrumentacao.authentication.TokenMetricasAuthentication'
+    name = 'tokenMetricas'
+
+    def get_security_definition(self, auto_schema):
+        return {'type': 'http', 'scheme': 'bearer', 'description': 'Token de coleta (METRICAS_TOKEN)'}
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from AppCore.basics.schema import ArtefatoSchema, calcular_versao_schema
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera o artefato do schema OpenAPI (YAML e JSON) servido em /api/schema/, para rodar no deploy. '
+        'Se o artefato da versão atual já existir, nada é feito.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--forcar', action='store_true', help='Gera o artefato mesmo se ele já existir')
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        versao = calcular_versao_schema()
+        self.stdout.write(f'Versão do schema: {versao} ({(time.perf_counter() - inicio) * 1000:.0f} ms)')
+
+        if not options['forcar'] and ArtefatoSchema.carregar(versao) is not None:
+            self.stdout.write(self.style.SUCCESS(f'Artefato já gerado em {ArtefatoSchema.caminho(versao, "*")}.'))
+            return
+
+        inicio = time.perf_counter()
+        artefato = ArtefatoSchema.gerar(versao)
+        artefato.gravar()
+
+        for formato, conteudo in artefato.conteudos.items():
+            self.stdout.write(f'{ArtefatoSchema.caminho(versao, formato)}: {len(conteudo) / 1024:.1f} KiB')
+        self.stdout.write(self.style.SUCCESS(f'Artefato gerado em {time.perf_counter() - inicio:.2f} s.'))
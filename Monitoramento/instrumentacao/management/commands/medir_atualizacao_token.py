@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+import secrets
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from Auth.auth.lista_negra import lista_negra_tokens
+from Auth.auth.views import AtualizarTokenView
+from Usuarios.usuario.models import Usuario
+
+
+# Modo -> (serializer do refresh, configurações do SimpleJWT)
+MODOS = {
+    # Antes da lista negra: serializer do SimpleJWT (SELECT do usuário), sem rotação
+    'original': (
+        'rest_framework_simplejwt.serializers.TokenRefreshSerializer',
+        {'ROTATE_REFRESH_TOKENS': False, 'BLACKLIST_AFTER_ROTATION': False},
+    ),
+    # Configuração atual: rotação com a verificação e a revogação na lista negra
+    'lista_negra': (
+        'Auth.auth.serializers.AtualizarTokenSerializer',
+        {'ROTATE_REFRESH_TOKENS': True, 'BLACKLIST_AFTER_ROTATION': True},
+    ),
+}
+
+
+def _atualizar_tokens(modo, usuario_id, quantidade):
+    """Faz `quantidade` refreshes seguidos (cada um com o refresh devolvido pelo anterior)."""
+    serializer, _ = MODOS[modo]
+    view = AtualizarTokenView.as_view(_serializer_class=serializer)
+    fabrica = APIRequestFactory()
+    refresh = str(RefreshToken.for_user(Usuario(pk=usuario_id)))
+
+    # Aquece o cache do principal e a conexão com a lista negra
+    resposta = view(fabrica.post('/auth/token_jwt/refresh/', {'refresh': refresh}, format='json'))
+    refresh = resposta.data.get('refresh', refresh)
+
+    inicio = time.perf_counter()
+    for _ in range(quantidade):
+        resposta = view(fabrica.post('/auth/token_jwt/refresh/', {'refresh': refresh}, format='json'))
+        if resposta.status_code != 200:
+            raise RuntimeError(f'Refresh recusado ({resposta.status_code}): {resposta.data}')
+        refresh = resposta.data.get('refresh', refresh)
+    return time.perf_counter() - inicio
+
+
+def _worker(modo, usuario_id, quantidade, fila):
+    try:
+        fila.put(_atualizar_tokens(modo, usuario_id, quantidade))
+    except Exception as e:
+        fila.put(e)
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a vazão (refreshes/s) do AtualizarTokenView: sem rotação (SimpleJWT original) e com a rotação '
+        'verificando e revogando os refresh tokens na lista negra, com um ou mais processos (workers).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quantidade', type=int, default=2000, help='Refreshes por processo')
+        parser.add_argument(
+            '--processos', type=int, nargs='+', help='Quantidades de processos (padrão: 1 e o total de CPUs)'
+        )
+        parser.add_argument(
+            '--revogados', type=int, default=50_000,
+            help='JTIs revogados gravados na lista negra antes da medição (tokens de outros usuários)',
+        )
+        parser.add_argument('--modos', nargs='+', choices=list(MODOS), default=list(MODOS), help='Modos medidos')
+
+    def handle(self, *args, **options):
+        processos = options['processos'] or sorted({1, os.cpu_count() or 1})
+        if options['quantidade'] < 1 or min(processos) < 1:
+            raise CommandError('A quantidade e os processos devem ser maiores que zero.')
+
+        usuario_id = Usuario._base_manager.filter(ativo=True).values_list('pk', flat=True).first()
+        if usuario_id is None:
+            raise CommandError('Nenhum usuário ativo para gerar os tokens.')
+
+        # Lista negra temporária, para não deixar os tokens da medição no arquivo configurado
+        with tempfile.TemporaryDirectory() as diretorio:
+            with override_settings(TOKENS_LISTA_NEGRA_ARQUIVO=str(Path(diretorio) / 'lista_negra.sqlite3')):
+                self.preencher_lista_negra(options['revogados'])
+                for modo in options['modos']:
+                    for total_processos in processos:
+                        self.medir(modo, total_processos, usuario_id, options['quantidade'])
+
+    def preencher_lista_negra(self, quantidade):
+        expiracao = time.time() + settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds()
+        for _ in range(quantidade):
+            lista_negra_tokens.revogar(secrets.token_hex(16), expiracao)
+        self.stdout.write(f'Lista negra com {len(lista_negra_tokens)} JTI(s) revogados')
+
+    def medir(self, modo, processos, usuario_id, quantidade):
+        _, configuracoes = MODOS[modo]
+        with override_settings(SIMPLE_JWT={**settings.SIMPLE_JWT, **configuracoes}):
+            if processos == 1:
+                duracoes = [_atualizar_tokens(modo, usuario_id, quantidade)]
+            else:
+                # Cada processo com as próprias conexões, como os workers do gunicorn
+                connections.close_all()
+                contexto = multiprocessing.get_context('fork')
+                fila = contexto.Queue()
+                workers = [
+                    contexto.Process(target=_worker, args=(modo, usuario_id, quantidade, fila))
+                    for _ in range(processos)
+                ]
+                for worker in workers:
+                    worker.start()
+                duracoes = [fila.get() for _ in workers]
+                for worker in workers:
+                    worker.join()
+
+        erros = [duracao for duracao in duracoes if isinstance(duracao, Exception)]
+        if erros:
+            raise CommandError(f'Falha na medição ({modo}): {erros[0]}')
+
+        vazao = processos * quantidade / max(duracoes)
+        self.stdout.write(
+            f'{modo:<12} {processos:>3} processo(s): {vazao:9.0f} refreshes/s  '
+            f'({max(duracoes) / quantidade * 1_000_000:6.0f} µs por refresh)'
+        )
+
@@ -0,0 +1,107 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Executado em um processo novo, como um worker do gunicorn: carrega a aplicação WSGI e atende uma requisição
+SCRIPT_WORKER = '''
+import json, resource, sys, time
+from wsgiref.util import setup_testing_defaults
+
+inicio = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+boot = time.perf_counter()
+
+environ = {'PATH_INFO': sys.argv[1]}
+setup_testing_defaults(environ)
+status = []
+b''.join(application(environ, lambda codigo, headers: status.append(codigo)))
+fim = time.perf_counter()
+
+print(json.dumps({
+    'boot_ms': (boot - inicio) * 1000,
+    'primeira_ms': (fim - boot) * 1000,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modulos': len(sys.modules),
+    'status': status[0] if status else '',
+}))
+'''
+
+MODOS = {
+    'producao': 'True',
+    'desenvolvimento': 'False',
+}
+
+
+def _perfil_importacoes(saida_importtime):
+    """Soma o tempo próprio de importação (`-X importtime`) por pacote de primeiro nível."""
+    pacotes = {}
+    for linha in saida_importtime.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, _, modulo = linha[len('import time:'):].split('|')
+        pacote = modulo.strip().split('.')[0]
+        tempo, quantidade = pacotes.get(pacote, (0, 0))
+        pacotes[pacote] = (tempo + int(proprio), quantidade + 1)
+    return pacotes
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a inicialização de um worker (tempo até a aplicação WSGI ficar pronta, primeira requisição, '
+        'memória e módulos carregados) nos modos de boot de produção e de desenvolvimento.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticoes', type=int, default=5, help='Processos iniciados por modo')
+        parser.add_argument('--rota', default='/usuarios/', help='Rota da primeira requisição')
+        parser.add_argument('--modos', nargs='+', choices=list(MODOS), default=list(MODOS), help='Modos medidos')
+        parser.add_argument(
+            '--perfil', type=int, default=0, metavar='N',
+            help='Mostra os N pacotes com maior tempo de importação em cada modo',
+        )
+
+    def iniciar_worker(self, modo, rota, perfil):
+        ambiente = {**os.environ, 'DJANGO_BOOT_PRODUCAO': MODOS[modo]}
+        opcoes = ['-W', 'ignore', *(['-X', 'importtime'] if perfil else [])]
+        comando = [sys.executable, *opcoes, '-c', SCRIPT_WORKER, rota]
+
+        processo = subprocess.run(comando, cwd=settings.BASE_DIR, env=ambiente, capture_output=True, text=True)
+        if processo.returncode != 0:
+            raise CommandError(f'Falha ao iniciar o worker ({modo}):\n{processo.stderr[-2000:]}')
+        return json.loads(processo.stdout.strip().splitlines()[-1]), processo.stderr
+
+    def handle(self, *args, **options):
+        if options['repeticoes'] < 1:
+            raise CommandError('A quantidade de repetições deve ser maior que zero.')
+
+        # Modos intercalados, para que variações de carga da máquina afetem todos igualmente
+        medicoes = {modo: [] for modo in options['modos']}
+        for _ in range(options['repeticoes']):
+            for modo in options['modos']:
+                medicoes[modo].append(self.iniciar_worker(modo, options['rota'], perfil=False)[0])
+
+        for modo in options['modos']:
+            mediana = {
+                campo: statistics.median(medicao[campo] for medicao in medicoes[modo])
+                for campo in ('boot_ms', 'primeira_ms', 'rss_mb', 'modulos')
+            }
+            self.stdout.write(
+                f'{modo:<16} boot {mediana["boot_ms"]:7.1f} ms  primeira requisição {mediana["primeira_ms"]:6.1f} ms '
+                f'({medicoes[modo][0]["status"]})  RSS {mediana["rss_mb"]:6.1f} MB  {mediana["modulos"]:.0f} módulos'
+            )
+
+            if options['perfil']:
+                _, saida_importtime = self.iniciar_worker(modo, options['rota'], perfil=True)
+                pacotes = _perfil_importacoes(saida_importtime)
+                total = sum(tempo for tempo, _ in pacotes.values())
+                self.stdout.write(f'  importações: {total / 1000:.1f} ms em {len(pacotes)} pacotes')
+                mais_lentos = sorted(pacotes.items(), key=lambda item: item[1][0], reverse=True)
+                for pacote, (tempo, quantidade) in mais_lentos[:options['perfil']]:
+                    self.stdout.write(f'  {tempo / 1000:8.1f} ms  {quantidade:4d} módulos  {pacote}')
@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from rest_framework.renderers import JSONRenderer
+
+from AppCore.basics.views.basic_views import BasicGetAPIView
+
+
+def _listar_views(padroes, prefixo=''):
+    """Percorre o URLconf e retorna [(rota, classe)] das listagens com serializer compilado."""
+    views = []
+    for padrao in padroes:
+        if isinstance(padrao, URLResolver):
+            views.extend(_listar_views(padrao.url_patterns, prefixo + str(padrao.pattern)))
+        elif isinstance(padrao, URLPattern):
+            classe = getattr(padrao.callback, 'view_class', None)
+            if classe is not None and issubclass(classe, BasicGetAPIView) and classe.serializer_compilado:
+                views.append((f'/{prefixo}{padrao.pattern}', classe))
+    return views
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a vazão (linhas/s) da serialização das listagens com serializer compilado, '
+        'comparando com o serializer do DRF sobre as mesmas linhas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, default=500, help='Quantidade de linhas por listagem')
+        parser.add_argument('--repeticoes', type=int, default=20, help='Repetições de cada medição')
+
+    def handle(self, *args, **options):
+        linhas = options['linhas']
+        repeticoes = options['repeticoes']
+        if linhas < 1 or repeticoes < 1:
+            raise CommandError('A quantidade de linhas e de repetições deve ser maior que zero.')
+
+        renderer = JSONRenderer()
+
+        for rota, classe in _listar_views(get_resolver().url_patterns):
+            view = classe()
+            view.setup(RequestFactory().get(rota))
+            view.request = view.initialize_request(view.request)
+            view.format_kwarg = None
+
+            compilado = view.obter_serializer_compilado()
+            if compilado is None:
+                self.stdout.write(f'{rota}: serializer não compilável, a view usa o DRF')
+                continue
+
+            queryset = view.anotar_queryset(view.filter_queryset(view.get_queryset()))
+            objetos = list(queryset[:linhas])
+            valores = list(compilado.projetar(queryset)[:linhas])
+            if not objetos:
+                self.stdout.write(f'{rota}: sem registros')
+                continue
+
+            if renderer.render(view.serializar_lista(objetos)) != renderer.render(
+                view.serializar_lista(valores, compilado)
+            ):
+                raise CommandError(f'{rota}: a saída do serializer compilado difere da do DRF.')
+
+            vazoes = []
+            for lote, argumentos in ((objetos, ()), (valores, (compilado,))):
+                inicio = time.perf_counter()
+                for _ in range(repeticoes):
+                    view.serializar_lista(lote, *argumentos)
+                vazoes.append(len(lote) * repeticoes / (time.perf_counter() - inicio))
+
+            drf, compilada = vazoes
+            self.stdout.write(
+                f'{rota:<45} {len(objetos):>5} linha(s)  DRF {drf:10.0f} linhas/s  '
+                f'compilado {compilada:10.0f} linhas/s  ({compilada / drf:.1f}x)'
+            )
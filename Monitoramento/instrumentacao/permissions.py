@@ -0,0 +1,12 @@
+from AppCore.core.permissions.permissions import IsAdminPermission
+
+
+class IsAdminOrColetorMetricasPermission(IsAdminPermission):
+    """
+        Permite o acesso a administradores ou ao coletor autenticado pelo `METRICAS_TOKEN`.
+    """
+    def has_permission(self, request, view):
+        if request.auth == 'metricas':
+            return True
+
+        return super().has_permission(request, view)
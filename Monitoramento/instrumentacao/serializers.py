@@ -0,0 +1,27 @@
+from rest_framework import serializers
+
+
+class LatenciaEndpointSerializer(serializers.Serializer):
+    """Estatísticas de um endpoint na janela de instrumentação."""
+    endpoint = serializers.CharField(read_only=True, help_text='Método e nome da rota (ex: GET usuarios:lista)')
+    total = serializers.IntegerField(read_only=True)
+    erros = serializers.IntegerField(read_only=True, help_text='Respostas com status 5xx')
+    media_ms = serializers.FloatField(read_only=True)
+    p50_ms = serializers.IntegerField(read_only=True, help_text='Limite superior da faixa do histograma')
+    p95_ms = serializers.IntegerField(read_only=True)
+    p99_ms = serializers.IntegerField(read_only=True)
+    queries_media = serializers.FloatField(read_only=True)
+    auth_media_ms = serializers.FloatField(read_only=True)
+    db_media_ms = serializers.FloatField(read_only=True)
+    serializacao_media_ms = serializers.FloatField(read_only=True)
+    render_media_ms = serializers.FloatField(read_only=True)
+    contadores = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+    histograma = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True, help_text='Requisições por faixa de latência (ms)'
+    )
+
+
+class LatenciasSerializer(serializers.Serializer):
+    """Resumo da instrumentação do processo."""
+    janela_minutos = serializers.IntegerField(read_only=True)
+    endpoints = LatenciaEndpointSerializer(many=True, read_only=True)
@@ -0,0 +1,50 @@
+from datetime import date
+
+from django.test import TestCase, override_settings
+
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from AppCore.basics.instrumentacao import CONTENT_TYPE_PROMETHEUS
+
+from Usuarios.usuario.models import Usuario
+
+
+@override_settings(METRICAS_TOKEN='token-coletor', METRICAS_DIR='')
+class MetricasViewTests(TestCase):
+    """Acesso às métricas pelo token do coletor ou por administradores."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def coletar(self, autorizacao=None):
+        extra = {'HTTP_AUTHORIZATION': autorizacao} if autorizacao else {}
+        return self.client.get('/monitoramento/metricas/', **extra)
+
+    def test_token_do_coletor(self):
+        resposta = self.coletar('Bearer token-coletor')
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta['Content-Type'], CONTENT_TYPE_PROMETHEUS)
+        self.assertIn('# TYPE cortex_http_requisicoes_total counter', resposta.content.decode())
+
+    def test_token_errado_ou_ausente(self):
+        self.assertEqual(self.coletar('Bearer outro-token').status_code, 401)
+        self.assertEqual(self.coletar().status_code, 401)
+
+    @override_settings(METRICAS_TOKEN='')
+    def test_sem_token_configurado_o_coletor_nao_entra(self):
+        self.assertEqual(self.coletar('Bearer token-coletor').status_code, 401)
+
+    def test_jwt_de_administrador(self):
+        admin = Usuario._base_manager.get(cpf='12345678901')
+
+        self.assertEqual(self.coletar(f'Bearer {AccessToken.for_user(admin)}').status_code, 200)
+
+    def test_jwt_de_usuario_comum(self):
+        admin = Usuario._base_manager.get(cpf='12345678901')
+        usuario = Usuario.objects.create_user(
+            cpf='00000000001', nome='Usuário', campus=admin.campus, data_nascimento=date(2000, 1, 1)
+        )
+
+        self.assertEqual(self.coletar(f'Bearer {AccessToken.for_user(usuario)}').status_code, 403)
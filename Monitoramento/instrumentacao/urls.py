@@ -0,0 +1,12 @@
+from django.urls import path
+from .views import (
+    LatenciasView,
+    MetricasView,
+)
+
+app_name = 'instrumentacao'
+
+urlpatterns = [
+    path('latencias/', LatenciasView.as_view(), name='latencias'),
+    path('metricas/', MetricasView.as_view(), name='metricas'),
+]
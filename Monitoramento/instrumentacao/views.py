@@ -0,0 +1,89 @@
+from django.http import HttpResponse
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+
+from rest_framework import status
+from rest_framework.settings import api_settings
+
+from AppCore.basics.decorators.decorators import handle_exceptions
+from AppCore.basics.instrumentacao import (
+    CONTENT_TYPE_PROMETHEUS, armazem_metricas, formatar_prometheus, registro_latencias
+)
+from AppCore.basics.mixins.mixins import IsAdminMixin
+from AppCore.basics.views.basic_views import BasicAPIView, BasicRetrieveAPIView
+
+from Monitoramento.instrumentacao.authentication import TokenMetricasAuthentication
+from Monitoramento.instrumentacao.permissions import IsAdminOrColetorMetricasPermission
+from Monitoramento.instrumentacao.serializers import LatenciasSerializer
+
+
+@extend_schema(
+    tags=['Monitoramento'],
+    summary='Latências por endpoint',
+    description='''
+    Retorna os histogramas de latência de cada endpoint na janela deslizante
+    (`INSTRUMENTACAO_JANELA_MINUTOS`), medidos pelo `InstrumentacaoMiddleware`.
+    
+    **Permissões:** Apenas administradores (is_admin ou is_superuser) podem acessar.
+    
+    **Retorno (por endpoint):**
+    - total de requisições e erros (5xx)
+    - média e percentis p50/p95/p99 (ms, estimados pelo histograma)
+    - média de queries e de tempo em auth, db, serialização e renderização
+    - histograma por faixa de latência
+    
+    Os dados ficam na memória de cada processo: com vários workers, cada um responde
+    apenas pelas requisições que atendeu.
+    ''',
+    responses={
+        status.HTTP_200_OK: LatenciasSerializer,
+        status.HTTP_401_UNAUTHORIZED: {'description': 'Não autenticado'},
+        status.HTTP_403_FORBIDDEN: {'description': 'Sem permissão de administrador'},
+    },
+)
+class LatenciasView(IsAdminMixin, BasicRetrieveAPIView):
+    """View para consultar as latências por endpoint registradas pela instrumentação."""
+    serializer_class = LatenciasSerializer
+    mensagem_sucesso = 'Latências recuperadas com sucesso.'
+
+    def get_object(self):
+        return {
+            'janela_minutos': registro_latencias.janela_minutos,
+            'endpoints': registro_latencias.resumo(),
+        }
+
+
+@extend_schema(
+    tags=['Monitoramento'],
+    summary='Métricas no formato Prometheus',
+    description='''
+    Exposição de métricas para coleta (pull) no formato texto do Prometheus, somando
+    todos os workers do gunicorn (estado compartilhado em `METRICAS_DIR`).
+    
+    **Permissões:** Administradores (JWT) ou o coletor, com `Authorization: Bearer <METRICAS_TOKEN>`.
+    
+    **Métricas (por endpoint e método):**
+    - `cortex_http_requisicoes_total`, `cortex_http_erros_total` (5xx)
+    - `cortex_http_duracao_segundos` (histograma)
+    - `cortex_http_queries_total`, `cortex_http_etapa_segundos_total` (auth, db, serializacao, render)
+    - `cortex_cache_acessos_total` e `cortex_cache_taxa_acerto` (por cache)
+    - `cortex_http_latencia_janela_segundos` (p50/p95/p99) e `cortex_http_requisicoes_por_segundo`,
+      na janela de `INSTRUMENTACAO_JANELA_MINUTOS`
+    ''',
+    responses={
+        (status.HTTP_200_OK, 'text/plain'): OpenApiTypes.STR,
+        status.HTTP_401_UNAUTHORIZED: {'description': 'Não autenticado'},
+        status.HTTP_403_FORBIDDEN: {'description': 'Sem permissão de administrador'},
+    },
+)
+class MetricasView(BasicAPIView):
+    """View de exposição das métricas de todos os workers no formato Prometheus."""
+    http_method_names = ['get']
+    authentication_classes = [TokenMetricasAuthentication, *api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    permission_classes = [IsAdminOrColetorMetricasPermission]
+
+    @handle_exceptions
+    def get(self, request, *args, **kwargs):
+        acumulado, janela = armazem_metricas.coletar()
+        return HttpResponse(formatar_prometheus(acumulado, janela), content_type=CONTENT_TYPE_PROMETHEUS)
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class TarefasConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'Monitoramento.tarefas'
+    verbose_name = 'Tarefas em segundo plano'
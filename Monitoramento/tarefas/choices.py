@@ -0,0 +1,13 @@
+TAREFA_PENDENTE = 'pendente'
+TAREFA_PROCESSANDO = 'processando'
+TAREFA_CONCLUIDA = 'concluida'
+TAREFA_ERRO = 'erro'
+
+TAREFA_STATUS_OPCOES = [
+    (TAREFA_PENDENTE, 'Pendente'),
+    (TAREFA_PROCESSANDO, 'Processando'),
+    (TAREFA_CONCLUIDA, 'Concluída'),
+    (TAREFA_ERRO, 'Erro'),
+]
+
+TAREFA_EM_ANDAMENTO = (TAREFA_PENDENTE, TAREFA_PROCESSANDO)
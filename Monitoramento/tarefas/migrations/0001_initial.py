@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tarefa',
+            fields=[
+                ('id', models.CharField(max_length=32, primary_key=True, serialize=False, verbose_name='Id')),
+                ('tipo', models.CharField(max_length=64, verbose_name='Tipo')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluida', 'Concluída'), ('erro', 'Erro')], default='pendente', max_length=16, verbose_name='Status')),
+                ('processo', models.CharField(help_text='Host e PID do worker que executa a tarefa', max_length=255, verbose_name='Processo')),
+                ('criada_em', models.DateTimeField(auto_now_add=True, verbose_name='Criada em')),
+                ('iniciada_em', models.DateTimeField(blank=True, null=True, verbose_name='Iniciada em')),
+                ('concluida_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluída em')),
+                ('sinal_em', models.DateTimeField(verbose_name='Último sinal em')),
+                ('resultado', models.JSONField(blank=True, null=True, verbose_name='Resultado')),
+                ('erro', models.TextField(blank=True, null=True, verbose_name='Erro')),
+            ],
+            options={
+                'verbose_name': 'Tarefa',
+                'verbose_name_plural': 'Tarefas',
+                'db_table': 'tarefas',
+                'ordering': ['-criada_em'],
+                'indexes': [models.Index(fields=['status', 'sinal_em'], name='tarefas_status_f3643c_idx')],
+            },
+        ),
+    ]
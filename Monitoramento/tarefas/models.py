@@ -0,0 +1,32 @@
+from django.db import models
+
+from Monitoramento.tarefas.choices import TAREFA_PENDENTE, TAREFA_STATUS_OPCOES
+
+
+class Tarefa(models.Model):
+    """
+    Estado de uma tarefa em segundo plano (ver `Monitoramento.tarefas.tarefas`).
+
+    Fica no banco para que qualquer worker responda a consulta. Enquanto executa, a
+    tarefa renova `sinal_em`; sem sinal recente, ela é considerada interrompida.
+    """
+    id = models.CharField('Id', max_length=32, primary_key=True)
+    tipo = models.CharField('Tipo', max_length=64)
+    status = models.CharField('Status', max_length=16, choices=TAREFA_STATUS_OPCOES, default=TAREFA_PENDENTE)
+    processo = models.CharField('Processo', max_length=255, help_text='Host e PID do worker que executa a tarefa')
+    criada_em = models.DateTimeField('Criada em', auto_now_add=True)
+    iniciada_em = models.DateTimeField('Iniciada em', blank=True, null=True)
+    concluida_em = models.DateTimeField('Concluída em', blank=True, null=True)
+    sinal_em = models.DateTimeField('Último sinal em')
+    resultado = models.JSONField('Resultado', blank=True, null=True)
+    erro = models.TextField('Erro', blank=True, null=True)
+
+    class Meta:
+        db_table = 'tarefas'
+        verbose_name = 'Tarefa'
+        verbose_name_plural = 'Tarefas'
+        ordering = ['-criada_em']
+        indexes = [models.Index(fields=['status', 'sinal_em'])]
+
+    def __str__(self):
+        return f'{self.tipo} {self.id} ({self.status})'
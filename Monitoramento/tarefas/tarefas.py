@@ -0,0 +1,165 @@
+"""
+Tarefas em segundo plano - execução em thread com o estado guardado no banco.
+
+Para operações longas disparadas por uma requisição (ex: importação em massa): a view
+inicia a tarefa, responde 202 com o id e o cliente consulta o estado depois. O estado
+fica no model `Tarefa`, então qualquer worker responde a consulta.
+
+A thread da tarefa morre com o processo (reinício do gunicorn, deploy). Para que a tarefa
+não fique em 'processando' para sempre:
+
+- enquanto ela executa, outra thread renova `sinal_em` a cada `TAREFAS_INTERVALO_SINAL`
+  segundos; na consulta, uma tarefa pendente ou em processamento sem sinal há mais de
+  `INTERVALOS_SEM_SINAL` intervalos é marcada como erro;
+- no encerramento normal do processo, as tarefas dele são marcadas como erro na hora.
+
+Tarefas concluídas há mais de `TAREFAS_RETENCAO` segundos são removidas quando outra é iniciada.
+
+Exemplo de uso:
+    tarefa_id = iniciar_tarefa('importacao_usuarios', executar, caminho, formato)
+    ...
+    tarefa = obter_tarefa(tarefa_id)  # {'status': 'concluida', 'resultado': {...}, ...}
+"""
+import atexit
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from Monitoramento.tarefas.choices import TAREFA_CONCLUIDA, TAREFA_EM_ANDAMENTO, TAREFA_ERRO, TAREFA_PROCESSANDO
+from Monitoramento.tarefas.models import Tarefa
+
+
+logger = logging.getLogger(__name__)
+
+# Intervalos de sinal perdidos após os quais uma tarefa em andamento é considerada interrompida
+INTERVALOS_SEM_SINAL = 4
+
+# Tarefas executadas por este processo, marcadas como erro se ele encerrar antes delas
+_em_execucao = set()
+_lock = threading.Lock()
+
+
+def _intervalo_sinal():
+    return getattr(settings, 'TAREFAS_INTERVALO_SINAL', 30)
+
+
+def _atualizar(tarefa_id, **campos):
+    Tarefa.objects.filter(pk=tarefa_id).update(**campos)
+
+
+def _interromper(filtro, mensagem):
+    Tarefa.objects.filter(filtro, status__in=TAREFA_EM_ANDAMENTO).update(
+        status=TAREFA_ERRO, erro=mensagem, concluida_em=timezone.now()
+    )
+
+
+def _como_dicionario(tarefa):
+    def data(valor):
+        return valor.isoformat() if valor else None
+
+    return {
+        'id': tarefa.id,
+        'tipo': tarefa.tipo,
+        'status': tarefa.status,
+        'criada_em': data(tarefa.criada_em),
+        'iniciada_em': data(tarefa.iniciada_em),
+        'concluida_em': data(tarefa.concluida_em),
+        'resultado': tarefa.resultado,
+        'erro': tarefa.erro,
+    }
+
+
+def obter_tarefa(tarefa_id):
+    """Retorna o estado da tarefa, ou None se ela não existir (ou já tiver sido removida)."""
+    tarefa = Tarefa.objects.filter(pk=tarefa_id).first()
+    if tarefa is None:
+        return None
+
+    limite = timezone.now() - timedelta(seconds=INTERVALOS_SEM_SINAL * _intervalo_sinal())
+    if tarefa.status in TAREFA_EM_ANDAMENTO and tarefa.sinal_em < limite:
+        _interromper(Q(pk=tarefa.pk, sinal_em__lt=limite), 'Tarefa interrompida: o processo que a executava parou.')
+        tarefa.refresh_from_db()
+
+    return _como_dicionario(tarefa)
+
+
+def _renovar_sinal(tarefa_id, parar):
+    try:
+        while not parar.wait(_intervalo_sinal()):
+            _atualizar(tarefa_id, sinal_em=timezone.now())
+    finally:
+        connections.close_all()
+
+
+def _executar(tarefa_id, tipo, funcao, args, kwargs):
+    with _lock:
+        _em_execucao.add(tarefa_id)
+
+    agora = timezone.now()
+    _atualizar(tarefa_id, status=TAREFA_PROCESSANDO, iniciada_em=agora, sinal_em=agora)
+
+    parar = threading.Event()
+    sinal = threading.Thread(target=_renovar_sinal, args=(tarefa_id, parar), daemon=True)
+    sinal.start()
+
+    campos = {}
+    try:
+        campos['resultado'] = funcao(*args, **kwargs)
+        campos['status'] = TAREFA_CONCLUIDA
+    except Exception as erro:
+        logger.exception('Falha na tarefa %s (%s).', tarefa_id, tipo)
+        campos.update(status=TAREFA_ERRO, erro=str(erro))
+    finally:
+        parar.set()
+        sinal.join()
+        _atualizar(tarefa_id, concluida_em=timezone.now(), **campos)
+        with _lock:
+            _em_execucao.discard(tarefa_id)
+        connections.close_all()
+
+
+@atexit.register
+def _interromper_em_execucao():
+    with _lock:
+        tarefas_ids = list(_em_execucao)
+    if not tarefas_ids:
+        return
+
+    try:
+        _interromper(Q(pk__in=tarefas_ids), 'Tarefa interrompida pelo encerramento do processo.')
+    except Exception:
+        logger.exception('Não foi possível marcar as tarefas interrompidas: %s.', ', '.join(tarefas_ids))
+
+
+def iniciar_tarefa(tipo, funcao, *args, **kwargs):
+    """
+    Registra a tarefa e a executa em uma thread após o commit da transação corrente.
+
+    Args:
+        tipo: Identificação do tipo da tarefa (ex: 'importacao_usuarios')
+        funcao: Callable executado na thread; seu retorno (serializável em JSON) vira o `resultado` da tarefa
+
+    Returns:
+        str: Id da tarefa, usado em `obter_tarefa`
+    """
+    agora = timezone.now()
+
+    retencao = getattr(settings, 'TAREFAS_RETENCAO', 60 * 60 * 24)
+    Tarefa.objects.filter(concluida_em__lt=agora - timedelta(seconds=retencao)).delete()
+
+    tarefa = Tarefa.objects.create(
+        id=uuid.uuid4().hex, tipo=tipo, processo=f'{socket.gethostname()}:{os.getpid()}', sinal_em=agora
+    )
+
+    thread = threading.Thread(target=_executar, args=(tarefa.id, tipo, funcao, args, kwargs), daemon=True)
+    transaction.on_commit(thread.start)
+
+    return tarefa.id
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from Monitoramento.tarefas import tarefas
+from Monitoramento.tarefas.choices import TAREFA_CONCLUIDA, TAREFA_ERRO, TAREFA_PENDENTE, TAREFA_PROCESSANDO
+from Monitoramento.tarefas.models import Tarefa
+from Monitoramento.tarefas.tarefas import iniciar_tarefa, obter_tarefa
+from Usuarios.usuario.models import Usuario
+
+
+@mock.patch.object(tarefas, 'connections')
+class TarefasTests(TestCase):
+    """Estado das tarefas em segundo plano no banco e detecção das tarefas interrompidas."""
+
+    def executar(self, tarefa_id, funcao):
+        # Executa na thread do teste o que a thread da tarefa executaria após o commit
+        tarefas._executar(tarefa_id, 'teste', funcao, (), {})
+
+    def test_estado_gravado_no_banco(self, connections):
+        with self.captureOnCommitCallbacks():
+            tarefa_id = iniciar_tarefa('teste', lambda: None)
+
+        self.assertEqual(obter_tarefa(tarefa_id)['status'], TAREFA_PENDENTE)
+
+        self.executar(tarefa_id, lambda: {'importados': 2})
+
+        tarefa = obter_tarefa(tarefa_id)
+        self.assertEqual(tarefa['status'], TAREFA_CONCLUIDA)
+        self.assertEqual(tarefa['resultado'], {'importados': 2})
+        self.assertIsNotNone(tarefa['concluida_em'])
+        self.assertNotIn(tarefa_id, tarefas._em_execucao)
+
+    def test_falha_da_funcao_vira_erro(self, connections):
+        def falhar():
+            raise ValueError('arquivo inválido')
+
+        with self.captureOnCommitCallbacks():
+            tarefa_id = iniciar_tarefa('teste', falhar)
+
+        with self.assertLogs(tarefas.logger, 'ERROR'):
+            self.executar(tarefa_id, falhar)
+
+        tarefa = obter_tarefa(tarefa_id)
+        self.assertEqual(tarefa['status'], TAREFA_ERRO)
+        self.assertEqual(tarefa['erro'], 'arquivo inválido')
+
+    @override_settings(TAREFAS_INTERVALO_SINAL=30)
+    def test_tarefa_sem_sinal_vira_erro(self, connections):
+        agora = timezone.now()
+        Tarefa.objects.create(id='recente', tipo='teste', status=TAREFA_PROCESSANDO, sinal_em=agora)
+        Tarefa.objects.create(
+            id='orfa', tipo='teste', status=TAREFA_PROCESSANDO, sinal_em=agora - timedelta(minutes=5),
+        )
+
+        self.assertEqual(obter_tarefa('recente')['status'], TAREFA_PROCESSANDO)
+
+        tarefa = obter_tarefa('orfa')
+        self.assertEqual(tarefa['status'], TAREFA_ERRO)
+        self.assertIsNotNone(tarefa['concluida_em'])
+
+    def test_encerramento_do_processo_marca_as_tarefas_dele(self, connections):
+        agora = timezone.now()
+        Tarefa.objects.create(id='deste', tipo='teste', status=TAREFA_PROCESSANDO, sinal_em=agora)
+        Tarefa.objects.create(id='de_outro', tipo='teste', status=TAREFA_PROCESSANDO, sinal_em=agora)
+
+        with mock.patch.object(tarefas, '_em_execucao', {'deste'}):
+            tarefas._interromper_em_execucao()
+
+        self.assertEqual(obter_tarefa('deste')['status'], TAREFA_ERRO)
+        self.assertEqual(obter_tarefa('de_outro')['status'], TAREFA_PROCESSANDO)
+
+    @override_settings(TAREFAS_RETENCAO=60)
+    def test_concluidas_antigas_removidas(self, connections):
+        antiga = timezone.now() - timedelta(minutes=5)
+        Tarefa.objects.create(
+            id='antiga', tipo='teste', status=TAREFA_CONCLUIDA, sinal_em=antiga, concluida_em=antiga,
+        )
+
+        with self.captureOnCommitCallbacks():
+            iniciar_tarefa('teste', lambda: None)
+
+        self.assertIsNone(obter_tarefa('antiga'))
+
+    def test_consulta_da_importacao(self, connections):
+        Tarefa.objects.create(id='importacao', tipo='importacao_usuarios', sinal_em=timezone.now())
+        Tarefa.objects.create(id='outra', tipo='teste', sinal_em=timezone.now())
+
+        client = APIClient()
+        client.force_authenticate(Usuario._base_manager.get(cpf='12345678901'))
+
+        resposta = client.get('/usuarios/importacoes/importacao/')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data['dados']['status'], TAREFA_PENDENTE)
+
+        self.assertEqual(client.get('/usuarios/importacoes/outra/').status_code, 404)
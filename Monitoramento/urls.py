@@ -0,0 +1,7 @@
+from django.urls import path, include
+
+app_name = 'monitoramento'
+
+urlpatterns = [
+    path('', include('Monitoramento.instrumentacao.urls')),
+]
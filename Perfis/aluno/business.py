@@ -1,4 +1,4 @@
-from AppCore.core.business.business import ModelInstanceBusiness
+from AppCore.core.business.business import ModelInstanceBusiness, ModelLoteBusiness
 from AppCore.core.exceptions.exceptions import SystemErrorException
 
 
@@ -40,3 +40,14 @@ class AlunoBusiness(ModelInstanceBusiness):
             self.object_instance.save()
         except Exception as e:
             raise SystemErrorException('Não foi possível deletar o aluno.')
+
+
+class AlunoLoteBusiness(ModelLoteBusiness):
+    """
+    Classe de business para operações em lote sobre Aluno.
+    
+    Usada para atualizar ou desativar turmas inteiras (ex: formandos de um ano)
+    com um único UPDATE e o histórico gravado em massa.
+    """
+    mensagem_erro_atualizar = 'Não foi possível atualizar os alunos.'
+    mensagem_erro_deletar = 'Não foi possível deletar os alunos.'
@@ -1,6 +1,7 @@
 from django.db import models
 
 from AppCore.basics.models.models import BasicModel, BaseManager
+from AppCore.common.util.dependencias import depende_de
 from AppCore.core.business.business_mixin import ModelBusinessMixin
 
 from . import choices
@@ -92,6 +93,7 @@ class Aluno(ModelBusinessMixin, BasicModel):
         return f'{self.usuario.nome} - IRA: {self.ira}'
 
     @property
+    @depende_de('ano_conclusao')
     def is_formado(self):
         """Verifica se o aluno já se formou."""
         return self.ano_conclusao is not None
\ No newline at end of file
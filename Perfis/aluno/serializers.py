@@ -1,5 +1,8 @@
 from rest_framework import serializers
 
+from AppCore.basics.serializers import depende_de
+from AppCore.basics.serializers.lote import SelecaoLoteSerializer
+
 from Usuarios.usuario.serializers import (
     CampusResumoSerializer,
     ContatoListaSerializer,
@@ -30,6 +33,7 @@ class UsuarioBaseAlunoSerializer(serializers.Serializer):
     ativo = serializers.BooleanField(read_only=True)
     campus = CampusResumoSerializer(read_only=True)
 
+    @depende_de('cpf')
     def get_cpf_formatado(self, obj):
         """Retorna o CPF formatado (XXX.XXX.XXX-XX)."""
         cpf = obj.cpf
@@ -48,9 +52,13 @@ class UsuarioCompletoAlunoSerializer(UsuarioBaseAlunoSerializer):
     enderecos = EnderecoListaSerializer(many=True, read_only=True)
     setores = serializers.SerializerMethodField()
 
+    @depende_de(('usuario_setores', UsuarioSetorResumoSerializer))
     def get_setores(self, obj):
         """Retorna os setores vinculados ao usuário."""
-        usuario_setores = obj.usuario_setores.select_related('setor', 'campus').all()
+        if 'usuario_setores' in getattr(obj, '_prefetched_objects_cache', {}):
+            usuario_setores = obj.usuario_setores.all()
+        else:
+            usuario_setores = obj.usuario_setores.select_related('setor', 'campus').all()
         return UsuarioSetorResumoSerializer(usuario_setores, many=True).data
 
 
@@ -84,6 +92,7 @@ class AlunoListaSerializer(serializers.Serializer):
     ativo = serializers.BooleanField(read_only=True)
     is_formado = serializers.BooleanField(read_only=True)
 
+    @depende_de('turno')
     def get_turno_display(self, obj):
         """Retorna a descrição legível do turno."""
         return obj.get_turno_display()
@@ -129,14 +138,17 @@ class AlunoDetalheSerializer(serializers.Serializer):
     # Dados do usuário base
     usuario = UsuarioCompletoAlunoSerializer(read_only=True)
 
+    @depende_de('forma_ingresso')
     def get_forma_ingresso_display(self, obj):
         """Retorna a descrição legível da forma de ingresso."""
         return obj.get_forma_ingresso_display()
 
+    @depende_de('turno')
     def get_turno_display(self, obj):
         """Retorna a descrição legível do turno."""
         return obj.get_turno_display()
 
+    @depende_de('ano_conclusao', 'ativo', 'aluno_especial')
     def get_situacao_academica(self, obj):
         """Retorna a situação acadêmica atual do aluno."""
         if obj.is_formado:
@@ -160,6 +172,7 @@ class AlunoResumoSerializer(serializers.Serializer):
     turno_display = serializers.SerializerMethodField()
     is_formado = serializers.BooleanField(read_only=True)
 
+    @depende_de('turno')
     def get_turno_display(self, obj):
         """Retorna a descrição legível do turno."""
         return obj.get_turno_display()
@@ -183,10 +196,12 @@ class AlunoFormadoSerializer(serializers.Serializer):
     data_expedicao_diploma = serializers.DateField(read_only=True, allow_null=True)
     diploma_expedido = serializers.SerializerMethodField()
 
+    @depende_de('forma_ingresso')
     def get_forma_ingresso_display(self, obj):
         """Retorna a descrição legível da forma de ingresso."""
         return obj.get_forma_ingresso_display()
 
+    @depende_de('data_expedicao_diploma')
     def get_diploma_expedido(self, obj):
         """Verifica se o diploma foi expedido."""
         return obj.data_expedicao_diploma is not None
@@ -364,3 +379,60 @@ class AlunoEditarSerializer(serializers.Serializer):
         if value is not None and (value < 0 or value > 10):
             raise serializers.ValidationError('O IRA deve estar entre 0.00 e 10.00.')
         return value
+
+
+class AlunoEdicaoLoteSerializer(SelecaoLoteSerializer):
+    """
+    Serializer para edição em lote dos alunos.
+    
+    **Seleção (informe apenas um):**
+    - ids: Ids dos alunos
+    - filtro: Campos aceitos: ativo, turno, forma_ingresso, previsao_conclusao, aluno_especial, usuario__campus_id
+    
+    **Campos editáveis (todos opcionais):**
+    - forma_ingresso: Forma de ingresso
+    - previsao_conclusao: Ano previsto para conclusão
+    - aluno_especial: Se é aluno especial
+    - turno: Turno do aluno
+    - ativo: Se os alunos estão ativos
+    - ano_conclusao: Ano de conclusão (para formados)
+    - data_colacao: Data de colação (para formados)
+    - data_expedicao_diploma: Data de expedição do diploma (para formados)
+    """
+    forma_ingresso = serializers.ChoiceField(
+        choices=choices.FORMA_INGRESSO_OPCOES,
+        required=False,
+        help_text='Forma de ingresso dos alunos'
+    )
+    previsao_conclusao = serializers.IntegerField(
+        required=False,
+        help_text='Ano previsto para conclusão do curso'
+    )
+    aluno_especial = serializers.BooleanField(
+        required=False,
+        help_text='Se os alunos são alunos especiais'
+    )
+    turno = serializers.ChoiceField(
+        choices=choices.TURNO_OPCOES,
+        required=False,
+        help_text='Turno dos alunos'
+    )
+    ativo = serializers.BooleanField(
+        required=False,
+        help_text='Se os alunos estão ativos'
+    )
+    ano_conclusao = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text='Ano de conclusão do curso'
+    )
+    data_colacao = serializers.DateField(
+        required=False,
+        allow_null=True,
+        help_text='Data de colação de grau'
+    )
+    data_expedicao_diploma = serializers.DateField(
+        required=False,
+        allow_null=True,
+        help_text='Data de expedição do diploma'
+    )
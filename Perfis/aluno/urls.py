@@ -6,6 +6,8 @@ from Perfis.aluno.views import (
     AlunoCriarView,
     AlunoEditarView,
     AlunoDeletarView,
+    AlunoLoteView,
+    AlunoExportarView,
 )
 
 app_name = 'aluno'
@@ -16,4 +18,6 @@ urlpatterns = [
     path('<int:pk>/', AlunoDetalheView.as_view(), name='detalhe'),
     path('<int:pk>/editar/', AlunoEditarView.as_view(), name='editar'),
     path('<int:pk>/deletar/', AlunoDeletarView.as_view(), name='deletar'),
+    *AlunoLoteView.rotas_lote(),
+    path('exportar/', AlunoExportarView.as_view(), name='exportar'),
 ]
@@ -9,16 +9,21 @@ from AppCore.basics.views.basic_views import (
     BasicPutAPIView,
     BasicDeleteAPIView,
     BasicRetrieveAPIView,
+    BasicLoteAPIView,
+    BasicExportacaoAPIView,
 )
 
+from Perfis.aluno.business import AlunoLoteBusiness
 from Perfis.aluno.models import Aluno
 from Perfis.aluno.serializers import (
     AlunoListaSerializer,
     AlunoDetalheSerializer,
     AlunoCriarSerializer,
     AlunoEditarSerializer,
+    AlunoEdicaoLoteSerializer,
 )
 
+from Usuarios.usuario.exportacao import ExportacaoAlunos
 from Usuarios.usuario.models import Usuario
 
 
@@ -57,9 +62,9 @@ class AlunoListaView(IsAdminMixin, BasicGetAPIView):
     """
     serializer_class = AlunoListaSerializer
     mensagem_sucesso = 'Alunos listados com sucesso.'
-
-    def get_queryset(self):
-        return Aluno.objects.select_related('usuario', 'usuario__campus').all()
+    otimizar_queryset = True
+    serializer_compilado = True
+    queryset = Aluno.objects.all()
 
 
 @extend_schema(
@@ -93,16 +98,8 @@ class AlunoDetalheView(IsOwnerOrAdminMixin, BasicRetrieveAPIView):
     """
     serializer_class = AlunoDetalheSerializer
     mensagem_sucesso = 'Aluno recuperado com sucesso.'
-    queryset = Aluno.objects.select_related(
-        'usuario',
-        'usuario__campus'
-    ).prefetch_related(
-        'usuario__contatos',
-        'usuario__enderecos',
-        'usuario__usuario_setores',
-        'usuario__usuario_setores__setor',
-        'usuario__usuario_setores__campus',
-    )
+    otimizar_queryset = True
+    queryset = Aluno.objects.all()
     lookup_field = 'pk'
 
     def obter_usuario_dono(self, obj):
@@ -240,3 +237,46 @@ class AlunoDeletarView(IsAdminMixin, BasicDeleteAPIView):
 
     def do_action_delete(self, request):
         self.object.business.deletar_dados()
+
+
+class AlunoLoteView(IsAdminMixin, BasicLoteAPIView):
+    """
+    Edição e deleção (soft delete) de vários alunos de uma vez.
+    
+    Apenas administradores podem acessar. As rotas são geradas por `rotas_lote`.
+    """
+    business_lote_class = AlunoLoteBusiness
+    serializer_edicao_class = AlunoEdicaoLoteSerializer
+    filtros_lote = ['ativo', 'turno', 'forma_ingresso', 'previsao_conclusao', 'aluno_especial', 'usuario__campus_id']
+    tag_schema = 'Perfis.Aluno'
+    nome_plural = 'alunos'
+
+    def get_queryset(self):
+        return Aluno.objects.select_related('usuario').all()
+
+
+
+@extend_schema(
+    tags=['Perfis.Aluno'],
+    summary='Exportar alunos',
+    description='''
+    Exporta todos os alunos em CSV, NDJSON ou JSON, enviados em streaming.
+    
+    **Permissões:** Apenas administradores (is_admin ou is_superuser) podem acessar.
+    
+    **Colunas** (as mesmas da importação em `/usuarios/importar/`):
+    - Usuário: nome, cpf, data_nascimento, data_ingresso, campus (CNPJ), cargo (descrição)
+    - Perfil: perfil, ira, forma_ingresso, previsao_conclusao, aluno_especial, turno
+    - Contato, endereço e matrícula mais recentes
+    
+    Por padrão apenas alunos ativos; use `inativos=true` para incluir os inativos.
+    ''',
+)
+class AlunoExportarView(IsAdminMixin, BasicExportacaoAPIView):
+    """
+    View para exportação de todos os alunos.
+    
+    Apenas administradores podem exportar.
+    O arquivo é gerado em blocos enquanto é enviado.
+    """
+    exportacao_class = ExportacaoAlunos
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from AppCore.basics.serializers import depende_de
+
 from Usuarios.usuario.serializers import (
     CampusResumoSerializer,
     ContatoListaSerializer,
@@ -30,6 +32,7 @@ class UsuarioBaseEstagiarioSerializer(serializers.Serializer):
     ativo = serializers.BooleanField(read_only=True)
     campus = CampusResumoSerializer(read_only=True)
 
+    @depende_de('cpf')
     def get_cpf_formatado(self, obj):
         """Retorna o CPF formatado (XXX.XXX.XXX-XX)."""
         cpf = obj.cpf
@@ -48,9 +51,13 @@ class UsuarioCompletoEstagiarioSerializer(UsuarioBaseEstagiarioSerializer):
     enderecos = EnderecoListaSerializer(many=True, read_only=True)
     setores = serializers.SerializerMethodField()
 
+    @depende_de(('usuario_setores', UsuarioSetorResumoSerializer))
     def get_setores(self, obj):
         """Retorna os setores vinculados ao usuário."""
-        usuario_setores = obj.usuario_setores.select_related('setor', 'campus').all()
+        if 'usuario_setores' in getattr(obj, '_prefetched_objects_cache', {}):
+            usuario_setores = obj.usuario_setores.all()
+        else:
+            usuario_setores = obj.usuario_setores.select_related('setor', 'campus').all()
         return UsuarioSetorResumoSerializer(usuario_setores, many=True).data
 
 
@@ -84,6 +91,7 @@ class EstagiarioListaSerializer(serializers.Serializer):
     ativo = serializers.BooleanField(source='usuario.ativo', read_only=True)
     estagio_ativo = serializers.SerializerMethodField()
 
+    @depende_de('data_fim_estagio')
     def get_estagio_ativo(self, obj):
         """Verifica se o estágio está ativo."""
         from django.utils import timezone
@@ -130,10 +138,12 @@ class EstagiarioDetalheSerializer(serializers.Serializer):
     # Dados do usuário base
     usuario = UsuarioCompletoEstagiarioSerializer(read_only=True)
 
+    @depende_de('carga_horaria')
     def get_carga_horaria_mensal(self, obj):
         """Calcula a carga horária mensal estimada (semanas * carga semanal)."""
         return obj.carga_horaria * 4
 
+    @depende_de('data_fim_estagio')
     def get_estagio_ativo(self, obj):
         """Verifica se o estágio está ativo."""
         from django.utils import timezone
@@ -142,6 +152,7 @@ class EstagiarioDetalheSerializer(serializers.Serializer):
             return True
         return obj.data_fim_estagio >= timezone.now().date()
 
+    @depende_de('data_inicio_estagio', 'data_fim_estagio')
     def get_tempo_estagio_dias(self, obj):
         """Calcula o tempo de estágio em dias."""
         from django.utils import timezone
@@ -150,6 +161,7 @@ class EstagiarioDetalheSerializer(serializers.Serializer):
         delta = data_fim - obj.data_inicio_estagio
         return delta.days
 
+    @depende_de('data_inicio_estagio', 'data_fim_estagio')
     def get_tempo_estagio_meses(self, obj):
         """Calcula o tempo de estágio em meses."""
         from django.utils import timezone
@@ -158,6 +170,7 @@ class EstagiarioDetalheSerializer(serializers.Serializer):
         delta = data_fim - obj.data_inicio_estagio
         return delta.days // 30
 
+    @depende_de('data_fim_estagio')
     def get_dias_restantes_estagio(self, obj):
         """Calcula os dias restantes do estágio."""
         from django.utils import timezone
@@ -172,6 +185,7 @@ class EstagiarioDetalheSerializer(serializers.Serializer):
         delta = obj.data_fim_estagio - hoje
         return delta.days
 
+    @depende_de('data_inicio_estagio', 'data_fim_estagio', 'carga_horaria')
     def get_horas_totais_estimadas(self, obj):
         """Calcula as horas totais estimadas do estágio."""
         from django.utils import timezone
@@ -195,6 +209,7 @@ class EstagiarioResumoSerializer(serializers.Serializer):
     carga_horaria = serializers.IntegerField(read_only=True)
     estagio_ativo = serializers.SerializerMethodField()
 
+    @depende_de('data_fim_estagio')
     def get_estagio_ativo(self, obj):
         """Verifica se o estágio está ativo."""
         from django.utils import timezone
@@ -221,6 +236,7 @@ class EstagiarioPorCursoSerializer(serializers.Serializer):
     data_fim_estagio = serializers.DateField(read_only=True, allow_null=True)
     estagio_ativo = serializers.SerializerMethodField()
 
+    @depende_de('data_fim_estagio')
     def get_estagio_ativo(self, obj):
         """Verifica se o estágio está ativo."""
         from django.utils import timezone
@@ -243,6 +259,7 @@ class EstagiarioPorEmpresaSerializer(serializers.Serializer):
     data_fim_estagio = serializers.DateField(read_only=True, allow_null=True)
     estagio_ativo = serializers.SerializerMethodField()
 
+    @depende_de('data_fim_estagio')
     def get_estagio_ativo(self, obj):
         """Verifica se o estágio está ativo."""
         from django.utils import timezone
@@ -291,6 +308,7 @@ class EstagiosVencendoSerializer(serializers.Serializer):
     data_fim_estagio = serializers.DateField(read_only=True)
     dias_restantes = serializers.SerializerMethodField()
 
+    @depende_de('data_fim_estagio')
     def get_dias_restantes(self, obj):
         """Calcula os dias restantes do estágio."""
         from django.utils import timezone
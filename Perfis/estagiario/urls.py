@@ -6,6 +6,7 @@ from Perfis.estagiario.views import (
     EstagiarioCriarView,
     EstagiarioEditarView,
     EstagiarioDeletarView,
+    EstagiarioExportarView,
 )
 
 app_name = 'estagiario'
@@ -16,4 +17,5 @@ urlpatterns = [
     path('<int:pk>/', EstagiarioDetalheView.as_view(), name='detalhe'),
     path('<int:pk>/editar/', EstagiarioEditarView.as_view(), name='editar'),
     path('<int:pk>/deletar/', EstagiarioDeletarView.as_view(), name='deletar'),
+    path('exportar/', EstagiarioExportarView.as_view(), name='exportar'),
 ]
@@ -9,6 +9,7 @@ from AppCore.basics.views.basic_views import (
     BasicPutAPIView,
     BasicDeleteAPIView,
     BasicRetrieveAPIView,
+    BasicExportacaoAPIView,
 )
 
 from Perfis.estagiario.models import Estagiario
@@ -19,6 +20,7 @@ from Perfis.estagiario.serializers import (
     EstagiarioEditarSerializer,
 )
 
+from Usuarios.usuario.exportacao import ExportacaoEstagiarios
 from Usuarios.usuario.models import Usuario
 from EstruturaOrganizacional.empresa.models import Empresa
 from EstruturaOrganizacional.curso.models import Curso
@@ -59,14 +61,9 @@ class EstagiarioListaView(IsAdminMixin, BasicGetAPIView):
     """
     serializer_class = EstagiarioListaSerializer
     mensagem_sucesso = 'Estagiários listados com sucesso.'
-
-    def get_queryset(self):
-        return Estagiario.objects.select_related(
-            'usuario',
-            'usuario__campus',
-            'empresa',
-            'curso'
-        ).all()
+    otimizar_queryset = True
+    serializer_compilado = True
+    queryset = Estagiario.objects.all()
 
 
 @extend_schema(
@@ -100,18 +97,8 @@ class EstagiarioDetalheView(IsOwnerOrAdminMixin, BasicRetrieveAPIView):
     """
     serializer_class = EstagiarioDetalheSerializer
     mensagem_sucesso = 'Estagiário recuperado com sucesso.'
-    queryset = Estagiario.objects.select_related(
-        'usuario',
-        'usuario__campus',
-        'empresa',
-        'curso'
-    ).prefetch_related(
-        'usuario__contatos',
-        'usuario__enderecos',
-        'usuario__usuario_setores',
-        'usuario__usuario_setores__setor',
-        'usuario__usuario_setores__campus',
-    )
+    otimizar_queryset = True
+    queryset = Estagiario.objects.all()
     lookup_field = 'pk'
 
     def obter_usuario_dono(self, obj):
@@ -263,3 +250,29 @@ class EstagiarioDeletarView(IsAdminMixin, BasicDeleteAPIView):
 
     def do_action_delete(self, request):
         self.object.business.deletar_dados()
+
+
+@extend_schema(
+    tags=['Perfis.Estagiario'],
+    summary='Exportar estagiários',
+    description='''
+    Exporta todos os estagiários em CSV, NDJSON ou JSON, enviados em streaming.
+    
+    **Permissões:** Apenas administradores (is_admin ou is_superuser) podem acessar.
+    
+    **Colunas** (as mesmas da importação em `/usuarios/importar/`):
+    - Usuário: nome, cpf, data_nascimento, data_ingresso, campus (CNPJ), cargo (descrição)
+    - Perfil: perfil, empresa (CNPJ), curso (nome), carga_horaria, data_inicio_estagio, data_fim_estagio
+    - Contato, endereço e matrícula mais recentes
+    
+    Por padrão apenas estagiários ativos; use `inativos=true` para incluir os inativos.
+    ''',
+)
+class EstagiarioExportarView(IsAdminMixin, BasicExportacaoAPIView):
+    """
+    View para exportação de todos os estagiários.
+    
+    Apenas administradores podem exportar.
+    O arquivo é gerado em blocos enquanto é enviado.
+    """
+    exportacao_class = ExportacaoEstagiarios
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from AppCore.basics.serializers import depende_de
+
 from Usuarios.usuario.serializers import (
     CampusResumoSerializer,
     ContatoListaSerializer,
@@ -32,6 +34,7 @@ class UsuarioBaseServidorSerializer(serializers.Serializer):
     last_login = serializers.DateField(read_only=True, allow_null=True)
     campus = CampusResumoSerializer(read_only=True)
 
+    @depende_de('cpf')
     def get_cpf_formatado(self, obj):
         """Retorna o CPF formatado (XXX.XXX.XXX-XX)."""
         cpf = obj.cpf
@@ -50,9 +53,13 @@ class UsuarioCompletoServidorSerializer(UsuarioBaseServidorSerializer):
     enderecos = EnderecoListaSerializer(many=True, read_only=True)
     setores = serializers.SerializerMethodField()
 
+    @depende_de(('usuario_setores', UsuarioSetorResumoSerializer))
     def get_setores(self, obj):
         """Retorna os setores vinculados ao usuário."""
-        usuario_setores = obj.usuario_setores.select_related('setor', 'campus').all()
+        if 'usuario_setores' in getattr(obj, '_prefetched_objects_cache', {}):
+            usuario_setores = obj.usuario_setores.all()
+        else:
+            usuario_setores = obj.usuario_setores.select_related('setor', 'campus').all()
         return UsuarioSetorResumoSerializer(usuario_setores, many=True).data
 
 
@@ -84,6 +91,7 @@ class ServidorListaSerializer(serializers.Serializer):
     # Status
     ativo = serializers.BooleanField(source='usuario.ativo', read_only=True)
 
+    @depende_de('jornada_trabalho')
     def get_jornada_trabalho_display(self, obj):
         """Retorna a descrição legível da jornada de trabalho."""
         return obj.get_jornada_trabalho_display()
@@ -122,10 +130,12 @@ class ServidorDetalheSerializer(serializers.Serializer):
     # Dados do usuário base
     usuario = UsuarioCompletoServidorSerializer(read_only=True)
 
+    @depende_de('jornada_trabalho')
     def get_jornada_trabalho_display(self, obj):
         """Retorna a descrição legível da jornada de trabalho."""
         return obj.get_jornada_trabalho_display()
 
+    @depende_de('data_posse')
     def get_tempo_servico_anos(self, obj):
         """Calcula o tempo de serviço em anos."""
         from django.utils import timezone
@@ -134,6 +144,7 @@ class ServidorDetalheSerializer(serializers.Serializer):
         delta = hoje - obj.data_posse
         return delta.days // 365
 
+    @depende_de('data_posse')
     def get_tempo_servico_dias(self, obj):
         """Calcula o tempo de serviço em dias."""
         from django.utils import timezone
@@ -155,6 +166,7 @@ class ServidorResumoSerializer(serializers.Serializer):
     classe = serializers.CharField(read_only=True)
     jornada_trabalho_display = serializers.SerializerMethodField()
 
+    @depende_de('jornada_trabalho')
     def get_jornada_trabalho_display(self, obj):
         """Retorna a descrição legível da jornada de trabalho."""
         return obj.get_jornada_trabalho_display()
@@ -6,6 +6,7 @@ from Perfis.servidor.views import (
     ServidorCriarView,
     ServidorEditarView,
     ServidorDeletarView,
+    ServidorExportarView,
 )
 
 app_name = 'servidor'
@@ -16,4 +17,5 @@ urlpatterns = [
     path('<int:pk>/', ServidorDetalheView.as_view(), name='detalhe'),
     path('<int:pk>/editar/', ServidorEditarView.as_view(), name='editar'),
     path('<int:pk>/deletar/', ServidorDeletarView.as_view(), name='deletar'),
+    path('exportar/', ServidorExportarView.as_view(), name='exportar'),
 ]
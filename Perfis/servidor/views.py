@@ -9,6 +9,7 @@ from AppCore.basics.views.basic_views import (
     BasicPutAPIView,
     BasicDeleteAPIView,
     BasicRetrieveAPIView,
+    BasicExportacaoAPIView,
 )
 
 from Perfis.servidor.models import Servidor
@@ -19,6 +20,7 @@ from Perfis.servidor.serializers import (
     ServidorEditarSerializer,
 )
 
+from Usuarios.usuario.exportacao import ExportacaoServidores
 from Usuarios.usuario.models import Usuario
 
 
@@ -57,9 +59,9 @@ class ServidorListaView(IsAdminMixin, BasicGetAPIView):
     """
     serializer_class = ServidorListaSerializer
     mensagem_sucesso = 'Servidores listados com sucesso.'
-
-    def get_queryset(self):
-        return Servidor.objects.select_related('usuario', 'usuario__campus').all()
+    otimizar_queryset = True
+    serializer_compilado = True
+    queryset = Servidor.objects.all()
 
 
 @extend_schema(
@@ -93,16 +95,8 @@ class ServidorDetalheView(IsOwnerOrAdminMixin, BasicRetrieveAPIView):
     """
     serializer_class = ServidorDetalheSerializer
     mensagem_sucesso = 'Servidor recuperado com sucesso.'
-    queryset = Servidor.objects.select_related(
-        'usuario',
-        'usuario__campus'
-    ).prefetch_related(
-        'usuario__contatos',
-        'usuario__enderecos',
-        'usuario__usuario_setores',
-        'usuario__usuario_setores__setor',
-        'usuario__usuario_setores__campus',
-    )
+    otimizar_queryset = True
+    queryset = Servidor.objects.all()
     lookup_field = 'pk'
 
     def obter_usuario_dono(self, obj):
@@ -235,3 +229,29 @@ class ServidorDeletarView(IsAdminMixin, BasicDeleteAPIView):
 
     def do_action_delete(self, request):
         self.object.business.deletar_dados()
+
+
+@extend_schema(
+    tags=['Perfis.Servidor'],
+    summary='Exportar servidores',
+    description='''
+    Exporta todos os servidores em CSV, NDJSON ou JSON, enviados em streaming.
+    
+    **Permissões:** Apenas administradores (is_admin ou is_superuser) podem acessar.
+    
+    **Colunas** (as mesmas da importação em `/usuarios/importar/`):
+    - Usuário: nome, cpf, data_nascimento, data_ingresso, campus (CNPJ), cargo (descrição)
+    - Perfil: perfil, data_posse, jornada_trabalho, padrao, classe, tipo_servidor
+    - Contato, endereço e matrícula mais recentes
+    
+    Por padrão apenas servidores ativos; use `inativos=true` para incluir os inativos.
+    ''',
+)
+class ServidorExportarView(IsAdminMixin, BasicExportacaoAPIView):
+    """
+    View para exportação de todos os servidores.
+    
+    Apenas administradores podem exportar.
+    O arquivo é gerado em blocos enquanto é enviado.
+    """
+    exportacao_class = ExportacaoServidores
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from AppCore.basics.serializers import depende_de
+
 from Usuarios.usuario.serializers import (
     CampusResumoSerializer,
     ContatoListaSerializer,
@@ -29,6 +31,7 @@ class UsuarioBaseTerceirizadoSerializer(serializers.Serializer):
     ativo = serializers.BooleanField(read_only=True)
     campus = CampusResumoSerializer(read_only=True)
 
+    @depende_de('cpf')
     def get_cpf_formatado(self, obj):
         """Retorna o CPF formatado (XXX.XXX.XXX-XX)."""
         cpf = obj.cpf
@@ -47,9 +50,13 @@ class UsuarioCompletoTerceirizadoSerializer(UsuarioBaseTerceirizadoSerializer):
     enderecos = EnderecoListaSerializer(many=True, read_only=True)
     setores = serializers.SerializerMethodField()
 
+    @depende_de(('usuario_setores', UsuarioSetorResumoSerializer))
     def get_setores(self, obj):
         """Retorna os setores vinculados ao usuário."""
-        usuario_setores = obj.usuario_setores.select_related('setor', 'campus').all()
+        if 'usuario_setores' in getattr(obj, '_prefetched_objects_cache', {}):
+            usuario_setores = obj.usuario_setores.all()
+        else:
+            usuario_setores = obj.usuario_setores.select_related('setor', 'campus').all()
         return UsuarioSetorResumoSerializer(usuario_setores, many=True).data
 
 
@@ -81,6 +88,7 @@ class TerceirizadoListaSerializer(serializers.Serializer):
     ativo = serializers.BooleanField(source='usuario.ativo', read_only=True)
     contrato_ativo = serializers.SerializerMethodField()
 
+    @depende_de('data_fim_contrato')
     def get_contrato_ativo(self, obj):
         """Verifica se o contrato está ativo."""
         from django.utils import timezone
@@ -123,6 +131,7 @@ class TerceirizadoDetalheSerializer(serializers.Serializer):
     # Dados do usuário base
     usuario = UsuarioCompletoTerceirizadoSerializer(read_only=True)
 
+    @depende_de('data_fim_contrato')
     def get_contrato_ativo(self, obj):
         """Verifica se o contrato está ativo."""
         from django.utils import timezone
@@ -131,6 +140,7 @@ class TerceirizadoDetalheSerializer(serializers.Serializer):
             return True
         return obj.data_fim_contrato >= timezone.now().date()
 
+    @depende_de('data_inicio_contrato', 'data_fim_contrato')
     def get_tempo_contrato_dias(self, obj):
         """Calcula o tempo de contrato em dias."""
         from django.utils import timezone
@@ -139,6 +149,7 @@ class TerceirizadoDetalheSerializer(serializers.Serializer):
         delta = data_fim - obj.data_inicio_contrato
         return delta.days
 
+    @depende_de('data_inicio_contrato', 'data_fim_contrato')
     def get_tempo_contrato_meses(self, obj):
         """Calcula o tempo de contrato em meses."""
         from django.utils import timezone
@@ -147,6 +158,7 @@ class TerceirizadoDetalheSerializer(serializers.Serializer):
         delta = data_fim - obj.data_inicio_contrato
         return delta.days // 30
 
+    @depende_de('data_fim_contrato')
     def get_dias_restantes_contrato(self, obj):
         """Calcula os dias restantes do contrato."""
         from django.utils import timezone
@@ -173,6 +185,7 @@ class TerceirizadoResumoSerializer(serializers.Serializer):
     empresa_nome = serializers.CharField(source='empresa.nome', read_only=True)
     contrato_ativo = serializers.SerializerMethodField()
 
+    @depende_de('data_fim_contrato')
     def get_contrato_ativo(self, obj):
         """Verifica se o contrato está ativo."""
         from django.utils import timezone
@@ -197,6 +210,7 @@ class TerceirizadoPorEmpresaSerializer(serializers.Serializer):
     data_fim_contrato = serializers.DateField(read_only=True, allow_null=True)
     contrato_ativo = serializers.SerializerMethodField()
 
+    @depende_de('data_fim_contrato')
     def get_contrato_ativo(self, obj):
         """Verifica se o contrato está ativo."""
         from django.utils import timezone
@@ -221,6 +235,7 @@ class EmpresaComTerceirizadosSerializer(serializers.Serializer):
     total_terceirizados = serializers.SerializerMethodField()
     total_contratos_ativos = serializers.SerializerMethodField()
 
+    @depende_de('cnpj')
     def get_cnpj_formatado(self, obj):
         """Retorna o CNPJ formatado (XX.XXX.XXX/XXXX-XX)."""
         cnpj = obj.cnpj
@@ -253,6 +268,7 @@ class ContratosVencendoSerializer(serializers.Serializer):
     data_fim_contrato = serializers.DateField(read_only=True)
     dias_restantes = serializers.SerializerMethodField()
 
+    @depende_de('data_fim_contrato')
     def get_dias_restantes(self, obj):
         """Calcula os dias restantes do contrato."""
         from django.utils import timezone
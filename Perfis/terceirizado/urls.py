@@ -6,6 +6,7 @@ from Perfis.terceirizado.views import (
     TerceirizadoCriarView,
     TerceirizadoEditarView,
     TerceirizadoDeletarView,
+    TerceirizadoExportarView,
 )
 
 app_name = 'terceirizado'
@@ -16,4 +17,5 @@ urlpatterns = [
     path('<int:pk>/', TerceirizadoDetalheView.as_view(), name='detalhe'),
     path('<int:pk>/editar/', TerceirizadoEditarView.as_view(), name='editar'),
     path('<int:pk>/deletar/', TerceirizadoDeletarView.as_view(), name='deletar'),
+    path('exportar/', TerceirizadoExportarView.as_view(), name='exportar'),
 ]
@@ -9,6 +9,7 @@ from AppCore.basics.views.basic_views import (
     BasicPutAPIView,
     BasicDeleteAPIView,
     BasicRetrieveAPIView,
+    BasicExportacaoAPIView,
 )
 
 from Perfis.terceirizado.models import Terceirizado
@@ -19,6 +20,7 @@ from Perfis.terceirizado.serializers import (
     TerceirizadoEditarSerializer,
 )
 
+from Usuarios.usuario.exportacao import ExportacaoTerceirizados
 from Usuarios.usuario.models import Usuario
 from EstruturaOrganizacional.empresa.models import Empresa
 
@@ -58,13 +60,9 @@ class TerceirizadoListaView(IsAdminMixin, BasicGetAPIView):
     """
     serializer_class = TerceirizadoListaSerializer
     mensagem_sucesso = 'Terceirizados listados com sucesso.'
-
-    def get_queryset(self):
-        return Terceirizado.objects.select_related(
-            'usuario',
-            'usuario__campus',
-            'empresa'
-        ).all()
+    otimizar_queryset = True
+    serializer_compilado = True
+    queryset = Terceirizado.objects.all()
 
 
 @extend_schema(
@@ -98,17 +96,8 @@ class TerceirizadoDetalheView(IsOwnerOrAdminMixin, BasicRetrieveAPIView):
     """
     serializer_class = TerceirizadoDetalheSerializer
     mensagem_sucesso = 'Terceirizado recuperado com sucesso.'
-    queryset = Terceirizado.objects.select_related(
-        'usuario',
-        'usuario__campus',
-        'empresa'
-    ).prefetch_related(
-        'usuario__contatos',
-        'usuario__enderecos',
-        'usuario__usuario_setores',
-        'usuario__usuario_setores__setor',
-        'usuario__usuario_setores__campus',
-    )
+    otimizar_queryset = True
+    queryset = Terceirizado.objects.all()
     lookup_field = 'pk'
 
     def obter_usuario_dono(self, obj):
@@ -251,3 +240,29 @@ class TerceirizadoDeletarView(IsAdminMixin, BasicDeleteAPIView):
 
     def do_action_delete(self, request):
         self.object.business.deletar_dados()
+
+
+@extend_schema(
+    tags=['Perfis.Terceirizado'],
+    summary='Exportar terceirizados',
+    description='''
+    Exporta todos os terceirizados em CSV, NDJSON ou JSON, enviados em streaming.
+    
+    **Permissões:** Apenas administradores (is_admin ou is_superuser) podem acessar.
+    
+    **Colunas** (as mesmas da importação em `/usuarios/importar/`):
+    - Usuário: nome, cpf, data_nascimento, data_ingresso, campus (CNPJ), cargo (descrição)
+    - Perfil: perfil, empresa (CNPJ), data_inicio_contrato, data_fim_contrato
+    - Contato, endereço e matrícula mais recentes
+    
+    Por padrão apenas terceirizados ativos; use `inativos=true` para incluir os inativos.
+    ''',
+)
+class TerceirizadoExportarView(IsAdminMixin, BasicExportacaoAPIView):
+    """
+    View para exportação de todos os terceirizados.
+    
+    Apenas administradores podem exportar.
+    O arquivo é gerado em blocos enquanto é enviado.
+    """
+    exportacao_class = ExportacaoTerceirizados
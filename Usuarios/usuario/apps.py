@@ -11,6 +11,13 @@ class UsuarioConfig(AppConfig):
         from django.db.models.signals import post_migrate
         post_migrate.connect(garantir_admin_padrao, sender=self)
 
+        from Usuarios.usuario.signals import conectar_signal_ultimo_login, conectar_signals_snapshot
+        conectar_signals_snapshot()
+        conectar_signal_ultimo_login()
+
+        from AppCore.basics.cache.signals import conectar_signals_cache_respostas
+        conectar_signals_cache_respostas()
+
 
 def garantir_admin_padrao(sender, **kwargs):
     """
@@ -1,5 +1,73 @@
+import io
+import os
+import tempfile
+
 from AppCore.core.business.business import ModelInstanceBusiness
+from AppCore.core.exceptions.exceptions import SystemErrorException, ValidationException
+
+from Monitoramento.tarefas.tarefas import iniciar_tarefa
+from Usuarios.usuario.importacao import ImportadorUsuarios, TAMANHO_LOTE_IMPORTACAO
 
 
 class UsuarioBusiness(ModelInstanceBusiness):
-    pass
+    def importar_em_massa(self, arquivo, formato, usuario_responsavel=None, tamanho_lote=TAMANHO_LOTE_IMPORTACAO):
+        """
+        Importa usuários (com perfil, contato, endereço e matrícula) de um arquivo de texto.
+
+        Args:
+            arquivo: Arquivo de texto aberto (CSV ou JSONL)
+            formato: 'csv' ou 'jsonl'
+            usuario_responsavel: Autor registrado no histórico das inserções
+            tamanho_lote: Linhas gravadas por transação
+
+        Returns:
+            dict: Relatório da importação (total_linhas, importados, com_erro, erros)
+
+        Raises:
+            ValidationException: Se o arquivo não estiver em UTF-8
+            SystemErrorException: Se a importação falhar
+        """
+        try:
+            importador = ImportadorUsuarios(usuario_responsavel=usuario_responsavel, tamanho_lote=tamanho_lote)
+            return importador.importar(arquivo, formato)
+        except UnicodeDecodeError:
+            raise ValidationException('O arquivo deve estar codificado em UTF-8.')
+        except Exception as e:
+            raise SystemErrorException('Não foi possível importar os usuários.')
+
+    def importar_arquivo_enviado(self, arquivo_enviado, formato, usuario_responsavel=None):
+        """Importa um arquivo recebido por upload, na própria requisição."""
+        arquivo_enviado.open('rb')
+        texto = io.TextIOWrapper(arquivo_enviado.file, encoding='utf-8-sig', newline='')
+        try:
+            return self.importar_em_massa(texto, formato, usuario_responsavel)
+        finally:
+            texto.detach()
+
+    def importar_em_segundo_plano(self, arquivo_enviado, formato, usuario_responsavel=None):
+        """
+        Copia o upload para um arquivo temporário e agenda a importação em segundo plano.
+
+        Returns:
+            str: Id da tarefa, consultado em `obter_tarefa`
+        """
+        try:
+            with tempfile.NamedTemporaryFile(suffix=f'.{formato}', delete=False) as destino:
+                for parte in arquivo_enviado.chunks():
+                    destino.write(parte)
+        except Exception as e:
+            raise SystemErrorException('Não foi possível receber o arquivo de importação.')
+
+        def executar():
+            try:
+                with open(destino.name, encoding='utf-8-sig', newline='') as texto:
+                    return self.importar_em_massa(texto, formato, usuario_responsavel)
+            finally:
+                os.remove(destino.name)
+
+        try:
+            return iniciar_tarefa('importacao_usuarios', executar)
+        except Exception:
+            # Sem a tarefa agendada, ninguém mais removeria o arquivo temporário
+            os.remove(destino.name)
+            raise
@@ -0,0 +1,241 @@
+"""
+Exportação em massa de usuários, perfis e vínculos com setores.
+
+As exportações de perfil (alunos, servidores, terceirizados e estagiários) usam as
+mesmas colunas da importação (`importacao.py`): referências pela chave natural (campus
+e empresa pelo CNPJ, cargo pela descrição, curso pelo nome), mais contato, endereço e
+matrícula. O arquivo exportado pode ser reimportado em outra base (sem as senhas).
+
+Contatos, endereços, matrículas, perfis e setores são buscados uma vez por bloco de
+usuários (ver `Exportacao.montar_linhas`), com o contato, o endereço e a matrícula mais
+recentes de cada usuário (apenas matrículas ativas, salvo com `incluir_inativos`).
+
+Exemplo de uso:
+    exportacao = criar_exportacao('alunos')
+    for pedaco in gerar_exportacao(exportacao, 'csv'):
+        arquivo.write(pedaco)
+"""
+from django.db.models import Q
+from django.utils import timezone
+
+from AppCore.basics.exportacao import Exportacao, TAMANHO_BLOCO_EXPORTACAO
+from AppCore.core.exceptions.exceptions import ValidationException
+
+from Perfis.aluno.models import Aluno
+from Perfis.estagiario.models import Estagiario
+from Perfis.servidor.models import Servidor
+from Perfis.terceirizado.models import Terceirizado
+from Usuarios.usuario.importacao import CAMPOS_ENDERECO, CAMPOS_USUARIO
+from Usuarios.usuario.models import Contato, Endereco, Usuario
+from Usuarios.usuario_setor.models import UsuarioSetor
+from Vinculos.matricula.models import Matricula
+
+
+# Colunas de contato, endereço e matrícula (as mesmas da importação)
+COLUNAS_COMPLEMENTARES = ['email', 'telefone', *CAMPOS_ENDERECO, 'matricula', 'matricula_validade']
+
+# Perfil → (model, {coluna: lookup a partir do perfil}); referências pela chave natural da importação
+COLUNAS_PERFIL = {
+    'aluno': (Aluno, {
+        'ira': 'ira', 'forma_ingresso': 'forma_ingresso', 'previsao_conclusao': 'previsao_conclusao',
+        'aluno_especial': 'aluno_especial', 'turno': 'turno',
+    }),
+    'servidor': (Servidor, {
+        'data_posse': 'data_posse', 'jornada_trabalho': 'jornada_trabalho', 'padrao': 'padrao',
+        'classe': 'classe', 'tipo_servidor': 'tipo_servidor',
+    }),
+    'terceirizado': (Terceirizado, {
+        'empresa': 'empresa__cnpj', 'data_inicio_contrato': 'data_inicio_contrato',
+        'data_fim_contrato': 'data_fim_contrato',
+    }),
+    'estagiario': (Estagiario, {
+        'empresa': 'empresa__cnpj', 'curso': 'curso__nome', 'carga_horaria': 'carga_horaria',
+        'data_inicio_estagio': 'data_inicio_estagio', 'data_fim_estagio': 'data_fim_estagio',
+    }),
+}
+
+
+def _mais_recentes(queryset, campos):
+    """Retorna {usuario_id: {campo: valor}} com o primeiro registro de cada usuário (na ordenação do model)."""
+    registros = {}
+    for dados in queryset.values('usuario_id', *campos):
+        registros.setdefault(dados['usuario_id'], dados)
+    return registros
+
+
+class ExportacaoUsuarios(Exportacao):
+    """
+    Usuários com campus, cargo, perfis, setores, contato, endereço e matrícula.
+
+    Subclasses com `perfil` exportam apenas os usuários daquele perfil, com as colunas
+    dele no formato da importação.
+
+    Args:
+        incluir_inativos: Inclui usuários (ou perfis) e matrículas inativos
+        tamanho_bloco: Registros buscados do banco e codificados por vez
+    """
+    nome = 'usuarios'
+    perfil = None
+
+    def __init__(self, incluir_inativos=False, tamanho_bloco=TAMANHO_BLOCO_EXPORTACAO):
+        super().__init__(tamanho_bloco)
+        self.incluir_inativos = incluir_inativos
+
+        if self.perfil is None:
+            self.colunas_perfil = {}
+            colunas_perfil = ['ativo', 'perfis', 'setores']
+        else:
+            self.colunas_perfil = {
+                coluna: f'{self.perfil}__{lookup}' for coluna, lookup in COLUNAS_PERFIL[self.perfil][1].items()
+            }
+            colunas_perfil = ['perfil', *self.colunas_perfil]
+
+        self.colunas = [*CAMPOS_USUARIO, 'campus', 'cargo', *colunas_perfil, *COLUNAS_COMPLEMENTARES]
+
+    def obter_queryset(self):
+        queryset = Usuario.objects.all()
+        if self.perfil is not None:
+            queryset = queryset.filter(**{f'{self.perfil}__isnull': False})
+            if not self.incluir_inativos and hasattr(COLUNAS_PERFIL[self.perfil][0], 'ativo'):
+                queryset = queryset.filter(**{f'{self.perfil}__ativo': True})
+        if not self.incluir_inativos:
+            queryset = queryset.filter(ativo=True)
+        return queryset.order_by('pk')
+
+    def obter_valores(self):
+        return ['pk', *CAMPOS_USUARIO, 'ativo', 'campus__cnpj', 'cargo__descricao', *self.colunas_perfil.values()]
+
+    def montar_linhas(self, bloco):
+        ids = [dados['pk'] for dados in bloco]
+
+        contatos = _mais_recentes(Contato._base_manager.filter(usuario_id__in=ids), ['email', 'telefone'])
+        enderecos = _mais_recentes(Endereco._base_manager.filter(usuario_id__in=ids), CAMPOS_ENDERECO)
+        matriculas = Matricula._base_manager.filter(usuario_id__in=ids)
+        if not self.incluir_inativos:
+            matriculas = matriculas.filter(ativo=True)
+        matriculas = _mais_recentes(matriculas, ['matricula', 'data_validade'])
+        if self.perfil is None:
+            perfis = self.buscar_perfis(ids)
+            setores = self.buscar_setores(ids)
+
+        linhas = []
+        for dados in bloco:
+            usuario_id = dados['pk']
+            linha = {campo: dados[campo] for campo in CAMPOS_USUARIO}
+            linha['campus'] = dados['campus__cnpj']
+            linha['cargo'] = dados['cargo__descricao']
+
+            if self.perfil is None:
+                linha['ativo'] = dados['ativo']
+                linha['perfis'] = perfis.get(usuario_id, [])
+                linha['setores'] = setores.get(usuario_id, [])
+            else:
+                linha['perfil'] = self.perfil
+                for coluna, lookup in self.colunas_perfil.items():
+                    linha[coluna] = dados[lookup]
+
+            contato = contatos.get(usuario_id, {})
+            endereco = enderecos.get(usuario_id, {})
+            matricula = matriculas.get(usuario_id, {})
+            linha['email'] = contato.get('email')
+            linha['telefone'] = contato.get('telefone')
+            for campo in CAMPOS_ENDERECO:
+                linha[campo] = endereco.get(campo)
+            linha['matricula'] = matricula.get('matricula')
+            linha['matricula_validade'] = matricula.get('data_validade')
+            linhas.append(linha)
+
+        return linhas
+
+    def buscar_perfis(self, ids):
+        """Retorna {usuario_id: [perfis]} do bloco, uma consulta por tipo de perfil."""
+        perfis = {}
+        for perfil, (model, _) in COLUNAS_PERFIL.items():
+            for usuario_id in model._base_manager.filter(usuario_id__in=ids).values_list('usuario_id', flat=True):
+                perfis.setdefault(usuario_id, []).append(perfil)
+        return perfis
+
+    def buscar_setores(self, ids):
+        """Retorna {usuario_id: [nomes dos setores atuais]} do bloco."""
+        setores = {}
+        vinculos = UsuarioSetor._base_manager.filter(
+            Q(data_saida__isnull=True) | Q(data_saida__gte=timezone.localdate()), usuario_id__in=ids
+        ).order_by('setor__nome').values_list('usuario_id', 'setor__nome')
+        for usuario_id, nome in vinculos:
+            setores.setdefault(usuario_id, []).append(nome)
+        return setores
+
+
+class ExportacaoAlunos(ExportacaoUsuarios):
+    nome = 'alunos'
+    perfil = 'aluno'
+
+
+class ExportacaoServidores(ExportacaoUsuarios):
+    nome = 'servidores'
+    perfil = 'servidor'
+
+
+class ExportacaoTerceirizados(ExportacaoUsuarios):
+    nome = 'terceirizados'
+    perfil = 'terceirizado'
+
+
+class ExportacaoEstagiarios(ExportacaoUsuarios):
+    nome = 'estagiarios'
+    perfil = 'estagiario'
+
+
+class ExportacaoSetoresUsuarios(Exportacao):
+    """
+    Vínculos de usuários com setores (uma linha por vínculo).
+
+    Args:
+        incluir_inativos: Inclui os vínculos encerrados (com data de saída passada)
+        tamanho_bloco: Registros buscados do banco e codificados por vez
+    """
+    nome = 'setores-usuarios'
+    colunas = ['cpf', 'nome', 'setor', 'sigla', 'campus', 'e_responsavel', 'monitor', 'data_entrada', 'data_saida']
+
+    valores = {
+        'cpf': 'usuario__cpf', 'nome': 'usuario__nome', 'setor': 'setor__nome', 'sigla': 'setor__sigla',
+        'campus': 'campus__cnpj', 'e_responsavel': 'e_responsavel', 'monitor': 'monitor',
+        'data_entrada': 'data_entrada', 'data_saida': 'data_saida',
+    }
+
+    def __init__(self, incluir_inativos=False, tamanho_bloco=TAMANHO_BLOCO_EXPORTACAO):
+        super().__init__(tamanho_bloco)
+        self.incluir_inativos = incluir_inativos
+
+    def obter_queryset(self):
+        queryset = UsuarioSetor._base_manager.all()
+        if not self.incluir_inativos:
+            queryset = queryset.filter(Q(data_saida__isnull=True) | Q(data_saida__gte=timezone.localdate()))
+        return queryset.order_by('pk')
+
+    def obter_valores(self):
+        return list(self.valores.values())
+
+    def montar_linhas(self, bloco):
+        return [{coluna: dados[lookup] for coluna, lookup in self.valores.items()} for dados in bloco]
+
+
+EXPORTACOES = {
+    exportacao_class.nome: exportacao_class
+    for exportacao_class in (
+        ExportacaoUsuarios, ExportacaoAlunos, ExportacaoServidores, ExportacaoTerceirizados,
+        ExportacaoEstagiarios, ExportacaoSetoresUsuarios,
+    )
+}
+
+
+def criar_exportacao(nome, **kwargs):
+    """
+    Retorna a exportação pelo nome (ver `EXPORTACOES`).
+
+    Raises:
+        ValidationException: Se não houver exportação com o nome
+    """
+    if nome not in EXPORTACOES:
+        raise ValidationException(f'Exportação inválida. Use {", ".join(EXPORTACOES)}.')
+    return EXPORTACOES[nome](**kwargs)
@@ -1,7 +1,87 @@
+from django.conf import settings
+from django.db import router
+from django.db.models import Prefetch
 from django.utils import timezone
 
+from AppCore.basics.cache import CacheVersionado
 from AppCore.core.helpers.helpers import ModelInstanceHelpers
 
+from EstruturaOrganizacional.atividade.models import Atividade
+from Usuarios.usuario.models import Usuario
+from Usuarios.usuario_setor.models import UsuarioSetor
+
+
+# Snapshots por usuário (payload de login e perfil completo), invalidados pelos signals do app
+snapshot_usuario = CacheVersionado('snapshot_usuario')
+
+# Principal das requisições autenticadas: mesmas versões do `snapshot_usuario` (invalidado pelos mesmos
+# signals, ao salvar o usuário), mas com validade curta
+principal_usuario = CacheVersionado(
+    'snapshot_usuario', timeout=getattr(settings, 'AUTENTICACAO_CACHE_TIMEOUT', 60)
+)
+
+# Campos do usuário carregados no principal; os demais são buscados do banco se acessados
+CAMPOS_PRINCIPAL = ['id', 'cpf', 'nome', 'campus_id', 'cargo_id', 'ativo', 'is_admin', 'is_staff', 'is_superuser']
+
+
+def obter_usuario_contexto_login(usuario_id):
+    """
+    Carrega o usuário com tudo o que o payload de login precisa.
+
+    Perfis, empresa/curso e campus vêm via select_related; os vínculos ativos
+    (`usuario_setores_ativos`), com atividades e funções, via prefetch. São sempre
+    4 queries, independente de quantos setores, atividades e funções existam.
+
+    Args:
+        usuario_id: ID do usuário autenticado
+
+    Returns:
+        Usuario: Instância com os caches de perfis e vínculos ativos preenchidos
+    """
+    return Usuario.objects.select_related(
+        'campus',
+        'servidor',
+        'aluno',
+        'terceirizado__empresa',
+        'estagiario__empresa',
+        'estagiario__curso',
+    ).prefetch_related(
+        Prefetch(
+            'usuario_setores',
+            queryset=UsuarioSetor.objects.filter(data_saida__isnull=True).select_related('setor', 'campus'),
+            to_attr='usuario_setores_ativos',
+        ),
+        Prefetch(
+            'usuario_setores_ativos__setor__atividades',
+            queryset=Atividade.objects.prefetch_related('funcoes'),
+        ),
+    ).get(pk=usuario_id)
+
+
+def obter_principal_usuario(usuario_id):
+    """
+    Retorna o usuário autenticado a partir do cache (`principal_usuario`), sem consultar o banco.
+
+    A instância é um `Usuario` com apenas os `CAMPOS_PRINCIPAL` carregados, como em um
+    `.only()`: compara igual ao usuário do banco, pode ser atribuída a chaves estrangeiras
+    (ex: `history_user`) e busca os demais campos só se forem acessados.
+
+    Args:
+        usuario_id: ID do usuário (claim do token)
+
+    Returns:
+        Usuario ou None se o usuário não existir
+    """
+    def carregar():
+        return Usuario._base_manager.filter(pk=usuario_id).values(*CAMPOS_PRINCIPAL).first()
+
+    dados = principal_usuario.obter('principal', usuario_id, carregar)
+    if dados is None:
+        return None
+
+    campos = [campo.attname for campo in Usuario._meta.concrete_fields if campo.attname in dados]
+    return Usuario.from_db(router.db_for_read(Usuario), campos, [dados[campo] for campo in campos])
+
 
 class UsuarioHelper(ModelInstanceHelpers):
     pass
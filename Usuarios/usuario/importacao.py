@@ -0,0 +1,378 @@
+"""
+Importação em massa de usuários com perfis, contatos, endereço e matrícula.
+
+O arquivo (CSV ou JSONL) é lido em streaming, uma linha por vez, e gravado em lotes:
+cada lote é validado, tem as chaves estrangeiras resolvidas por mapas em memória
+(carregados uma única vez) e é inserido com `bulk_create_with_history`, gerando também
+os registros de histórico em massa. Linhas inválidas não interrompem a importação;
+elas entram no relatório final com o número da linha e os erros encontrados.
+
+Colunas aceitas (uma linha por usuário):
+- Usuário: nome, cpf, data_nascimento, data_ingresso, campus (CNPJ), cargo (descrição), senha
+- Perfil: perfil (aluno, servidor, terceirizado ou estagiario) e os campos do perfil
+- Contato: email, telefone
+- Endereço: logradouro, bairro, cep, num_casa, cidade, estado
+- Matrícula: matricula, matricula_validade
+
+Exemplo de uso:
+    with open('usuarios.csv', encoding='utf-8-sig', newline='') as arquivo:
+        relatorio = ImportadorUsuarios(usuario_responsavel=request.user).importar(arquivo, 'csv')
+"""
+import csv
+import json
+import os
+
+from django.db import DatabaseError, transaction
+from simple_history.utils import bulk_create_with_history
+
+from AppCore.basics.cache import cache_respostas
+from AppCore.basics.exportacao import desproteger_valor_csv
+from AppCore.common.util.senhas import HashSenhasEmLote
+from AppCore.core.exceptions.exceptions import ValidationException
+
+from EstruturaOrganizacional.campus.models import Campus
+from EstruturaOrganizacional.cargo.models import Cargo
+from EstruturaOrganizacional.curso.models import Curso
+from EstruturaOrganizacional.empresa.models import Empresa
+from Perfis.aluno.models import Aluno
+from Perfis.estagiario.models import Estagiario
+from Perfis.servidor.models import Servidor
+from Perfis.terceirizado.models import Terceirizado
+from Usuarios.usuario.models import Contato, Endereco, Usuario
+from Usuarios.usuario.serializers import LinhaImportacaoUsuarioSerializer
+from Vinculos.matricula.models import Matricula
+
+
+FORMATOS_IMPORTACAO = ['csv', 'jsonl']
+
+TAMANHO_LOTE_IMPORTACAO = 500
+
+CAMPOS_USUARIO = ['nome', 'cpf', 'data_nascimento', 'data_ingresso']
+
+CAMPOS_PERFIL = {
+    'aluno': (Aluno, ['ira', 'forma_ingresso', 'previsao_conclusao', 'aluno_especial', 'turno']),
+    'servidor': (Servidor, ['data_posse', 'jornada_trabalho', 'padrao', 'classe', 'tipo_servidor']),
+    'terceirizado': (Terceirizado, ['empresa_id', 'data_inicio_contrato', 'data_fim_contrato']),
+    'estagiario': (Estagiario, ['empresa_id', 'curso_id', 'carga_horaria', 'data_inicio_estagio', 'data_fim_estagio']),
+}
+
+CAMPOS_ENDERECO = ['logradouro', 'bairro', 'cep', 'num_casa', 'cidade', 'estado']
+
+
+def deduzir_formato(nome_arquivo, formato=None):
+    """
+    Retorna o formato informado ou, na falta dele, o deduzido pela extensão do arquivo.
+
+    Raises:
+        ValidationException: Se o formato não for suportado nem puder ser deduzido
+    """
+    if not formato:
+        extensao = os.path.splitext(nome_arquivo or '')[1].lstrip('.').lower()
+        formato = 'jsonl' if extensao == 'ndjson' else extensao
+
+    if formato not in FORMATOS_IMPORTACAO:
+        raise ValidationException('Informe o formato do arquivo (csv ou jsonl).')
+    return formato
+
+
+def ler_linhas(arquivo, formato):
+    """
+    Lê o arquivo em streaming e gera (número da linha, dados) para cada registro.
+
+    Valores vazios são descartados, para que os campos opcionais fiquem ausentes
+    em vez de chegarem como string vazia aos validadores.
+
+    Args:
+        arquivo: Arquivo de texto aberto (ou qualquer iterável de linhas)
+        formato: 'csv' (separador ',' ou ';', detectado pelo cabeçalho) ou 'jsonl'
+    """
+    if formato == 'csv':
+        linhas = iter(arquivo)
+        cabecalho = next(linhas, '')
+        delimitador = ';' if cabecalho.count(';') > cabecalho.count(',') else ','
+        colunas = [coluna.strip() for coluna in next(csv.reader([cabecalho], delimiter=delimitador), [])]
+
+        leitor = csv.reader(linhas, delimiter=delimitador)
+        for valores in leitor:
+            if not any(valor.strip() for valor in valores):
+                continue
+            # `line_num` conta as linhas físicas lidas (campos entre aspas podem ter quebras de linha)
+            valores = [desproteger_valor_csv(valor) for valor in valores]
+            yield leitor.line_num + 1, _limpar(dict(zip(colunas, valores)))
+        return
+
+    for numero, linha in enumerate(arquivo, start=1):
+        if not linha.strip():
+            continue
+        try:
+            dados = json.loads(linha)
+        except ValueError:
+            dados = None
+        if not isinstance(dados, dict):
+            yield numero, None
+            continue
+        yield numero, _limpar(dados)
+
+
+def _limpar(dados):
+    limpos = {}
+    for campo, valor in dados.items():
+        if isinstance(valor, str):
+            valor = valor.strip()
+        if valor is None or valor == '':
+            continue
+        limpos[str(campo).strip()] = valor
+    return limpos
+
+
+class ImportadorUsuarios:
+    """
+    Pipeline de importação em massa de usuários.
+
+    Args:
+        usuario_responsavel: Usuário registrado no histórico como autor das inserções
+        tamanho_lote: Quantidade de linhas gravadas por transação
+    """
+
+    def __init__(self, usuario_responsavel=None, tamanho_lote=TAMANHO_LOTE_IMPORTACAO):
+        self.usuario_responsavel = usuario_responsavel
+        self.tamanho_lote = tamanho_lote
+        self.mapas = None
+        self.hash_senhas = None
+        self.cpfs_vistos = set()
+        self.matriculas_vistas = set()
+        self.relatorio = {'total_linhas': 0, 'importados': 0, 'com_erro': 0, 'erros': []}
+
+    # ========================================================================
+    # ENTRADA
+    # ========================================================================
+
+    def importar(self, arquivo, formato):
+        """
+        Importa todas as linhas do arquivo e retorna o relatório.
+
+        Returns:
+            dict: total_linhas, importados, com_erro e erros (linha, cpf e erros de cada linha rejeitada)
+        """
+        self.mapas = self.carregar_mapas()
+
+        self.hash_senhas = HashSenhasEmLote()
+
+        lote = []
+        for numero, dados in ler_linhas(arquivo, formato):
+            self.relatorio['total_linhas'] += 1
+
+            linha = self.validar_linha(numero, dados)
+            if linha is None:
+                continue
+
+            lote.append(linha)
+            if len(lote) >= self.tamanho_lote:
+                self.processar_lote(lote)
+                lote = []
+
+        if lote:
+            self.processar_lote(lote)
+
+        return self.relatorio
+
+    def carregar_mapas(self):
+        """
+        Carrega os mapas chave natural → id das entidades referenciadas pelas linhas.
+
+        Cursos não têm nome único; nomes repetidos ficam mapeados para None e são
+        rejeitados como ambíguos.
+        """
+        cursos = {}
+        for id_curso, nome in Curso.objects.filter().values_list('id', 'nome'):
+            cursos[nome] = None if nome in cursos else id_curso
+
+        return {
+            'campus': dict(Campus.objects.filter().values_list('cnpj', 'id')),
+            'cargo': dict(Cargo.objects.filter().values_list('descricao', 'id')),
+            'empresa': dict(Empresa.objects.filter().values_list('cnpj', 'id')),
+            'curso': cursos,
+        }
+
+    # ========================================================================
+    # VALIDAÇÃO
+    # ========================================================================
+
+    def registrar_erro(self, numero, cpf, erros):
+        self.relatorio['com_erro'] += 1
+        self.relatorio['erros'].append({'linha': numero, 'cpf': cpf, 'erros': erros})
+
+    def validar_linha(self, numero, dados):
+        """Valida a linha e resolve suas referências; retorna None quando ela é rejeitada."""
+        if dados is None:
+            self.registrar_erro(numero, None, {'linha': ['Linha não é um objeto JSON válido.']})
+            return None
+
+        serializer = LinhaImportacaoUsuarioSerializer(data=dados)
+        if not serializer.is_valid():
+            erros = {campo: [str(erro) for erro in lista] for campo, lista in serializer.errors.items()}
+            self.registrar_erro(numero, dados.get('cpf'), erros)
+            return None
+
+        linha = dict(serializer.validated_data)
+        erros = self.resolver_referencias(linha)
+
+        if linha['cpf'] in self.cpfs_vistos:
+            erros['cpf'] = ['CPF repetido no arquivo.']
+        if linha.get('matricula') and linha['matricula'] in self.matriculas_vistas:
+            erros['matricula'] = ['Matrícula repetida no arquivo.']
+
+        if erros:
+            self.registrar_erro(numero, linha['cpf'], erros)
+            return None
+
+        self.cpfs_vistos.add(linha['cpf'])
+        if linha.get('matricula'):
+            self.matriculas_vistas.add(linha['matricula'])
+
+        linha['numero'] = numero
+        return linha
+
+    def resolver_referencias(self, linha):
+        """Troca as chaves naturais (CNPJ, descrição, nome) pelos ids dos mapas em memória."""
+        erros = {}
+        referencias = [
+            ('campus', 'campus', 'Campus'),
+            ('cargo', 'cargo', 'Cargo'),
+            ('empresa', 'empresa', 'Empresa'),
+            ('curso', 'curso', 'Curso'),
+        ]
+
+        for campo, mapa, rotulo in referencias:
+            if campo not in linha:
+                continue
+
+            chave = linha.pop(campo)
+            mapa = self.mapas[mapa]
+            if chave not in mapa:
+                erros[campo] = [f'{rotulo} "{chave}" não encontrado ou inativo.']
+            elif mapa[chave] is None:
+                erros[campo] = [f'{rotulo} "{chave}" é ambíguo.']
+            else:
+                linha[f'{campo}_id'] = mapa[chave]
+
+        return erros
+
+    # ========================================================================
+    # GRAVAÇÃO
+    # ========================================================================
+
+    def processar_lote(self, lote):
+        """Rejeita as linhas que já existem no banco e grava as demais."""
+        cpfs_existentes = set(
+            Usuario._base_manager.filter(cpf__in=[linha['cpf'] for linha in lote]).values_list('cpf', flat=True)
+        )
+        matriculas_existentes = set(
+            Matricula._base_manager.filter(
+                matricula__in=[linha['matricula'] for linha in lote if linha.get('matricula')]
+            ).values_list('matricula', flat=True)
+        )
+
+        validas = []
+        for linha in lote:
+            erros = {}
+            if linha['cpf'] in cpfs_existentes:
+                erros['cpf'] = ['Já existe um usuário com este CPF.']
+            if linha.get('matricula') in matriculas_existentes:
+                erros['matricula'] = ['Esta matrícula já está cadastrada.']
+
+            if erros:
+                self.registrar_erro(linha['numero'], linha['cpf'], erros)
+            else:
+                validas.append(linha)
+
+        if not validas:
+            return
+
+        # Os hashes saem antes da transação: o lote não fica com locks abertos durante o PBKDF2
+        hashes = self.hash_senhas.gerar([linha.get('senha') for linha in validas])
+        for linha, hash_senha in zip(validas, hashes):
+            linha['password'] = hash_senha
+
+        self.gravar_lote(validas)
+
+    def gravar_lote(self, lote):
+        """
+        Grava o lote em uma transação.
+
+        Se o banco recusar o lote (ex: CPF inserido por outra requisição durante a
+        importação), as linhas são regravadas uma a uma para isolar as que falham.
+        """
+        try:
+            with transaction.atomic():
+                self.inserir(lote)
+                # O bulk_create não dispara post_save: as contagens das listagens em cache mudaram
+                cache_respostas.invalidar_todos()
+        except DatabaseError as erro:
+            if len(lote) > 1:
+                for linha in lote:
+                    self.gravar_lote([linha])
+                return
+            self.registrar_erro(lote[0]['numero'], lote[0]['cpf'], {'linha': [f'Erro ao gravar: {erro}']})
+            return
+
+        self.relatorio['importados'] += len(lote)
+
+    def bulk_create(self, model, objetos):
+        if objetos:
+            bulk_create_with_history(
+                objetos, model, batch_size=self.tamanho_lote, default_user=self.usuario_responsavel
+            )
+
+    def inserir(self, lote):
+        usuarios = [
+            Usuario(
+                **{campo: linha[campo] for campo in CAMPOS_USUARIO if campo in linha},
+                campus_id=linha['campus_id'],
+                cargo_id=linha.get('cargo_id'),
+                password=linha['password'],
+            )
+            for linha in lote
+        ]
+        self.bulk_create(Usuario, usuarios)
+
+        # Nem todo banco devolve as chaves no bulk_create; o CPF é único e identifica cada linha
+        ids = {usuario.cpf: usuario.pk for usuario in usuarios}
+        if None in ids.values():
+            ids = dict(Usuario._base_manager.filter(cpf__in=list(ids)).values_list('cpf', 'id'))
+
+        perfis = {}
+        contatos = []
+        enderecos = []
+        matriculas = []
+
+        for linha in lote:
+            usuario_id = ids[linha['cpf']]
+
+            model, campos = CAMPOS_PERFIL[linha['perfil']]
+            perfis.setdefault(model, []).append(model(
+                usuario_id=usuario_id, **{campo: linha[campo] for campo in campos if campo in linha}
+            ))
+
+            if linha.get('email') or linha.get('telefone'):
+                contatos.append(Contato(
+                    usuario_id=usuario_id, email=linha.get('email'), telefone=linha.get('telefone')
+                ))
+
+            if linha.get('logradouro'):
+                enderecos.append(Endereco(
+                    usuario_id=usuario_id, **{campo: linha[campo] for campo in CAMPOS_ENDERECO}
+                ))
+
+            if linha.get('matricula'):
+                matriculas.append(Matricula(
+                    usuario_id=usuario_id,
+                    matricula=linha['matricula'],
+                    data_validade=linha['matricula_validade'],
+                ))
+
+        for model, objetos in perfis.items():
+            self.bulk_create(model, objetos)
+        self.bulk_create(Contato, contatos)
+        self.bulk_create(Endereco, enderecos)
+        self.bulk_create(Matricula, matriculas)
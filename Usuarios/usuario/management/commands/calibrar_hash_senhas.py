@@ -0,0 +1,96 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+
+from AppCore.common.util.hashers import PBKDF2ConfiguravelPasswordHasher, ScryptConfiguravelPasswordHasher
+
+
+# Iterações usadas para medir o custo de uma iteração do PBKDF2 (o tempo é linear nas iterações)
+ITERACOES_AMOSTRA = 100_000
+
+# Expoentes de N medidos no scrypt (2**12 = 4 MiB até 2**20 = 1 GiB de memória com r=8)
+EXPOENTES_SCRYPT = range(12, 21)
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede o hash de senhas nesta máquina e sugere o custo (iterações do PBKDF2, N do scrypt) '
+        'que leva ao tempo-alvo por verificação.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--alvo-ms', type=float, default=250, help='Tempo-alvo de uma verificação, em ms')
+        parser.add_argument(
+            '--algoritmos', nargs='+', choices=['pbkdf2', 'scrypt'], default=['pbkdf2', 'scrypt'],
+            help='Algoritmos calibrados',
+        )
+        parser.add_argument('--repeticoes', type=int, default=3, help='Medições por parâmetro (usa a mediana)')
+
+    def medir(self, hasher, **parametros):
+        senha, salt = 'Calibracao@123', hasher.salt()
+        duracoes = []
+        for _ in range(self.repeticoes):
+            inicio = time.perf_counter()
+            hasher.encode(senha, salt, **parametros)
+            duracoes.append((time.perf_counter() - inicio) * 1000)
+        return statistics.median(duracoes)
+
+    def handle(self, *args, **options):
+        if options['alvo_ms'] <= 0 or options['repeticoes'] < 1:
+            raise CommandError('O tempo-alvo e as repetições devem ser maiores que zero.')
+        self.repeticoes = options['repeticoes']
+        alvo = options['alvo_ms']
+
+        hasher_atual = get_hasher()
+        self.stdout.write(
+            f'Hasher atual: {hasher_atual.algorithm} (SENHAS_HASHER={settings.SENHAS_HASHER}), '
+            f'{self.medir(hasher_atual):.0f} ms por verificação. Alvo: {alvo:.0f} ms'
+        )
+
+        sugestoes = []
+        if 'pbkdf2' in options['algoritmos']:
+            sugestoes.append(self.calibrar_pbkdf2(alvo))
+        if 'scrypt' in options['algoritmos']:
+            sugestoes.append(self.calibrar_scrypt(alvo))
+
+        self.stdout.write('\nConfiguração sugerida (.env):')
+        for sugestao in sugestoes:
+            self.stdout.write(self.style.SUCCESS(f'  {sugestao}'))
+
+    def calibrar_pbkdf2(self, alvo):
+        hasher = PBKDF2ConfiguravelPasswordHasher()
+        por_iteracao = self.medir(hasher, iterations=ITERACOES_AMOSTRA) / ITERACOES_AMOSTRA
+
+        # Múltiplo de 10 mil abaixo do alvo, conferido com uma nova medição
+        iteracoes = max(int(alvo / por_iteracao) // 10_000 * 10_000, 10_000)
+        duracao = self.medir(hasher, iterations=iteracoes)
+        self.stdout.write(
+            f'\npbkdf2_sha256: {por_iteracao * 1_000_000:.2f} ms por milhão de iterações\n'
+            f'  atual    {hasher.iterations:>10,} iterações  {hasher.iterations * por_iteracao:6.0f} ms (estimado)\n'
+            f'  sugerido {iteracoes:>10,} iterações  {duracao:6.0f} ms'
+        )
+        return f'SENHAS_HASHER=pbkdf2 SENHAS_PBKDF2_ITERACOES={iteracoes}'
+
+    def calibrar_scrypt(self, alvo):
+        hasher = ScryptConfiguravelPasswordHasher()
+        r, p = hasher.block_size, hasher.parallelism
+        self.stdout.write(f'\nscrypt (r={r}, p={p}):')
+
+        escolhido = None
+        for expoente in EXPOENTES_SCRYPT:
+            n = 2 ** expoente
+            duracao = self.medir(hasher, n=n, r=r, p=p)
+            memoria = 128 * n * r / 1024 / 1024
+            marcador = ' (atual)' if n == hasher.work_factor else ''
+            self.stdout.write(f'  N=2**{expoente:<3} {memoria:7.0f} MiB  {duracao:6.0f} ms{marcador}')
+            if duracao > alvo:
+                break
+            escolhido = n
+
+        if escolhido is None:
+            escolhido = 2 ** EXPOENTES_SCRYPT[0]
+            self.stdout.write(self.style.WARNING('  Nenhum N atinge o alvo; sugerido o menor medido.'))
+        return f'SENHAS_HASHER=scrypt SENHAS_SCRYPT_N={escolhido} SENHAS_SCRYPT_R={r} SENHAS_SCRYPT_P={p}'
@@ -0,0 +1,54 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from AppCore.basics.exportacao import FORMATOS_EXPORTACAO, TAMANHO_BLOCO_EXPORTACAO, gerar_exportacao
+
+from Usuarios.usuario.exportacao import EXPORTACOES, criar_exportacao
+
+
+class Command(BaseCommand):
+    help = (
+        'Exporta usuários, perfis (alunos, servidores, terceirizados, estagiários) ou vínculos com setores '
+        'em CSV, NDJSON ou JSON, em blocos e com memória constante.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('exportacao', choices=list(EXPORTACOES), help='O que exportar')
+        parser.add_argument('--formato', choices=FORMATOS_EXPORTACAO, default='csv', help='Formato do arquivo')
+        parser.add_argument('--saida', help='Caminho do arquivo gerado (padrão: saída padrão)')
+        parser.add_argument('--inativos', action='store_true', help='Inclui os registros inativos')
+        parser.add_argument(
+            '--bloco', type=int, default=TAMANHO_BLOCO_EXPORTACAO, help='Registros buscados do banco por vez'
+        )
+
+    def handle(self, *args, **options):
+        if options['bloco'] < 1:
+            raise CommandError('O tamanho do bloco deve ser maior que zero.')
+
+        exportacao = criar_exportacao(
+            options['exportacao'], incluir_inativos=options['inativos'], tamanho_bloco=options['bloco']
+        )
+
+        inicio = time.perf_counter()
+        total_bytes = 0
+        try:
+            saida = open(options['saida'], 'wb') if options['saida'] else sys.stdout.buffer
+        except OSError as erro:
+            raise CommandError(f'Não foi possível criar o arquivo: {erro}')
+
+        try:
+            for pedaco in gerar_exportacao(exportacao, options['formato']):
+                saida.write(pedaco)
+                total_bytes += len(pedaco)
+        finally:
+            if options['saida']:
+                saida.close()
+            else:
+                saida.flush()
+
+        if options['saida']:
+            self.stdout.write(self.style.SUCCESS(
+                f'{options["saida"]}: {total_bytes / 1024:.1f} KiB em {time.perf_counter() - inicio:.2f} s.'
+            ))
@@ -0,0 +1,53 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from AppCore.core.exceptions.exceptions import SystemErrorException, ValidationException
+
+from Usuarios.usuario.business import UsuarioBusiness
+from Usuarios.usuario.importacao import FORMATOS_IMPORTACAO, TAMANHO_LOTE_IMPORTACAO, deduzir_formato
+
+
+class Command(BaseCommand):
+    help = 'Importa usuários com perfil, contato, endereço e matrícula de um arquivo CSV ou JSONL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help='Caminho do arquivo CSV ou JSONL (UTF-8)')
+        parser.add_argument(
+            '--formato', choices=FORMATOS_IMPORTACAO, help='Formato do arquivo (padrão: deduzido pela extensão)'
+        )
+        parser.add_argument(
+            '--lote', type=int, default=TAMANHO_LOTE_IMPORTACAO, help='Linhas gravadas por transação'
+        )
+        parser.add_argument('--relatorio', help='Grava o relatório completo (JSON) neste caminho')
+
+    def handle(self, *args, **options):
+        caminho = options['arquivo']
+        try:
+            formato = deduzir_formato(caminho, options['formato'])
+        except ValidationException:
+            raise CommandError('Informe o formato do arquivo com --formato (csv ou jsonl).')
+        if options['lote'] < 1:
+            raise CommandError('O tamanho do lote deve ser maior que zero.')
+
+        try:
+            with open(caminho, encoding='utf-8-sig', newline='') as arquivo:
+                relatorio = UsuarioBusiness().importar_em_massa(arquivo, formato, tamanho_lote=options['lote'])
+        except OSError as erro:
+            raise CommandError(f'Não foi possível abrir o arquivo: {erro}')
+        except (ValidationException, SystemErrorException) as erro:
+            raise CommandError(str(erro))
+
+        if options['relatorio']:
+            with open(options['relatorio'], 'w', encoding='utf-8') as saida:
+                json.dump(relatorio, saida, ensure_ascii=False, indent=2)
+
+        for erro in relatorio['erros'][:20]:
+            self.stderr.write(f'Linha {erro["linha"]} (CPF {erro["cpf"]}): {json.dumps(erro["erros"], ensure_ascii=False)}')
+        if relatorio['com_erro'] > 20:
+            self.stderr.write(f'... e mais {relatorio["com_erro"] - 20} linha(s) com erro.')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{relatorio["importados"]} de {relatorio["total_linhas"]} linha(s) importada(s); '
+            f'{relatorio["com_erro"]} com erro.'
+        ))
@@ -0,0 +1,50 @@
+import os
+import secrets
+import time
+
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+
+from AppCore.common.util.senhas import HashSenhasEmLote
+
+
+class Command(BaseCommand):
+    help = 'Mede a vazão (usuários/s) do hash de senhas do cadastro em massa, em série e com o pool de processos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quantidade', type=int, default=500, help='Quantidade de senhas por medição')
+        parser.add_argument(
+            '--processos', type=int, nargs='+',
+            help='Tamanhos de pool a medir (padrão: 1 e o tamanho usado pela importação)',
+        )
+
+    def handle(self, *args, **options):
+        quantidade = options['quantidade']
+        if quantidade < 1:
+            raise CommandError('A quantidade deve ser maior que zero.')
+
+        processos = options['processos'] or sorted({1, HashSenhasEmLote().processos})
+        senhas = [secrets.token_urlsafe(12) for _ in range(quantidade)]
+
+        hasher = get_hasher()
+        self.stdout.write(
+            f'Hasher: {hasher.algorithm} ({getattr(hasher, "iterations", "-")} iterações), '
+            f'{quantidade} senha(s), {os.cpu_count()} CPU(s)'
+        )
+
+        referencia = None
+        for total_processos in processos:
+            hash_senhas = HashSenhasEmLote(processos=total_processos, minimo_para_pool=0)
+            # Aquece o pool para que a criação dos processos não entre na medição
+            hash_senhas.gerar(senhas[:total_processos])
+
+            inicio = time.perf_counter()
+            hash_senhas.gerar(senhas)
+            duracao = time.perf_counter() - inicio
+
+            vazao = quantidade / duracao
+            referencia = referencia or vazao
+            self.stdout.write(
+                f'{total_processos:>3} processo(s): {duracao:8.2f} s  {vazao:10.1f} usuários/s  '
+                f'({vazao / referencia:.1f}x)'
+            )
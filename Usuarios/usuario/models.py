@@ -1,3 +1,4 @@
+from django.contrib.auth.hashers import check_password
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
 
@@ -127,6 +128,19 @@ class Usuario(ModelHelperMixin, ModelBusinessMixin, PermissionsMixin, AbstractBa
     def __str__(self):
         return f'{self.nome} ({self.cpf})'
 
+    def check_password(self, raw_password):
+        """
+        Verifica a senha e, se o hash foi gerado com outro hasher ou outro custo (ver
+        `SENHAS_HASHER`), grava o hash novo. Diferente do Django, grava só a coluna
+        `password` (UPDATE direto), sem `save()`: sem signals e sem registro no histórico.
+        """
+        def atualizar_hash(senha):
+            self.set_password(senha)
+            self._password = None
+            Usuario._base_manager.filter(pk=self.pk).update(password=self.password)
+
+        return check_password(raw_password, self.password, atualizar_hash)
+
     def has_perm(self, perm, obj=None):
         return self.is_superuser or self.is_admin
 
@@ -3,6 +3,11 @@ from typing import List, Optional
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from AppCore.basics.serializers import CampoAnotado, ContagemRelacionada, depende_de
+
+from Perfis.aluno import choices as choices_aluno
+from Perfis.servidor import choices as choices_servidor
+
 
 # ============================================================================
 # SERIALIZERS DE ENTIDADES RELACIONADAS (Campus, Setor, Empresa, Curso)
@@ -119,6 +124,7 @@ class ServidorPerfilSerializer(serializers.Serializer):
     updated_at = serializers.DateTimeField(read_only=True)
 
     @extend_schema_field(serializers.CharField())
+    @depende_de('jornada_trabalho')
     def get_jornada_trabalho_display(self, obj) -> str:
         """Retorna a descrição legível da jornada de trabalho."""
         return obj.get_jornada_trabalho_display()
@@ -146,11 +152,13 @@ class AlunoPerfilSerializer(serializers.Serializer):
     updated_at = serializers.DateTimeField(read_only=True)
 
     @extend_schema_field(serializers.CharField())
+    @depende_de('forma_ingresso')
     def get_forma_ingresso_display(self, obj) -> str:
         """Retorna a descrição legível da forma de ingresso."""
         return obj.get_forma_ingresso_display()
 
     @extend_schema_field(serializers.CharField())
+    @depende_de('turno')
     def get_turno_display(self, obj) -> str:
         """Retorna a descrição legível do turno."""
         return obj.get_turno_display()
@@ -170,6 +178,7 @@ class TerceirizadoPerfilSerializer(serializers.Serializer):
     updated_at = serializers.DateTimeField(read_only=True)
 
     @extend_schema_field(serializers.BooleanField())
+    @depende_de('data_fim_contrato')
     def get_contrato_ativo(self, obj) -> bool:
         """Verifica se o contrato está ativo (sem data de fim ou data futura)."""
         from django.utils import timezone
@@ -194,6 +203,7 @@ class EstagiarioPerfilSerializer(serializers.Serializer):
     updated_at = serializers.DateTimeField(read_only=True)
 
     @extend_schema_field(serializers.BooleanField())
+    @depende_de('data_fim_estagio')
     def get_estagio_ativo(self, obj) -> bool:
         """Verifica se o estágio está ativo (sem data de fim ou data futura)."""
         from django.utils import timezone
@@ -222,6 +232,7 @@ class UsuarioSetorResumoSerializer(serializers.Serializer):
     vinculo_ativo = serializers.SerializerMethodField()
 
     @extend_schema_field(serializers.BooleanField())
+    @depende_de('data_saida')
     def get_vinculo_ativo(self, obj) -> bool:
         """Verifica se o vínculo com o setor está ativo."""
         return obj.data_saida is None
@@ -241,6 +252,7 @@ class UsuarioListaSerializer(serializers.Serializer):
     ativo = serializers.BooleanField(read_only=True)
     tipo_perfil = serializers.SerializerMethodField()
 
+    @depende_de('servidor', 'aluno', 'terceirizado', 'estagiario')
     def get_tipo_perfil(self, obj):
         """Retorna o tipo de perfil do usuário."""
         tipos = []
@@ -267,10 +279,25 @@ class SetorComAtividadesFuncoesSerializer(serializers.Serializer):
     atividades = serializers.SerializerMethodField()
 
     @extend_schema_field(serializers.ListField())
+    @depende_de('atividades__descricao', 'atividades__funcoes__descricao')
     def get_atividades(self, obj) -> list:
-        """Retorna as atividades do setor com suas funções."""
+        """
+        Retorna as atividades do setor com suas funções.
+
+        A árvore de cada setor é montada uma única vez por requisição e reaproveitada
+        para todos os usuários vinculados a ele.
+        """
+        arvore_setores = self.context.setdefault('arvore_setores', {})
+        if obj.id in arvore_setores:
+            return arvore_setores[obj.id]
+
+        if 'atividades' in getattr(obj, '_prefetched_objects_cache', {}):
+            atividades = obj.atividades.all()
+        else:
+            atividades = obj.atividades.prefetch_related('funcoes').all()
+
         atividades_data = []
-        for atividade in obj.atividades.prefetch_related('funcoes').all():
+        for atividade in atividades:
             atividade_item = {
                 'id': atividade.id,
                 'descricao': atividade.descricao,
@@ -283,6 +310,8 @@ class SetorComAtividadesFuncoesSerializer(serializers.Serializer):
                 ],
             }
             atividades_data.append(atividade_item)
+
+        arvore_setores[obj.id] = atividades_data
         return atividades_data
 
 
@@ -302,6 +331,7 @@ class UsuarioSetorComAtividadesSerializer(serializers.Serializer):
     vinculo_ativo = serializers.SerializerMethodField()
 
     @extend_schema_field(serializers.BooleanField())
+    @depende_de('data_saida')
     def get_vinculo_ativo(self, obj) -> bool:
         """Verifica se o vínculo com o setor está ativo."""
         return obj.data_saida is None
@@ -344,14 +374,19 @@ class UsuarioListaDetalhadaSerializer(serializers.Serializer):
     
     # Setores com atividades e funções
     setores = serializers.SerializerMethodField()
-    total_setores_ativos = serializers.SerializerMethodField()
+    total_setores_ativos = CampoAnotado(
+        ContagemRelacionada('usuario_setores', data_saida__isnull=True),
+        help_text='Total de setores com vínculo ativo',
+    )
 
     @extend_schema_field(ContatoListaSerializer(many=True))
+    @depende_de(('contatos', ContatoListaSerializer))
     def get_contatos(self, obj) -> list:
         """Retorna os contatos do usuário."""
         return ContatoListaSerializer(obj.contatos.all(), many=True).data
 
     @extend_schema_field(serializers.CharField())
+    @depende_de('cpf')
     def get_cpf_formatado(self, obj) -> str:
         """Retorna o CPF formatado (XXX.XXX.XXX-XX)."""
         cpf = obj.cpf
@@ -360,6 +395,7 @@ class UsuarioListaDetalhadaSerializer(serializers.Serializer):
         return cpf
 
     @extend_schema_field(serializers.ListField(child=serializers.CharField()))
+    @depende_de('servidor', 'aluno', 'terceirizado', 'estagiario')
     def get_tipo_perfil(self, obj) -> List[str]:
         """Retorna o(s) tipo(s) de perfil do usuário."""
         tipos = []
@@ -386,20 +422,19 @@ class UsuarioListaDetalhadaSerializer(serializers.Serializer):
         return tipos if tipos else ['Sem perfil']
 
     @extend_schema_field(UsuarioSetorComAtividadesSerializer(many=True))
+    @depende_de(('usuario_setores', UsuarioSetorComAtividadesSerializer))
     def get_setores(self, obj) -> list:
         """Retorna os setores vinculados ao usuário com atividades e funções."""
-        usuario_setores = obj.usuario_setores.select_related(
-            'setor', 'campus'
-        ).prefetch_related(
-            'setor__atividades',
-            'setor__atividades__funcoes'
-        ).all()
-        return UsuarioSetorComAtividadesSerializer(usuario_setores, many=True).data
-
-    @extend_schema_field(serializers.IntegerField())
-    def get_total_setores_ativos(self, obj) -> int:
-        """Retorna o total de setores com vínculo ativo."""
-        return obj.usuario_setores.filter(data_saida__isnull=True).count()
+        if 'usuario_setores' in getattr(obj, '_prefetched_objects_cache', {}):
+            usuario_setores = obj.usuario_setores.all()
+        else:
+            usuario_setores = obj.usuario_setores.select_related(
+                'setor', 'campus'
+            ).prefetch_related(
+                'setor__atividades',
+                'setor__atividades__funcoes'
+            ).all()
+        return UsuarioSetorComAtividadesSerializer(usuario_setores, many=True, context=self.context).data
 
 
 class UsuarioDetalheSerializer(serializers.Serializer):
@@ -454,6 +489,7 @@ class UsuarioDetalheSerializer(serializers.Serializer):
     perfil_estagiario = serializers.SerializerMethodField()
 
     @extend_schema_field(serializers.CharField())
+    @depende_de('cpf')
     def get_cpf_formatado(self, obj) -> str:
         """Retorna o CPF formatado (XXX.XXX.XXX-XX)."""
         cpf = obj.cpf
@@ -462,12 +498,17 @@ class UsuarioDetalheSerializer(serializers.Serializer):
         return cpf
 
     @extend_schema_field(UsuarioSetorResumoSerializer(many=True))
+    @depende_de(('usuario_setores', UsuarioSetorResumoSerializer))
     def get_setores(self, obj) -> list:
         """Retorna os setores vinculados ao usuário."""
-        usuario_setores = obj.usuario_setores.select_related('setor', 'campus').all()
+        if 'usuario_setores' in getattr(obj, '_prefetched_objects_cache', {}):
+            usuario_setores = obj.usuario_setores.all()
+        else:
+            usuario_setores = obj.usuario_setores.select_related('setor', 'campus').all()
         return UsuarioSetorResumoSerializer(usuario_setores, many=True).data
 
     @extend_schema_field(serializers.ListField(child=serializers.CharField()))
+    @depende_de('servidor', 'aluno', 'terceirizado', 'estagiario')
     def get_tipo_perfil(self, obj) -> List[str]:
         """Retorna o(s) tipo(s) de perfil do usuário."""
         tipos = []
@@ -498,6 +539,7 @@ class UsuarioDetalheSerializer(serializers.Serializer):
         return tipos if tipos else ['Sem perfil']
 
     @extend_schema_field(ServidorPerfilSerializer(allow_null=True))
+    @depende_de(('servidor', ServidorPerfilSerializer))
     def get_perfil_servidor(self, obj) -> Optional[dict]:
         """Retorna os dados do perfil de servidor, se existir."""
         try:
@@ -508,6 +550,7 @@ class UsuarioDetalheSerializer(serializers.Serializer):
         return None
 
     @extend_schema_field(AlunoPerfilSerializer(allow_null=True))
+    @depende_de(('aluno', AlunoPerfilSerializer))
     def get_perfil_aluno(self, obj) -> Optional[dict]:
         """Retorna os dados do perfil de aluno, se existir."""
         try:
@@ -518,6 +561,7 @@ class UsuarioDetalheSerializer(serializers.Serializer):
         return None
 
     @extend_schema_field(TerceirizadoPerfilSerializer(allow_null=True))
+    @depende_de(('terceirizado', TerceirizadoPerfilSerializer))
     def get_perfil_terceirizado(self, obj) -> Optional[dict]:
         """Retorna os dados do perfil de terceirizado, se existir."""
         try:
@@ -528,6 +572,7 @@ class UsuarioDetalheSerializer(serializers.Serializer):
         return None
 
     @extend_schema_field(EstagiarioPerfilSerializer(allow_null=True))
+    @depende_de(('estagiario', EstagiarioPerfilSerializer))
     def get_perfil_estagiario(self, obj) -> Optional[dict]:
         """Retorna os dados do perfil de estagiário, se existir."""
         try:
@@ -580,6 +625,7 @@ class UsuarioResumoSerializer(serializers.Serializer):
     ativo = serializers.BooleanField(read_only=True)
     tipo_perfil = serializers.SerializerMethodField()
 
+    @depende_de('cpf')
     def get_cpf_formatado(self, obj):
         """Retorna o CPF formatado (XXX.XXX.XXX-XX)."""
         cpf = obj.cpf
@@ -587,6 +633,7 @@ class UsuarioResumoSerializer(serializers.Serializer):
             return f'{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}'
         return cpf
 
+    @depende_de('servidor', 'aluno', 'terceirizado', 'estagiario')
     def get_tipo_perfil(self, obj):
         """Retorna o(s) tipo(s) de perfil do usuário."""
         tipos = []
@@ -611,3 +658,163 @@ class UsuarioResumoSerializer(serializers.Serializer):
         except:
             pass
         return tipos if tipos else ['Sem perfil']
+
+
+# ============================================================================
+# SERIALIZERS DE IMPORTAÇÃO EM MASSA
+# ============================================================================
+
+PERFIS_IMPORTACAO = [
+    ('aluno', 'Aluno'),
+    ('servidor', 'Servidor'),
+    ('terceirizado', 'Terceirizado'),
+    ('estagiario', 'Estagiário'),
+]
+
+CAMPOS_OBRIGATORIOS_PERFIL = {
+    'aluno': ['previsao_conclusao'],
+    'servidor': ['data_posse', 'padrao', 'classe', 'tipo_servidor'],
+    'terceirizado': ['empresa', 'data_inicio_contrato'],
+    'estagiario': ['empresa', 'curso', 'carga_horaria', 'data_inicio_estagio'],
+}
+
+
+class ImportacaoUsuariosSerializer(serializers.Serializer):
+    """
+    Serializer para o envio de um arquivo de importação em massa de usuários.
+
+    **Campos obrigatórios:**
+    - arquivo: Arquivo CSV (separado por ',' ou ';') ou JSONL, em UTF-8
+
+    **Campos opcionais:**
+    - formato: 'csv' ou 'jsonl' (padrão: deduzido pela extensão do arquivo)
+    - assincrono: Processa em segundo plano e retorna o id da tarefa (padrão: False)
+    """
+    arquivo = serializers.FileField(
+        help_text='Arquivo CSV ou JSONL com um usuário por linha'
+    )
+    formato = serializers.ChoiceField(
+        choices=[('csv', 'CSV'), ('jsonl', 'JSONL')],
+        required=False,
+        help_text='Formato do arquivo (padrão: deduzido pela extensão)'
+    )
+    assincrono = serializers.BooleanField(
+        default=False,
+        required=False,
+        help_text='Processa em segundo plano; acompanhe pelo id da tarefa retornado'
+    )
+
+
+class LinhaImportacaoUsuarioSerializer(serializers.Serializer):
+    """
+    Serializer de validação de uma linha do arquivo de importação.
+
+    As referências (campus, cargo, empresa e curso) chegam pela chave natural e são
+    resolvidas pelo importador; aqui só o formato de cada campo é validado.
+    """
+    # Usuário
+    nome = serializers.CharField(max_length=255)
+    cpf = serializers.CharField(max_length=11, min_length=11)
+    data_nascimento = serializers.DateField()
+    data_ingresso = serializers.DateField(required=False)
+    campus = serializers.CharField(help_text='CNPJ do campus')
+    cargo = serializers.CharField(required=False, help_text='Descrição do cargo')
+    senha = serializers.CharField(required=False, help_text='Sem senha, o usuário é criado sem senha utilizável')
+    perfil = serializers.ChoiceField(choices=PERFIS_IMPORTACAO)
+
+    # Aluno
+    ira = serializers.DecimalField(max_digits=4, decimal_places=2, required=False)
+    forma_ingresso = serializers.ChoiceField(choices=choices_aluno.FORMA_INGRESSO_OPCOES, required=False)
+    previsao_conclusao = serializers.IntegerField(required=False)
+    aluno_especial = serializers.BooleanField(required=False)
+    turno = serializers.ChoiceField(choices=choices_aluno.TURNO_OPCOES, required=False)
+
+    # Servidor
+    data_posse = serializers.DateField(required=False)
+    jornada_trabalho = serializers.ChoiceField(choices=choices_servidor.JORNADA_OPCOES, required=False)
+    padrao = serializers.CharField(max_length=50, required=False)
+    classe = serializers.CharField(max_length=50, required=False)
+    tipo_servidor = serializers.CharField(max_length=100, required=False)
+
+    # Terceirizado e estagiário
+    empresa = serializers.CharField(required=False, help_text='CNPJ da empresa')
+    data_inicio_contrato = serializers.DateField(required=False)
+    data_fim_contrato = serializers.DateField(required=False)
+    curso = serializers.CharField(required=False, help_text='Nome do curso')
+    carga_horaria = serializers.IntegerField(required=False)
+    data_inicio_estagio = serializers.DateField(required=False)
+    data_fim_estagio = serializers.DateField(required=False)
+
+    # Contato, endereço e matrícula
+    email = serializers.EmailField(required=False)
+    telefone = serializers.CharField(max_length=20, required=False)
+    logradouro = serializers.CharField(max_length=255, required=False)
+    bairro = serializers.CharField(max_length=255, required=False)
+    cep = serializers.CharField(max_length=8, min_length=8, required=False)
+    num_casa = serializers.CharField(max_length=20, required=False)
+    cidade = serializers.CharField(max_length=255, required=False)
+    estado = serializers.CharField(max_length=2, min_length=2, required=False)
+    matricula = serializers.CharField(max_length=50, required=False)
+    matricula_validade = serializers.DateField(required=False)
+
+    def validate_cpf(self, value):
+        """Valida se o CPF contém apenas números."""
+        if not value.isdigit():
+            raise serializers.ValidationError('O CPF deve conter apenas números.')
+        return value
+
+    def validate_cep(self, value):
+        """Valida se o CEP contém apenas números."""
+        if not value.isdigit():
+            raise serializers.ValidationError('O CEP deve conter apenas números.')
+        return value
+
+    def validate_estado(self, value):
+        return value.upper()
+
+    def validate(self, attrs):
+        """Valida os campos obrigatórios do perfil, do endereço e da matrícula."""
+        erros = {}
+
+        for campo in CAMPOS_OBRIGATORIOS_PERFIL[attrs['perfil']]:
+            if campo not in attrs:
+                erros[campo] = 'Campo obrigatório para este perfil.'
+
+        campos_endereco = ['logradouro', 'bairro', 'cep', 'num_casa', 'cidade', 'estado']
+        if any(campo in attrs for campo in campos_endereco):
+            for campo in campos_endereco:
+                if campo not in attrs:
+                    erros[campo] = 'Campo obrigatório quando o endereço é informado.'
+
+        if 'matricula' in attrs and 'matricula_validade' not in attrs:
+            erros['matricula_validade'] = 'Campo obrigatório quando a matrícula é informada.'
+
+        if erros:
+            raise serializers.ValidationError(erros)
+        return attrs
+
+
+class ErroImportacaoSerializer(serializers.Serializer):
+    """Serializer de uma linha rejeitada na importação."""
+    linha = serializers.IntegerField(read_only=True)
+    cpf = serializers.CharField(read_only=True, allow_null=True)
+    erros = serializers.DictField(child=serializers.ListField(child=serializers.CharField()), read_only=True)
+
+
+class RelatorioImportacaoSerializer(serializers.Serializer):
+    """Serializer do relatório de uma importação em massa."""
+    total_linhas = serializers.IntegerField(read_only=True)
+    importados = serializers.IntegerField(read_only=True)
+    com_erro = serializers.IntegerField(read_only=True)
+    erros = ErroImportacaoSerializer(many=True, read_only=True)
+
+
+class TarefaImportacaoSerializer(serializers.Serializer):
+    """Serializer do estado de uma importação em segundo plano."""
+    id = serializers.CharField(read_only=True)
+    status = serializers.CharField(read_only=True, help_text='pendente, processando, concluida ou erro')
+    criada_em = serializers.CharField(read_only=True)
+    iniciada_em = serializers.CharField(read_only=True, allow_null=True)
+    concluida_em = serializers.CharField(read_only=True, allow_null=True)
+    resultado = RelatorioImportacaoSerializer(read_only=True, allow_null=True)
+    erro = serializers.CharField(read_only=True, allow_null=True)
@@ -0,0 +1,91 @@
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete, post_save
+
+from AppCore.core.business.business import atualizacao_em_lote
+
+from Usuarios.usuario.helpers import snapshot_usuario
+
+
+# Models cujas alterações afetam apenas o snapshot do próprio usuário (campo que aponta para ele)
+MODELS_DO_USUARIO = {
+    'usuarios.Usuario': 'pk',
+    'servidor.Servidor': 'usuario_id',
+    'aluno.Aluno': 'usuario_id',
+    'terceirizado.Terceirizado': 'usuario_id',
+    'estagiario.Estagiario': 'usuario_id',
+    'usuario_setor.UsuarioSetor': 'usuario_id',
+    'usuarios.Contato': 'usuario_id',
+    'usuarios.Endereco': 'usuario_id',
+}
+
+# Models da estrutura organizacional compartilhados entre usuários (invalidam todos os snapshots)
+MODELS_DA_ESTRUTURA = [
+    'setor.Setor',
+    'atividade.Atividade',
+    'funcao.Funcao',
+    'campus.Campus',
+    'cargo.Cargo',
+    'empresa.Empresa',
+    'curso.Curso',
+]
+
+
+def invalidar_snapshot_usuario(sender, instance, **kwargs):
+    """Invalida o snapshot do usuário dono da instância alterada."""
+    campo = MODELS_DO_USUARIO[sender._meta.label]
+    usuario_id = getattr(instance, campo)
+
+    if usuario_id is not None:
+        snapshot_usuario.invalidar(usuario_id)
+
+
+def invalidar_snapshots_estrutura(sender, instance, **kwargs):
+    """Invalida os snapshots de todos os usuários após mudança na estrutura organizacional."""
+    snapshot_usuario.invalidar_todos()
+
+
+def invalidar_snapshots_lote(sender, objetos, **kwargs):
+    """Invalida os snapshots afetados por uma escrita em lote (`ModelLoteBusiness`)."""
+    label = sender._meta.label
+
+    if label in MODELS_DA_ESTRUTURA:
+        snapshot_usuario.invalidar_todos()
+        return
+
+    campo = MODELS_DO_USUARIO.get(label)
+    if campo is None:
+        return
+
+    for usuario_id in {getattr(objeto, campo) for objeto in objetos}:
+        if usuario_id is not None:
+            snapshot_usuario.invalidar(usuario_id)
+
+
+def conectar_signals_snapshot():
+    """Conecta os signals de invalidação do snapshot de usuário."""
+    from django.apps import apps
+
+    for label in MODELS_DO_USUARIO:
+        model = apps.get_model(label)
+        post_save.connect(invalidar_snapshot_usuario, sender=model, dispatch_uid=f'snapshot_usuario_save_{label}')
+        post_delete.connect(invalidar_snapshot_usuario, sender=model, dispatch_uid=f'snapshot_usuario_delete_{label}')
+
+    for label in MODELS_DA_ESTRUTURA:
+        model = apps.get_model(label)
+        post_save.connect(invalidar_snapshots_estrutura, sender=model, dispatch_uid=f'snapshot_estrutura_save_{label}')
+        post_delete.connect(invalidar_snapshots_estrutura, sender=model, dispatch_uid=f'snapshot_estrutura_delete_{label}')
+
+    atualizacao_em_lote.connect(invalidar_snapshots_lote, dispatch_uid='snapshot_usuario_lote')
+
+
+def registrar_ultimo_login(sender, user, **kwargs):
+    """Registra o login de sessão (admin) sem `save()` quando a data não muda."""
+    from Usuarios.usuario.ultimo_login import ultimo_login
+
+    ultimo_login.registrar(user)
+
+
+def conectar_signal_ultimo_login():
+    """Troca o `update_last_login` do Django (`save()` e histórico a cada login) pelo `ultimo_login`."""
+    user_logged_in.disconnect(dispatch_uid='update_last_login')
+    user_logged_in.connect(registrar_ultimo_login, dispatch_uid='usuario_ultimo_login')
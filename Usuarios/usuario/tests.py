@@ -0,0 +1,476 @@
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import date, timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, IntegrityError, connection, connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from AppCore.basics.cache import cache_respostas
+from AppCore.basics.pagination import contagem
+from AppCore.common.util import senhas
+from AppCore.common.util.queries import fora_do_limite_queries
+
+from EstruturaOrganizacional.atividade.models import Atividade
+from EstruturaOrganizacional.cargo.models import Cargo
+from EstruturaOrganizacional.curso.models import Curso
+from EstruturaOrganizacional.empresa.models import Empresa
+from EstruturaOrganizacional.funcao.models import Funcao
+from EstruturaOrganizacional.setor.models import Setor
+from Monitoramento.tarefas import tarefas
+from Perfis.aluno.models import Aluno
+from Perfis.estagiario.models import Estagiario
+from Perfis.terceirizado.models import Terceirizado
+from Usuarios.usuario.business import UsuarioBusiness
+from Usuarios.usuario.exportacao import ExportacaoUsuarios
+from Usuarios.usuario.helpers import obter_usuario_contexto_login, snapshot_usuario
+from Usuarios.usuario.importacao import ImportadorUsuarios, ler_linhas
+from Usuarios.usuario.models import Contato, Endereco, Usuario
+from Usuarios.usuario.ultimo_login import RegistroUltimoLogin
+from Usuarios.usuario_setor.models import UsuarioSetor
+from Vinculos.matricula.models import Matricula
+
+
+def criar_usuarios(quantidade, campus):
+    """Cria usuários com contato e vínculo a um setor com atividades e funções."""
+    setor = Setor.objects.create(nome='Coordenação', sigla='COORD')
+    for indice in range(2):
+        atividade = Atividade.objects.create(setor=setor, descricao=f'Atividade {indice}')
+        Funcao.objects.create(atividade=atividade, descricao=f'Função {indice}')
+
+    usuarios = []
+    for indice in range(quantidade):
+        usuario = Usuario.objects.create_user(
+            cpf=f'{indice:011d}', nome=f'Usuário {indice}', campus=campus, data_nascimento=date(2000, 1, 1)
+        )
+        Contato.objects.create(usuario=usuario, email=f'usuario{indice}@ifpi.edu.br')
+        UsuarioSetor.objects.create(usuario=usuario, setor=setor, campus=campus, data_entrada=date(2024, 1, 1))
+        usuarios.append(usuario)
+    return usuarios
+
+
+class SnapshotUsuarioTests(TestCase):
+    """Invalidação do `snapshot_usuario` pelos signals do app."""
+
+    def setUp(self):
+        self.usuario = Usuario._base_manager.get(cpf='12345678901')
+
+    def test_alterar_cargo_invalida_snapshots(self):
+        cargo = Cargo.objects.create(descricao='Professor')
+        chave = snapshot_usuario.chave('perfil', self.usuario.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cargo.descricao = 'Professor EBTT'
+            cargo.save()
+
+        self.assertNotEqual(snapshot_usuario.chave('perfil', self.usuario.pk), chave)
+
+    def test_alterar_usuario_invalida_so_o_proprio_snapshot(self):
+        chave_global = snapshot_usuario.obter_versao(snapshot_usuario.VERSAO_GLOBAL)
+        chave = snapshot_usuario.chave('perfil', self.usuario.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.usuario.nome = 'Administrador'
+            self.usuario.save()
+
+        self.assertNotEqual(snapshot_usuario.chave('perfil', self.usuario.pk), chave)
+        self.assertEqual(snapshot_usuario.obter_versao(snapshot_usuario.VERSAO_GLOBAL), chave_global)
+
+
+@override_settings(LIMITE_QUERIES_ESTRITO=True)
+class UsuarioListaQueriesTests(TestCase):
+    """`limite_queries` da listagem de usuários (estourar o limite vira erro no modo estrito)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Usuario._base_manager.get(cpf='12345678901')
+        criar_usuarios(8, cls.admin.campus)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        contagem._estimativas.clear()
+        cache_respostas.cache.clear()
+
+    def test_listagem_dentro_do_limite(self):
+        resposta = self.client.get('/usuarios/', {'paginacao': 10})
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data['count'], 9)
+
+    def test_queries_independem_do_tamanho_da_pagina(self):
+        # Uma página com 2 usuários e outra com todos: setores, atividades e perfis vêm dos prefetches
+        with CaptureQueriesContext(connection) as pagina_pequena:
+            self.client.get('/usuarios/', {'paginacao': 2})
+        cache_respostas.cache.clear()
+        with CaptureQueriesContext(connection) as pagina_cheia:
+            resposta = self.client.get('/usuarios/', {'paginacao': 10})
+
+        self.assertEqual(len(pagina_cheia), len(pagina_pequena))
+        usuario = next(usuario for usuario in resposta.data['dados'] if usuario['cpf'] == '00000000000')
+        self.assertEqual(len(usuario['setores']), 1)
+
+    def test_estimativa_da_contagem_fora_do_limite(self):
+        def consultar_estimativa(conexao, tabela):
+            with fora_do_limite_queries(), connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return 9
+
+        with mock.patch.object(connections['default'], 'vendor', 'postgresql'), \
+                mock.patch.object(contagem.ContagemEstimada, 'consultar_estimativa', side_effect=consultar_estimativa):
+            resposta = self.client.get('/usuarios/', {'paginacao': 10})
+
+        self.assertEqual(resposta.status_code, 200)
+
+
+class ContextoLoginQueriesTests(TestCase):
+    """`obter_usuario_contexto_login` em número fixo de queries, com vários setores e atividades."""
+
+    def test_quatro_queries(self):
+        admin = Usuario._base_manager.get(cpf='12345678901')
+        usuario = criar_usuarios(1, admin.campus)[0]
+        for indice in range(3):
+            setor = Setor.objects.create(nome=f'Setor {indice}', sigla=f'S{indice}')
+            Funcao.objects.create(
+                atividade=Atividade.objects.create(setor=setor, descricao='Atividade'), descricao='Função'
+            )
+            UsuarioSetor.objects.create(
+                usuario=usuario, setor=setor, campus=admin.campus, data_entrada=date(2024, 1, 1)
+            )
+
+        with self.assertNumQueries(4):
+            usuario = obter_usuario_contexto_login(usuario.pk)
+            funcoes = [
+                funcao.descricao
+                for vinculo in usuario.usuario_setores_ativos
+                for atividade in vinculo.setor.atividades.all()
+                for funcao in atividade.funcoes.all()
+            ]
+            usuario.campus.nome
+
+        self.assertEqual(len(usuario.usuario_setores_ativos), 4)
+        self.assertEqual(len(funcoes), 5)
+
+
+class HashSenhasEmLoteTests(TestCase):
+    """Pool de processos do hash de senhas: iniciado com spawn e reaproveitado entre os lotes."""
+
+    def tearDown(self):
+        senhas.encerrar_pools()
+
+    @mock.patch.dict(os.environ, {'SENHAS_PBKDF2_ITERACOES': '1000'})
+    def test_pool_unico_por_processo(self):
+        with override_settings(SENHAS_PBKDF2_ITERACOES=1000):
+            hashes = senhas.HashSenhasEmLote(processos=2, minimo_para_pool=0).gerar(['Senh@123', '', 'Outr@456'])
+            pool = senhas.obter_pool(2)
+            senhas.HashSenhasEmLote(processos=2, minimo_para_pool=0).gerar(['Senh@123', 'Outr@456'])
+
+            self.assertTrue(check_password('Senh@123', hashes[0]))
+            self.assertFalse(check_password('', hashes[1]))
+            self.assertTrue(check_password('Outr@456', hashes[2]))
+
+        self.assertIs(senhas.obter_pool(2), pool)
+        self.assertEqual(pool._mp_context.get_start_method(), 'spawn')
+
+    def test_padrao_limitado(self):
+        with override_settings(HASH_SENHAS_PROCESSOS=0), mock.patch.object(os, 'cpu_count', return_value=64):
+            self.assertEqual(senhas.HashSenhasEmLote().processos, senhas.PROCESSOS_PADRAO_MAXIMO)
+
+
+@override_settings(SENHAS_PBKDF2_ITERACOES=1000)
+class RehashSenhaTests(TestCase):
+    """Hash refeito com o hasher e o custo atuais no login, com um único UPDATE da senha."""
+
+    def setUp(self):
+        self.usuario = Usuario._base_manager.get(cpf='12345678901')
+        self.usuario.set_password('Senh@123')
+        self.usuario.save()
+
+    def hash_gravado(self):
+        return Usuario._base_manager.values_list('password', flat=True).get(pk=self.usuario.pk)
+
+    @override_settings(SENHAS_PBKDF2_ITERACOES=2000)
+    def test_outro_custo_refeito_no_login(self):
+        with self.assertNumQueries(2):
+            usuario = authenticate(cpf='12345678901', password='Senh@123')
+
+        self.assertEqual(usuario, self.usuario)
+        self.assertTrue(self.hash_gravado().startswith('pbkdf2_sha256$2000$'))
+
+        with self.assertNumQueries(1):
+            authenticate(cpf='12345678901', password='Senh@123')
+
+    def test_outro_algoritmo_refeito_no_login(self):
+        hashers = [settings.HASHERS_SENHAS['scrypt'], settings.HASHERS_SENHAS['pbkdf2']]
+        with override_settings(PASSWORD_HASHERS=hashers, SENHAS_SCRYPT_N=2 ** 10):
+            self.assertTrue(self.usuario.check_password('Senh@123'))
+
+            self.assertTrue(self.hash_gravado().startswith('scrypt$1024$'))
+            self.assertTrue(Usuario._base_manager.get(pk=self.usuario.pk).check_password('Senh@123'))
+
+    @override_settings(SENHAS_PBKDF2_ITERACOES=2000)
+    def test_senha_errada_nao_refeita(self):
+        hash_anterior = self.hash_gravado()
+
+        with self.assertNumQueries(0):
+            self.assertFalse(self.usuario.check_password('errada'))
+
+        self.assertEqual(self.hash_gravado(), hash_anterior)
+
+
+class UltimoLoginTests(TestCase):
+    """`last_login` gravado com um UPDATE no primeiro login do dia, e em lote com `ULTIMO_LOGIN_LOTE`."""
+
+    def setUp(self):
+        admin = Usuario._base_manager.get(cpf='12345678901')
+        self.usuarios = criar_usuarios(3, admin.campus)
+
+    def ultimo_login_gravado(self, usuario):
+        return Usuario._base_manager.values_list('last_login', flat=True).get(pk=usuario.pk)
+
+    def test_um_update_por_dia(self):
+        registro = RegistroUltimoLogin(lote=1)
+        usuario = self.usuarios[0]
+        hoje = timezone.localdate()
+
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(1):
+            registro.registrar(usuario)
+        self.assertEqual(self.ultimo_login_gravado(usuario), hoje)
+
+        recarregado = Usuario._base_manager.get(pk=usuario.pk)
+        with self.assertNumQueries(0):
+            registro.registrar(usuario)
+            registro.registrar(recarregado)
+
+        amanha = hoje + timedelta(days=1)
+        with mock.patch.object(timezone, 'localdate', return_value=amanha), self.assertNumQueries(1):
+            registro.registrar(usuario)
+        self.assertEqual(self.ultimo_login_gravado(usuario), amanha)
+
+    def test_data_gravada_nao_volta(self):
+        usuario = self.usuarios[0]
+        amanha = timezone.localdate() + timedelta(days=1)
+        Usuario._base_manager.filter(pk=usuario.pk).update(last_login=amanha)
+
+        RegistroUltimoLogin(lote=1).registrar(usuario)
+
+        self.assertEqual(self.ultimo_login_gravado(usuario), amanha)
+
+    def test_gravacao_em_lote(self):
+        registro = RegistroUltimoLogin(lote=3, intervalo=3600)
+
+        with self.assertNumQueries(0):
+            registro.registrar(self.usuarios[0])
+            registro.registrar(self.usuarios[1])
+
+        with self.assertNumQueries(1):
+            registro.registrar(self.usuarios[2])
+
+        for usuario in self.usuarios:
+            self.assertEqual(self.ultimo_login_gravado(usuario), timezone.localdate())
+
+
+class ExportacaoUsuariosTests(TestCase):
+    """Exportação de usuários: matrícula conforme `incluir_inativos`."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Usuario._base_manager.get(cpf='12345678901')
+        Matricula.objects.create(
+            usuario=cls.admin, matricula='2020001', data_validade=date(2030, 1, 1), ativo=False
+        )
+
+    def linha_do_admin(self, incluir_inativos):
+        exportacao = ExportacaoUsuarios(incluir_inativos=incluir_inativos)
+        linhas = [linha for bloco in exportacao.iterar_blocos() for linha in bloco]
+        return next(linha for linha in linhas if linha['cpf'] == self.admin.cpf)
+
+    def test_matricula_inativa_so_com_inativos(self):
+        self.assertIsNone(self.linha_do_admin(incluir_inativos=False)['matricula'])
+        self.assertEqual(self.linha_do_admin(incluir_inativos=True)['matricula'], '2020001')
+
+
+class ImportacaoSegundoPlanoTests(TestCase):
+    """Arquivo temporário da importação assíncrona."""
+
+    def test_remove_arquivo_temporario_se_agendamento_falha(self):
+        arquivo = SimpleUploadedFile('usuarios.csv', b'cpf,nome\n')
+
+        with tempfile.TemporaryDirectory() as diretorio, mock.patch.object(tempfile, 'tempdir', diretorio):
+            with mock.patch('Usuarios.usuario.business.iniciar_tarefa', side_effect=DatabaseError('falhou')):
+                with self.assertRaises(DatabaseError):
+                    UsuarioBusiness().importar_em_segundo_plano(arquivo, 'csv')
+
+            self.assertEqual(os.listdir(diretorio), [])
+
+
+CSV_IMPORTACAO = (
+    'cpf;nome;data_nascimento;campus;perfil;previsao_conclusao;email;logradouro;bairro;cep;num_casa;cidade;estado;'
+    'matricula;matricula_validade\n'
+    "00000000001;'=Maria Souza;2000-01-01;{cnpj};aluno;2027;maria@ifpi.edu.br;Rua A;Centro;64000000;10;Teresina;pi;"
+    '2024001;2030-01-01\n'
+    '123;João;2000-01-01;{cnpj};aluno;2027;;;;;;;;;\n'
+    '00000000001;Maria Repetida;2000-01-01;{cnpj};aluno;2027;;;;;;;;;\n'
+    '12345678901;Admin;2000-01-01;{cnpj};aluno;2027;;;;;;;;;\n'
+)
+
+
+class ImportadorUsuariosTests(TestCase):
+    """Pipeline de importação: leitura, validação, mapas de chaves naturais e gravação em lote."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Usuario._base_manager.get(cpf='12345678901')
+        cls.cnpj = cls.admin.campus.cnpj
+        cls.empresa = Empresa.objects.create(nome='Empresa', cnpj='22222222000122')
+        cls.curso = Curso.objects.create(nome='ADS')
+        Curso.objects.create(nome='Direito')
+        Curso.objects.create(nome='Direito')
+
+    def importar(self, conteudo, formato, **kwargs):
+        importador = ImportadorUsuarios(usuario_responsavel=self.admin, **kwargs)
+        return importador.importar(io.StringIO(conteudo), formato)
+
+    def test_ler_linhas_detecta_o_separador(self):
+        virgula = list(ler_linhas(io.StringIO('nome,cpf\n"Silva; Ana",00000000001\n'), 'csv'))
+        ponto_e_virgula = list(ler_linhas(io.StringIO('nome;cpf\nSilva, Ana;00000000001\n\n;\n'), 'csv'))
+
+        self.assertEqual(virgula, [(2, {'nome': 'Silva; Ana', 'cpf': '00000000001'})])
+        self.assertEqual(ponto_e_virgula, [(2, {'nome': 'Silva, Ana', 'cpf': '00000000001'})])
+
+    def test_csv(self):
+        relatorio = self.importar(CSV_IMPORTACAO.format(cnpj=self.cnpj), 'csv')
+
+        self.assertEqual(relatorio['total_linhas'], 4)
+        self.assertEqual(relatorio['importados'], 1)
+        self.assertEqual(relatorio['com_erro'], 3)
+        self.assertEqual(
+            [(erro['linha'], erro['cpf'], list(erro['erros'])) for erro in relatorio['erros']],
+            [(3, '123', ['cpf']), (4, '00000000001', ['cpf']), (5, '12345678901', ['cpf'])],
+        )
+        self.assertEqual(relatorio['erros'][1]['erros']['cpf'], ['CPF repetido no arquivo.'])
+        self.assertEqual(relatorio['erros'][2]['erros']['cpf'], ['Já existe um usuário com este CPF.'])
+
+        # O prefixo de proteção contra fórmulas da exportação é removido
+        usuario = Usuario._base_manager.get(cpf='00000000001')
+        self.assertEqual(usuario.nome, '=Maria Souza')
+        self.assertFalse(usuario.has_usable_password())
+        self.assertEqual(Aluno.objects.get(usuario=usuario).previsao_conclusao, 2027)
+        self.assertEqual(Contato.objects.get(usuario=usuario).email, 'maria@ifpi.edu.br')
+        self.assertEqual(Endereco.objects.get(usuario=usuario).estado, 'PI')
+        self.assertEqual(Matricula.objects.get(usuario=usuario).matricula, '2024001')
+
+        # bulk_create_with_history grava o histórico de todas as tabelas, com o autor da importação
+        for model in (Usuario, Aluno, Contato, Endereco, Matricula):
+            registro = model.history.get(**({'cpf': usuario.cpf} if model is Usuario else {'usuario_id': usuario.pk}))
+            self.assertEqual(registro.history_user, self.admin)
+
+    def test_jsonl_resolve_as_chaves_naturais(self):
+        linhas = [
+            {'cpf': '00000000002', 'nome': 'Terceirizado', 'data_nascimento': '1990-01-01', 'campus': self.cnpj,
+             'perfil': 'terceirizado', 'empresa': self.empresa.cnpj, 'data_inicio_contrato': '2024-01-01'},
+            {'cpf': '00000000003', 'nome': 'Estagiário', 'data_nascimento': '2001-01-01', 'campus': self.cnpj,
+             'perfil': 'estagiario', 'empresa': self.empresa.cnpj, 'curso': 'ADS', 'carga_horaria': 20,
+             'data_inicio_estagio': '2024-01-01', 'senha': 'Senh@123'},
+            {'cpf': '00000000004', 'nome': 'Ambíguo', 'data_nascimento': '2001-01-01', 'campus': self.cnpj,
+             'perfil': 'estagiario', 'empresa': self.empresa.cnpj, 'curso': 'Direito', 'carga_horaria': 20,
+             'data_inicio_estagio': '2024-01-01', 'cargo': 'Inexistente'},
+        ]
+        conteudo = '\n'.join(json.dumps(linha) for linha in linhas) + '\nnão é json\n[1, 2]\n'
+
+        with override_settings(SENHAS_PBKDF2_ITERACOES=1000):
+            relatorio = self.importar(conteudo, 'jsonl')
+
+        self.assertEqual(relatorio['importados'], 2)
+        self.assertEqual([erro['linha'] for erro in relatorio['erros']], [3, 4, 5])
+        self.assertEqual(relatorio['erros'][0]['erros'], {
+            'cargo': ['Cargo "Inexistente" não encontrado ou inativo.'],
+            'curso': ['Curso "Direito" é ambíguo.'],
+        })
+        self.assertEqual(relatorio['erros'][1]['erros'], {'linha': ['Linha não é um objeto JSON válido.']})
+
+        self.assertEqual(Terceirizado.objects.get(usuario__cpf='00000000002').empresa, self.empresa)
+        estagiario = Estagiario.objects.get(usuario__cpf='00000000003')
+        self.assertEqual((estagiario.empresa, estagiario.curso), (self.empresa, self.curso))
+        self.assertTrue(Usuario._base_manager.get(cpf='00000000003').check_password('Senh@123'))
+
+    def test_lote_recusado_pelo_banco_regravado_linha_a_linha(self):
+        linhas = [
+            {'cpf': f'0000000001{indice}', 'nome': f'Aluno {indice}', 'data_nascimento': '2000-01-01',
+             'campus': self.cnpj, 'perfil': 'aluno', 'previsao_conclusao': 2027}
+            for indice in range(3)
+        ]
+        inserir = ImportadorUsuarios.inserir
+
+        def inserir_com_conflito(importador, lote):
+            # Simula um CPF inserido por outra requisição depois da verificação do lote
+            inserir(importador, lote)
+            if any(linha['cpf'] == '00000000011' for linha in lote):
+                raise IntegrityError('UNIQUE constraint failed: usuarios.cpf')
+
+        with mock.patch.object(ImportadorUsuarios, 'inserir', autospec=True, side_effect=inserir_com_conflito):
+            relatorio = self.importar('\n'.join(json.dumps(linha) for linha in linhas), 'jsonl')
+
+        self.assertEqual(relatorio['importados'], 2)
+        self.assertEqual(relatorio['erros'], [{
+            'linha': 2, 'cpf': '00000000011',
+            'erros': {'linha': ['Erro ao gravar: UNIQUE constraint failed: usuarios.cpf']},
+        }])
+        self.assertEqual(
+            sorted(Aluno.objects.filter(usuario__cpf__startswith='0000000001').values_list('usuario__cpf', flat=True)),
+            ['00000000010', '00000000012'],
+        )
+
+
+@mock.patch.object(tarefas, 'connections')
+class UsuarioImportarViewTests(TestCase):
+    """Importação pela API, síncrona e em segundo plano."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(Usuario._base_manager.get(cpf='12345678901'))
+        self.csv = CSV_IMPORTACAO.format(cnpj=Usuario._base_manager.get(cpf='12345678901').campus.cnpj)
+
+    def enviar(self, **dados):
+        arquivo = SimpleUploadedFile('usuarios.csv', self.csv.encode('utf-8-sig'), content_type='text/csv')
+        return self.client.post('/usuarios/importar/', {'arquivo': arquivo, **dados}, format='multipart')
+
+    def test_importacao_sincrona(self, connections):
+        resposta = self.enviar()
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data['mensagem'], 'Importação concluída com 3 linha(s) rejeitada(s).')
+        self.assertEqual(resposta.data['dados']['importados'], 1)
+        self.assertEqual(len(resposta.data['dados']['erros']), 3)
+        self.assertTrue(Usuario._base_manager.filter(cpf='00000000001').exists())
+
+    def test_importacao_em_segundo_plano(self, connections):
+        with self.captureOnCommitCallbacks() as callbacks:
+            resposta = self.enviar(assincrono='true')
+
+        self.assertEqual(resposta.status_code, 202)
+        tarefa_id = resposta.data['dados']['tarefa_id']
+        self.assertEqual(self.client.get(f'/usuarios/importacoes/{tarefa_id}/').data['dados']['status'], 'pendente')
+
+        # Executa na thread do teste a thread agendada para depois do commit
+        thread = next(callback.__self__ for callback in callbacks if isinstance(
+            getattr(callback, '__self__', None), threading.Thread
+        ))
+        thread.run()
+
+        dados = self.client.get(f'/usuarios/importacoes/{tarefa_id}/').data['dados']
+        self.assertEqual(dados['status'], 'concluida')
+        self.assertEqual(dados['resultado']['importados'], 1)
+        self.assertEqual(dados['resultado']['com_erro'], 3)
+        self.assertTrue(Usuario._base_manager.filter(cpf='00000000001').exists())
@@ -0,0 +1,105 @@
+"""
+Último login - gravação de `Usuario.last_login` só quando a data muda.
+
+`last_login` é uma data (`DateField`): de todos os logins de um usuário no mesmo dia,
+só o primeiro muda o valor. O `update_last_login` do Django faz `save()` a cada login,
+com signals e uma linha no `HistoricalUsuario`. Aqui:
+
+- Se a data do usuário já é a de hoje, nada é gravado (nem consultado).
+- A gravação é um UPDATE só da coluna `last_login`, condicionado à data gravada ser
+  anterior (dois workers nunca voltam a data), sem `save()` e sem histórico. O snapshot
+  do usuário, que mostra o `last_login`, é invalidado.
+- Com `ULTIMO_LOGIN_LOTE` maior que 1, as datas ficam em memória e são gravadas em lote
+  (um UPDATE por data para até `ULTIMO_LOGIN_LOTE` usuários) quando o lote enche, quando
+  passam `ULTIMO_LOGIN_INTERVALO` segundos desde a última gravação (verificado no próximo
+  login do worker) ou no fim do processo.
+
+Exemplo de uso:
+    ultimo_login.registrar(usuario)  # após autenticar
+
+    ultimo_login.descarregar()  # grava o que estiver em memória
+"""
+import atexit
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from Usuarios.usuario.helpers import snapshot_usuario
+from Usuarios.usuario.models import Usuario
+
+
+class RegistroUltimoLogin:
+    """
+    Registra a data do último login dos usuários, imediatamente ou em lotes.
+
+    Args:
+        lote: Logins guardados em memória antes da gravação (padrão: `ULTIMO_LOGIN_LOTE`; 1 = imediato)
+        intervalo: Segundos máximos entre as gravações em lote (padrão: `ULTIMO_LOGIN_INTERVALO`)
+    """
+
+    def __init__(self, lote=None, intervalo=None):
+        self._lote = lote
+        self._intervalo = intervalo
+        self._lock = threading.Lock()
+        self._pendentes = {}
+        self._ultima_gravacao = time.monotonic()
+        atexit.register(self.descarregar)
+
+    @property
+    def lote(self):
+        return self._lote or getattr(settings, 'ULTIMO_LOGIN_LOTE', 1)
+
+    @property
+    def intervalo(self):
+        return self._intervalo or getattr(settings, 'ULTIMO_LOGIN_INTERVALO', 60)
+
+    def registrar(self, usuario):
+        """Registra o login de hoje; só grava (ou guarda para o lote) se a data mudou."""
+        hoje = timezone.localdate()
+        if usuario.last_login == hoje:
+            return
+        usuario.last_login = hoje
+
+        if self.lote <= 1:
+            self._gravar({hoje: [usuario.pk]})
+            return
+
+        with self._lock:
+            self._pendentes[usuario.pk] = hoje
+            devido = (
+                len(self._pendentes) >= self.lote
+                or time.monotonic() - self._ultima_gravacao >= self.intervalo
+            )
+        if devido:
+            self.descarregar()
+
+    def descarregar(self):
+        """Grava as datas guardadas em memória."""
+        with self._lock:
+            pendentes, self._pendentes = self._pendentes, {}
+            self._ultima_gravacao = time.monotonic()
+
+        por_data = {}
+        for usuario_id, data in pendentes.items():
+            por_data.setdefault(data, []).append(usuario_id)
+        self._gravar(por_data)
+
+    def _gravar(self, por_data):
+        tamanho = max(self.lote, 1)
+        for data, usuarios_ids in por_data.items():
+            for inicio in range(0, len(usuarios_ids), tamanho):
+                ids = usuarios_ids[inicio:inicio + tamanho]
+                atualizados = Usuario._base_manager.filter(
+                    Q(last_login__isnull=True) | Q(last_login__lt=data), pk__in=ids,
+                ).update(last_login=data)
+
+                if atualizados:
+                    for usuario_id in ids:
+                        snapshot_usuario.invalidar(usuario_id)
+
+
+# Registro do processo (usado pelo LoginSerializer e pelo login do admin)
+ultimo_login = RegistroUltimoLogin()
@@ -1,10 +1,21 @@
 from django.urls import path
 
-from Usuarios.usuario.views import UsuarioListaView, UsuarioRetrieveView
+from Usuarios.usuario.views import (
+    UsuarioListaView,
+    UsuarioRetrieveView,
+    UsuarioImportarView,
+    UsuarioImportacaoStatusView,
+    UsuarioExportarView,
+    UsuarioSetorExportarView,
+)
 
 app_name = 'usuarios'
 
 urlpatterns = [
     path('', UsuarioListaView.as_view(), name='lista'),
     path('<int:pk>/', UsuarioRetrieveView.as_view(), name='detalhe'),
+    path('importar/', UsuarioImportarView.as_view(), name='importar'),
+    path('importacoes/<str:tarefa_id>/', UsuarioImportacaoStatusView.as_view(), name='importacao'),
+    path('exportar/', UsuarioExportarView.as_view(), name='exportar'),
+    path('setores/exportar/', UsuarioSetorExportarView.as_view(), name='exportar-setores'),
 ]
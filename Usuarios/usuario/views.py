@@ -1,12 +1,28 @@
+from django.db.models import prefetch_related_objects
+from django.http import Http404
+
 from drf_spectacular.utils import extend_schema
 
 from rest_framework import status
 
 from AppCore.basics.mixins.mixins import IsOwnerOrAdminMixin, IsAdminMixin
-from AppCore.basics.views.basic_views import BasicGetAPIView, BasicRetrieveAPIView
+from AppCore.basics.views.basic_views import (
+    BasicGetAPIView, BasicPostAPIView, BasicRetrieveAPIView, BasicExportacaoAPIView
+)
 
+from Monitoramento.tarefas.tarefas import obter_tarefa
+from Usuarios.usuario.business import UsuarioBusiness
+from Usuarios.usuario.exportacao import ExportacaoSetoresUsuarios, ExportacaoUsuarios
+from Usuarios.usuario.helpers import snapshot_usuario
+from Usuarios.usuario.importacao import deduzir_formato
 from Usuarios.usuario.models import Usuario
-from Usuarios.usuario.serializers import UsuarioListaDetalhadaSerializer, UsuarioCompletoSerializer
+from Usuarios.usuario.serializers import (
+    UsuarioListaDetalhadaSerializer,
+    UsuarioCompletoSerializer,
+    ImportacaoUsuariosSerializer,
+    RelatorioImportacaoSerializer,
+    TarefaImportacaoSerializer,
+)
 
 
 @extend_schema(
@@ -45,15 +61,10 @@ class UsuarioListaView(IsAdminMixin, BasicGetAPIView):
     """
     serializer_class = UsuarioListaDetalhadaSerializer
     mensagem_sucesso = 'Usuários listados com sucesso.'
-
-    def get_queryset(self):
-        return Usuario.objects.select_related(
-            'campus'
-        ).prefetch_related(
-            'contatos',
-            'usuario_setores__setor__atividades__funcoes',
-            'usuario_setores__campus',
-        ).all()
+    # count + usuários + contatos + vínculos + atividades + funções
+    limite_queries = 6
+    otimizar_queryset = True
+    queryset = Usuario.objects.all()
 
 
 @extend_schema(
@@ -93,16 +104,29 @@ class UsuarioRetrieveView(IsOwnerOrAdminMixin, BasicRetrieveAPIView):
     serializer_class = UsuarioCompletoSerializer
     mensagem_sucesso = 'Usuário recuperado com sucesso.'
     lookup_field = 'pk'
+    otimizar_queryset = True
+    queryset = Usuario.objects.all()
+
+    def otimizar(self, queryset):
+        """Os prefetches ficam para quando o snapshot precisar ser (re)gerado."""
+        return self.obter_otimizacao().aplicar(queryset, prefetch=False)
 
-    def get_queryset(self):
-        return Usuario.objects.select_related(
-            'campus', 'cargo'
-        ).prefetch_related(
-            'contatos',
-            'enderecos',
-            'usuario_setores__setor__atividades__funcoes',
-            'usuario_setores__campus',
-        ).all()
+    def serializar_objeto(self, objeto):
+        """
+        Retorna os dados completos do usuário a partir do snapshot em cache.
+
+        As relações só são carregadas quando o snapshot precisa ser (re)gerado. Com `?campos=`,
+        o objeto vem projetado para os campos pedidos e é serializado sem passar pelo snapshot.
+        """
+        if self.obter_campos_solicitados() is not None:
+            prefetch_related_objects([objeto], *self.obter_otimizacao().prefetch_related)
+            return super().serializar_objeto(objeto)
+
+        def gerar():
+            prefetch_related_objects([objeto], *self.obter_otimizacao().prefetch_related)
+            return super(UsuarioRetrieveView, self).serializar_objeto(objeto)
+
+        return snapshot_usuario.obter('perfil', objeto.pk, gerar)
 
     def obter_usuario_dono(self, obj):
         """
@@ -111,3 +135,157 @@ class UsuarioRetrieveView(IsOwnerOrAdminMixin, BasicRetrieveAPIView):
         Como o objeto é o próprio usuário, retorna ele mesmo.
         """
         return obj
+
+
+@extend_schema(
+    tags=['Usuarios'],
+    summary='Importar usuários em massa',
+    description='''
+    Importa usuários com perfil, contato, endereço e matrícula a partir de um arquivo CSV ou JSONL.
+    
+    **Permissões:** Apenas administradores (is_admin ou is_superuser) podem acessar.
+    
+    **Arquivo (uma linha por usuário, UTF-8):**
+    - Usuário: nome, cpf, data_nascimento, data_ingresso, campus (CNPJ), cargo (descrição), senha
+    - Perfil: perfil (aluno, servidor, terceirizado ou estagiario) e os campos do perfil;
+      empresa pelo CNPJ e curso pelo nome
+    - Contato: email, telefone
+    - Endereço: logradouro, bairro, cep, num_casa, cidade, estado
+    - Matrícula: matricula, matricula_validade
+    
+    Usuários sem `senha` são criados sem senha utilizável. Linhas inválidas não interrompem
+    a importação e são listadas no relatório com o número da linha e os erros.
+    
+    **Modo assíncrono:** com `assincrono=true` a resposta é 202 com o `tarefa_id`; o relatório
+    fica disponível em `/usuarios/importacoes/<tarefa_id>/`.
+    ''',
+    request={'multipart/form-data': ImportacaoUsuariosSerializer},
+    responses={
+        status.HTTP_200_OK: RelatorioImportacaoSerializer,
+        status.HTTP_202_ACCEPTED: {'description': 'Importação agendada (dados.tarefa_id)'},
+        status.HTTP_400_BAD_REQUEST: {'description': 'Arquivo ou formato inválido'},
+        status.HTTP_401_UNAUTHORIZED: {'description': 'Não autenticado'},
+        status.HTTP_403_FORBIDDEN: {'description': 'Sem permissão de administrador'},
+    },
+)
+class UsuarioImportarView(IsAdminMixin, BasicPostAPIView):
+    """
+    View para importação em massa de usuários.
+    
+    Apenas administradores podem importar usuários.
+    Na importação síncrona, o relatório é retornado em `dados`. Cada lote da importação
+    tem sua própria transação, por isso a ação não roda dentro de uma transação única.
+    """
+    serializer_class = ImportacaoUsuariosSerializer
+    mensagem_sucesso = 'Importação concluída.'
+    transacao_unica = False
+
+    def do_action_post(self, serializer_data, request):
+        business = UsuarioBusiness()
+        arquivo = serializer_data['arquivo']
+        formato = deduzir_formato(arquivo.name, serializer_data.get('formato'))
+
+        if serializer_data['assincrono']:
+            tarefa_id = business.importar_em_segundo_plano(arquivo, formato, request.user)
+            return {
+                'status_code': status.HTTP_202_ACCEPTED,
+                'mensagem': 'Importação agendada. Acompanhe o andamento pelo id da tarefa.',
+                'dados': {'tarefa_id': tarefa_id},
+            }
+
+        relatorio = business.importar_arquivo_enviado(arquivo, formato, request.user)
+
+        mensagem = self.mensagem_sucesso
+        if relatorio['com_erro']:
+            mensagem = f'Importação concluída com {relatorio["com_erro"]} linha(s) rejeitada(s).'
+
+        return {'status_code': status.HTTP_200_OK, 'mensagem': mensagem, 'dados': relatorio}
+
+
+@extend_schema(
+    tags=['Usuarios'],
+    summary='Consultar uma importação em segundo plano',
+    description='''
+    Retorna o estado de uma importação iniciada com `assincrono=true`.
+    
+    **Permissões:** Apenas administradores (is_admin ou is_superuser) podem acessar.
+    
+    **Retorno:**
+    - id, status (pendente, processando, concluida ou erro)
+    - criada_em, iniciada_em, concluida_em
+    - resultado (relatório da importação, quando concluída)
+    - erro (mensagem, quando a tarefa falha)
+    ''',
+    responses={
+        status.HTTP_200_OK: TarefaImportacaoSerializer,
+        status.HTTP_401_UNAUTHORIZED: {'description': 'Não autenticado'},
+        status.HTTP_403_FORBIDDEN: {'description': 'Sem permissão de administrador'},
+        status.HTTP_404_NOT_FOUND: {'description': 'Tarefa não encontrada ou removida'},
+    },
+)
+class UsuarioImportacaoStatusView(IsAdminMixin, BasicRetrieveAPIView):
+    """
+    View para consultar o estado de uma importação em segundo plano.
+    
+    O estado fica no banco (`Monitoramento.tarefas`); tarefas concluídas são removidas
+    após `TAREFAS_RETENCAO` segundos.
+    """
+    serializer_class = TarefaImportacaoSerializer
+    mensagem_sucesso = 'Importação recuperada com sucesso.'
+
+    def get_object(self):
+        tarefa = obter_tarefa(self.kwargs['tarefa_id'])
+        if not tarefa or tarefa.get('tipo') != 'importacao_usuarios':
+            raise Http404
+        return tarefa
+
+
+@extend_schema(
+    tags=['Usuarios'],
+    summary='Exportar usuários',
+    description='''
+    Exporta todos os usuários em CSV, NDJSON ou JSON, enviados em streaming.
+    
+    **Permissões:** Apenas administradores (is_admin ou is_superuser) podem acessar.
+    
+    **Colunas:**
+    - Usuário: nome, cpf, data_nascimento, data_ingresso, campus (CNPJ), cargo (descrição), ativo
+    - perfis (aluno, servidor, terceirizado, estagiario) e setores atuais (nomes)
+    - Contato, endereço e matrícula mais recentes
+    
+    Para os campos de cada perfil, no formato da importação, use a exportação do perfil
+    (ex: `/perfis/alunos/exportar/`). Por padrão apenas usuários ativos; use `inativos=true`
+    para incluir os inativos.
+    ''',
+)
+class UsuarioExportarView(IsAdminMixin, BasicExportacaoAPIView):
+    """
+    View para exportação de todos os usuários.
+    
+    Apenas administradores podem exportar.
+    O arquivo é gerado em blocos enquanto é enviado.
+    """
+    exportacao_class = ExportacaoUsuarios
+
+
+@extend_schema(
+    tags=['Usuarios'],
+    summary='Exportar vínculos de usuários com setores',
+    description='''
+    Exporta os vínculos de usuários com setores (uma linha por vínculo) em CSV, NDJSON ou JSON.
+    
+    **Permissões:** Apenas administradores (is_admin ou is_superuser) podem acessar.
+    
+    **Colunas:** cpf, nome, setor, sigla, campus (CNPJ), e_responsavel, monitor, data_entrada, data_saida
+    
+    Por padrão apenas os vínculos atuais (sem data de saída passada); use `inativos=true`
+    para incluir os encerrados.
+    ''',
+)
+class UsuarioSetorExportarView(IsAdminMixin, BasicExportacaoAPIView):
+    """
+    View para exportação dos vínculos de usuários com setores.
+    
+    Apenas administradores podem exportar.
+    """
+    exportacao_class = ExportacaoSetoresUsuarios